@@ -585,12 +585,13 @@ class ModInstaller(tk.Tk):
         # Open feature selection dialog
         FeatureSelectionDialog(self, self.start_installation)
     
-    def start_installation(self, selected_features):
+    def start_installation(self, selected_features, allow_unknown_build=False):
         """Start installation with selected features."""
         if self.is_working:
             return
         
         self.selected_features = selected_features
+        self.allow_unknown_build = allow_unknown_build
         self.is_working = True
         self.set_buttons_enabled(False)
         self.set_status("Starting installation...", '#4ecca3')
@@ -600,6 +601,7 @@ class ModInstaller(tk.Tk):
     
     def install_mods_worker(self):
         """Worker thread for mod installation."""
+        unknown_build = None
         try:
             # Step 0: Ensure node_modules are installed
             node_modules = SCRIPT_DIR / "node_modules"
@@ -638,17 +640,18 @@ class ModInstaller(tk.Tk):
             
             success, applied, failed = apply_selected_mods(
                 self.selected_features, 
-                progress_callback
+                progress_callback,
+                allow_unknown_build=self.allow_unknown_build
             )
             
             if not success:
-                # Check for specific error messages from backup/extract
+                # Unrecognised game build: ask (on the Tk thread) whether to patch anyway
+                if failed and failed[0].startswith("VERSION WARNING") and not self.allow_unknown_build:
+                    unknown_build = failed[0]
+                    return
+                # Show the actual reason (backup, extraction, repack, ...)
                 if failed:
-                    first_error = failed[0]
-                    if "vanilla backup" in first_error.lower() or "reinstall" in first_error.lower():
-                        raise Exception(first_error)
-                    elif "extraction" in first_error.lower():
-                        raise Exception(first_error)
+                    raise Exception(failed[0])
                 raise Exception(f"Failed to apply mods. Applied: {len(applied)}, Failed: {len(failed)}")
             
             # Check for failures
@@ -681,6 +684,23 @@ class ModInstaller(tk.Tk):
         finally:
             self.is_working = False
             self.after(0, lambda: self.set_buttons_enabled(True))
+            if unknown_build:
+                self.after(0, lambda: self.on_unknown_build(unknown_build))
+    
+    def on_unknown_build(self, warning):
+        """Offer to patch a game build this mod doesn't recognise."""
+        self.set_status("⚠️ Unknown game build", '#ffaa00')
+        message = warning.replace("VERSION WARNING: ", "", 1)
+        if messagebox.askyesno(
+            "Unknown Game Build",
+            f"{message}\n\n"
+            "Patching anyway may break the game. You can always undo it with 'Restore Vanilla'.\n\n"
+            "Patch anyway?",
+            icon='warning'
+        ):
+            self.start_installation(self.selected_features, allow_unknown_build=True)
+        else:
+            self.set_status("Installation cancelled (unknown game build)", '#666666')
     
     def on_install_success(self):
         """Handle successful installation."""
@@ -150,48 +150,41 @@ def main():
     
     # 5c. Check game version compatibility
     print("\n[Checking game version compatibility...]")
-    # Expected vanilla file sizes for the game version this mod targets
-    EXPECTED_VANILLA_FILES = {
-        "src/js/game/Game.js":                  42952,
-        "src/js/game/component/Pokemon.js":     24443,
-        "src/js/game/scenes/PokemonScene.js":   58824,
-        "src/js/game/core/Area.js":             18938,
-        "src/js/game/core/Team.js":             1854,
-        "src/js/game/core/Box.js":              703,
-    }
-    
-    # Try vanilla backup first, then extracted files
+    # Builds are identified by content hash against lib/game_builds.json
+    sys.path.insert(0, str(script_dir))
+    try:
+        from lib import fingerprint
+    except Exception as e:
+        fingerprint = None
+        print(f"  [INFO] Cannot load build fingerprinting ({e})")
+    
     vanilla_asar = resources / "app.asar.vanilla" if resources.exists() else None
-    app_extracted = resources / "app_extracted" if resources.exists() else None
     
     version_checked = False
-    if app_extracted and app_extracted.exists():
-        mismatches = []
-        for rel_path, expected_size in EXPECTED_VANILLA_FILES.items():
-            file_path = app_extracted / rel_path.replace("/", os.sep)
-            if file_path.exists():
-                actual_size = file_path.stat().st_size
-                # Modded files will be different sizes, so only flag if files are
-                # clearly from a different game version (vanilla files match exactly)
-                # We can't distinguish modded-size from wrong-version-size here,
-                # so just report for awareness
-        version_checked = True
-    
-    if vanilla_asar and vanilla_asar.exists():
-        vanilla_size = vanilla_asar.stat().st_size
-        # Known vanilla asar size for Windows v1.5.4
-        expected_vanilla_asar_size = 75099415
-        version_ok = vanilla_size == expected_vanilla_asar_size
-        check(f"Vanilla backup size ({vanilla_size:,} bytes)", version_ok,
-              f"Expected {expected_vanilla_asar_size:,} bytes for Windows v1.5.4.\n"
-              "      Your game may be a different version. This mod currently targets PokePath TD v1.5.4 on Windows.\n"
-              "      Update your game or download the matching mod version.")
-        if not version_ok:
-            all_good = False
-        version_checked = True
+    if fingerprint and vanilla_asar and vanilla_asar.exists():
+        try:
+            fp = fingerprint.compute_fingerprint(vanilla_asar)
+            build = fingerprint.identify_build(fp)
+        except Exception as e:
+            fp, build = None, None
+            print(f"  [INFO] Cannot fingerprint vanilla backup: {e}")
+        if fp is not None:
+            builds = fingerprint.load_builds()
+            known = ", ".join(f"v{b['game_version']} ({b.get('platform', '?')})" for b in builds) or "none"
+            name = (f"Vanilla backup is a known build: v{build['game_version']} ({build.get('platform', '?')})"
+                    if build else f"Vanilla backup build ({fp['header'][:12]}...)")
+            check(name, build is not None,
+                  f"Not a build this mod knows. Supported: {known}.\n"
+                  "      Update your game or download the matching mod version.")
+            if build is None:
+                all_good = False
+                if builds:
+                    for m in fingerprint.describe_mismatches(fp, builds[0]):
+                        print(f"      - {m}")
+            version_checked = True
     
     if not version_checked:
-        print("  [INFO] Cannot verify game version (no vanilla backup or extracted files)")
+        print("  [INFO] Cannot verify game version (no vanilla backup)")
         print("         Run the installer first to create a vanilla backup.")
     
     # 6. Check for common mistakes
@@ -204,16 +197,19 @@ def main():
           "EXTRACT the zip file first! Don't run from inside the zip.")
     all_good &= not in_temp
     
-    # Check if extraction already done
-    app_extracted = resources / "app_extracted" if resources.exists() else None
-    if app_extracted and app_extracted.exists():
-        check("Game already extracted", True)
-        
-        # Check if JS files exist
-        js_root = app_extracted / "src" / "js"
-        check("Extracted JS files present", js_root.exists())
-    else:
-        check("Game needs extraction", True)  # Not a failure, just info
+    # Game scripts readable by the tools (extracted tree, or the asar itself -
+    # the default install never extracts)
+    try:
+        from lib.game_files import GameFiles
+        game_files = GameFiles(resources if resources.exists() else None)
+        source = game_files.source
+        readable = game_files.exists("src/js/game/Game.js")
+        check(f"Game scripts readable ({source.name if source else 'no game files'})", readable,
+              "Reinstall the game - app.asar is missing or damaged")
+        all_good &= readable
+        game_files.close()
+    except Exception as e:
+        print(f"  [INFO] Cannot read game files ({e})")
     
     # Summary
     print("\n" + "=" * 50)
@@ -24,11 +24,23 @@ from pathlib import Path
 import re
 import shutil
 import json
+import hashlib
+import errno
+import io
+import contextlib
 import os
 import subprocess
 import sys
 import stat
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from lib import asar, fingerprint
+except ImportError:
+    import asar
+    import fingerprint
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 MODS_DIR = SCRIPT_DIR.parent  # mods/ root (one level up from lib/)
@@ -76,38 +88,79 @@ JS_ROOT = APP_EXTRACTED / "src" / "js"
 # ============================================================================
 # GAME VERSION COMPATIBILITY
 # ============================================================================
-# Expected vanilla file sizes for the game version this mod targets.
-# If these don't match, the user likely has a different game version and
-# full-file-replacement patches (.modded.js) will break core gameplay.
-EXPECTED_VANILLA_FILES = {
-    "src/js/game/Game.js":                  42952,
-    "src/js/game/component/Pokemon.js":     24443,
-    "src/js/game/scenes/PokemonScene.js":   58824,
-    "src/js/game/core/Area.js":             18938,
-    "src/js/game/core/Team.js":             1854,
-    "src/js/game/core/Box.js":              703,
+# Builds are identified by a content hash of the vanilla asar (header + key
+# scripts, see fingerprint.py) looked up in lib/game_builds.json.
+# Full-file-replacement patches (.modded.js) are tied to a specific build and
+# break core gameplay on any other, so unknown builds are refused.
+GAME_BUILD = None  # game_builds.json entry of the last identified build
+GAME_FINGERPRINT = None  # fingerprint.compute_fingerprint() of the last checked asar
+
+# Patch profiles: per-build anchor variants and the folder holding the
+# .modded.js bundle written for that build. A known build names its profile in
+# game_builds.json (defaulting to its game_version), so every anchor declared
+# with per-profile variants tries exactly one alternative. With no profile
+# (unknown build, patched with allow_unknown_build) every variant is tried in
+# declaration order, then the '*' catch-all. The '1.5.4' variants are the exact
+# vanilla (or earlier-patch) text; the loose regex fallbacks live under '*'.
+PATCH_PROFILES = {
+    '1.5.4': {'bundle': 'patches'},
 }
-
-def check_game_version_compatibility():
-    """Check if extracted vanilla files match expected sizes.
+PATCH_PROFILE = None  # active profile name, or None for "try every variant"
+
+def modded_patch(name):
+    """Path of a .modded.js (or other patch asset) in the active profile's bundle."""
+    profile = PATCH_PROFILES.get(PATCH_PROFILE, {})
+    return MODS_DIR / profile.get('bundle', 'patches') / name
+
+def _select_profile(build):
+    """Activate the patch profile for an identified build (None: no profile)."""
+    global PATCH_PROFILE
+    PATCH_PROFILE = None
+    if build is None:
+        return None
+    name = build.get('profile', build.get('game_version'))
+    if name not in PATCH_PROFILES:
+        print(f"  [WARN] No patch profile '{name}' for game v{build.get('game_version')}, trying every anchor variant")
+        return None
+    PATCH_PROFILE = name
+    return name
+
+def identify_game_build(source=None):
+    """Fingerprint the vanilla asar and look it up in the known-build DB.
+    
+    Only the asar header and the key scripts' byte ranges are read; nothing
+    is extracted. Also selects the build's patch profile.
     
     Returns:
-        tuple: (compatible: bool, mismatches: list of str)
+        tuple: (build: dict or None, mismatches: list of str)
     """
-    mismatches = []
-    if not APP_EXTRACTED.exists():
-        return True, []  # Can't check yet, will be checked after extraction
-    
-    for rel_path, expected_size in EXPECTED_VANILLA_FILES.items():
-        file_path = APP_EXTRACTED / rel_path.replace("/", os.sep)
-        if not file_path.exists():
-            mismatches.append(f"{rel_path}: FILE MISSING (expected {expected_size} bytes)")
-            continue
-        actual_size = file_path.stat().st_size
-        if actual_size != expected_size:
-            mismatches.append(f"{rel_path}: {actual_size} bytes (expected {expected_size})")
+    global GAME_BUILD, GAME_FINGERPRINT
+    if source is None:
+        source = APP_ASAR_VANILLA if APP_ASAR_VANILLA.exists() else APP_ASAR
+    GAME_BUILD = GAME_FINGERPRINT = None
+    _select_profile(None)
+    try:
+        fp = fingerprint.compute_fingerprint(source)
+    except (OSError, asar.AsarError) as e:
+        return None, [f"{Path(source).name}: can't fingerprint ({e})"]
+    GAME_FINGERPRINT = fp
+    GAME_BUILD = fingerprint.identify_build(fp)
+    _select_profile(GAME_BUILD)
+    if GAME_BUILD:
+        return GAME_BUILD, []
+    builds = fingerprint.load_builds()
+    target = next((b for b in builds if b.get('game_version') == GAME_VERSION), builds[0] if builds else None)
+    mismatches = fingerprint.describe_mismatches(fp, target) if target else []
+    return None, mismatches or [f"{Path(source).name}: not a known PokePath TD build"]
+
+def check_game_version_compatibility(source=None):
+    """Check if the vanilla game is a build this mod knows.
     
-    return len(mismatches) == 0, mismatches
+    Returns:
+        tuple: (compatible: bool, mismatches: list of str)
+    """
+    build, mismatches = identify_game_build(source)
+    return build is not None, mismatches
 
 
 # ============================================================================
@@ -191,41 +244,16 @@ def is_game_modded(check_asar=False):
             except Exception:
                 pass
     
-    # If app_extracted doesn't exist and we want to check asar, extract to temp
+    # If app_extracted doesn't exist, read Game.js straight out of app.asar
     elif check_asar and APP_ASAR.exists():
-        import tempfile
-        temp_dir = Path(tempfile.mkdtemp(prefix="pokepath_check_"))
         try:
-            # Quick extraction using asar module
-            creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            result = subprocess.run(
-                ['node', '-e', f'''
-const asar = require('@electron/asar');
-asar.extractAll({repr(str(APP_ASAR))}, {repr(str(temp_dir))});
-'''],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                creationflags=creationflags,
-                cwd=str(MODS_DIR)
-            )
-            
-            if result.returncode == 0:
-                # Check extracted temp files for markers
-                temp_game_js = temp_dir / "src" / "js" / "game" / "Game.js"
-                if temp_game_js.exists():
-                    content = temp_game_js.read_text(encoding='utf-8')
-                    for marker in MOD_MARKERS[:3]:
-                        if marker in content:
-                            return True
+            with asar.AsarArchive(APP_ASAR) as archive:
+                content = archive.read_text('src/js/game/Game.js')
+            for marker in MOD_MARKERS[:3]:
+                if marker in content:
+                    return True
         except Exception:
             pass
-        finally:
-            # Clean up temp dir
-            try:
-                shutil.rmtree(temp_dir)
-            except Exception:
-                pass
     
     return False
 
@@ -286,6 +314,9 @@ def extract_from_vanilla(progress_callback=None):
     
     source_name = "vanilla backup" if source == APP_ASAR_VANILLA else "app.asar (no vanilla backup)"
     
+    # A fresh extraction invalidates the incremental-install manifest
+    _discard_install_manifest()
+    
     # Delete existing extraction
     if APP_EXTRACTED.exists():
         print(f"  [*] Removing old extraction...")
@@ -303,6 +334,15 @@ def extract_from_vanilla(progress_callback=None):
     if progress_callback:
         progress_callback(0, 1, f"Extracting from {source_name}...")
     
+    # Native extraction (no Node.js needed)
+    try:
+        asar.extract_all(source, APP_EXTRACTED)
+        print(f"  [OK] Extracted successfully from {source_name}")
+        return True, f"Extracted from {source_name}"
+    except Exception as e:
+        print(f"  [WARN] Native extraction failed, trying Node.js: {e}")
+        remove_tree_safe(APP_EXTRACTED)
+    
     creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
     
     # Try local extract script first
@@ -362,6 +402,16 @@ console.log('OK: Extracted to', dest);
 applied_mods = []
 failed_mods = []
 
+# Active incremental-install recorder (None outside apply_selected_mods)
+_install_tracker = None
+
+# Active patch session: buffered game files (None outside apply_selected_mods).
+# An _AsarOverlay when patching straight out of app.asar.vanilla.
+_session = None
+
+# Collects (AnchorSet, hits, content) from AnchorSet.apply() during --plan runs
+_anchor_report = None
+
 # ============================================================================
 # MOD FEATURES - Defines selectable feature groups for the installer GUI
 # ============================================================================
@@ -374,7 +424,7 @@ MOD_FEATURES = {
     },
     'speed': {
         'name': '10x Speed',
-        'description': 'Adds 1x, 1.5x, 2x, 3x, 5x, and 10x game speed options with sub-stepping for accuracy at high speeds',
+        'description': 'Adds 1x, 1.5x, 2x, 3x, 5x, and 10x game speed options with fixed-timestep simulation for accuracy at high speeds',
         'functions': ['_ensure_game_modded', 'apply_speed_mod'],
         'default': True,
     },
@@ -424,7 +474,7 @@ MOD_FEATURES = {
     # Keeping them in the shop would create duplicates. See transcript guide.
     'deltatime': {
         'name': 'Delta Time & Performance',
-        'description': 'Sub-stepping simulation, accurate projectile timing, squared-distance checks, batch removal, throttled UI, cached draws',
+        'description': 'Fixed-timestep simulation with interpolated rendering, spatial-grid tower targeting, accurate projectile timing, squared-distance checks, batch removal, pooled enemies/projectiles/damage texts, throttled UI, cached draws',
         'functions': ['_ensure_game_modded', 'apply_tower_deltatime', 'apply_projectile_scaling', 'apply_projectile_speed_scaling'],
         'default': True,
     },
@@ -442,8 +492,79 @@ MOD_FEATURES = {
     },
 }
 
+# Files each patch function may read or rewrite, relative to app_extracted/.
+# Used by incremental installs to decide which files must be restored from
+# vanilla and which functions must be replayed when the selection changes.
+# Entries ending in '/' cover every file under that folder.
+PATCH_TARGETS = {
+    '_ensure_game_modded':               ('src/js/game/Game.js',),
+    'apply_pause_micromanagement':       ('src/js/game/Game.js',),
+    'apply_speed_mod':                   ('src/js/game/Game.js',),
+    'apply_endless_mode':                ('src/js/game/scenes/FinalScene.js',),
+    'apply_endless_waves':               ('src/js/game/core/Area.js',),
+    'apply_endless_checkpoints':         ('src/js/game/scenes/DefeatScene.js',),
+    'apply_enemy_scaling':               ('src/js/game/component/Enemy.js',),
+    'apply_text_continue_option':        ('src/js/file/text.js',),
+    'apply_menu_autoreset_range':        ('src/js/game/scenes/MenuScene.js',),
+    'apply_map_record_uncap':            ('src/js/game/scenes/MapScene.js',),
+    'apply_wave_manager_fix':            ('src/js/game/UI.js',),
+    'apply_endless_stat_safety':         ('src/js/game/component/Pokemon.js',),
+    'apply_endless_levelbutton_safety':  ('src/js/game/scenes/PokemonScene.js',),
+    'apply_star_scaling_uncap':          ('src/js/game/component/PlacementTile.js',
+                                          'src/js/game/component/Projectile.js',
+                                          'src/js/game/component/Tower.js',
+                                          'src/js/game/data/abilityData.js',
+                                          'src/js/game/data/itemData.js'),
+    'apply_pokemon_mods':                ('src/js/game/component/Pokemon.js',),
+    'apply_pokemonscene_mods':           ('src/js/game/scenes/PokemonScene.js',),
+    'apply_recharge_precision':          ('src/js/game/scenes/PokemonScene.js',),
+    'apply_shiny_eggs':                  ('src/js/game/core/Shop.js',),
+    'apply_shiny_starters':              ('src/js/game/scenes/NewGameScene.js',),
+    'apply_shiny_reveal':                ('src/js/game/scenes/ShopScene.js',),
+    'apply_shiny_sprites':               ('src/assets/images/pokemon/shiny/',),
+    'apply_secret_shiny':                ('src/js/game/UI.js',),
+    'apply_challenge_reward_shiny':      ('src/js/game/scenes/ChallengeScene.js',),
+    'apply_enemy_shiny_spawn':           ('src/js/game/component/Enemy.js',),
+    'apply_item_tooltips':               ('src/js/utils/Tooltip.js',),
+    'apply_ui_mods':                     ('src/js/game/UI.js',),
+    'apply_emoji_font_fix':              ('src/css/scenes.css',),
+    'apply_ui_emoji_font_fix':           ('src/css/ui.css',),
+    'apply_challenge_party_preserve':    ('src/js/game/scenes/ChallengeScene.js',),
+    'apply_attacktype_sort':             ('src/js/file/text.js',),
+    'apply_gold_cap_increase':           ('src/js/game/core/Player.js',),
+    'apply_gold_display_format_player':  ('src/js/game/core/Player.js',),
+    'apply_gold_display_format_ui':      ('src/js/game/UI.js',),
+    'apply_profile_endless_stats':       ('src/js/game/scenes/ProfileScene.js',),
+    'apply_profile_live_update':         ('src/js/game/scenes/ProfileScene.js',),
+    'apply_map_hover_stars':             ('src/css/map.css',),
+    'apply_box_expansion':               ('src/js/game/scenes/BoxScene.js',),
+    'apply_tower_deltatime':             ('src/js/game/component/Tower.js',),
+    'apply_projectile_scaling':          ('src/js/game/component/Projectile.js',),
+    'apply_projectile_speed_scaling':    ('src/js/game/component/Projectile.js',),
+    'apply_pokemon_sprite_isolation_fix': ('src/js/game/component/Pokemon.js',),
+    'apply_challenge_levelcap_fix':      ('src/js/game/component/Pokemon.js',
+                                          'src/js/game/scenes/ChallengeScene.js',
+                                          'src/js/game/UI.js',
+                                          'src/js/game/scenes/PokemonScene.js'),
+    'apply_projectile_retarget_fix':     ('src/js/game/component/Projectile.js',),
+    'apply_offscreen_target_fix':        ('src/js/game/component/Projectile.js',),
+    'apply_shellbell_fix':               ('src/js/game/component/Enemy.js',),
+    'apply_allow_dupes':                 ('src/js/game/core/Team.js', 'src/js/game/core/Box.js'),
+    'apply_force_no_dupes':              ('src/js/game/core/Team.js', 'src/js/game/core/Box.js',
+                                          'src/js/game/core/Shop.js'),
+    'apply_wave_clamp':                  ('src/js/game/core/Area.js',),
+    'apply_star_display_cap':            ('src/js/game/UI.js',),
+    'apply_star_record_cap':             ('src/js/game/UI.js',),
+    'apply_expanded_egg_list':           ('src/js/game/data/pokemonData.js',),
+    'apply_hidden_items':                ('src/js/game/data/itemData.js',),
+    'apply_modded_userdata_redirect':    ('main.js',),
+    'apply_debug_diagnostics':           ('src/js/game/Init.js', 'index.html'),
+}
+
 def log_success(name):
     applied_mods.append(name)
+    if _install_tracker:
+        _install_tracker.note_log('applied', name)
     print(f"  [OK] {name}")
 
 def log_skip(name):
@@ -451,19 +572,1047 @@ def log_skip(name):
 
 def log_fail(name, reason="pattern not found"):
     failed_mods.append(name)
+    if _install_tracker:
+        _install_tracker.note_log('failed', name)
     print(f"  [FAIL] {name}: {reason}")
 
 def read_file(path):
+    if _install_tracker:
+        _install_tracker.note_input(path)
+    if _session is not None and _extracted_rel(path) is not None:
+        return _session.read_text(_extracted_rel(path))
     return path.read_text(encoding='utf-8')
 
 def write_file(path, content):
+    if _install_tracker:
+        _install_tracker.before_write(path)
+    if _session is not None and _extracted_rel(path) is not None:
+        _session.write_text(_extracted_rel(path), content)
+        return
     path.write_text(content, encoding='utf-8')
 
 def copy_modded_file(src, dest):
     """Copy modded file as UTF-8 without BOM (BOM breaks Electron's JS module loader)."""
+    if _install_tracker:
+        _install_tracker.note_input(src)
+        _install_tracker.before_write(dest)
     content = src.read_text(encoding='utf-8-sig')  # utf-8-sig strips BOM on read
+    if _session is not None and _extracted_rel(dest) is not None:
+        _session.write_text(_extracted_rel(dest), content)
+        return
     dest.write_text(content, encoding='utf-8')      # write without BOM
 
+def copy_asset_file(src, dest):
+    """Copy a binary asset (sprite etc.) into the extracted game tree."""
+    if _install_tracker:
+        _install_tracker.before_write(dest)
+    if _session is not None and _extracted_rel(dest) is not None:
+        _session.copy_file(_extracted_rel(dest), src)
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(src, dest)
+
+def game_file_exists(path):
+    """path.exists() for a game file, seeing files buffered by the patch session."""
+    if _session is not None and _extracted_rel(path) is not None:
+        return _session.exists(_extracted_rel(path))
+    return path.exists()
+
+# ============================================================================
+# INCREMENTAL INSTALL - Content-hash manifest of the previous install
+# ============================================================================
+# The manifest and the pristine copies of every file a patch touched live next
+# to app_extracted/ (never inside it, or they would be packed into app.asar).
+INSTALL_MANIFEST = RESOURCES / "app_extracted.manifest.json"
+VANILLA_STASH = RESOURCES / "app_extracted.vanilla"
+MANIFEST_FORMAT = 1
+
+def _hash_file(path):
+    """sha256 of a file's content, or None if it doesn't exist."""
+    try:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+def _hash_input(path):
+    """Content hash of a patch input (a .modded.js file or a whole sprite folder)."""
+    path = Path(path)
+    if not path.is_dir():
+        return _hash_file(path)
+    digest = hashlib.sha256()
+    for child in sorted(p for p in path.rglob('*') if p.is_file()):
+        digest.update(child.relative_to(path).as_posix().encode('utf-8'))
+        digest.update(bytes.fromhex(_hash_file(child)))
+    return digest.hexdigest()
+
+def _source_fingerprint(path):
+    """Cheap identity of an asar on disk (size + mtime)."""
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return {'name': Path(path).name, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+def _extracted_rel(path):
+    try:
+        return Path(path).relative_to(APP_EXTRACTED).as_posix()
+    except ValueError:
+        return None
+
+def _paths_overlap(a, b):
+    """True if two target paths name the same file or one is a folder ('/') containing the other."""
+    if a == b:
+        return True
+    if a.endswith('/') and b.startswith(a):
+        return True
+    return b.endswith('/') and a.startswith(b)
+
+def _touches(targets, paths):
+    return any(_paths_overlap(t, p) for t in targets for p in paths)
+
+class _InstallTracker:
+    """Records the inputs, outputs and log lines of each patch function.
+
+    Before a file in app_extracted/ is written for the first time, its vanilla
+    content is stashed (or it's marked as created) so a later incremental run
+    can put it back without re-extracting the whole asar.
+    """
+
+    def __init__(self, vanilla=None, stash=True):
+        self.vanilla = dict(vanilla or {})  # rel path -> 'stash' | 'created'
+        self.stash = stash  # False in overlay mode: vanilla stays in the asar
+        self.records = {}
+        self._local = threading.local()  # patch functions may run on worker threads
+
+    @property
+    def current(self):
+        return getattr(self._local, 'current', None)
+
+    @current.setter
+    def current(self, record):
+        self._local.current = record
+
+    def begin(self, func_name):
+        self.current = {'writes': [], 'inputs': {}, 'applied': [], 'failed': []}
+        self.records[func_name] = self.current
+
+    def end(self):
+        self.current = None
+
+    def note_input(self, path):
+        if self.current is None:
+            return
+        try:
+            rel = Path(path).relative_to(MODS_DIR).as_posix()
+        except ValueError:
+            return
+        if rel not in self.current['inputs']:
+            self.current['inputs'][rel] = _hash_input(path)
+
+    def note_log(self, kind, name):
+        if self.current is not None:
+            self.current[kind].append(name)
+
+    def before_write(self, path):
+        rel = _extracted_rel(path)
+        if rel is None:
+            return
+        if self.stash and rel not in self.vanilla:
+            if Path(path).exists():
+                stash = VANILLA_STASH / rel
+                stash.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(path, stash)
+                self.vanilla[rel] = 'stash'
+            else:
+                self.vanilla[rel] = 'created'
+        if self.current is not None and rel not in self.current['writes']:
+            self.current['writes'].append(rel)
+
+def _load_install_manifest():
+    try:
+        with open(INSTALL_MANIFEST, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if data.get('format') != MANIFEST_FORMAT:
+        return None
+    return data
+
+def _save_install_manifest(data):
+    tmp = INSTALL_MANIFEST.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, INSTALL_MANIFEST)
+
+def _discard_install_manifest():
+    """Forget the previous install (called whenever app_extracted/ is rebuilt)."""
+    try:
+        INSTALL_MANIFEST.unlink()
+    except FileNotFoundError:
+        pass
+    if VANILLA_STASH.exists():
+        remove_tree_safe(VANILLA_STASH)
+
+def is_extracted_install():
+    """True if the installed app.asar was packed from app_extracted/ (an --extract install)."""
+    manifest = _load_install_manifest()
+    return (manifest is not None and manifest.get('mode', 'extract') == 'extract'
+            and manifest.get('asar') is not None
+            and manifest.get('asar') == _source_fingerprint(APP_ASAR)
+            and APP_EXTRACTED.exists())
+
+def _remove_stale_extraction():
+    """Delete app_extracted/ (and its stash) once app.asar was built without it.
+
+    is_game_modded, GameFiles and balance_sim prefer an extracted tree, so one
+    left over from an earlier --extract install would keep describing that
+    install instead of the app.asar that is actually in place.
+    """
+    if VANILLA_STASH.exists():
+        remove_tree_safe(VANILLA_STASH)
+    if not APP_EXTRACTED.exists():
+        return
+    removed, remove_msg = remove_tree_safe(APP_EXTRACTED)
+    if removed:
+        print(f"  [OK] Removed {APP_EXTRACTED.name}/ left over from an extracted install")
+    else:
+        print(f"  [WARN] Couldn't remove {APP_EXTRACTED.name}/ (it no longer matches app.asar): {remove_msg}")
+
+def _function_targets(func_name, prev):
+    recorded = prev['functions'].get(func_name, {}).get('writes', []) if prev else []
+    return set(PATCH_TARGETS.get(func_name, ())) | set(recorded)
+
+def _plan_incremental(steps, prev, source):
+    """Work out which patch functions must be replayed for this selection.
+
+    Returns (rerun, dirty) where rerun is the ordered list of functions to run
+    and dirty the target paths to restore from the vanilla stash first, or
+    None when the previous install can't be reused (full extraction needed).
+    """
+    if not prev or prev.get('mode', 'extract') != 'extract' or not APP_EXTRACTED.exists():
+        return None
+    if (prev.get('mod_version') != MOD_VERSION or prev.get('source') != _source_fingerprint(source)
+            or prev.get('profile') != PATCH_PROFILE):
+        return None
+    if any(kind == 'stash' and not (VANILLA_STASH / rel).exists()
+           for rel, kind in prev.get('vanilla', {}).items()):
+        return None
+
+    targets = {fn: _function_targets(fn, prev) for fn in set(steps) | set(prev['order'])}
+    dirty = set()
+
+    # Files whose chain of patch functions changed (added, removed or reordered)
+    universe = set().union(*targets.values()) if targets else set()
+    for rel in universe:
+        seq_new = [fn for fn in steps if _touches(targets[fn], (rel,))]
+        seq_old = [fn for fn in prev['order'] if _touches(targets[fn], (rel,))]
+        if seq_new != seq_old:
+            dirty.add(rel)
+
+    # Functions whose patch inputs (.modded.js, sprite folders) changed
+    for fn in steps:
+        record = prev['functions'].get(fn)
+        if record is None:
+            continue
+        for rel, digest in record.get('inputs', {}).items():
+            if _hash_input(MODS_DIR / rel) != digest:
+                dirty |= targets[fn]
+                break
+
+    # Outputs edited or deleted on disk since the last install
+    for rel, digest in prev.get('outputs', {}).items():
+        if _hash_file(APP_EXTRACTED / rel) != digest:
+            dirty.add(rel)
+
+    # Replaying a function rewrites all of its targets, so those become dirty too
+    while True:
+        rerun = [fn for fn in steps if fn not in prev['functions'] or _touches(targets[fn], dirty)]
+        grown = dirty.union(*(targets[fn] for fn in rerun)) if rerun else dirty
+        if grown == dirty:
+            return rerun, dirty
+        dirty = grown
+
+def _restore_from_stash(dirty, vanilla):
+    """Put every recorded file under the dirty targets back to its vanilla state."""
+    restored = 0
+    for rel, kind in vanilla.items():
+        if not _touches((rel,), dirty):
+            continue
+        dest = APP_EXTRACTED / rel
+        if kind == 'created':
+            if dest.exists():
+                dest.unlink()
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(VANILLA_STASH / rel, dest)
+        restored += 1
+    return restored
+
+# ============================================================================
+# PARALLEL PATCHING - Independent patch functions run on a thread pool
+# ============================================================================
+# Functions are grouped by overlapping PATCH_TARGETS; each group runs in plan
+# order on one worker, so two functions never touch the same file at once.
+PATCH_WORKERS = min(8, os.cpu_count() or 1)
+
+class _OrderedStdout:
+    """stdout proxy that buffers print() output per worker thread.
+
+    Lets parallel patch functions log freely while the console still shows
+    each function's lines in plan order, as if they had run one by one.
+    """
+
+    def __init__(self, real):
+        self.real = real
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buf = []
+
+    def release(self):
+        text = ''.join(self._local.buf)
+        self._local.buf = None
+        return text
+
+    def write(self, text):
+        buf = getattr(self._local, 'buf', None)
+        if buf is not None:
+            buf.append(text)
+            return len(text)
+        if self.real is not None:  # None under pythonw
+            return self.real.write(text)
+        return len(text)
+
+    def flush(self):
+        if self.real is not None:
+            self.real.flush()
+
+def _patch_groups(steps, prev):
+    """Split steps into groups with disjoint targets, each kept in plan order.
+
+    A function with no declared (or recorded) targets could touch anything,
+    so it pulls every step into a single sequential group.
+    """
+    targets = {fn: _function_targets(fn, prev) for fn in steps}
+    if any(not targets[fn] for fn in steps):
+        return [list(steps)] if steps else []
+    parent = {fn: fn for fn in steps}
+
+    def find(fn):
+        while parent[fn] != fn:
+            parent[fn] = parent[parent[fn]]
+            fn = parent[fn]
+        return fn
+
+    for i, a in enumerate(steps):
+        for b in steps[i + 1:]:
+            if find(a) != find(b) and _touches(targets[a], targets[b]):
+                parent[find(b)] = find(a)
+    groups = {}
+    for fn in steps:
+        groups.setdefault(find(fn), []).append(fn)
+    return list(groups.values())
+
+def _run_patch_steps(steps, rerun, prev, progress_callback, total):
+    """Run the rerun steps of a plan (on PATCH_WORKERS threads) and replay the rest.
+
+    Console output and the applied/failed lists come out in plan order;
+    progress_callback sees the number of finished steps before each start.
+    """
+    lock = threading.Lock()
+    done = [0]
+    finished = {}  # func name -> captured console output
+    emitted = [0]
+    stdout = _OrderedStdout(sys.stdout)
+
+    def emit_ready():
+        # Print every finished step at the front of the plan (caller holds lock)
+        while emitted[0] < len(steps) and steps[emitted[0]] in finished:
+            text = finished.pop(steps[emitted[0]])
+            if text and stdout.real is not None:
+                stdout.real.write(text)
+            emitted[0] += 1
+
+    def run_one(func_name):
+        with lock:
+            if progress_callback:
+                progress_callback(done[0], total, f"Applying {func_name}...")
+        stdout.capture()
+        try:
+            func = globals().get(func_name)
+            _install_tracker.begin(func_name)
+            if func and callable(func):
+                try:
+                    func()
+                except Exception as e:
+                    _install_tracker.note_log('failed', f"{func_name}: {str(e)}")
+            else:
+                _install_tracker.note_log('failed', f"{func_name}: function not found")
+            _install_tracker.end()
+        finally:
+            text = stdout.release()
+            with lock:
+                done[0] += 1
+                finished[func_name] = text
+                emit_ready()
+
+    def run_group(group):
+        for func_name in group:
+            run_one(func_name)
+
+    for func_name in steps:
+        if func_name not in rerun:
+            # Output already on disk from the last install; its log is replayed below
+            with lock:
+                done[0] += 1
+                finished[func_name] = f"  [SKIP] {func_name} (unchanged since last install)\n"
+
+    groups = _patch_groups([fn for fn in steps if fn in rerun], prev)
+    sys.stdout = stdout
+    try:
+        with lock:
+            emit_ready()
+        if PATCH_WORKERS > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(max_workers=min(PATCH_WORKERS, len(groups))) as pool:
+                for future in [pool.submit(run_group, group) for group in groups]:
+                    future.result()
+        else:
+            for group in groups:
+                run_group(group)
+    finally:
+        sys.stdout = stdout.real
+
+    # Rebuild the logs in plan order (log_success/log_fail appended them as they came)
+    functions = {fn: _install_tracker.records.get(fn) or prev['functions'][fn] for fn in steps}
+    applied_mods[:] = [name for fn in steps for name in functions[fn]['applied']]
+    failed_mods[:] = [m for m in failed_mods if m.startswith('VERSION WARNING')]
+    failed_mods.extend(name for fn in steps for name in functions[fn]['failed'])
+    return functions
+
+# ============================================================================
+# PATCH SESSION - Per-install buffer cache for game files
+# ============================================================================
+class _PatchSession:
+    """Buffers every game file the patch functions touch during one install.
+
+    Files are addressed by their path relative to app_extracted/. Each one is
+    decoded once (with the same newline translation as Path.read_text) and
+    that string is handed to every function that reads it; write_file only
+    swaps the buffer. flush() writes each dirty file exactly once, through a
+    temp file and rename, so a failed install never leaves half-written JS.
+    """
+
+    def __init__(self):
+        self.text = {}      # rel path -> str, as Path.read_text() would return it
+        self.assets = {}    # rel path -> source Path of binary files copied in
+        self.dirty = set()  # rel paths written by patch functions
+
+    def _read_raw(self, rel):
+        return (APP_EXTRACTED / rel).read_bytes()
+
+    def _has(self, rel):
+        return (APP_EXTRACTED / rel).exists()
+
+    def close(self):
+        self.text.clear()
+        self.assets.clear()
+
+    def exists(self, rel):
+        return rel in self.text or rel in self.assets or self._has(rel)
+
+    def read_text(self, rel):
+        text = self.text.get(rel)
+        if text is None:
+            raw = self.assets[rel].read_bytes() if rel in self.assets else self._read_raw(rel)
+            text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+            self.text[rel] = text
+        return text
+
+    def write_text(self, rel, content):
+        self.text[rel] = content
+        self.assets.pop(rel, None)
+        self.dirty.add(rel)
+
+    def copy_file(self, rel, src):
+        self.assets[rel] = Path(src)
+        self.text.pop(rel, None)
+        self.dirty.add(rel)
+
+    def encoded(self, rel):
+        """Bytes of a dirty file as they will be written (Path.write_text newlines)."""
+        if rel in self.assets:
+            return self.assets[rel].read_bytes()
+        return self.text[rel].replace('\n', os.linesep).encode('utf-8')
+
+    def output_hashes(self):
+        return {rel: hashlib.sha256(self.encoded(rel)).hexdigest() for rel in sorted(self.dirty)}
+
+    def flush(self):
+        """Write every dirty file back under app_extracted/ (once each, atomically)."""
+        for rel in sorted(self.dirty):
+            dest = APP_EXTRACTED / rel
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + '.tmp')
+            if rel in self.assets:
+                shutil.copy2(self.assets[rel], tmp)
+            else:
+                tmp.write_bytes(self.encoded(rel))
+            os.replace(tmp, dest)
+        return len(self.dirty)
+
+# ============================================================================
+# VIRTUAL OVERLAY INSTALL - Patch straight out of app.asar.vanilla
+# ============================================================================
+class _AsarOverlay(_PatchSession):
+    """Patch session backed by the vanilla asar instead of app_extracted/.
+
+    Game paths resolve against the archive index, so only the files the patch
+    functions ask for are pulled into memory; write_asar() then streams every
+    untouched entry from the vanilla archive with the patched ones spliced in.
+    """
+
+    def __init__(self, source):
+        super().__init__()
+        self.archive = asar.AsarArchive(source)
+        for rel, node in self.archive.walk():
+            if 'link' in node:
+                self.archive.close()
+                raise asar.AsarError(f"symlinked entry not supported: {rel}")
+        self.archive.mmap  # map up front; patch groups read from worker threads
+
+    def _read_raw(self, rel):
+        node = self.archive.get_entry(rel)
+        if node is None or 'files' in node:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(APP_EXTRACTED / rel))
+        return self.archive.read(rel)
+
+    def _has(self, rel):
+        return self.archive.exists(rel)
+
+    def close(self):
+        super().close()
+        self.archive.close()
+
+    def _pack_entry(self, rel, executable=False):
+        if rel in self.assets:
+            return asar.PackEntry.from_path(rel, self.assets[rel])
+        data = self.encoded(rel)
+        return asar.PackEntry(rel, len(data), data, executable)
+
+    def write_asar(self, dest):
+        entries, directories = [], []
+        for rel, node in self.archive.walk():
+            if 'files' in node:
+                directories.append(rel)
+            elif rel in self.dirty:
+                entries.append(self._pack_entry(rel, bool(node.get('executable'))))
+            elif node.get('unpacked'):
+                entries.append(asar.PackEntry.from_path(rel, self.archive.unpacked_dir / rel))
+            else:
+                entries.append(asar.PackEntry.from_archive(rel, self.archive, node))
+        # Files the patches created (e.g. shiny sprites) go after the vanilla ones
+        packed = {entry.rel_path for entry in entries}
+        for rel in sorted(self.dirty - packed):
+            entries.append(self._pack_entry(rel))
+        asar.write_archive(dest, entries, directories)
+
+def _write_overlay_asar():
+    """Build app.asar from the active overlay. Returns True on success."""
+    try:
+        _session.write_asar(APP_ASAR)
+        print(f"  [OK] Game repacked successfully! ({len(_session.dirty)} patched files spliced in)")
+        return True
+    except Exception as e:
+        print(f"  [ERROR] Repack failed: {e}")
+        return False
+
+# ============================================================================
+# BUILD CACHE - Previously built app.asar outputs, keyed by feature set
+# ============================================================================
+# Flipping between the same few feature combinations rebuilds identical
+# archives, so every overlay build is kept in resources/app.asar.cache/ as
+# <key>.asar + <key>.json, keyed by (vanilla fingerprint, sorted features, mod
+# version, patch profile, digest of the patch inputs - this file and the
+# bundle's .modded.js files and sprites, so editing either without bumping
+# the version still rebuilds). A hit is verified against its recorded sha256 and then hardlinked
+# (or copied) into place. Least recently used entries are evicted once the
+# cache grows past ASAR_CACHE_LIMIT bytes.
+ASAR_CACHE_DIR = RESOURCES / "app.asar.cache"
+ASAR_CACHE_LIMIT = 512 * 1024 * 1024
+ASAR_CACHE_FORMAT = 2
+
+def _patch_inputs_digest():
+    """Content hash of the patch code and the active profile's patch bundle."""
+    bundle = modded_patch('')
+    inputs = [Path(__file__).resolve(), MODS_DIR / "patches" / "shiny_sprites"]
+    inputs += sorted(bundle.glob('*.modded.js'))
+    digest = hashlib.sha256()
+    for path in inputs:
+        digest.update(path.name.encode('utf-8'))
+        digest.update((_hash_input(path) or '-').encode('ascii'))
+    return digest.hexdigest()
+
+def _build_cache_key(selected_features):
+    """Cache key for a feature selection on the fingerprinted vanilla asar, or None."""
+    if GAME_FINGERPRINT is None:
+        return None
+    key = json.dumps({
+        'format': ASAR_CACHE_FORMAT,
+        'vanilla': GAME_FINGERPRINT['header'],
+        'features': sorted(set(selected_features)),
+        'mod_version': MOD_VERSION,
+        'profile': PATCH_PROFILE,
+        'inputs': _patch_inputs_digest(),
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def _cache_paths(key):
+    return ASAR_CACHE_DIR / f"{key}.asar", ASAR_CACHE_DIR / f"{key}.json"
+
+def _read_cache_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return meta if meta.get('format') == ASAR_CACHE_FORMAT else None
+
+def _write_cache_meta(meta_path, meta):
+    tmp = meta_path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, meta_path)
+
+def _discard_cache_entry(key):
+    for path in _cache_paths(key):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+def _link_or_copy(src, dest):
+    """Atomically put src's bytes at dest, as a hardlink when the filesystem allows."""
+    if dest.exists() and os.path.samefile(src, dest):
+        return True  # already linked (and rename() between links is a no-op)
+    tmp = dest.with_name(dest.name + '.tmp')
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(src, tmp)
+        linked = True
+    except OSError:
+        shutil.copyfile(src, tmp)
+        linked = False
+    os.replace(tmp, dest)
+    return linked
+
+def _cache_lookup(key):
+    """Verified cache entry (its metadata) for key, or None. Corrupt entries are dropped."""
+    if key is None:
+        return None
+    asar_path, meta_path = _cache_paths(key)
+    meta = _read_cache_meta(meta_path)
+    if meta is None:
+        return None
+    # Something may have written through a hardlink since: check the bytes
+    try:
+        size = asar_path.stat().st_size
+    except FileNotFoundError:
+        size = None
+    if size != meta.get('size') or _hash_file(asar_path) != meta.get('sha256'):
+        print("  [WARN] Cached build failed verification, discarding it")
+        _discard_cache_entry(key)
+        return None
+    return meta
+
+def _install_cached_build(key, meta, source):
+    """Put a verified cache entry in place as app.asar and record its manifest."""
+    asar_path, meta_path = _cache_paths(key)
+    try:
+        linked = _link_or_copy(asar_path, APP_ASAR)
+    except OSError as e:
+        print(f"  [WARN] Can't install cached build: {e}")
+        return False
+    meta['last_used'] = time.time()
+    _write_cache_meta(meta_path, meta)
+    manifest = dict(meta['manifest'], source=_source_fingerprint(source), asar=_source_fingerprint(APP_ASAR))
+    _save_install_manifest(manifest)
+    print(f"  [OK] Reused cached build for this feature set ({'hardlinked' if linked else 'copied'}, "
+          f"{meta['size'] / (1024 * 1024):.1f} MB)")
+    return True
+
+def _cache_store(key, selected_features, manifest):
+    """Keep the app.asar just built under key, then evict down to ASAR_CACHE_LIMIT."""
+    if key is None or not APP_ASAR.exists():
+        return
+    asar_path, meta_path = _cache_paths(key)
+    try:
+        digest = _hash_file(APP_ASAR)
+        meta = _read_cache_meta(meta_path)
+        if meta is None or meta.get('sha256') != digest or not asar_path.exists():
+            ASAR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(APP_ASAR, asar_path)
+        _write_cache_meta(meta_path, {
+            'format': ASAR_CACHE_FORMAT,
+            'features': sorted(set(selected_features)),
+            'mod_version': MOD_VERSION,
+            'game_version': GAME_BUILD['game_version'] if GAME_BUILD else None,
+            'size': APP_ASAR.stat().st_size,
+            'sha256': digest,
+            'last_used': time.time(),
+            'applied': applied_mods,
+            'failed': failed_mods,
+            'manifest': manifest,
+        })
+        _evict_build_cache(keep=key)
+    except OSError as e:
+        print(f"  [WARN] Couldn't cache this build: {e}")
+
+def _evict_build_cache(limit=ASAR_CACHE_LIMIT, keep=None):
+    """Drop least recently used cache entries until the cache fits in limit bytes."""
+    entries = []
+    for meta_path in ASAR_CACHE_DIR.glob('*.json'):
+        key = meta_path.stem
+        meta = _read_cache_meta(meta_path)
+        asar_path = _cache_paths(key)[0]
+        if meta is None or not asar_path.exists():
+            _discard_cache_entry(key)
+            continue
+        entries.append((meta.get('last_used', 0), key, asar_path.stat().st_size))
+    total = sum(size for _, _, size in entries)
+    for _, key, size in sorted(entries):
+        if total <= limit:
+            break
+        if key == keep:
+            continue
+        _discard_cache_entry(key)
+        total -= size
+
+# ============================================================================
+# ANCHOR REGISTRY - Declared patch sites, located in one scan per file
+# ============================================================================
+# Every surgical patch function declares what it looks for in a file once, at
+# import time (declare_anchors): the sites it splices, and the markers its skip
+# checks test for (probe anchors). AnchorSet.scan() then finds all of them in a
+# single pass over the file - literal anchors through one combined,
+# precompiled alternation - and splice() writes the replacements from the end
+# of the buffer backwards, instead of one `in` check + str.replace copy per
+# patch site. All anchors of a set are matched against the text before any of
+# them is applied; where two hits overlap, the anchor declared first wins.
+PATCH_ANCHORS = {}  # func name -> [AnchorSet, ...]
+
+class Anchor:
+    """One patch site: what to find and what to put in its place.
+
+    find is a literal string, a compiled regex, or a tuple of them tried in
+    order (the first alternative with a match is used). It can also be a dict
+    of per-profile variants ({'1.5.4': ..., '*': ...}): the active patch
+    profile's variant is the only one tried ('*' if it has none), and without
+    a profile all of them are, '*' last.
+
+    replace is the text spliced in; regex replacements go through
+    match.expand(), like re.sub. A callable gets the match object and returns
+    the text. replace=None declares a probe: a marker that is located (and
+    reported) but never spliced. count=1 replaces the first occurrence,
+    count=0 every occurrence.
+    """
+
+    def __init__(self, name, find, replace=None, count=1):
+        self.name = name
+        self.variants = None
+        if isinstance(find, dict):
+            self.variants = {key: self._as_tuple(alt) for key, alt in find.items()}
+            ordered = [key for key in self.variants if key != '*'] + (['*'] if '*' in self.variants else [])
+            find = tuple(alt for key in ordered for alt in self.variants[key])
+        self.alternatives = self._as_tuple(find)
+        self.replace = replace
+        self.count = count
+
+    @staticmethod
+    def _as_tuple(find):
+        return tuple(find) if isinstance(find, (tuple, list)) else (find,)
+
+    @property
+    def is_probe(self):
+        return self.replace is None
+
+    def alternatives_for(self, profile):
+        """The alternatives to try under a patch profile (None: all of them)."""
+        if self.variants is None or profile is None:
+            return self.alternatives
+        return self.variants.get(profile, self.variants.get('*', ()))
+
+    def replacement(self, match):
+        """Text to splice in for one match (None for a probe)."""
+        if self.replace is None:
+            return None
+        if callable(self.replace):
+            return self.replace(match)
+        return match.expand(self.replace)
+
+class AnchorHit:
+    """Where one anchor matched: the alternative used (its index and pattern),
+    every (start, end, text) match of it, and how many were spliced in."""
+
+    def __init__(self, anchor):
+        self.anchor = anchor
+        self.alternative = None
+        self.pattern = None
+        self.spans = []
+        self.applied = 0
+
+    @property
+    def found(self):
+        return bool(self.spans)
+
+    def __bool__(self):
+        return self.applied > 0
+
+class AnchorHits(list):
+    """AnchorSet.scan() result: one AnchorHit per anchor, in declaration
+    order, also indexable by anchor name."""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for hit in self:
+                if hit.anchor.name == key:
+                    return hit
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+class AnchorSet:
+    """The anchors one patch function applies to one file, compiled once."""
+
+    def __init__(self, func_name, rel_path, anchors):
+        self.func_name = func_name
+        self.rel_path = rel_path
+        self.anchors = list(anchors)
+        self._compiled = {}
+        self._compile(None)
+        for anchor in self.anchors:
+            for profile in anchor.variants or ():
+                self._compile(profile)
+
+    def _compile(self, profile):
+        """Combined scanner (and prefix literals) for one patch profile, cached."""
+        if profile not in self._compiled:
+            literals = []
+            for anchor in self.anchors:
+                for alt in anchor.alternatives_for(profile):
+                    if isinstance(alt, str) and alt not in literals:
+                        literals.append(alt)
+            # The scan tries every position (a lookahead), so literals that
+            # overlap each other are all found - except a literal that starts
+            # another one, which the longer alternative shadows.
+            nested = [lit for lit in literals if any(lit != other and other.startswith(lit) for other in literals)]
+            scanned = sorted((lit for lit in literals if lit not in nested), key=len, reverse=True)
+            scanner = re.compile('(?=(%s))' % '|'.join(map(re.escape, scanned))) if scanned else None
+            self._compiled[profile] = (scanner, [(lit, re.compile(re.escape(lit))) for lit in nested])
+        return self._compiled[profile]
+
+    def find(self, content, profile=None):
+        """Locate every anchor in content; returns AnchorHits."""
+        scanner, nested = self._compile(profile)
+        found = {}  # literal -> non-overlapping start offsets
+        if scanner is not None:
+            for m in scanner.finditer(content):
+                lit = m.group(1)
+                starts = found.setdefault(lit, [])
+                if not starts or m.start() >= starts[-1] + len(lit):
+                    starts.append(m.start())
+        for lit, pattern in nested:
+            found[lit] = [m.start() for m in pattern.finditer(content)]
+
+        hits = AnchorHits()
+        for anchor in self.anchors:
+            hit = AnchorHit(anchor)
+            for index, alt in enumerate(anchor.alternatives_for(profile)):
+                if isinstance(alt, str):
+                    starts = found.get(alt, ())
+                    if callable(anchor.replace):
+                        literal = re.compile(re.escape(alt))
+                        spans = [(start, start + len(alt), anchor.replace(literal.match(content, start)))
+                                 for start in starts]
+                    else:
+                        spans = [(start, start + len(alt), anchor.replace) for start in starts]
+                else:
+                    spans = [(m.start(), m.end(), anchor.replacement(m)) for m in alt.finditer(content)]
+                if spans:
+                    hit.alternative = index
+                    hit.pattern = alt
+                    hit.spans = spans
+                    break
+            hits.append(hit)
+        return hits
+
+    def scan(self, content):
+        """Locate every anchor under the active patch profile (recorded for --plan)."""
+        hits = self.find(content, PATCH_PROFILE)
+        if _anchor_report is not None:
+            _anchor_report.append((self, hits, content))
+        return hits
+
+    def splice(self, content, hits, skip=()):
+        """Splice the scanned hits into content, except the anchors named in
+        skip (already applied); returns the new content."""
+        claimed = []
+        for hit in hits:
+            if hit.anchor.is_probe or hit.anchor.name in skip:
+                continue
+            for span in hit.spans:
+                if hit.anchor.count and hit.applied >= hit.anchor.count:
+                    break
+                if any(span[0] < end and start < span[1] for start, end, _ in claimed):
+                    continue
+                claimed.append(span)
+                hit.applied += 1
+        if not claimed:
+            return content
+        claimed.sort()
+        parts = []
+        pos = len(content)
+        for start, end, text in reversed(claimed):
+            parts.append(content[end:pos])
+            parts.append(text)
+            pos = start
+        parts.append(content[:pos])
+        return ''.join(reversed(parts))
+
+    def apply(self, content):
+        """Scan and splice in one go. Returns (new_content, hits)."""
+        hits = self.scan(content)
+        return self.splice(content, hits), hits
+
+def declare_anchors(func_name, rel_path, *anchors):
+    """Register (and compile) the anchors func_name patches into rel_path."""
+    anchor_set = AnchorSet(func_name, rel_path, anchors)
+    PATCH_ANCHORS.setdefault(func_name, []).append(anchor_set)
+    return anchor_set
+
+# ============================================================================
+# PLAN MODE - Dry run that reports anchor hits without touching the game
+# ============================================================================
+def plan_selected_mods(selected_features):
+    """Dry-run the patch plan for a feature selection, entirely in memory.
+    
+    Every patch function runs in plan order against an in-memory overlay of
+    the vanilla asar - nothing is extracted, written or repacked - and every
+    declared anchor's matches are recorded. Byte offsets are into the file as
+    that function sees it (after the earlier steps of the plan).
+    
+    Returns:
+        list of dict: one per function with 'function', 'status'
+        ('ok' | 'fail' | 'skip'), 'messages' and 'rows' (file, anchor,
+        alternative, applied, byte offsets, and whether it is a probe or a
+        file written without declared anchors).
+    """
+    global applied_mods, failed_mods, _install_tracker, _session, _anchor_report
+    source = APP_ASAR_VANILLA if APP_ASAR_VANILLA.exists() else APP_ASAR
+    identify_game_build(source)  # selects the patch profile
+    saved_logs = applied_mods, failed_mods
+    applied_mods, failed_mods = [], []
+    report = []
+    _session = _AsarOverlay(source)
+    _install_tracker = _InstallTracker(stash=False)
+    try:
+        for func_name in build_install_plan(selected_features):
+            func = globals().get(func_name)
+            _anchor_report = []
+            _install_tracker.begin(func_name)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                try:
+                    if func and callable(func):
+                        func()
+                    else:
+                        _install_tracker.note_log('failed', f"{func_name}: function not found")
+                except Exception as e:
+                    _install_tracker.note_log('failed', f"{func_name}: {str(e)}")
+            record = _install_tracker.current
+            _install_tracker.end()
+            
+            rows = []
+            for anchor_set, hits, content in _anchor_report:
+                for hit in hits:
+                    rows.append({
+                        'file': anchor_set.rel_path,
+                        'anchor': hit.anchor.name,
+                        'alternative': hit.alternative,
+                        'applied': hit.applied,
+                        'probe': hit.anchor.is_probe,
+                        'write': False,
+                        'offsets': [len(content[:start].encode('utf-8')) for start, _, _ in hit.spans],
+                    })
+            # Functions without declared anchors (full-file copies, line
+            # edits): list the files they'd write, with nothing to hit or miss
+            if not _anchor_report:
+                by_dir = {}
+                for rel in record['writes']:
+                    by_dir.setdefault(rel.rpartition('/')[0], []).append(rel)
+                for rel_dir, rels in by_dir.items():
+                    target = rels[0] if len(rels) == 1 else f"{rel_dir}/ ({len(rels)} files)"
+                    rows.append({'file': target, 'anchor': '(no anchors)', 'alternative': None,
+                                 'applied': 0, 'probe': False, 'write': True, 'offsets': []})
+            
+            # Log lines the function printed, plus exceptions (only recorded, not printed)
+            messages = [line.strip() for line in output.getvalue().splitlines()
+                        if any(tag in line for tag in ('[OK]', '[FAIL]', '[SKIP]', '[WARN]'))]
+            messages += [f"[FAIL] {m}" for m in record['failed'] if m.startswith(f"{func_name}: ")]
+            if record['failed']:
+                status = 'fail'
+            elif record['applied']:
+                status = 'ok'
+            else:
+                status = 'skip'
+            report.append({
+                'function': func_name,
+                'status': status,
+                'messages': messages,
+                'rows': rows,
+            })
+    finally:
+        _anchor_report = None
+        _install_tracker = None
+        _session.close()
+        _session = None
+        applied_mods, failed_mods = saved_logs
+    return report
+
+def print_install_plan(report):
+    """Print a plan_selected_mods() report as a per-function, per-file table."""
+    print(f"\n  {'FILE':<44} {'ANCHOR':<28} {'RESULT':<6} BYTE OFFSETS")
+    hit_count = miss_count = 0
+    for entry in report:
+        print(f"\n  [{entry['status'].upper()}] {entry['function']}")
+        for message in entry['messages']:
+            print(f"      {message}")
+        for row in entry['rows']:
+            if row['probe']:
+                # Markers the function only checks for: neither hit nor miss
+                result = 'FOUND' if row['offsets'] else 'ABSENT'
+            elif row['write']:
+                result = 'WRITE'
+            elif row['offsets'] or row['applied']:
+                result = 'HIT'
+                hit_count += 1
+            else:
+                result = 'MISS'
+                miss_count += 1
+            anchor = row['anchor']
+            if row['alternative']:
+                anchor += f" (alt {row['alternative'] + 1})"
+            offsets = ', '.join(str(o) for o in row['offsets'][:4])
+            if len(row['offsets']) > 4:
+                offsets += f" (+{len(row['offsets']) - 4} more)"
+            print(f"    {row['file']:<44} {anchor:<28} {result:<6} {offsets}")
+    statuses = [entry['status'] for entry in report]
+    print(f"\n  {len(report)} patch steps: {statuses.count('ok')} ok, "
+          f"{statuses.count('fail')} failing, {statuses.count('skip')} skipped; "
+          f"{hit_count} anchors hit, {miss_count} missed")
+
 # ============================================================================
 # SHINY SPRITES - Copy pre-generated non-max evolution shinies
 # ============================================================================
@@ -478,14 +1627,14 @@ def apply_shiny_sprites():
         print("  [SKIP] No pre-generated shiny sprites found")
         return
     
-    # Ensure destination exists
-    shiny_dest.mkdir(parents=True, exist_ok=True)
-    
+    if _install_tracker:
+        _install_tracker.note_input(shiny_src)
+
     # Copy all sprite files
     count = 0
     for sprite_file in shiny_src.glob("*.png"):
         dest_file = shiny_dest / sprite_file.name
-        shutil.copy2(sprite_file, dest_file)
+        copy_asset_file(sprite_file, dest_file)
         count += 1
     
     if count > 0:
@@ -496,45 +1645,46 @@ def apply_shiny_sprites():
 # ============================================================================
 # TEXT.JS - Add "Continue" option to auto-reset
 # ============================================================================
+TEXT_RESET_VANILLA = """reset: {
+				0: ['Off', 'Apagado', 'Arrêt', 'Desligado', 'Spento', 'Aus', 'オフ', '끄기', '关é--­', 'Wył.'],
+				1: ['Restart', 'Reiniciar', 'Recommencer', 'Reiniciar', 'Ricomincia', 'Neustarten', 'リスタート', '재시작', '重新开始', 'Restart'],
+				2: ['Retry', 'Reintentar', 'Réessayer', 'Tentar', 'Riprova', 'Wiederholen', 'リトライ', '재시도', '重试', 'Ponów'],
+			}"""
+
+TEXT_CONTINUE_LINE = "\n\t\t\t\t3: ['Continue', 'Continuar', 'Continuer', 'Continuar', 'Continua', 'Fortsetzen', 'つづく', '계속', '继续', 'Kontynuuj'],"
+
+def _insert_continue_option(match):
+    """Add option 3 after the last reset option, before the closing brace."""
+    text = match.group(0)
+    close = re.search(r'\s*\n\s*\},?$', text).start()
+    return text[:close] + TEXT_CONTINUE_LINE + text[close:]
+
+TEXT_CONTINUE_ANCHORS = declare_anchors('apply_text_continue_option', 'src/js/file/text.js',
+    Anchor('continue option', ("'Continue'", '"Continue"')),
+    # Find the reset object and add option 3. On unrecognised builds the regex
+    # matches the same structure where the encoding of the translations differs.
+    Anchor('reset options', {
+        '1.5.4': TEXT_RESET_VANILLA,
+        '*': re.compile(r"reset:\s*\{\s*\n\s*0:\s*\[[^\]]+\],\s*\n\s*1:\s*\[[^\]]+\],\s*\n\s*2:\s*\[[^\]]+\],\s*\n\s*\},?"),
+    }, _insert_continue_option, count=0),
+)
+
 def apply_text_continue_option():
     """Add 'Continue' as 4th auto-reset option in all languages."""
     path = JS_ROOT / "file" / "text.js"
     content = read_file(path)
+    hits = TEXT_CONTINUE_ANCHORS.scan(content)
     
     # Check if already applied
-    if "'Continue'" in content or '"Continue"' in content:
+    if hits['continue option'].found:
         log_skip("text.js: Continue option")
         return True
     
-    # Find the reset object and add option 3
-    old_pattern = """reset: {
-				0: ['Off', 'Apagado', 'Arrêt', 'Desligado', 'Spento', 'Aus', 'オフ', '끄기', '关é--­', 'Wył.'],
-				1: ['Restart', 'Reiniciar', 'Recommencer', 'Reiniciar', 'Ricomincia', 'Neustarten', 'リスタート', '재시작', '重新开始', 'Restart'],
-				2: ['Retry', 'Reintentar', 'Réessayer', 'Tentar', 'Riprova', 'Wiederholen', 'リトライ', '재시도', '重试', 'Ponów'],
-			}"""
-    
-    new_pattern = """reset: {
-				0: ['Off', 'Apagado', 'Arrêt', 'Desligado', 'Spento', 'Aus', 'オフ', '끄기', '关é--­', 'Wył.'],
-				1: ['Restart', 'Reiniciar', 'Recommencer', 'Reiniciar', 'Ricomincia', 'Neustarten', 'リスタート', '재시작', '重新开始', 'Restart'],
-				2: ['Retry', 'Reintentar', 'Réessayer', 'Tentar', 'Riprova', 'Wiederholen', 'リトライ', '재시도', '重试', 'Ponów'],
-				3: ['Continue', 'Continuar', 'Continuer', 'Continuar', 'Continua', 'Fortsetzen', 'つづく', '계속', '继续', 'Kontynuuj'],
-			}"""
-    
-    if old_pattern in content:
-        content = content.replace(old_pattern, new_pattern)
-        write_file(path, content)
-        log_success("text.js: Continue option added")
-        return True
-    
-    # Try alternate pattern matching (encoding might differ)
-    # Match the structure and add line 3
-    pattern = r"(reset:\s*\{\s*\n\s*0:\s*\[[^\]]+\],\s*\n\s*1:\s*\[[^\]]+\],\s*\n\s*2:\s*\[[^\]]+\],)(\s*\n\s*\},?)"
-    match = re.search(pattern, content)
-    if match:
-        new_line = "\n\t\t\t\t3: ['Continue', 'Continuar', 'Continuer', 'Continuar', 'Continua', 'Fortsetzen', 'つづく', '계속', '继续', 'Kontynuuj'],"
-        content = content[:match.end(1)] + new_line + content[match.start(2):]
+    content = TEXT_CONTINUE_ANCHORS.splice(content, hits)
+    hit = hits['reset options']
+    if hit:
         write_file(path, content)
-        log_success("text.js: Continue option added (regex)")
+        log_success("text.js: Continue option added" + (" (regex)" if isinstance(hit.pattern, re.Pattern) else ""))
         return True
     
     log_fail("text.js: Continue option")
@@ -543,53 +1693,35 @@ def apply_text_continue_option():
 # ============================================================================
 # MENUSCENE.JS - Auto-reset cycles 0-3 instead of 0-2
 # ============================================================================
-def apply_menu_autoreset_range():
-    """Change auto-reset to cycle through 4 options (0-3) instead of 3 (0-2)."""
-    path = JS_ROOT / "game" / "scenes" / "MenuScene.js"
-    content = read_file(path)
-    changed = False
+MENU_AUTORESET_DISPLAY_VANILLA = "else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();\n\t\telse this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"
+MENU_AUTORESET_DISPLAY_MODDED = "else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();\n\t\telse if (data.config.autoReset == 3) this.autoResetRow.value.innerText = text.menu.settings.reset[3][this.main.lang].toUpperCase();\n\t\telse this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"
 
-    old_pattern = """updateAutoReset = (dir) => {
+MENU_AUTORESET_ANCHORS = declare_anchors('apply_menu_autoreset_range', 'src/js/game/scenes/MenuScene.js',
+    Anchor('range', """updateAutoReset = (dir) => {
     	let pos = Number(this.main.autoReset) + dir;
 		if (pos < 0) pos = 2;
-		else if (pos == 3) pos = 0;"""
-
-    new_pattern = """updateAutoReset = (dir) => {
+		else if (pos == 3) pos = 0;""", """updateAutoReset = (dir) => {
     	let pos = Number(this.main.autoReset) + dir;
 		if (pos < 0) pos = 3;
-		else if (pos == 4) pos = 0;"""
-
-    if old_pattern in content:
-        content = content.replace(old_pattern, new_pattern)
-        changed = True
-
-    display_old = """this.autoResetRow.label.innerText = text.menu.settings.autoReset[this.main.lang].toUpperCase();
-		if (data.config.autoReset == 1) this.autoResetRow.value.innerText = text.menu.settings.reset[1][this.main.lang].toUpperCase();
-		else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();
-		else this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"""
-
-    display_new = """this.autoResetRow.label.innerText = text.menu.settings.autoReset[this.main.lang].toUpperCase();
-		if (data.config.autoReset == 1) this.autoResetRow.value.innerText = text.menu.settings.reset[1][this.main.lang].toUpperCase();
-		else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();
-		else if (data.config.autoReset == 3) this.autoResetRow.value.innerText = text.menu.settings.reset[3][this.main.lang].toUpperCase();
-		else this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"""
-
-    if display_old in content:
-        content = content.replace(display_old, display_new)
-        changed = True
-    elif 'else if (data.config.autoReset == 3)' not in content:
-        fallback_old = "else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();\n\t\telse this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"
-        fallback_new = "else if (data.config.autoReset == 2) this.autoResetRow.value.innerText = text.menu.settings.reset[2][this.main.lang].toUpperCase();\n\t\telse if (data.config.autoReset == 3) this.autoResetRow.value.innerText = text.menu.settings.reset[3][this.main.lang].toUpperCase();\n\t\telse this.autoResetRow.value.innerText = text.menu.settings.reset[0][this.main.lang].toUpperCase();"
-        if fallback_old in content:
-            content = content.replace(fallback_old, fallback_new)
-            changed = True
+		else if (pos == 4) pos = 0;""", count=0),
+    # Display the new option 3 label
+    Anchor('display', MENU_AUTORESET_DISPLAY_VANILLA, MENU_AUTORESET_DISPLAY_MODDED, count=0),
+    Anchor('range 0-3', 'pos == 4'),
+    Anchor('display 3', 'else if (data.config.autoReset == 3)'),
+)
 
-    if changed:
+def apply_menu_autoreset_range():
+    """Change auto-reset to cycle through 4 options (0-3) instead of 3 (0-2)."""
+    path = JS_ROOT / "game" / "scenes" / "MenuScene.js"
+    content = read_file(path)
+    content, hits = MENU_AUTORESET_ANCHORS.apply(content)
+
+    if any(hits):
         write_file(path, content)
         log_success("MenuScene.js: Auto-reset range/display 0-3")
         return True
 
-    if 'pos == 4' in content and 'else if (data.config.autoReset == 3)' in content:
+    if hits['range 0-3'].found and hits['display 3'].found:
         log_skip("MenuScene.js: Auto-reset range/display 0-3")
         return True
 
@@ -599,28 +1731,22 @@ def apply_menu_autoreset_range():
 # ============================================================================
 # MAPSCENE.JS - Remove wave 100 cap on record display
 # ============================================================================
+MAP_RECORD_ANCHORS = declare_anchors('apply_map_record_uncap', 'src/js/game/scenes/MapScene.js',
+    # Remove legacy wave-100 caps in record display
+    Anchor('record cap', 'Math.min(100, recordValue)', 'recordValue', count=0),
+    Anchor('records cap', 'Math.min(100, this.main.player.records[i])', 'this.main.player.records[i]', count=0),
+    # Endless-safe preview lookup (wave > 100 no longer indexes this.main.area.waves directly)
+    Anchor('wave preview', "\t\tthis.main.UI.displayEnemyInfo(this.main.area.waves[this.main.area.waveNumber].preview[0], 0);\n",
+           "\t\tconst previewEnemy = this.main.area.getWavePreview(this.main.area.waveNumber);\n\t\tif (previewEnemy) this.main.UI.displayEnemyInfo(previewEnemy, 0);\n", count=0),
+)
+
 def apply_map_record_uncap():
     """Remove legacy wave-100 caps and make preview selection endless-safe."""
     path = JS_ROOT / "game" / "scenes" / "MapScene.js"
     content = read_file(path)
+    content, hits = MAP_RECORD_ANCHORS.apply(content)
 
-    changed = False
-
-    # Remove legacy wave-100 caps in record display
-    new_content = content.replace('Math.min(100, recordValue)', 'recordValue')
-    new_content = new_content.replace('Math.min(100, this.main.player.records[i])', 'this.main.player.records[i]')
-    if new_content != content:
-        content = new_content
-        changed = True
-
-    # Endless-safe preview lookup (wave > 100 no longer indexes this.main.area.waves directly)
-    old_preview_line = "\t\tthis.main.UI.displayEnemyInfo(this.main.area.waves[this.main.area.waveNumber].preview[0], 0);\n"
-    new_preview_block = "\t\tconst previewEnemy = this.main.area.getWavePreview(this.main.area.waveNumber);\n\t\tif (previewEnemy) this.main.UI.displayEnemyInfo(previewEnemy, 0);\n"
-    if old_preview_line in content:
-        content = content.replace(old_preview_line, new_preview_block)
-        changed = True
-
-    if changed:
+    if any(hits):
         write_file(path, content)
         log_success("MapScene.js: Record display uncapped + endless-safe preview")
     else:
@@ -631,29 +1757,29 @@ def apply_map_record_uncap():
 # ============================================================================
 # MAP.CSS - Show route star counts on hover
 # ============================================================================
+MAP_HOVER_ANCHORS = declare_anchors('apply_map_hover_stars', 'src/css/map.css',
+    Anchor('hover record rule', ".maps-scene-route:hover .maps-scene-route-record-container {\n\tdisplay: block;\n}"),
+    Anchor('hover name rule', ".maps-scene-route:hover .maps-scene-route-name {\n\topacity: 1;\n}\n",
+           ".maps-scene-route:hover .maps-scene-route-name {\n\topacity: 1;\n}\n\n.maps-scene-route:hover .maps-scene-route-record-container {\n\tdisplay: block;\n}\n", count=0),
+)
+
 def apply_map_hover_stars():
     """Show per-route star totals on hover without changing endless-specific record logic."""
     css_path = APP_EXTRACTED / "src" / "css" / "map.css"
     css_content = read_file(css_path)
-    changed = False
-
-    hover_record_rule = ".maps-scene-route:hover .maps-scene-route-record-container {\n\tdisplay: block;\n}"
-    if hover_record_rule not in css_content:
-        old_css = ".maps-scene-route:hover .maps-scene-route-name {\n\topacity: 1;\n}\n"
-        new_css = ".maps-scene-route:hover .maps-scene-route-name {\n\topacity: 1;\n}\n\n.maps-scene-route:hover .maps-scene-route-record-container {\n\tdisplay: block;\n}\n"
-        if old_css in css_content:
-            css_content = css_content.replace(old_css, new_css)
-            changed = True
-        else:
-            log_fail("map.css: Hover star display", "hover name rule not found")
-            return False
+    hits = MAP_HOVER_ANCHORS.scan(css_content)
 
-    if changed:
-        write_file(css_path, css_content)
-        log_success("map.css: Hover star display")
-    else:
+    if hits['hover record rule'].found:
         log_skip("map.css: Hover star display")
+        return True
 
+    css_content = MAP_HOVER_ANCHORS.splice(css_content, hits)
+    if not hits['hover name rule']:
+        log_fail("map.css: Hover star display", "hover name rule not found")
+        return False
+
+    write_file(css_path, css_content)
+    log_success("map.css: Hover star display")
     return True
 
 # ============================================================================
@@ -670,7 +1796,7 @@ def apply_shiny_eggs():
         return True
     
     # Use full file replacement from patches/Shop.modded.js
-    modded_path = MODS_DIR / "patches" / "Shop.modded.js"
+    modded_path = modded_patch("Shop.modded.js")
     if modded_path.exists():
         copy_modded_file(modded_path, path)
         log_success("Shop.js: Shiny eggs (full file replacement)")
@@ -682,38 +1808,43 @@ def apply_shiny_eggs():
 # ============================================================================
 # NEWGAMESCENE.JS - 1/30 shiny chance for starters
 # ============================================================================
+SHINY_STARTERS_ANCHORS = declare_anchors('apply_shiny_starters', 'src/js/game/scenes/NewGameScene.js',
+    Anchor('isShiny', 'isShiny'),
+    # "1/30" and "1 / 30" spacing
+    Anchor('1/30', ('1/30', '1 / 30')),
+    # Fallback when NewGameScene.modded.js is missing: inline patch
+    Anchor('close', """	close() {
+		super.close();
+		this.main.team.addPokemon(new Pokemon(STARTER[this.starterSelected], 1, null, this.main));
+		this.main.shop.eggList.splice(this.starterSelected, 1);""",
+           """	close() {
+		super.close();
+		// 1 in 30 chance for shiny starter
+		const isShiny = Math.random() < (1 / 30);
+		this.main.team.addPokemon(new Pokemon(STARTER[this.starterSelected], 1, null, this.main, undefined, false, null, undefined, isShiny));
+		this.main.shop.eggList.splice(this.starterSelected, 1);""", count=0),
+)
+
 def apply_shiny_starters():
     """Add 1/30 shiny chance when selecting starter."""
     path = JS_ROOT / "game" / "scenes" / "NewGameScene.js"
     content = read_file(path)
+    hits = SHINY_STARTERS_ANCHORS.scan(content)
     
-    # Check if already applied (handle both "1/30" and "1 / 30" spacing)
-    if 'isShiny' in content and ('1/30' in content or '1 / 30' in content):
+    # Check if already applied
+    if hits['isShiny'].found and hits['1/30'].found:
         log_skip("NewGameScene.js: Shiny starters")
         return True
     
     # Use modded file if available (safer, idempotent)
-    modded_file = MODS_DIR / "patches" / "NewGameScene.modded.js"
+    modded_file = modded_patch("NewGameScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("NewGameScene.js: Shiny starters (full file replacement)")
         return True
     
-    # Fallback: inline patch
-    old_pattern = """	close() {
-		super.close();
-		this.main.team.addPokemon(new Pokemon(STARTER[this.starterSelected], 1, null, this.main));
-		this.main.shop.eggList.splice(this.starterSelected, 1);"""
-    
-    new_pattern = """	close() {
-		super.close();
-		// 1 in 30 chance for shiny starter
-		const isShiny = Math.random() < (1 / 30);
-		this.main.team.addPokemon(new Pokemon(STARTER[this.starterSelected], 1, null, this.main, undefined, false, null, undefined, isShiny));
-		this.main.shop.eggList.splice(this.starterSelected, 1);"""
-    
-    if old_pattern in content:
-        content = content.replace(old_pattern, new_pattern)
+    content = SHINY_STARTERS_ANCHORS.splice(content, hits)
+    if hits['close']:
         write_file(path, content)
         log_success("NewGameScene.js: Shiny starters (1/30)")
         return True
@@ -724,18 +1855,10 @@ def apply_shiny_starters():
 # ============================================================================
 # SHOPSCENE.JS - Shiny reveal display
 # ============================================================================
-def apply_shiny_reveal():
-    """Add shiny reveal display with sparkle animation."""
-    path = JS_ROOT / "game" / "scenes" / "ShopScene.js"
-    content = read_file(path)
-    
-    # Check if already applied
-    if 'isShinyReveal' in content:
-        log_skip("ShopScene.js: Shiny reveal")
-        return True
-    
+SHINY_REVEAL_ANCHORS = declare_anchors('apply_shiny_reveal', 'src/js/game/scenes/ShopScene.js',
+    Anchor('isShinyReveal', 'isShinyReveal'),
     # Modify DisplayPokemon constructor
-    old_constructor = """class DisplayPokemon extends GameScene {
+    Anchor('constructor', """class DisplayPokemon extends GameScene {
 	constructor(main) {
 		super(200, 200);
 		this.main = main;
@@ -743,9 +1866,8 @@ def apply_shiny_reveal():
 		
 		this.header.removeChild(this.closeButton);
 		this.render();
-	}"""
-    
-    new_constructor = """class DisplayPokemon extends GameScene {
+	}""",
+           """class DisplayPokemon extends GameScene {
 	constructor(main) {
 		super(200, 200);
 		this.main = main;
@@ -754,17 +1876,15 @@ def apply_shiny_reveal():
 		
 		this.header.removeChild(this.closeButton);
 		this.render();
-	}"""
-    
+	}""", count=0),
     # Modify render to add shiny symbol
-    old_render = """	render() {
+    Anchor('render', """	render() {
 		this.title.innerHTML = text.shop.title[this.main.lang].toUpperCase();
 		this.prompt = new Element(this.container, { className: 'dp-scene-prompt' }).element;
 		this.pokemonName = new Element(this.container, { className: 'dp-scene-pokemon-name' }).element;
 		this.image = new Element(this.container, { className: 'dp-scene-image' }).element;
-		this.closeButton = new Element(this.container, { className: 'shop-scene-purchase' }).element;"""
-    
-    new_render = """	render() {
+		this.closeButton = new Element(this.container, { className: 'shop-scene-purchase' }).element;""",
+           """	render() {
 		this.title.innerHTML = text.shop.title[this.main.lang].toUpperCase();
 		this.prompt = new Element(this.container, { className: 'dp-scene-prompt' }).element;
 		this.pokemonName = new Element(this.container, { className: 'dp-scene-pokemon-name' }).element;
@@ -786,19 +1906,17 @@ def apply_shiny_reveal():
 		}
 		this.shinySymbol.style.animation = 'shinyPulse 1s ease-in-out infinite';
 		
-		this.closeButton = new Element(this.container, { className: 'shop-scene-purchase' }).element;"""
-    
+		this.closeButton = new Element(this.container, { className: 'shop-scene-purchase' }).element;""", count=0),
     # Modify update to show shiny text
-    old_update = """	update() {
+    Anchor('update', """	update() {
 		this.title.innerHTML = text.shop.title[this.main.lang].toUpperCase();
 		this.prompt.innerText = text.shop.new[this.main.lang].toUpperCase();
 		this.pokemonName.innerHTML = this.pokemon.name[this.main.lang].toUpperCase();
 		this.pokemonName.style.color = this.pokemon.specie.color;
 		this.image.style.backgroundImage = `url("${this.pokemon.sprite.base}")`;
 		this.closeButton.innerHTML = 'OK';
-	}"""
-    
-    new_update = """	update() {
+	}""",
+           """	update() {
 		this.title.innerHTML = text.shop.title[this.main.lang].toUpperCase();
 		if (this.isShinyReveal) {
 			this.prompt.innerHTML = '<span class="msrre">\u2b50</span> SHINY! <span class="msrre">\u2b50</span>';
@@ -812,43 +1930,38 @@ def apply_shiny_reveal():
 		
 		// Show shiny symbol if it's a shiny reveal
 		this.shinySymbol.style.display = this.isShinyReveal ? 'block' : 'none';
-	}"""
-    
+	}""", count=0),
     # Modify open to accept isShiny param
-    old_open = """	open(pokemon) {
+    Anchor('open', """	open(pokemon) {
 		playSound('results', 'ui');
 		this.pokemon = pokemon;
 
 		super.open();
 		this.update();
-	}"""
-    
-    new_open = """	open(pokemon, isShiny = false) {
+	}""",
+           """	open(pokemon, isShiny = false) {
 		playSound('results', 'ui');
 		this.pokemon = pokemon;
 		this.isShinyReveal = isShiny;
 
 		super.open();
 		this.update();
-	}"""
+	}""", count=0),
+)
+
+def apply_shiny_reveal():
+    """Add shiny reveal display with sparkle animation."""
+    path = JS_ROOT / "game" / "scenes" / "ShopScene.js"
+    content = read_file(path)
+    hits = SHINY_REVEAL_ANCHORS.scan(content)
     
-    changes_made = 0
+    # Check if already applied
+    if hits['isShinyReveal'].found:
+        log_skip("ShopScene.js: Shiny reveal")
+        return True
     
-    if old_constructor in content:
-        content = content.replace(old_constructor, new_constructor)
-        changes_made += 1
-    
-    if old_render in content:
-        content = content.replace(old_render, new_render)
-        changes_made += 1
-    
-    if old_update in content:
-        content = content.replace(old_update, new_update)
-        changes_made += 1
-    
-    if old_open in content:
-        content = content.replace(old_open, new_open)
-        changes_made += 1
+    content = SHINY_REVEAL_ANCHORS.splice(content, hits)
+    changes_made = sum(1 for hit in hits if hit)
     
     if changes_made > 0:
         write_file(path, content)
@@ -861,21 +1974,10 @@ def apply_shiny_reveal():
 # ============================================================================
 # UI.JS - 1/30 shiny chance for secret/hidden Pokemon unlocks
 # ============================================================================
-def apply_secret_shiny():
-    """Patch getSecret() in UI.js to add 1/30 shiny chance for hidden Pokemon."""
-    path = JS_ROOT / "game" / "UI.js"
-    
-    if not path.exists():
-        log_skip("UI.js: Secret shiny (file not yet installed)")
-        return True
-    
-    content = read_file(path)
-    
-    if 'const isShiny = Math.random() < (1 / 30);' in content and 'getSecret' in content:
-        log_skip("UI.js: Secret shiny")
-        return True
-    
-    old = """	getSecret(poke) {
+SECRET_SHINY_ANCHORS = declare_anchors('apply_secret_shiny', 'src/js/game/UI.js',
+    Anchor('shiny roll', 'const isShiny = Math.random() < (1 / 30);'),
+    Anchor('getSecret', 'getSecret'),
+    Anchor('getSecret body', """	getSecret(poke) {
 		const pokemon = pokemonData[poke];
 
 		if (this.main.team.pokemon.length < this.main.player.teamSlots) {
@@ -884,9 +1986,8 @@ def apply_secret_shiny():
 		} else {
 			this.main.box.addPokemon(new Pokemon(pokemon, 1, null, this.main));
 			this.main.shopScene.displayPokemon.open(this.main.box.pokemon.at(-1))
-		}"""
-    
-    new = """	getSecret(poke) {
+		}""",
+           """	getSecret(poke) {
 		const pokemon = pokemonData[poke];
 		const isShiny = Math.random() < (1 / 30);
 
@@ -896,10 +1997,26 @@ def apply_secret_shiny():
 		} else {
 			this.main.box.addPokemon(new Pokemon(pokemon, 1, null, this.main, undefined, false, null, undefined, isShiny));
 			this.main.shopScene.displayPokemon.open(this.main.box.pokemon.at(-1), isShiny)
-		}"""
+		}""", count=0),
+)
+
+def apply_secret_shiny():
+    """Patch getSecret() in UI.js to add 1/30 shiny chance for hidden Pokemon."""
+    path = JS_ROOT / "game" / "UI.js"
+    
+    if not game_file_exists(path):
+        log_skip("UI.js: Secret shiny (file not yet installed)")
+        return True
+    
+    content = read_file(path)
+    hits = SECRET_SHINY_ANCHORS.scan(content)
     
-    if old in content:
-        content = content.replace(old, new)
+    if hits['shiny roll'].found and hits['getSecret'].found:
+        log_skip("UI.js: Secret shiny")
+        return True
+    
+    content = SECRET_SHINY_ANCHORS.splice(content, hits)
+    if hits['getSecret body']:
         write_file(path, content)
         log_success("UI.js: Secret shiny (1/30 chance for hidden Pokemon)")
         return True
@@ -908,21 +2025,10 @@ def apply_secret_shiny():
     return False
 
 
-def apply_challenge_reward_shiny():
-    """Patch ChallengeScene reward Pokemon claims to roll 1/30 shiny odds."""
-    path = JS_ROOT / "game" / "scenes" / "ChallengeScene.js"
-
-    if not path.exists():
-        log_skip("ChallengeScene.js: Reward shiny (file not yet installed)")
-        return True
-
-    content = read_file(path)
-
-    if 'const isShiny = Math.random() < (1 / 30);' in content and 'claimPokemon(rewardIndex, pokemon)' in content:
-        log_skip("ChallengeScene.js: Reward shiny")
-        return True
-
-    old = """\tclaimPokemon(rewardIndex, pokemon) {
+REWARD_SHINY_ANCHORS = declare_anchors('apply_challenge_reward_shiny', 'src/js/game/scenes/ChallengeScene.js',
+    Anchor('shiny roll', 'const isShiny = Math.random() < (1 / 30);'),
+    Anchor('claimPokemon', 'claimPokemon(rewardIndex, pokemon)'),
+    Anchor('claimPokemon body', """\tclaimPokemon(rewardIndex, pokemon) {
 \t\tconst price = this.prices[rewardIndex];
 
 \t\tif (
@@ -939,9 +2045,8 @@ def apply_challenge_reward_shiny():
 \t\t\tthis.main.box.addPokemon(new Pokemon(pokemon, 1, null, this.main));
 \t\t\tthis.main.shopScene.displayPokemon.open(this.main.box.pokemon.at(-1));
 \t\t}
-"""
-
-    new = """\tclaimPokemon(rewardIndex, pokemon) {
+""",
+           """\tclaimPokemon(rewardIndex, pokemon) {
 \t\tconst price = this.prices[rewardIndex];
 
 \t\tif (
@@ -959,10 +2064,26 @@ def apply_challenge_reward_shiny():
 \t\t\tthis.main.box.addPokemon(new Pokemon(pokemon, 1, null, this.main, undefined, false, null, undefined, isShiny));
 \t\t\tthis.main.shopScene.displayPokemon.open(this.main.box.pokemon.at(-1), isShiny);
 \t\t}
-"""
+""", count=0),
+)
+
+def apply_challenge_reward_shiny():
+    """Patch ChallengeScene reward Pokemon claims to roll 1/30 shiny odds."""
+    path = JS_ROOT / "game" / "scenes" / "ChallengeScene.js"
+
+    if not game_file_exists(path):
+        log_skip("ChallengeScene.js: Reward shiny (file not yet installed)")
+        return True
+
+    content = read_file(path)
+    hits = REWARD_SHINY_ANCHORS.scan(content)
 
-    if old in content:
-        content = content.replace(old, new)
+    if hits['shiny roll'].found and hits['claimPokemon'].found:
+        log_skip("ChallengeScene.js: Reward shiny")
+        return True
+
+    content = REWARD_SHINY_ANCHORS.splice(content, hits)
+    if hits['claimPokemon body']:
         write_file(path, content)
         log_success("ChallengeScene.js: Reward shiny (1/30 chance for reward Pokemon)")
         return True
@@ -971,21 +2092,7 @@ def apply_challenge_reward_shiny():
     return False
 
 
-def apply_enemy_shiny_spawn():
-    """Patch Enemy.js to add the shiny enemy gameplay variant."""
-    path = JS_ROOT / "game" / "component" / "Enemy.js"
-    
-    if not path.exists():
-        log_skip("Enemy.js: Shiny enemy spawn (file not yet installed)")
-        return True
-    
-    content = read_file(path)
-    
-    if "this.isShiny = Math.random() < (1 / 1000);" in content and "shinyEnemiesDefeated = (this.main.player.stats.shinyEnemiesDefeated ?? 0) + 1;" in content:
-        log_skip("Enemy.js: Shiny enemy spawn")
-        return True
-    
-    old_constructor = """		this.enemy = enemy;
+SHINY_ENEMY_CONSTRUCTOR = """		this.enemy = enemy;
 		this.hp = enemy.hp;
 		this.hpMax = enemy.hp;
 		this.armor = enemy.armor || 0;
@@ -997,20 +2104,20 @@ def apply_enemy_shiny_spawn():
 		this.power = enemy.power;
 		this.gold = enemy.gold + this.main.player.extraGold;
 """
-    # 1.5.3 variant omits semicolon on the gold line
-    old_constructor_no_semicolon = """		this.enemy = enemy;
-		this.hp = enemy.hp;
-		this.hpMax = enemy.hp;
-		this.armor = enemy.armor || 0;
-		this.armorMax = enemy.armor || 0;
-		this.regeneration = enemy.regeneration || 0; 
-		this.regenTimer = 0; 
-		this.speed = enemy.speed; 
-		this.baseSpeed = this.speed; 
-		this.power = enemy.power;
-		this.gold = enemy.gold + this.main.player.extraGold
-"""
-    new_constructor = """		this.enemy = enemy;
+SHINY_ENEMY_CONSTRUCTOR_REGEX = re.compile(
+    r"\t\tthis\.enemy = enemy;\s*"
+    r"\t\tthis\.hp = enemy\.hp;\s*"
+    r"\t\tthis\.hpMax = enemy\.hp;\s*"
+    r"\t\tthis\.armor = enemy\.armor \|\| 0;\s*"
+    r"\t\tthis\.armorMax = enemy\.armor \|\| 0;\s*"
+    r"\t\tthis\.regeneration = enemy\.regeneration \|\| 0;\s*"
+    r"\t\tthis\.regenTimer = 0;\s*"
+    r"\t\tthis\.speed = enemy\.speed;\s*"
+    r"\t\tthis\.baseSpeed = this\.speed;\s*"
+    r"\t\tthis\.power = enemy\.power;\s*"
+    r"\t\tthis\.gold = enemy\.gold \+ this\.main\.player\.extraGold;?\s*"
+)
+SHINY_ENEMY_CONSTRUCTOR_MODDED = """		this.enemy = enemy;
 		this.isShiny = Math.random() < (1 / 1000);
 		if (this.isShiny && typeof this.sprite?.src === 'string' && this.sprite.src.includes('/normal/')) {
 			const shinySrc = this.sprite.src.replace(/\\/normal\\//g, '/shiny/');
@@ -1036,49 +2143,46 @@ def apply_enemy_shiny_spawn():
 			this.gold = Math.floor(this.gold * 1000);
 		}
 """
-    old_defeat = """	    	this.main.player.stats.defeatedEnemies++;
+SHINY_ENEMY_DEFEAT = """	    	this.main.player.stats.defeatedEnemies++;
 	    	this.main.player.stats.defeatedSpecies.add(this.enemy.id);
 """
-    new_defeat = """	    	this.main.player.stats.defeatedEnemies++;
+SHINY_ENEMY_DEFEAT_MODDED = """	    	this.main.player.stats.defeatedEnemies++;
 	    	if (this.isShiny) this.main.player.stats.shinyEnemiesDefeated = (this.main.player.stats.shinyEnemiesDefeated ?? 0) + 1;
 	    	this.main.player.stats.defeatedSpecies.add(this.enemy.id);
 """
 
-    changed = False
-
+SHINY_ENEMY_ANCHORS = declare_anchors('apply_enemy_shiny_spawn', 'src/js/game/component/Enemy.js',
+    Anchor('shiny roll', "this.isShiny = Math.random() < (1 / 1000);"),
+    Anchor('shiny defeat count', "shinyEnemiesDefeated = (this.main.player.stats.shinyEnemiesDefeated ?? 0) + 1;"),
     # Constructor patch (required for actual shiny spawn behavior)
-    if old_constructor in content:
-        content = content.replace(old_constructor, new_constructor, 1)
-        changed = True
-    elif old_constructor_no_semicolon in content:
-        content = content.replace(old_constructor_no_semicolon, new_constructor, 1)
-        changed = True
-    elif "this.isShiny = Math.random() < (1 / 1000);" not in content:
-        constructor_regex = (
-            r"\t\tthis\.enemy = enemy;\s*"
-            r"\t\tthis\.hp = enemy\.hp;\s*"
-            r"\t\tthis\.hpMax = enemy\.hp;\s*"
-            r"\t\tthis\.armor = enemy\.armor \|\| 0;\s*"
-            r"\t\tthis\.armorMax = enemy\.armor \|\| 0;\s*"
-            r"\t\tthis\.regeneration = enemy\.regeneration \|\| 0;\s*"
-            r"\t\tthis\.regenTimer = 0;\s*"
-            r"\t\tthis\.speed = enemy\.speed;\s*"
-            r"\t\tthis\.baseSpeed = this\.speed;\s*"
-            r"\t\tthis\.power = enemy\.power;\s*"
-            r"\t\tthis\.gold = enemy\.gold \+ this\.main\.player\.extraGold;?\s*"
-        )
-        content2, replacements = re.subn(constructor_regex, new_constructor, content, count=1)
-        if replacements > 0:
-            content = content2
-            changed = True
-
+    Anchor('constructor', {
+               '1.5.4': SHINY_ENEMY_CONSTRUCTOR,
+               '*': SHINY_ENEMY_CONSTRUCTOR_REGEX,  # unrecognised builds only
+           }, SHINY_ENEMY_CONSTRUCTOR_MODDED),
     # Defeat tracking patch (optional but expected)
-    if old_defeat in content:
-        content = content.replace(old_defeat, new_defeat, 1)
-        changed = True
+    Anchor('defeat stat', SHINY_ENEMY_DEFEAT, SHINY_ENEMY_DEFEAT_MODDED),
+)
+
+def apply_enemy_shiny_spawn():
+    """Patch Enemy.js to add the shiny enemy gameplay variant."""
+    path = JS_ROOT / "game" / "component" / "Enemy.js"
+    
+    if not game_file_exists(path):
+        log_skip("Enemy.js: Shiny enemy spawn (file not yet installed)")
+        return True
+    
+    content = read_file(path)
+    hits = SHINY_ENEMY_ANCHORS.scan(content)
+    
+    if hits['shiny roll'].found and hits['shiny defeat count'].found:
+        log_skip("Enemy.js: Shiny enemy spawn")
+        return True
+    
+    content = SHINY_ENEMY_ANCHORS.splice(content, hits)
+    changed = any(hits)
 
-    constructor_ok = "this.isShiny = Math.random() < (1 / 1000);" in content
-    defeat_ok = "shinyEnemiesDefeated = (this.main.player.stats.shinyEnemiesDefeated ?? 0) + 1;" in content
+    constructor_ok = hits['shiny roll'].found or bool(hits['constructor'])
+    defeat_ok = hits['shiny defeat count'].found or bool(hits['defeat stat'])
 
     if changed:
         write_file(path, content)
@@ -1107,7 +2211,7 @@ def apply_endless_mode():
         return True
     
     # This requires extensive changes - use the modded file directly
-    modded_file = MODS_DIR / "patches" / "FinalScene.modded.js"
+    modded_file = modded_patch("FinalScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("FinalScene.js: Endless mode (full file replacement)")
@@ -1130,7 +2234,7 @@ def apply_item_tooltips():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "Tooltip.modded.js"
+    modded_file = modded_patch("Tooltip.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("Tooltip.js: Item tooltips (full file replacement)")
@@ -1153,7 +2257,7 @@ def apply_ui_mods():
         return True
     
     # Use modded file directly (too many changes)
-    modded_file = MODS_DIR / "patches" / "UI.modded.js"
+    modded_file = modded_patch("UI.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("UI.js: All mods (full file replacement)")
@@ -1165,87 +2269,7 @@ def apply_ui_mods():
 # ============================================================================
 # GAME.JS - Pause Micromanagement (surgical patch on Game.js)
 # ============================================================================
-def apply_pause_micromanagement():
-    """
-    Surgically patch Game.js to enable pause micromanagement.
-    
-    Changes made:
-    1. Remove 'if (this.stopped) return;' from animate() so render loop continues
-    2. Add stopped ternary to totalScaledDelta so sim freezes but render continues
-    3. Remove deploy guard so Pokemon can be deployed/moved while paused
-    4. Modify switchPause() to not block canvas or show overlay (allow interaction)
-    5. Keep game loop running during pause (don't clear interval)
-    
-    Works on both vanilla Game.js and Game.modded.js (different whitespace patterns).
-    """
-    path = JS_ROOT / "game" / "Game.js"
-    
-    if not path.exists():
-        log_skip("Game.js: Pause micromanagement (file not yet installed)")
-        return True
-    
-    content = read_file(path)
-    
-    # Check if already applied — look for the specific "No early return" comment
-    if 'PAUSE MICROMANAGEMENT - No early return' in content:
-        log_skip("Game.js: Pause micromanagement")
-        return True
-    
-    changes = 0
-    
-    # 1. Remove early return from animate()
-    pattern = r'(animate\s*\(time\)\s*\{)\s*\n(\s*)if\s*\(\s*this\.stopped\s*\)\s*return\s*;'
-    match = re.search(pattern, content)
-    if match:
-        old_text = match.group(0)
-        indent = match.group(2)
-        new_text = f"{match.group(1)}\n{indent}// MOD: PAUSE MICROMANAGEMENT - No early return when stopped"
-        content = content.replace(old_text, new_text)
-        changes += 1
-    
-    # 2. Patch totalScaledDelta if it lacks the ternary
-    old_delta = 'const totalScaledDelta = this.frameDuration * this.speedFactor;'
-    new_delta = '// MOD: PAUSE MICROMANAGEMENT - freeze sim when stopped\n\t    const totalScaledDelta = this.stopped ? 0 : this.frameDuration * this.speedFactor;'
-    if old_delta in content:
-        content = content.replace(old_delta, new_delta)
-        changes += 1
-    
-    # 3. Remove deploy guard (allow deploying while paused)
-    # Matches both: "if (this.stopped) return playSound('pop0', 'ui');" patterns
-    deploy_pattern = r"\s*if\s*\(this\.stopped\)\s*return\s+playSound\('pop0',\s*'ui'\);"
-    if re.search(deploy_pattern, content):
-        content = re.sub(deploy_pattern, '\n  \t\t// MOD: PAUSE MICROMANAGEMENT - deploy allowed while paused', content)
-        changes += 1
-    
-    # 4. Inject _simSteps override and stopped redraw block (for Game.modded.js sub-stepping loop)
-    old_loop_start = '\t    for (let step = 0; step < numSteps; step++) {'
-    new_loop_start = """\t    // MOD: PAUSE MICROMANAGEMENT - Skip simulation entirely when stopped
-\t    // Only the draw/render code below runs, so tiles highlight and clicks work
-\t    const _simSteps = this.stopped ? 0 : numSteps;
-
-\t    // When paused, still redraw background + entities so canvas doesn't smear
-\t    if (this.stopped && this.ctx) {
-\t        if (this.canvasBackground.complete && this.canvasBackground.naturalWidth !== 0) {
-\t            this.ctx.drawImage(this.canvasBackground, 0, 0, canvasW, canvasH);
-\t        } else {
-\t            this.ctx.clearRect(0, 0, canvasW, canvasH);
-\t        }
-\t        // Redraw enemies and towers in place (no update, just draw)
-\t        for (let i = 0; i < enemies.length; i++) { enemies[i]._skipDraw = false; enemies[i].draw(); }
-\t        for (let t = 0; t < towers.length; t++) { towers[t]._skipDraw = false; towers[t].draw(); }
-\t    }
-
-\t    for (let step = 0; step < _simSteps; step++) {"""
-    if old_loop_start in content:
-        content = content.replace(old_loop_start, new_loop_start, 1)
-        # Also update isLastStep to use _simSteps
-        content = content.replace('step === numSteps - 1', 'step === _simSteps - 1')
-        changes += 1
-    
-    # 5. Modify switchPause() — remove canvas blocking, overlay, and interval clearing
-    # Replace the pause branch to keep loop running and allow interaction
-    # Match the full switchPause for Game.modded.js pattern
-    old_switch_modded = """	switchPause() {
+PAUSE_SWITCH_GAME_MODDED = """	switchPause() {
 	    playSound('option', 'ui');
 
 	    // Clean up any active drag clone
@@ -1258,11 +2282,8 @@ def apply_pause_micromanagement():
 
 	        if (this.main.UI.fastScene.isOpen) this.main.UI.fastScene.close();
 
-	        // Stop the game loop interval
-	        if (this.loopId) {
-	            clearInterval(this.loopId);
-	            this.loopId = null;
-	        }
+	        // Stop the game loop
+	        this.stopLoop();
 
 	        // Block canvas interaction
 	        this.canvas.style.pointerEvents = 'none';
@@ -1281,8 +2302,7 @@ def apply_pause_micromanagement():
 	        this.stopped = false;
 	        this.lastTime = performance.now();
 
-	        if (this.loopId) clearInterval(this.loopId);
-	        this.loopId = setInterval(() => this.animate(performance.now()), this.frameDuration);
+	        this.startLoop();
 
 	        this.hidePauseOverlay();
 
@@ -1290,8 +2310,8 @@ def apply_pause_micromanagement():
 	        this.main.UI.pauseWave.style.background = `url("./src/assets/images/textures/texture1.png"), #6B7280`;
 	    }
 	}"""
-    
-    new_switch = """	// MOD: PAUSE MICROMANAGEMENT — pause freezes sim but allows Pokemon interaction
+
+PAUSE_SWITCH_MODDED = """	// MOD: PAUSE MICROMANAGEMENT — pause freezes sim but allows Pokemon interaction
 	switchPause() {
 	    playSound('option', 'ui');
 	    if (!this.stopped) {
@@ -1303,17 +2323,66 @@ def apply_pause_micromanagement():
 	    	this.main.UI.pauseWave.style.background = `url("./src/assets/images/textures/texture1.png"), #6B7280`;
 	    }
 	}"""
+
+def _pause_switch(match):
+    """The vanilla switchPause match includes its indent; the modded one doesn't."""
+    return PAUSE_SWITCH_MODDED if match.group(0) == PAUSE_SWITCH_GAME_MODDED else PAUSE_SWITCH_MODDED.lstrip()
+
+PAUSE_MICRO_ANCHORS = declare_anchors('apply_pause_micromanagement', 'src/js/game/Game.js',
+    Anchor('applied marker', 'PAUSE MICROMANAGEMENT - No early return'),
+    # 1. Remove early return from animate()
+    Anchor('animate early return',
+           re.compile(r'(animate\s*\(time\)\s*\{)\s*\n(\s*)if\s*\(\s*this\.stopped\s*\)\s*return\s*;'),
+           lambda m: f"{m.group(1)}\n{m.group(2)}// MOD: PAUSE MICROMANAGEMENT - No early return when stopped",
+           count=0),
+    # 2. Patch scaledDelta if it lacks the ternary
+    Anchor('scaledDelta', 'const scaledDelta = Math.min(delta, MAX_FRAME_GAP_MS) * this.speedFactor;',
+           '// MOD: PAUSE MICROMANAGEMENT - freeze sim when stopped\n\t    const scaledDelta = this.stopped ? 0 : Math.min(delta, MAX_FRAME_GAP_MS) * this.speedFactor;', count=0),
+    # 4. Modify switchPause() — remove canvas blocking, overlay, and loop stopping.
+    #    The full Game.modded.js body, else the vanilla one (regex for flexibility).
+    #    Declared before the deploy guard so it wins if the two overlap.
+    Anchor('switchPause', (
+        PAUSE_SWITCH_GAME_MODDED,
+        re.compile(r'(\tswitchPause\(\) \{.*?// Habilitar interacci.*?\n\s*this\.main\.UI\.pauseWave\.style\.background.*?;\s*\n\s*\})', re.DOTALL),
+    ), _pause_switch, count=0),
+    # 3. Remove deploy guard (allow deploying while paused)
+    # Matches both: "if (this.stopped) return playSound('pop0', 'ui');" patterns
+    Anchor('deploy guard', re.compile(r"\s*if\s*\(this\.stopped\)\s*return\s+playSound\('pop0',\s*'ui'\);"),
+           '\n  \t\t// MOD: PAUSE MICROMANAGEMENT - deploy allowed while paused', count=0),
+    Anchor('animate stopped check', re.compile(r'animate\s*\(time\)\s*\{\s*\n\s*if\s*\(\s*this\.stopped\s*\)\s*return')),
+)
+
+def apply_pause_micromanagement():
+    """
+    Surgically patch Game.js to enable pause micromanagement.
     
-    if old_switch_modded in content:
-        content = content.replace(old_switch_modded, new_switch)
-        changes += 1
-    else:
-        # Try vanilla switchPause pattern (regex for flexibility)
-        vanilla_switch_pattern = r'(\tswitchPause\(\) \{.*?// Habilitar interacci.*?\n\s*this\.main\.UI\.pauseWave\.style\.background.*?;\s*\n\s*\})'
-        vanilla_match = re.search(vanilla_switch_pattern, content, re.DOTALL)
-        if vanilla_match:
-            content = content.replace(vanilla_match.group(0), new_switch.lstrip())
-            changes += 1
+    Changes made:
+    1. Remove 'if (this.stopped) return;' from animate() so render loop continues
+    2. Add stopped ternary to the loop's scaledDelta so sim freezes but render continues
+    3. Remove deploy guard so Pokemon can be deployed/moved while paused
+    4. Modify switchPause() to not block canvas or show overlay (allow interaction)
+    5. Keep game loop running during pause (don't stop the loop)
+    
+    Works on both vanilla Game.js and Game.modded.js (different whitespace patterns).
+    (Game.modded.js needs nothing more: with no simulation steps to run, its
+    fixed-timestep loop redraws the whole scene from the current state.)
+    """
+    path = JS_ROOT / "game" / "Game.js"
+    
+    if not game_file_exists(path):
+        log_skip("Game.js: Pause micromanagement (file not yet installed)")
+        return True
+    
+    content = read_file(path)
+    hits = PAUSE_MICRO_ANCHORS.scan(content)
+    
+    # Check if already applied — look for the specific "No early return" comment
+    if hits['applied marker'].found:
+        log_skip("Game.js: Pause micromanagement")
+        return True
+    
+    content = PAUSE_MICRO_ANCHORS.splice(content, hits)
+    changes = sum(1 for hit in hits if hit)
     
     if changes > 0:
         write_file(path, content)
@@ -1321,7 +2390,7 @@ def apply_pause_micromanagement():
         return True
     
     # Check if it's already good (no early return exists at all)
-    if not re.search(r'animate\s*\(time\)\s*\{\s*\n\s*if\s*\(\s*this\.stopped\s*\)\s*return', content):
+    if not hits['animate stopped check'].found:
         log_skip("Game.js: Pause micromanagement (already applied)")
         return True
     
@@ -1336,11 +2405,11 @@ def _ensure_game_modded():
     path = JS_ROOT / "game" / "Game.js"
     content = read_file(path)
     
-    # Check if already modded (has sub-stepping loop)
-    if 'SUB-STEPPING' in content:
+    # Check if already modded (has the fixed-timestep loop)
+    if 'FIXED-TIMESTEP' in content:
         return True
     
-    modded_file = MODS_DIR / "patches" / "Game.modded.js"
+    modded_file = modded_patch("Game.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("Game.js: Enhanced game loop (full file replacement)")
@@ -1352,27 +2421,7 @@ def _ensure_game_modded():
 # ============================================================================
 # GAME.JS - Speed options 2x/3x/5x/10x (surgical patch on Game.modded.js)
 # ============================================================================
-def apply_speed_mod():
-    """Surgically patch Game.js to add 1x/1.5x/2x/3x/5x/10x speed options."""
-    path = JS_ROOT / "game" / "Game.js"
-    
-    # Ensure Game.modded.js is installed first
-    _ensure_game_modded()
-    
-    content = read_file(path)
-    
-    # Check if already applied
-    if 'speedFactor === 10' in content:
-        log_skip("Game.js: Speed mod")
-        return True
-    
-    changes = 0
-    
-    # IMPORTANT: Replace toggleSpeed FIRST before changing speedFactor values,
-    # otherwise the pattern won't match after global replacement
-    
-    # 1. Replace vanilla toggleSpeed with enhanced version
-    old_toggle = """	toggleSpeed() {
+SPEED_TOGGLE_VANILLA = """	toggleSpeed() {
 	    playSound('option', 'ui');
 	    if (this.speedFactor === 0.8) {
 	      	this.speedFactor = 1.2;
@@ -1391,8 +2440,8 @@ def apply_speed_mod():
 	      	this.main.UI.speedWave.style.background = `url("./src/assets/images/textures/texture1.png"), #6B7280`;
 	    }
 	}"""
-    
-    new_toggle = """	// MOD: Enhanced speed toggle with 1x, 1.5x, 2x, 3x, 5x, 10x options
+
+SPEED_TOGGLE_MODDED = """	// MOD: Enhanced speed toggle with 1x, 1.5x, 2x, 3x, 5x, 10x options
 	toggleSpeed() {
 	    playSound('option', 'ui');
 	    if (this.speedFactor === 1) {
@@ -1421,20 +2470,36 @@ def apply_speed_mod():
 	      	this.main.UI.speedWave.style.background = `url("./src/assets/images/textures/texture1.png"), #6B7280`;
 	    }
 	}"""
+
+SPEED_MOD_ANCHORS = declare_anchors('apply_speed_mod', 'src/js/game/Game.js',
+    # 1. Replace vanilla toggleSpeed with enhanced version
+    Anchor('toggleSpeed', SPEED_TOGGLE_VANILLA, SPEED_TOGGLE_MODDED, count=0),
+    # 2. Fix restoreSpeed to use 1 instead of 0.8
+    Anchor('restoreSpeed',
+           "this.speedFactor = 0.8;\n    \tthis.main.UI.speedWave.style.background",
+           "this.speedFactor = 1;\n    \tthis.main.UI.speedWave.innerText = '1x';\n    \tthis.main.UI.speedWave.style.background",
+           count=0),
+    # 3. Every other initial speedFactor 0.8 -> 1. Declared last so the two
+    #    patches above keep their own copies of this line.
+    Anchor('initial speedFactor', 'this.speedFactor = 0.8;', 'this.speedFactor = 1;', count=0),
+)
+
+def apply_speed_mod():
+    """Surgically patch Game.js to add 1x/1.5x/2x/3x/5x/10x speed options."""
+    path = JS_ROOT / "game" / "Game.js"
+    
+    # Ensure Game.modded.js is installed first
+    _ensure_game_modded()
     
-    if old_toggle in content:
-        content = content.replace(old_toggle, new_toggle)
-        changes += 1
+    content = read_file(path)
     
-    # 2. Fix restoreSpeed to use 1 instead of 0.8
-    old_restore = "this.speedFactor = 0.8;\n    \tthis.main.UI.speedWave.style.background"
-    new_restore = "this.speedFactor = 1;\n    \tthis.main.UI.speedWave.innerText = '1x';\n    \tthis.main.UI.speedWave.style.background"
-    if old_restore in content:
-        content = content.replace(old_restore, new_restore)
-        changes += 1
+    # Check if already applied
+    if 'speedFactor === 10' in content:
+        log_skip("Game.js: Speed mod")
+        return True
     
-    # 3. Change initial speedFactor from 0.8 to 1 (do this LAST to avoid breaking other patterns)
-    content = content.replace('this.speedFactor = 0.8;', 'this.speedFactor = 1;')
+    content, hits = SPEED_MOD_ANCHORS.apply(content)
+    changes = sum(1 for hit in hits[:2] if hit)  # toggleSpeed + restoreSpeed
     
     if changes > 0:
         write_file(path, content)
@@ -1458,7 +2523,7 @@ def apply_pokemon_mods():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "Pokemon.modded.js"
+    modded_file = modded_patch("Pokemon.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("Pokemon.js: All mods (full file replacement)")
@@ -1481,7 +2546,7 @@ def apply_pokemonscene_mods():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "PokemonScene.modded.js"
+    modded_file = modded_patch("PokemonScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("PokemonScene.js: Level cap removal (full file replacement)")
@@ -1491,6 +2556,25 @@ def apply_pokemonscene_mods():
     return False
 
 
+RECHARGE_PRECISION_ANCHORS = declare_anchors('apply_recharge_precision', 'src/js/game/scenes/PokemonScene.js',
+    Anchor('speedDecimals', 'speedDecimals'),
+    # 1. Base stat display: this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s`;
+    Anchor('base speed', "this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s`;",
+           "const _spd = this.pokemon.speed / 1000; const speedDecimals = _spd < 0.1 ? 3 : 2;\n"
+            "\t\tthis.data['speed'].value.innerHTML = `${_spd.toFixed(speedDecimals)}s`;"),
+    # 2. Level-up hover preview: speedDiff and display lines
+    Anchor('speedDiff', "const speedDiff = Math.abs((newSpeed / 1000).toFixed(2) - (this.pokemon.speed / 1000).toFixed(2)).toFixed(2);",
+           "const _curSpd = this.pokemon.speed / 1000; const _newSpd = newSpeed / 1000;\n"
+            "\t\tconst _spdDec = _curSpd < 0.1 ? 3 : 2;\n"
+            "\t\tconst speedDiff = Math.abs(_newSpd.toFixed(_spdDec) - _curSpd.toFixed(_spdDec)).toFixed(_spdDec);"),
+    Anchor('speed preview', "this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s <span style=\"color:var(--green)\">(-${(speedDiff)}s)</span>`;",
+           "this.data['speed'].value.innerHTML = `${_curSpd.toFixed(_spdDec)}s <span style=\"color:var(--green)\">(-${(speedDiff)}s)</span>`;"),
+    # 3. Item/ability gains: const speedSec = (Math.abs(speedGains) / 1000).toFixed(2);
+    Anchor('speedSec', "const speedSec = (Math.abs(speedGains) / 1000).toFixed(2);",
+           "const _spdDec3 = (this.pokemon.speed / 1000) < 0.1 ? 3 : 2;\n"
+            "\t        const speedSec = (Math.abs(speedGains) / 1000).toFixed(_spdDec3);"),
+)
+
 def apply_recharge_precision():
     """Show 3 decimal places for recharge time when it drops below 0.1s.
     
@@ -1501,43 +2585,14 @@ def apply_recharge_precision():
     """
     path = JS_ROOT / "game" / "scenes" / "PokemonScene.js"
     content = read_file(path)
+    hits = RECHARGE_PRECISION_ANCHORS.scan(content)
     
-    if 'speedDecimals' in content:
+    if hits['speedDecimals'].found:
         log_skip("PokemonScene.js: Recharge precision (already applied)")
         return True
     
-    patched = 0
-    
-    # 1. Base stat display: this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s`;
-    old1 = "this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s`;"
-    new1 = ("const _spd = this.pokemon.speed / 1000; const speedDecimals = _spd < 0.1 ? 3 : 2;\n"
-            "\t\tthis.data['speed'].value.innerHTML = `${_spd.toFixed(speedDecimals)}s`;")
-    if old1 in content:
-        content = content.replace(old1, new1, 1)
-        patched += 1
-    
-    # 2. Level-up hover preview: speedDiff and display lines
-    old2 = "const speedDiff = Math.abs((newSpeed / 1000).toFixed(2) - (this.pokemon.speed / 1000).toFixed(2)).toFixed(2);"
-    new2 = ("const _curSpd = this.pokemon.speed / 1000; const _newSpd = newSpeed / 1000;\n"
-            "\t\tconst _spdDec = _curSpd < 0.1 ? 3 : 2;\n"
-            "\t\tconst speedDiff = Math.abs(_newSpd.toFixed(_spdDec) - _curSpd.toFixed(_spdDec)).toFixed(_spdDec);")
-    if old2 in content:
-        content = content.replace(old2, new2, 1)
-        patched += 1
-    
-    old2b = "this.data['speed'].value.innerHTML = `${(this.pokemon.speed / 1000).toFixed(2)}s <span style=\"color:var(--green)\">(-${(speedDiff)}s)</span>`;"
-    new2b = "this.data['speed'].value.innerHTML = `${_curSpd.toFixed(_spdDec)}s <span style=\"color:var(--green)\">(-${(speedDiff)}s)</span>`;"
-    if old2b in content:
-        content = content.replace(old2b, new2b, 1)
-        patched += 1
-    
-    # 3. Item/ability gains: const speedSec = (Math.abs(speedGains) / 1000).toFixed(2);
-    old3 = "const speedSec = (Math.abs(speedGains) / 1000).toFixed(2);"
-    new3 = ("const _spdDec3 = (this.pokemon.speed / 1000) < 0.1 ? 3 : 2;\n"
-            "\t        const speedSec = (Math.abs(speedGains) / 1000).toFixed(_spdDec3);")
-    if old3 in content:
-        content = content.replace(old3, new3, 1)
-        patched += 1
+    content = RECHARGE_PRECISION_ANCHORS.splice(content, hits)
+    patched = sum(1 for hit in hits if hit)
     
     if patched > 0:
         write_file(path, content)
@@ -1548,6 +2603,48 @@ def apply_recharge_precision():
     return False
 
 
+STAR_UNCAP_PLACEMENT_ANCHORS = declare_anchors('apply_star_scaling_uncap', 'src/js/game/component/PlacementTile.js',
+    # Star Candy preview range cap
+    Anchor('range preview cap', "drawRangeValue += Math.min(120, this.main.player.stars * 0.1);",
+           "drawRangeValue += (this.main.player.stars * 0.1);", count=0),
+)
+
+STAR_UNCAP_PROJECTILE_ANCHORS = declare_anchors('apply_star_scaling_uncap', 'src/js/game/component/Projectile.js',
+    # Clefairy star ability damage and Amulet Coin gold bonus caps (if present in this version)
+    Anchor('tower stars cap', "Math.min(1200, this.tower.main.player.stars)", "this.tower.main.player.stars", count=0),
+    Anchor('stars cap', "Math.min(1200, this.main.player.stars)", "this.main.player.stars", count=0),
+    Anchor('other stars cap', re.compile(r"Math\.min\(\s*1200\s*,\s*([^\)]*player\.stars[^\)]*)\)"), r"\1", count=0),
+)
+
+STAR_UNCAP_TOWER_ANCHORS = declare_anchors('apply_star_scaling_uncap', 'src/js/game/component/Tower.js',
+    # Star Candy range cap (if present in this version)
+    Anchor('range cap', "this.range += Math.min(120, this.main.player.stars * 0.1);",
+           "this.range += (this.main.player.stars * 0.1);", count=0),
+    Anchor('range cap (assignment)', "this.range = this.range + Math.min(120, this.main.player.stars * 0.1);",
+           "this.range += (this.main.player.stars * 0.1);", count=0),
+)
+
+# Stale "max 1200" description text, in every language
+STAR_UNCAP_DESCRIPTION_TOKENS = [
+    "(max 1200)",
+    "(máx. 1200)",
+    "(max. 1200)",
+    "(최대 1200)",
+    "（最大1200）",
+    "（最大 1200）",
+    "(maks. 1200)",
+]
+
+STAR_UNCAP_DATA_ANCHORS = [
+    declare_anchors('apply_star_scaling_uncap', f'src/js/game/data/{name}',
+        # Removing a token also drops the space it leaves before a full stop
+        # (e.g. "obtained (max 1200)." -> "obtained.")
+        Anchor('description cap',
+               re.compile(r'(\s*)(?:%s)(\s*\.)?' % '|'.join(map(re.escape, STAR_UNCAP_DESCRIPTION_TOKENS))),
+               lambda m: '.' if m.group(2) else m.group(1), count=0))
+    for name in ('abilityData.js', 'itemData.js')
+]
+
 def apply_star_scaling_uncap():
     """Remove 1200-star cap behavior for star-scaled Clefairy/Star Candy/Amulet Coin effects.
 
@@ -1564,102 +2661,14 @@ def apply_star_scaling_uncap():
     """
     changed_any = False
 
-    # PlacementTile.js - Star Candy preview range cap
-    placement_path = JS_ROOT / "game" / "component" / "PlacementTile.js"
-    if placement_path.exists():
-        placement = read_file(placement_path)
-        if "drawRangeValue += Math.min(120, this.main.player.stars * 0.1);" in placement:
-            placement = placement.replace(
-                "drawRangeValue += Math.min(120, this.main.player.stars * 0.1);",
-                "drawRangeValue += (this.main.player.stars * 0.1);"
-            )
-            write_file(placement_path, placement)
-            changed_any = True
-
-    # Projectile.js - Clefairy star ability damage cap (if present in this version)
-    projectile_path = JS_ROOT / "game" / "component" / "Projectile.js"
-    if projectile_path.exists():
-        projectile = read_file(projectile_path)
-        replacements = [
-            (
-                "finalDamage += Math.min(1200, this.tower.main.player.stars);",
-                "finalDamage += this.tower.main.player.stars;"
-            ),
-            (
-                "finalDamage += Math.min(1200, this.main.player.stars);",
-                "finalDamage += this.main.player.stars;"
-            ),
-        ]
-        local_change = False
-        for old, new in replacements:
-            if old in projectile:
-                projectile = projectile.replace(old, new)
-                local_change = True
-        if local_change:
-            write_file(projectile_path, projectile)
-            changed_any = True
-
-    # Projectile.js - Amulet Coin gold bonus cap (if present in this version)
-    if projectile_path.exists():
-        projectile = read_file(projectile_path)
-        amulet_before = projectile
-        projectile = projectile.replace(
-            "Math.min(1200, this.tower.main.player.stars)",
-            "this.tower.main.player.stars"
-        )
-        projectile = projectile.replace(
-            "Math.min(1200, this.main.player.stars)",
-            "this.main.player.stars"
-        )
-        projectile = re.sub(
-            r"Math\.min\(\s*1200\s*,\s*([^\)]*player\.stars[^\)]*)\)",
-            r"\1",
-            projectile,
-        )
-        if projectile != amulet_before:
-            write_file(projectile_path, projectile)
-            changed_any = True
-
-    # Tower.js - Star Candy range cap (if present in this version)
-    tower_path = JS_ROOT / "game" / "component" / "Tower.js"
-    if tower_path.exists():
-        tower = read_file(tower_path)
-        local_change = False
-        for old in [
-            "this.range += Math.min(120, this.main.player.stars * 0.1);",
-            "this.range = this.range + Math.min(120, this.main.player.stars * 0.1);",
-        ]:
-            if old in tower:
-                tower = tower.replace(old, "this.range += (this.main.player.stars * 0.1);")
-                local_change = True
-        if local_change:
-            write_file(tower_path, tower)
-            changed_any = True
-
-    # abilityData.js / itemData.js - remove stale description caps
-    for rel in [
-        ("game", "data", "abilityData.js"),
-        ("game", "data", "itemData.js"),
-    ]:
-        data_path = JS_ROOT.joinpath(*rel)
-        if not data_path.exists():
+    for anchor_set in (STAR_UNCAP_PLACEMENT_ANCHORS, STAR_UNCAP_PROJECTILE_ANCHORS,
+                       STAR_UNCAP_TOWER_ANCHORS, *STAR_UNCAP_DATA_ANCHORS):
+        path = APP_EXTRACTED / anchor_set.rel_path
+        if not game_file_exists(path):
             continue
-        data = read_file(data_path)
-        updated = data
-        for token in [
-            "(max 1200)",
-            "(máx. 1200)",
-            "(max. 1200)",
-            "(최대 1200)",
-            "（最大1200）",
-            "（最大 1200）",
-            "(maks. 1200)",
-        ]:
-            updated = updated.replace(token, "")
-        # punctuation cleanup after token removal (e.g. "obtained ." -> "obtained.")
-        updated = re.sub(r'\s+\.', '.', updated)
-        if updated != data:
-            write_file(data_path, updated)
+        content, hits = anchor_set.apply(read_file(path))
+        if any(hits):
+            write_file(path, content)
             changed_any = True
 
     if changed_any:
@@ -1684,7 +2693,7 @@ def apply_endless_waves():
         return True
     
     # Use modded file directly (256 lines added!)
-    modded_file = MODS_DIR / "patches" / "Area.modded.js"
+    modded_file = modded_patch("Area.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("Area.js: Endless waves (full file replacement)")
@@ -1694,32 +2703,7 @@ def apply_endless_waves():
     return False
 
 
-def apply_endless_stat_safety():
-    """Clamp vanilla stat formulas for levels past 100 when Infinite Levels isn't installed.
-    
-    Without Infinite Levels, vanilla Pokemon.js uses linear formulas that break at high levels:
-    - Speed goes negative (e.g. -0.40s recharge at level 1000)
-    - Costs use Math.pow(1.12, level) which explodes past 100
-    
-    This patches updateStats() and setStatsLevel() to clamp the effective level at 100
-    for stat calculation, and clamps cost calculation level at 100.
-    The Pokemon's actual level is preserved, only the formulas are capped.
-    """
-    path = JS_ROOT / "game" / "component" / "Pokemon.js"
-    content = read_file(path)
-    
-    # Don't patch if Pokemon.modded.js is installed (has asymptotic scaling)
-    if 'calculateAsymptoticSpeed' in content:
-        log_skip("Pokemon.js: Endless stat safety (infinite levels installed)")
-        return True
-    
-    if '// MOD: Clamp stat level at 100' in content:
-        log_skip("Pokemon.js: Endless stat safety")
-        return True
-
-    changed = False
-
-    old_update_stats = """	updateStats() {
+STAT_SAFETY_UPDATE_STATS = """	updateStats() {
 		let level = this.lvl;
 		if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = this.main.area.inChallenge.lvlCap;
 
@@ -1729,7 +2713,7 @@ def apply_endless_stat_safety():
 		this.critical = this.specie.critical.base + (this.specie.critical.scale * level);
 	}"""
 
-    new_update_stats = """	updateStats() {
+STAT_SAFETY_UPDATE_STATS_MODDED = """	updateStats() {
 		let level = this.lvl;
 		if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = this.main.area.inChallenge.lvlCap;
 
@@ -1741,18 +2725,14 @@ def apply_endless_stat_safety():
 		this.critical = this.specie.critical.base + (this.specie.critical.scale * statLevel);
 	}"""
 
-    if old_update_stats in content:
-        content = content.replace(old_update_stats, new_update_stats)
-        changed = True
-
-    old_set_stats = """	setStatsLevel(level = 50) { // BORRAR y cambiar por lo de arriba 
+STAT_SAFETY_SET_STATS = """	setStatsLevel(level = 50) { // BORRAR y cambiar por lo de arriba 
 		this.speed = Math.floor(this.specie.speed.base + (this.specie.speed.scale * level));
 		this.power = Math.floor(this.specie.power.base + (this.specie.power.scale * level));
 		this.range = Math.floor(this.specie.range.base + (this.specie.range.scale * level));
 		this.critical = this.specie.critical.base + (this.specie.critical.scale * level);
 	}"""
 
-    new_set_stats = """	setStatsLevel(level = 50) { // BORRAR y cambiar por lo de arriba 
+STAT_SAFETY_SET_STATS_MODDED = """	setStatsLevel(level = 50) { // BORRAR y cambiar por lo de arriba 
 		// MOD: Clamp stat level at 100 for vanilla formulas (endless safety)
 		const statLevel = Math.min(level, 100);
 		this.speed = Math.max(200, Math.floor(this.specie.speed.base + (this.specie.speed.scale * statLevel)));
@@ -1761,24 +2741,16 @@ def apply_endless_stat_safety():
 		this.critical = this.specie.critical.base + (this.specie.critical.scale * statLevel);
 	}"""
 
-    if old_set_stats in content:
-        content = content.replace(old_set_stats, new_set_stats)
-        changed = True
-
-    cost_replacements = [
-        ("Math.ceil(27 * Math.pow(1.12, this.lvl))", "Math.ceil(27 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
-        ("Math.ceil(35 * Math.pow(1.12, this.lvl))", "Math.ceil(35 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
-        ("Math.ceil(51 * Math.pow(1.12, this.lvl))", "Math.ceil(51 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
-        ("Math.ceil(27 * Math.pow(1.12, this.lvl+i))", "Math.ceil(27 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
-        ("Math.ceil(35 * Math.pow(1.12, this.lvl+i))", "Math.ceil(35 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
-        ("Math.ceil(51 * Math.pow(1.12, this.lvl+i))", "Math.ceil(51 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
-    ]
-    for old_cost, new_cost in cost_replacements:
-        if old_cost in content:
-            content = content.replace(old_cost, new_cost)
-            changed = True
-    
-    old_adn = """this.speed = Math.floor(this.adn.speed.base + (this.adn.speed.scale * level));
+STAT_SAFETY_COST_FORMULAS = [
+    ("Math.ceil(27 * Math.pow(1.12, this.lvl))", "Math.ceil(27 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
+    ("Math.ceil(35 * Math.pow(1.12, this.lvl))", "Math.ceil(35 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
+    ("Math.ceil(51 * Math.pow(1.12, this.lvl))", "Math.ceil(51 * Math.pow(1.12, Math.min(this.lvl, 100)))"),
+    ("Math.ceil(27 * Math.pow(1.12, this.lvl+i))", "Math.ceil(27 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
+    ("Math.ceil(35 * Math.pow(1.12, this.lvl+i))", "Math.ceil(35 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
+    ("Math.ceil(51 * Math.pow(1.12, this.lvl+i))", "Math.ceil(51 * Math.pow(1.12, Math.min(this.lvl+i, 100)))"),
+]
+
+STAT_SAFETY_ADN = """this.speed = Math.floor(this.adn.speed.base + (this.adn.speed.scale * level));
 		this.power = Math.floor(this.adn.power.base + (this.adn.power.scale * level));
 		this.range = Math.floor(this.adn.range.base + (this.adn.range.scale * level));
 
@@ -1787,8 +2759,8 @@ def apply_endless_stat_safety():
 		
 		this.innerRange = this.adn.range.inner;
 		this.critical = this.adn.critical.base + (this.adn.critical.scale * level);"""
-    
-    new_adn = """// MOD: Clamp stat level at 100 for vanilla formulas (endless safety)
+
+STAT_SAFETY_ADN_MODDED = """// MOD: Clamp stat level at 100 for vanilla formulas (endless safety)
 		const adnStatLevel = Math.min(level, 100);
 		this.speed = Math.max(200, Math.floor(this.adn.speed.base + (this.adn.speed.scale * adnStatLevel)));
 		this.power = Math.floor(this.adn.power.base + (this.adn.power.scale * adnStatLevel));
@@ -1799,20 +2771,61 @@ def apply_endless_stat_safety():
 		
 		this.innerRange = this.adn.range.inner;
 		this.critical = this.adn.critical.base + (this.adn.critical.scale * adnStatLevel);"""
-    
-    if old_adn in content:
-        content = content.replace(old_adn, new_adn)
-        changed = True
 
-    if not changed:
-        log_fail("Pokemon.js: Endless stat safety", "1.5 stat/cost patterns not found")
-        return False
-    
+STAT_SAFETY_ANCHORS = declare_anchors('apply_endless_stat_safety', 'src/js/game/component/Pokemon.js',
+    Anchor('updateStats', STAT_SAFETY_UPDATE_STATS, STAT_SAFETY_UPDATE_STATS_MODDED, count=0),
+    Anchor('setStatsLevel', STAT_SAFETY_SET_STATS, STAT_SAFETY_SET_STATS_MODDED, count=0),
+    *(Anchor(f'cost formula {n}', old_cost, new_cost, count=0)
+      for n, (old_cost, new_cost) in enumerate(STAT_SAFETY_COST_FORMULAS, 1)),
+    Anchor('adn stats', STAT_SAFETY_ADN, STAT_SAFETY_ADN_MODDED, count=0),
+)
+
+def apply_endless_stat_safety():
+    """Clamp vanilla stat formulas for levels past 100 when Infinite Levels isn't installed.
+    
+    Without Infinite Levels, vanilla Pokemon.js uses linear formulas that break at high levels:
+    - Speed goes negative (e.g. -0.40s recharge at level 1000)
+    - Costs use Math.pow(1.12, level) which explodes past 100
+    
+    This patches updateStats() and setStatsLevel() to clamp the effective level at 100
+    for stat calculation, and clamps cost calculation level at 100.
+    The Pokemon's actual level is preserved, only the formulas are capped.
+    """
+    path = JS_ROOT / "game" / "component" / "Pokemon.js"
+    content = read_file(path)
+    
+    # Don't patch if Pokemon.modded.js is installed (has asymptotic scaling)
+    if 'calculateAsymptoticSpeed' in content:
+        log_skip("Pokemon.js: Endless stat safety (infinite levels installed)")
+        return True
+    
+    if '// MOD: Clamp stat level at 100' in content:
+        log_skip("Pokemon.js: Endless stat safety")
+        return True
+
+    content, hits = STAT_SAFETY_ANCHORS.apply(content)
+
+    if not any(hits):
+        log_fail("Pokemon.js: Endless stat safety", "1.5 stat/cost patterns not found")
+        return False
+    
     write_file(path, content)
     log_success("Pokemon.js: Endless stat safety (stats capped at level 100, min speed 200ms)")
     return True
 
 
+LEVELBUTTON_SAFETY_ANCHORS = declare_anchors('apply_endless_levelbutton_safety', 'src/js/game/scenes/PokemonScene.js',
+    Anchor('calculateAsymptoticSpeed', 'calculateAsymptoticSpeed'),
+    Anchor('isShiny', 'isShiny'),
+    Anchor('inLvlCapChallenge', 'inLvlCapChallenge'),
+    # x1 button: === 100 -> >= 100
+    # x5 button: > 95 -> >= 96 (same meaning) — actually this already catches 96+
+    # But level 1000 > 95 is true, so x5 already shows MAX. Same for x10 (> 90).
+    # Only x1 (=== 100) is broken for levels past 100.
+    Anchor('x1 button', "if (this.pokemon.lvl === 100) {", "if (this.pokemon.lvl >= 100) {", count=0),
+    Anchor('level 100 check', '>= 100) {'),
+)
+
 def apply_endless_levelbutton_safety():
     """Fix level-up buttons for levels past 100 when Infinite Levels isn't installed.
     
@@ -1820,38 +2833,25 @@ def apply_endless_levelbutton_safety():
     With Endless saves past 100, these don't match and buttons appear clickable.
     Patch to >= 100 so all three buttons show MAX for any level >= 100.
     Skipped when PokemonScene.modded.js is installed (has its own level handling).
+    With our vanilla bugfix patch ('// MOD: Level-up allowed during challenge')
+    the lvlCap block is already removed; the level 100 checks still need fixing.
     """
     path = JS_ROOT / "game" / "scenes" / "PokemonScene.js"
     content = read_file(path)
+    hits = LEVELBUTTON_SAFETY_ANCHORS.scan(content)
     
     # Don't patch if modded file is installed
-    if 'calculateAsymptoticSpeed' in content or 'isShiny' in content and 'inLvlCapChallenge' in content:
+    if hits['calculateAsymptoticSpeed'].found or hits['isShiny'].found and hits['inLvlCapChallenge'].found:
         log_skip("PokemonScene.js: Endless level button safety (modded file installed)")
         return True
     
-    if '// MOD: Level-up allowed during challenge' in content:
-        # Our vanilla bugfix patch is present — the lvlCap block is already removed
-        # Now fix the level 100 checks to >= 100
-        pass
-    
-    patched = False
-    
-    # x1 button: === 100 -> >= 100
-    old_x1 = "if (this.pokemon.lvl === 100) {"
-    new_x1 = "if (this.pokemon.lvl >= 100) {"
-    if old_x1 in content:
-        content = content.replace(old_x1, new_x1)
-        patched = True
-    
-    # x5 button: > 95 -> >= 96 (same meaning) — actually this already catches 96+
-    # But level 1000 > 95 is true, so x5 already shows MAX. Same for x10 (> 90).
-    # Only x1 (=== 100) is broken for levels past 100.
+    content = LEVELBUTTON_SAFETY_ANCHORS.splice(content, hits)
     
-    if patched:
+    if hits['x1 button']:
         write_file(path, content)
         log_success("PokemonScene.js: Endless level button safety (MAX at >= 100)")
         return True
-    elif '>= 100) {' in content:
+    elif hits['level 100 check'].found:
         log_skip("PokemonScene.js: Endless level button safety")
         return True
     else:
@@ -1859,6 +2859,12 @@ def apply_endless_levelbutton_safety():
         return False
 
 
+WAVE_MANAGER_ANCHORS = declare_anchors('apply_wave_manager_fix', 'src/js/game/UI.js',
+    Anchor('records >= 100', '>= 100 && this.main.player.hasBike)'),
+    Anchor('records === 100', ".records[this.main.area.map.id] === 100 && this.main.player.hasBike)",
+           ".records[this.main.area.map.id] >= 100 && this.main.player.hasBike)", count=0),
+)
+
 def apply_wave_manager_fix():
     """Fix wave manager visibility for endless mode records > 100.
     
@@ -1868,15 +2874,13 @@ def apply_wave_manager_fix():
     """
     path = JS_ROOT / "game" / "UI.js"
     content = read_file(path)
+    hits = WAVE_MANAGER_ANCHORS.scan(content)
     
-    old_check = ".records[this.main.area.map.id] === 100 && this.main.player.hasBike)"
-    new_check = ".records[this.main.area.map.id] >= 100 && this.main.player.hasBike)"
-    
-    if '>= 100 && this.main.player.hasBike)' in content:
+    if hits['records >= 100'].found:
         log_skip("UI.js: Wave manager >= 100 fix")
         return True
-    elif old_check in content:
-        content = content.replace(old_check, new_check)
+    elif hits['records === 100'].found:
+        content = WAVE_MANAGER_ANCHORS.splice(content, hits)
         write_file(path, content)
         log_success("UI.js: Wave manager >= 100 fix (records past 100)")
         return True
@@ -1900,7 +2904,7 @@ def apply_endless_checkpoints():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "DefeatScene.modded.js"
+    modded_file = modded_patch("DefeatScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("DefeatScene.js: Endless checkpoints (full file replacement)")
@@ -1923,7 +2927,7 @@ def apply_enemy_scaling():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "Enemy.modded.js"
+    modded_file = modded_patch("Enemy.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("Enemy.js: Endless scaling (full file replacement)")
@@ -1945,11 +2949,11 @@ def apply_tower_deltatime():
     content = read_file(path)
 
     # Check if already applied
-    if '_skipDraw' in content or 'DELTA TIME FIX' in content:
+    if 'DELTA TIME FIX' in content:
         log_skip("Tower.js: Delta time fix")
         return True
 
-    modded_file = MODS_DIR / "patches" / "Tower.modded.js"
+    modded_file = modded_patch("Tower.modded.js")
     if not modded_file.exists():
         log_fail("Tower.js: Delta time fix - modded file not found")
         return False
@@ -1974,7 +2978,7 @@ def apply_projectile_scaling():
     content = read_file(path)
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "Projectile.modded.js"
+    modded_file = modded_patch("Projectile.modded.js")
     if modded_file.exists():
         # Check if different
         if read_file(path) != read_file(modded_file):
@@ -1990,20 +2994,12 @@ def apply_projectile_scaling():
 # ============================================================================
 # PROJECTILE.JS - Projectile speed scales with attack rate (surgical)
 # ============================================================================
-def apply_projectile_speed_scaling():
-    """Scale projectile speed with tower attack speed so fast enemies can't outrun bullets."""
-    path = JS_ROOT / "game" / "component" / "Projectile.js"
-    content = read_file(path)
-
-    if "projectile speed with attack rate" in content:
-        log_skip("Projectile.js: Projectile speed scaling")
-        return True
-
-    old = """        const rawSpeed = projectile.speed ?? 5;
+PROJECTILE_SPEED_ANCHORS = declare_anchors('apply_projectile_speed_scaling', 'src/js/game/component/Projectile.js',
+    Anchor('applied marker', "projectile speed with attack rate"),
+    Anchor('speed', """        const rawSpeed = projectile.speed ?? 5;
         this.speed = rawSpeed <= 30 ? rawSpeed * 60 : rawSpeed; 
-"""
-
-    new = """        const rawSpeed = projectile.speed ?? 5;
+""",
+           """        const rawSpeed = projectile.speed ?? 5;
         let baseSpeed = rawSpeed <= 30 ? rawSpeed * 60 : rawSpeed;
 
         // MOD: Scale projectile speed with attack rate — faster attacks = faster projectiles
@@ -2013,13 +3009,24 @@ def apply_projectile_speed_scaling():
             baseSpeed *= (1 + 1 * t); // 1x → 2x
         }
         this.speed = baseSpeed;
-"""
+""", count=0),
+)
+
+def apply_projectile_speed_scaling():
+    """Scale projectile speed with tower attack speed so fast enemies can't outrun bullets."""
+    path = JS_ROOT / "game" / "component" / "Projectile.js"
+    content = read_file(path)
+    hits = PROJECTILE_SPEED_ANCHORS.scan(content)
+
+    if hits['applied marker'].found:
+        log_skip("Projectile.js: Projectile speed scaling")
+        return True
 
-    if old not in content:
+    if not hits['speed'].found:
         log_fail("Projectile.js: Projectile speed scaling", "pattern not found")
         return False
 
-    content = content.replace(old, new)
+    content = PROJECTILE_SPEED_ANCHORS.splice(content, hits)
     write_file(path, content)
     log_success("Projectile.js: Projectile speed scaling (attack rate)")
     return True
@@ -2027,31 +3034,37 @@ def apply_projectile_speed_scaling():
 # ============================================================================
 # BOXSCENE.JS - Expand box storage to 200 slots
 # ============================================================================
+BOX_EXPANSION_ANCHORS = declare_anchors('apply_box_expansion', 'src/js/game/scenes/BoxScene.js',
+    Anchor('200 slots', "< 200"),
+    # Fallback when BoxScene.modded.js is missing: direct replacement
+    Anchor('103 slots', "< 103", "< 200", count=0),
+)
+
 def apply_box_expansion():
     """Expand Pokemon box storage from 103 to 200 slots."""
     path = JS_ROOT / "game" / "scenes" / "BoxScene.js"
     
-    if not path.exists():
+    if not game_file_exists(path):
         log_fail("BoxScene.js: File not found")
         return False
     
     content = read_file(path)
+    hits = BOX_EXPANSION_ANCHORS.scan(content)
     
     # Check if already expanded
-    if "< 200" in content:
+    if hits['200 slots'].found:
         log_skip("BoxScene.js: Box expansion (already 200 slots)")
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "BoxScene.modded.js"
+    modded_file = modded_patch("BoxScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("BoxScene.js: Box expanded to 200 slots")
         return True
     
-    # Fallback: direct replacement
-    if "< 103" in content:
-        content = content.replace("< 103", "< 200")
+    if hits['103 slots'].found:
+        content = BOX_EXPANSION_ANCHORS.splice(content, hits)
         write_file(path, content)
         log_success("BoxScene.js: Box expanded to 200 slots (inline)")
         return True
@@ -2066,7 +3079,7 @@ def apply_profile_endless_stats():
     """Update profile stats for endless mode (no caps, unique species count)."""
     path = JS_ROOT / "game" / "scenes" / "ProfileScene.js"
     
-    if not path.exists():
+    if not game_file_exists(path):
         log_fail("ProfileScene.js: File not found")
         return False
     
@@ -2078,7 +3091,7 @@ def apply_profile_endless_stats():
         return True
     
     # Use modded file directly
-    modded_file = MODS_DIR / "patches" / "ProfileScene.modded.js"
+    modded_file = modded_patch("ProfileScene.modded.js")
     if modded_file.exists():
         copy_modded_file(modded_file, path)
         log_success("ProfileScene.js: Endless stats (full file replacement)")
@@ -2090,26 +3103,8 @@ def apply_profile_endless_stats():
 # ============================================================================
 # POKEMONDATA.JS - Expand egg shop with missing Pokemon
 # ============================================================================
-def apply_expanded_egg_list():
-    """Add missing Pokemon to the egg shop that exist in game but weren't in shop."""
-    path = JS_ROOT / "game" / "data" / "pokemonData.js"
-    
-    if not path.exists():
-        log_fail("pokemonData.js: File not found")
-        return False
-    
-    content = read_file(path)
-    
-    # Check if already expanded (look for one of the new Pokemon)
-    if "'bidoof'" in content and "'turtwig'" in content and "'vulpix'" in content:
-        # Check if they're in the eggListData specifically
-        egg_section = content[content.find("export const eggListData"):content.find("export const eggListDataUpdate")]
-        if "'bidoof'" in egg_section and "'turtwig'" in egg_section:
-            log_skip("pokemonData.js: Egg list already expanded")
-            return True
-    
-    # Old egg list (matches vanilla 1.4.4)
-    old_egg_list = """export const eggListData = [
+# Old egg list (matches vanilla 1.4.4)
+EGG_LIST_VANILLA = """export const eggListData = [
 	'charmander', 'treecko', 'froaki', 
 
 	'natu', 'spoink', 'murkrow',
@@ -2130,9 +3125,9 @@ def apply_expanded_egg_list():
 	'rockruff', 'pawniard', 'sandile', 'wimpod', 'honedge', 
 	'sobble', 'rowlet', 'comfey', 'smeargle', 'carvanha', 
 ]"""
-    
-    # New expanded egg list with 17 additional Pokemon
-    new_egg_list = """export const eggListData = [
+
+# New expanded egg list with 17 additional Pokemon
+EGG_LIST_MODDED = """export const eggListData = [
 	// === STARTERS ===
 	'charmander', 'treecko', 'froaki', 'chikorita', 'totodile', 'fennekin', 
 	'turtwig', 'chimchar', 'oshawott', 'sobble', 'rowlet', 'fuecoco',
@@ -2160,51 +3155,87 @@ def apply_expanded_egg_list():
 	'munna', 'hoothoot', 'wingull', 'archen', 'inkay', 'vulpix',
 	'tarountula', 'carbink',
 ]"""
+
+EGG_LIST_ANCHORS = declare_anchors('apply_expanded_egg_list', 'src/js/game/data/pokemonData.js',
+    Anchor('bidoof', "'bidoof'"),
+    Anchor('turtwig', "'turtwig'"),
+    Anchor('vulpix', "'vulpix'"),
+    Anchor('eggListData', "export const eggListData"),
+    Anchor('eggListDataUpdate', "export const eggListDataUpdate"),
+    # The vanilla list; unrecognised builds get a more flexible match of the
+    # eggListData export
+    Anchor('egg list', {
+        '1.5.4': EGG_LIST_VANILLA,
+        '*': re.compile(r"export const eggListData = \[[^\]]+\]", re.DOTALL),
+    }, EGG_LIST_MODDED),
+)
+
+def apply_expanded_egg_list():
+    """Add missing Pokemon to the egg shop that exist in game but weren't in shop."""
+    path = JS_ROOT / "game" / "data" / "pokemonData.js"
     
-    if old_egg_list in content:
-        content = content.replace(old_egg_list, new_egg_list)
-        write_file(path, content)
-        log_success("pokemonData.js: Egg list expanded (+17 Pokemon)")
-        return True
+    if not game_file_exists(path):
+        log_fail("pokemonData.js: File not found")
+        return False
+    
+    content = read_file(path)
+    hits = EGG_LIST_ANCHORS.scan(content)
+    
+    # Check if already expanded (look for one of the new Pokemon)
+    if hits['bidoof'].found and hits['turtwig'].found and hits['vulpix'].found:
+        # Check if they're in the eggListData specifically
+        start, end = (hits[name].spans[0][0] if hits[name].found else -1
+                      for name in ('eggListData', 'eggListDataUpdate'))
+        egg_section = content[start:end]
+        if "'bidoof'" in egg_section and "'turtwig'" in egg_section:
+            log_skip("pokemonData.js: Egg list already expanded")
+            return True
     
-    # Try a more flexible match - just find and replace the eggListData export
-    pattern = r"export const eggListData = \[[^\]]+\]"
-    match = re.search(pattern, content, re.DOTALL)
-    if match:
+    hit = hits['egg list']
+    if not hit.found:
+        log_fail("pokemonData.js: Could not find eggListData to expand")
+        return False
+    
+    regex = isinstance(hit.pattern, re.Pattern)
+    if regex:
         # DEFENSIVE: Check if already expanded (new Pokemon present in existing list)
-        existing_list = match.group(0)
+        start, end, _ = hit.spans[0]
+        existing_list = content[start:end]
         if "'bidoof'" in existing_list and "'vulpix'" in existing_list:
             log_skip("pokemonData.js: Egg list already expanded (regex check)")
             return True
-        content = content[:match.start()] + new_egg_list + content[match.end():]
-        write_file(path, content)
-        log_success("pokemonData.js: Egg list expanded (+17 Pokemon) (regex)")
-        return True
     
-    log_fail("pokemonData.js: Could not find eggListData to expand")
-    return False
+    content = EGG_LIST_ANCHORS.splice(content, hits)
+    write_file(path, content)
+    log_success("pokemonData.js: Egg list expanded (+17 Pokemon)" + (" (regex)" if regex else ""))
+    return True
 
 # ============================================================================
 # PLAYER.JS - Gold cap increase to 999 trillion
 # ============================================================================
+GOLD_CAP_ANCHORS = declare_anchors('apply_gold_cap_increase', 'src/js/game/core/Player.js',
+    Anchor('safe integer cap', '9007199254740991'),
+    # Match either vanilla or previously patched cap
+    Anchor('gold cap', tuple(f'if (this.gold >= {old_cap}) this.gold = {old_cap};'
+                             for old_cap in ['999999999999999', '99999999999']),
+           'if (this.gold >= 9007199254740991) this.gold = 9007199254740991;', count=0),
+)
+
 def apply_gold_cap_increase():
     """Raise gold cap to 9 quadrillion (safe JS integer limit)."""
     path = JS_ROOT / "game" / "core" / "Player.js"
     content = read_file(path)
+    hits = GOLD_CAP_ANCHORS.scan(content)
 
-    if '9007199254740991' in content:
+    if hits['safe integer cap'].found:
         log_skip("Player.js: Gold cap increase")
         return True
 
-    # Match either vanilla or previously patched cap
-    for old_cap in ['999999999999999', '99999999999']:
-        old = f'if (this.gold >= {old_cap}) this.gold = {old_cap};'
-        if old in content:
-            new = 'if (this.gold >= 9007199254740991) this.gold = 9007199254740991;'
-            content = content.replace(old, new)
-            write_file(path, content)
-            log_success("Player.js: Gold cap raised to 9 quadrillion (MAX_SAFE_INTEGER)")
-            return True
+    content = GOLD_CAP_ANCHORS.splice(content, hits)
+    if hits['gold cap']:
+        write_file(path, content)
+        log_success("Player.js: Gold cap raised to 9 quadrillion (MAX_SAFE_INTEGER)")
+        return True
 
     log_fail("Player.js: Gold cap increase", "gold cap pattern not found")
     return False
@@ -2212,40 +3243,44 @@ def apply_gold_cap_increase():
 # ============================================================================
 # PLAYER.JS - Gold display abbreviated format (HUD)
 # ============================================================================
-def apply_gold_display_format_player():
-    """Patch Player.js gold display to use abbreviated format for large amounts."""
-    path = JS_ROOT / "game" / "core" / "Player.js"
-    content = read_file(path)
-
-    if 'TRILLION' in content or 'QUADRILLION' in content:
-        log_skip("Player.js: Gold display format")
-        return True
-
+def _gold_display_anchor(marker, vanilla, new):
+    """Gold display line: a previously patched Trillion/Billion line (found by
+    marker), else the vanilla one. Replaced without its indentation."""
+    legacy = re.compile(r'(?m)^[^\S\n]*(?=[^\n]*Trillion)[^\n]*%s[^\n]*$' % re.escape(marker))
+    return Anchor('gold display', (legacy, vanilla),
+                  lambda m: m.group(0).replace(m.group(0).strip(), new), count=0)
+
+GOLD_DISPLAY_PLAYER_ANCHORS = declare_anchors('apply_gold_display_format_player', 'src/js/game/core/Player.js',
+    Anchor('TRILLION', 'TRILLION'),
+    Anchor('QUADRILLION', 'QUADRILLION'),
     # Remove old Trillion/Billion format if present
-    old_options = [
-        "this.main.UI.playerGold.innerText = `$${this.main.utility.numberDot(this.main.player.gold)}`;",
-    ]
-    # Also match the previously patched version
-    for marker in ['const g = this.main.player.gold;']:
-        for line in content.split('\n'):
-            if marker in line and 'Trillion' in line:
-                old_options.insert(0, line.strip())
-
-    new = ("const g = this.main.player.gold; "
+    _gold_display_anchor('const g = this.main.player.gold;',
+                         "this.main.UI.playerGold.innerText = `$${this.main.utility.numberDot(this.main.player.gold)}`;",
+                         "const g = this.main.player.gold; "
            "this.main.UI.playerGold.innerText = g >= 1e15 "
            "? `$${(g/1e15).toFixed(2)} QUADRILLION` "
            ": g >= 1e12 "
            "? `$${(g/1e12).toFixed(2)} TRILLION` "
            ": g >= 1e11 "
            "? `$${(g/1e9).toFixed(2)} BILLION` "
-           ": `$${this.main.utility.numberDot(g)}`;")
+           ": `$${this.main.utility.numberDot(g)}`;"),
+)
 
-    for old in old_options:
-        if old in content:
-            content = content.replace(old, new)
-            write_file(path, content)
-            log_success("Player.js: Gold display abbreviated (BILLION/TRILLION/QUADRILLION)")
-            return True
+def apply_gold_display_format_player():
+    """Patch Player.js gold display to use abbreviated format for large amounts."""
+    path = JS_ROOT / "game" / "core" / "Player.js"
+    content = read_file(path)
+    hits = GOLD_DISPLAY_PLAYER_ANCHORS.scan(content)
+
+    if hits['TRILLION'].found or hits['QUADRILLION'].found:
+        log_skip("Player.js: Gold display format")
+        return True
+
+    content = GOLD_DISPLAY_PLAYER_ANCHORS.splice(content, hits)
+    if hits['gold display']:
+        write_file(path, content)
+        log_success("Player.js: Gold display abbreviated (BILLION/TRILLION/QUADRILLION)")
+        return True
 
     log_fail("Player.js: Gold display format", "playerGold.innerText pattern not found")
     return False
@@ -2253,38 +3288,36 @@ def apply_gold_display_format_player():
 # ============================================================================
 # UI.JS - Gold display abbreviated format (UI update)
 # ============================================================================
+GOLD_DISPLAY_UI_ANCHORS = declare_anchors('apply_gold_display_format_ui', 'src/js/game/UI.js',
+    Anchor('TRILLION', 'TRILLION'),
+    Anchor('playerGold', 'playerGold'),
+    _gold_display_anchor('const _g = this.main.player.gold;',
+                         "this.playerGold.innerText = `$${this.main.utility.numberDot(this.main.player.gold)}`;",
+                         "const _g = this.main.player.gold; "
+           "this.playerGold.innerText = _g >= 1e15 "
+           "? `$${(_g/1e15).toFixed(2)} QUADRILLION` "
+           ": _g >= 1e12 "
+           "? `$${(_g/1e12).toFixed(2)} TRILLION` "
+           ": _g >= 1e11 "
+           "? `$${(_g/1e9).toFixed(2)} BILLION` "
+           ": `$${this.main.utility.numberDot(_g)}`;"),
+)
+
 def apply_gold_display_format_ui():
     """Patch UI.js gold display to use abbreviated format for large amounts."""
     path = JS_ROOT / "game" / "UI.js"
     content = read_file(path)
+    hits = GOLD_DISPLAY_UI_ANCHORS.scan(content)
 
-    if 'TRILLION' in content and 'playerGold' in content:
+    if hits['TRILLION'].found and hits['playerGold'].found:
         log_skip("UI.js: Gold display format")
         return True
 
-    old_options = [
-        "this.playerGold.innerText = `$${this.main.utility.numberDot(this.main.player.gold)}`;",
-    ]
-    for marker in ['const _g = this.main.player.gold;']:
-        for line in content.split('\n'):
-            if marker in line and 'Trillion' in line:
-                old_options.insert(0, line.strip())
-
-    new = ("const _g = this.main.player.gold; "
-           "this.playerGold.innerText = _g >= 1e15 "
-           "? `$${(_g/1e15).toFixed(2)} QUADRILLION` "
-           ": _g >= 1e12 "
-           "? `$${(_g/1e12).toFixed(2)} TRILLION` "
-           ": _g >= 1e11 "
-           "? `$${(_g/1e9).toFixed(2)} BILLION` "
-           ": `$${this.main.utility.numberDot(_g)}`;")
-
-    for old in old_options:
-        if old in content:
-            content = content.replace(old, new)
-            write_file(path, content)
-            log_success("UI.js: Gold display abbreviated (BILLION/TRILLION/QUADRILLION)")
-            return True
+    content = GOLD_DISPLAY_UI_ANCHORS.splice(content, hits)
+    if hits['gold display']:
+        write_file(path, content)
+        log_success("UI.js: Gold display abbreviated (BILLION/TRILLION/QUADRILLION)")
+        return True
 
     log_fail("UI.js: Gold display format", "playerGold.innerText pattern not found")
     return False
@@ -2292,70 +3325,61 @@ def apply_gold_display_format_ui():
 # ============================================================================
 # PROFILESCENE.JS - Live auto-updating stats while open
 # ============================================================================
-def apply_profile_live_update():
-    """Add setInterval refresh to ProfileScene so stats update live while open."""
-    path = JS_ROOT / "game" / "scenes" / "ProfileScene.js"
-    content = read_file(path)
-
-    if '_refreshInterval' in content:
-        log_skip("ProfileScene.js: Live update")
-        return True
-
-    open_replaced = False
-    close_replaced = False
-
-    current_open = """\t\tthis.update();
-\t\tthis.main.UI.section['profile'].classList.add('is-selected');"""
-    current_open_new = """\t\tthis.update();
+# Current and legacy open()/close() bodies, each with its patched form
+PROFILE_LIVE_OPEN = {
+    """\t\tthis.update();
+\t\tthis.main.UI.section['profile'].classList.add('is-selected');""": """\t\tthis.update();
 \t\tthis._refreshInterval = setInterval(() => this.update(), 500);
-\t\tthis.main.UI.section['profile'].classList.add('is-selected');"""
-    if current_open in content:
-        content = content.replace(current_open, current_open_new)
-        open_replaced = True
-
-    legacy_open = """\topen() {
+\t\tthis.main.UI.section['profile'].classList.add('is-selected');""",
+    """\topen() {
 \t\tsuper.open();
 \t\tthis.update();
-\t}"""
-    legacy_open_new = """\topen() {
+\t}""": """\topen() {
 \t\tsuper.open();
 \t\tthis.update();
 \t\tthis._refreshInterval = setInterval(() => this.update(), 500);
-\t}"""
-    if not open_replaced and legacy_open in content:
-        content = content.replace(legacy_open, legacy_open_new)
-        open_replaced = True
-
-    current_close = """\tclose() {
+\t}""",
+}
+PROFILE_LIVE_CLOSE = {
+    """\tclose() {
 \t\tsuper.close();
-\t\tthis.main.tooltip.hide();"""
-    current_close_new = """\tclose() {
+\t\tthis.main.tooltip.hide();""": """\tclose() {
 \t\tif (this._refreshInterval) { clearInterval(this._refreshInterval); this._refreshInterval = null; }
 \t\tsuper.close();
-\t\tthis.main.tooltip.hide();"""
-    if current_close in content:
-        content = content.replace(current_close, current_close_new)
-        close_replaced = True
-
-    legacy_close = """\tclose() {
+\t\tthis.main.tooltip.hide();""",
+    """\tclose() {
 \t\tthis.main.tooltip.hide();
-\t\tsuper.close();"""
-    legacy_close_new = """\tclose() {
+\t\tsuper.close();""": """\tclose() {
 \t\tif (this._refreshInterval) { clearInterval(this._refreshInterval); this._refreshInterval = null; }
 \t\tthis.main.tooltip.hide();
-\t\tsuper.close();"""
-    if not close_replaced and legacy_close in content:
-        content = content.replace(legacy_close, legacy_close_new)
-        close_replaced = True
+\t\tsuper.close();""",
+}
+
+PROFILE_LIVE_ANCHORS = declare_anchors('apply_profile_live_update', 'src/js/game/scenes/ProfileScene.js',
+    Anchor('_refreshInterval', '_refreshInterval'),
+    Anchor('open', tuple(PROFILE_LIVE_OPEN), lambda m: PROFILE_LIVE_OPEN[m.group(0)], count=0),
+    Anchor('close', tuple(PROFILE_LIVE_CLOSE), lambda m: PROFILE_LIVE_CLOSE[m.group(0)], count=0),
+)
+
+def apply_profile_live_update():
+    """Add setInterval refresh to ProfileScene so stats update live while open."""
+    path = JS_ROOT / "game" / "scenes" / "ProfileScene.js"
+    content = read_file(path)
+    hits = PROFILE_LIVE_ANCHORS.scan(content)
 
-    if not open_replaced:
+    if hits['_refreshInterval'].found:
+        log_skip("ProfileScene.js: Live update")
+        return True
+
+    if not hits['open'].found:
         log_fail("ProfileScene.js: Live update", "open() pattern not found")
         return False
 
-    if not close_replaced:
+    if not hits['close'].found:
         log_fail("ProfileScene.js: Live update", "close() pattern not found")
         return False
 
+    content = PROFILE_LIVE_ANCHORS.splice(content, hits)
     write_file(path, content)
     log_success("ProfileScene.js: Live auto-updating stats (500ms refresh)")
     return True
@@ -2366,6 +3390,18 @@ def apply_profile_live_update():
 # ============================================================================
 # POKEMON.JS - Prevent shared sprite mutation across Pokemon instances
 # ============================================================================
+SPRITE_ISOLATION_LINE = "\t\tthis.sprite = JSON.parse(JSON.stringify(specie.sprite));"
+
+SPRITE_ISOLATION_ANCHORS = declare_anchors('apply_pokemon_sprite_isolation_fix', 'src/js/game/component/Pokemon.js',
+    Anchor('isolated sprite', SPRITE_ISOLATION_LINE),
+    # Unrecognised builds: flexible fallback for whitespace variants (matched
+    # without the indent)
+    Anchor('shared sprite', {
+        '1.5.4': "\t\tthis.sprite = specie.sprite;",
+        '*': re.compile(r"\bthis\.sprite\s*=\s*specie\.sprite\s*;"),
+    }, lambda m: SPRITE_ISOLATION_LINE if m.group(0).startswith('\t') else SPRITE_ISOLATION_LINE.lstrip()),
+)
+
 def apply_pokemon_sprite_isolation_fix():
     """Ensure each Pokemon gets its own sprite object copy.
 
@@ -2375,27 +3411,18 @@ def apply_pokemon_sprite_isolation_fix():
     """
     path = JS_ROOT / "game" / "component" / "Pokemon.js"
     content = read_file(path)
+    hits = SPRITE_ISOLATION_ANCHORS.scan(content)
 
-    new_line = "\t\tthis.sprite = JSON.parse(JSON.stringify(specie.sprite));"
-    if new_line in content:
+    if hits['isolated sprite'].found:
         log_skip("Pokemon.js: Sprite isolation fix")
         return True
 
-    old_line = "\t\tthis.sprite = specie.sprite;"
-    if old_line in content:
-        content = content.replace(old_line, new_line, 1)
+    content = SPRITE_ISOLATION_ANCHORS.splice(content, hits)
+    if hits['shared sprite']:
         write_file(path, content)
         log_success("Pokemon.js: Sprite isolation fix (prevent shared shiny path bleed)")
         return True
 
-    # Flexible fallback for whitespace variants
-    pattern = r"\bthis\.sprite\s*=\s*specie\.sprite\s*;"
-    content2, replacements = re.subn(pattern, "this.sprite = JSON.parse(JSON.stringify(specie.sprite));", content, count=1)
-    if replacements > 0:
-        write_file(path, content2)
-        log_success("Pokemon.js: Sprite isolation fix (prevent shared shiny path bleed)")
-        return True
-
     log_fail("Pokemon.js: Sprite isolation fix", "sprite assignment pattern not found")
     return False
 
@@ -2403,6 +3430,77 @@ def apply_pokemon_sprite_isolation_fix():
 # ============================================================================
 # CHALLENGESCENE.JS - Fix level cap boosting low-level Pokemon
 # ============================================================================
+# Fix 1: Pokemon.js updateStats() unconditionally sets level = lvlCap
+LEVELCAP_POKEMON_ANCHORS = declare_anchors('apply_challenge_levelcap_fix', 'src/js/game/component/Pokemon.js',
+    Anchor('Math.min(this.lvl', 'Math.min(this.lvl'),
+    Anchor('inChallenge.lvlCap', 'inChallenge.lvlCap'),
+    Anchor('updateStats level', "if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = this.main.area.inChallenge.lvlCap;",
+           "if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = Math.min(this.lvl, this.main.area.inChallenge.lvlCap);", count=0),
+)
+
+# Fix 2: ChallengeScene.js setStatsLevel(capLevel) boosts low-level Pokemon
+LEVELCAP_SCENE_CAPPED = "pokemon.forEach(poke => poke.setStatsLevel(Math.min(poke.lvl, capLevel)))"
+LEVELCAP_SCENE_ANCHORS = declare_anchors('apply_challenge_levelcap_fix', 'src/js/game/scenes/ChallengeScene.js',
+    Anchor('capped setStatsLevel', LEVELCAP_SCENE_CAPPED),
+    Anchor('setStatsLevel', "pokemon.forEach(poke => poke.setStatsLevel(capLevel))", LEVELCAP_SCENE_CAPPED, count=0),
+)
+
+# Fix 3: UI.js team sidebar display shows cap instead of Math.min
+LEVELCAP_UI_CAPPED = "this.pokemon[i].level.innerText = `Lv ${Math.min(pokemon.lvl, this.main.area.inChallenge.lvlCap)}`;"
+LEVELCAP_UI_ANCHORS = declare_anchors('apply_challenge_levelcap_fix', 'src/js/game/UI.js',
+    Anchor('capped level display', LEVELCAP_UI_CAPPED),
+    Anchor('level display', "this.pokemon[i].level.innerText = `Lv ${this.main.area.inChallenge.lvlCap}`;",
+           LEVELCAP_UI_CAPPED, count=0),
+)
+
+# Fix 4: PokemonScene.js detail view shows cap instead of Math.min.
+# The vanilla code shows [lvlCap] for ALL pokemon instead of [Math.min(lvl, cap)]
+LEVELCAP_NAME_VANILLA = "else this.name.innerHTML = (this.pokemon.alias != undefined) ? `${this.pokemon.alias.toUpperCase()} [${this.main.area.inChallenge.lvlCap}]` : `${this.pokemon.name[this.main.lang].toUpperCase()} [${this.main.area.inChallenge.lvlCap}]`;"
+LEVELCAP_NAME_CAPPED = "else { const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap); this.name.innerHTML = (this.pokemon.alias != undefined) ? `${this.pokemon.alias.toUpperCase()} [${displayLvl}]` : `${this.pokemon.name[this.main.lang].toUpperCase()} [${displayLvl}]`; }"
+LEVELCAP_NAME_CAPPED_REGEX = (
+    "else { const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap); "
+    "this.name.innerHTML = (this.pokemon?.alias != undefined) ? "
+    "`${this.pokemon?.alias.toUpperCase()} [${displayLvl}]` : "
+    "`${this.pokemon.name[this.main.lang].toUpperCase()} [${displayLvl}]`; }"
+)
+
+# Fix 5: PokemonScene.js level-up buttons disabled during challenge
+LEVELCAP_BUTTONS_BLOCK = """if (typeof this.main.area.inChallenge.lvlCap == 'number') {
+			this.levelUp.innerHTML = `-`;
+			this.levelUp.style.filter = 'brightness(0.8)';
+			this.levelUp.style.pointerEvents = 'none';
+			this.levelUp.style.lineHeight = '28px';
+
+			this.levelUpFive.innerHTML = `-`;
+			this.levelUpFive.style.filter = 'brightness(0.8)';
+			this.levelUpFive.style.pointerEvents = 'none';
+			this.levelUpFive.style.lineHeight = '28px';
+
+			this.levelUpTen.innerHTML = `-`;
+			this.levelUpTen.style.filter = 'brightness(0.8)';
+			this.levelUpTen.style.pointerEvents = 'none';
+			this.levelUpTen.style.lineHeight = '28px';
+			return;
+		}"""
+
+LEVELCAP_POKEMONSCENE_ANCHORS = declare_anchors('apply_challenge_levelcap_fix', 'src/js/game/scenes/PokemonScene.js',
+    Anchor('capped name', 'const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap)'),
+    Anchor('name', {
+        '1.5.4': LEVELCAP_NAME_VANILLA,
+        '*': re.compile(
+            r"else\s+this\.name\.innerHTML\s*=\s*"
+            r"\(this\.pokemon\??\.alias\s*!=\s*undefined\)\s*\?\s*"
+            r"`\$\{this\.pokemon\??\.alias\.toUpperCase\(\)\} \[\$\{this\.main\.area\.inChallenge\.lvlCap\}\]`\s*:\s*"
+            r"`\$\{this\.pokemon\??\.name\[this\.main\.lang\]\.toUpperCase\(\)\} \[\$\{this\.main\.area\.inChallenge\.lvlCap\}\]`;"
+        ),
+    }, lambda m: LEVELCAP_NAME_CAPPED if m.group(0) == LEVELCAP_NAME_VANILLA else LEVELCAP_NAME_CAPPED_REGEX),
+    # Remove the entire block — level-up works normally, stats are capped by updateStats()
+    Anchor('level-up buttons', LEVELCAP_BUTTONS_BLOCK,
+           '// MOD: Level-up allowed during challenge (stats capped by updateStats)', count=0),
+    Anchor('level-up allowed', '// MOD: Level-up allowed during challenge'),
+    Anchor('lvlCap check', "inChallenge.lvlCap == 'number'"),
+)
+
 def apply_challenge_levelcap_fix():
     """
     Fix vanilla bug: level cap should cap high-level Pokemon, not boost low-level ones.
@@ -2415,32 +3513,25 @@ def apply_challenge_levelcap_fix():
     # --- Fix 1: Pokemon.js updateStats() ---
     path = JS_ROOT / "game" / "component" / "Pokemon.js"
     content = read_file(path)
+    hits = LEVELCAP_POKEMON_ANCHORS.scan(content)
     
-    if 'Math.min(this.lvl' in content and 'inChallenge.lvlCap' in content:
+    if hits['Math.min(this.lvl'].found and hits['inChallenge.lvlCap'].found:
         log_skip("Pokemon.js: Challenge level cap fix")
+    elif hits['updateStats level'].found:
+        write_file(path, LEVELCAP_POKEMON_ANCHORS.splice(content, hits))
+        log_success("Pokemon.js: Challenge level cap fix (cap down only, never boost up)")
     else:
-        old_cap = "if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = this.main.area.inChallenge.lvlCap;"
-        new_cap = "if (typeof this.main?.area?.inChallenge.lvlCap === 'number') level = Math.min(this.lvl, this.main.area.inChallenge.lvlCap);"
-        
-        if old_cap in content:
-            content = content.replace(old_cap, new_cap)
-            write_file(path, content)
-            log_success("Pokemon.js: Challenge level cap fix (cap down only, never boost up)")
-        else:
-            log_fail("Pokemon.js: Challenge level cap fix", "inChallenge.lvlCap pattern not found")
+        log_fail("Pokemon.js: Challenge level cap fix", "inChallenge.lvlCap pattern not found")
     
     # --- Fix 2: ChallengeScene.js setStatsLevel(capLevel) ---
     path_cs = JS_ROOT / "game" / "scenes" / "ChallengeScene.js"
     content_cs = read_file(path_cs)
+    hits = LEVELCAP_SCENE_ANCHORS.scan(content_cs)
     
-    old_scene = "pokemon.forEach(poke => poke.setStatsLevel(capLevel))"
-    new_scene = "pokemon.forEach(poke => poke.setStatsLevel(Math.min(poke.lvl, capLevel)))"
-    
-    if new_scene in content_cs:
+    if hits['capped setStatsLevel'].found:
         log_skip("ChallengeScene.js: Challenge level cap fix")
-    elif old_scene in content_cs:
-        content_cs = content_cs.replace(old_scene, new_scene)
-        write_file(path_cs, content_cs)
+    elif hits['setStatsLevel'].found:
+        write_file(path_cs, LEVELCAP_SCENE_ANCHORS.splice(content_cs, hits))
         log_success("ChallengeScene.js: Challenge level cap fix (cap down only)")
     else:
         log_fail("ChallengeScene.js: Challenge level cap fix", "setStatsLevel(capLevel) pattern not found")
@@ -2448,86 +3539,41 @@ def apply_challenge_levelcap_fix():
     # --- Fix 3: UI.js team sidebar display shows cap instead of Math.min ---
     path_ui = JS_ROOT / "game" / "UI.js"
     content_ui = read_file(path_ui)
+    hits = LEVELCAP_UI_ANCHORS.scan(content_ui)
     
-    old_ui_display = "this.pokemon[i].level.innerText = `Lv ${this.main.area.inChallenge.lvlCap}`;"
-    new_ui_display = "this.pokemon[i].level.innerText = `Lv ${Math.min(pokemon.lvl, this.main.area.inChallenge.lvlCap)}`;"
-    
-    if new_ui_display in content_ui:
+    if hits['capped level display'].found:
         log_skip("UI.js: Challenge level cap display fix")
-    elif old_ui_display in content_ui:
-        content_ui = content_ui.replace(old_ui_display, new_ui_display)
-        write_file(path_ui, content_ui)
+    elif hits['level display'].found:
+        write_file(path_ui, LEVELCAP_UI_ANCHORS.splice(content_ui, hits))
         log_success("UI.js: Challenge level cap display fix (show actual capped level)")
     else:
         log_fail("UI.js: Challenge level cap display fix", "lvlCap display pattern not found")
     
-    # --- Fix 4: PokemonScene.js detail view shows cap instead of Math.min ---
+    # --- Fix 4 + 5: PokemonScene.js, both located in one scan ---
     path_ps = JS_ROOT / "game" / "scenes" / "PokemonScene.js"
     content_ps = read_file(path_ps)
+    hits = LEVELCAP_POKEMONSCENE_ANCHORS.scan(content_ps)
+    content_ps = LEVELCAP_POKEMONSCENE_ANCHORS.splice(
+        content_ps, hits, skip=('name',) if hits['capped name'].found else ())
+    if any(hits):
+        write_file(path_ps, content_ps)
     
-    # The vanilla code shows [lvlCap] for ALL pokemon instead of [Math.min(lvl, cap)]
-    old_ps = "else this.name.innerHTML = (this.pokemon.alias != undefined) ? `${this.pokemon.alias.toUpperCase()} [${this.main.area.inChallenge.lvlCap}]` : `${this.pokemon.name[this.main.lang].toUpperCase()} [${this.main.area.inChallenge.lvlCap}]`;"
-    new_ps = "else { const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap); this.name.innerHTML = (this.pokemon.alias != undefined) ? `${this.pokemon.alias.toUpperCase()} [${displayLvl}]` : `${this.pokemon.name[this.main.lang].toUpperCase()} [${displayLvl}]`; }"
-
-    if 'const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap)' in content_ps:
+    if hits['capped name'].found:
         log_skip("PokemonScene.js: Challenge level cap display fix")
-    elif old_ps in content_ps:
-        content_ps = content_ps.replace(old_ps, new_ps)
-        write_file(path_ps, content_ps)
+    elif hits['name']:
         log_success("PokemonScene.js: Challenge level cap display fix (show actual capped level)")
     else:
-        old_ps_regex = (
-            r"else\s+this\.name\.innerHTML\s*=\s*"
-            r"\(this\.pokemon\??\.alias\s*!=\s*undefined\)\s*\?\s*"
-            r"`\$\{this\.pokemon\??\.alias\.toUpperCase\(\)\} \[\$\{this\.main\.area\.inChallenge\.lvlCap\}\]`\s*:\s*"
-            r"`\$\{this\.pokemon\??\.name\[this\.main\.lang\]\.toUpperCase\(\)\} \[\$\{this\.main\.area\.inChallenge\.lvlCap\}\]`;"
-        )
-        new_ps_regex = (
-            "else { const displayLvl = Math.min(this.pokemon.lvl, this.main.area.inChallenge.lvlCap); "
-            "this.name.innerHTML = (this.pokemon?.alias != undefined) ? "
-            "`${this.pokemon?.alias.toUpperCase()} [${displayLvl}]` : "
-            "`${this.pokemon.name[this.main.lang].toUpperCase()} [${displayLvl}]`; }"
-        )
-        content_ps2, replacements = re.subn(old_ps_regex, new_ps_regex, content_ps, count=1)
-        if replacements > 0:
-            write_file(path_ps, content_ps2)
-            log_success("PokemonScene.js: Challenge level cap display fix (show actual capped level)")
-        else:
-            # Non-fatal: this display string varies across builds and may already be handled elsewhere.
-            log_skip("PokemonScene.js: Challenge level cap display fix (pattern variant not present)")
+        # Non-fatal: this display string varies across builds and may already be handled elsewhere.
+        log_skip("PokemonScene.js: Challenge level cap display fix (pattern variant not present)")
     
-    # --- Fix 5: PokemonScene.js level-up buttons disabled during challenge ---
     # Vanilla completely disables +1/+5/+10 buttons when lvlCap is set.
     # Fix: remove the early return so players can still level up Pokemon.
     # Stats/display are already capped by Math.min in updateStats() and display fixes.
     # Without endless mode, vanilla level 100 cap still applies from the existing button logic.
     # With endless mode, PokemonScene.modded.js replaces this file entirely (no cap).
-    content_ps = read_file(path_ps)  # re-read in case Fix 4 wrote
-    
-    old_btn_block = """if (typeof this.main.area.inChallenge.lvlCap == 'number') {
-			this.levelUp.innerHTML = `-`;
-			this.levelUp.style.filter = 'brightness(0.8)';
-			this.levelUp.style.pointerEvents = 'none';
-			this.levelUp.style.lineHeight = '28px';
-
-			this.levelUpFive.innerHTML = `-`;
-			this.levelUpFive.style.filter = 'brightness(0.8)';
-			this.levelUpFive.style.pointerEvents = 'none';
-			this.levelUpFive.style.lineHeight = '28px';
-
-			this.levelUpTen.innerHTML = `-`;
-			this.levelUpTen.style.filter = 'brightness(0.8)';
-			this.levelUpTen.style.pointerEvents = 'none';
-			this.levelUpTen.style.lineHeight = '28px';
-			return;
-		}"""
-    
-    if old_btn_block in content_ps:
-        # Remove the entire block — level-up works normally, stats are capped by updateStats()
-        content_ps = content_ps.replace(old_btn_block, '// MOD: Level-up allowed during challenge (stats capped by updateStats)')
-        write_file(path_ps, content_ps)
+    if hits['level-up buttons']:
         log_success("PokemonScene.js: Level-up buttons enabled during challenge mode")
-    elif '// MOD: Level-up allowed during challenge' in content_ps or "inChallenge.lvlCap == 'number'" not in content_ps:
+    elif hits['level-up allowed'].found or not hits['lvlCap check'].found:
         # Already patched, or modded file that never had the block
         log_skip("PokemonScene.js: Level-up buttons during challenge")
     else:
@@ -2536,6 +3582,13 @@ def apply_challenge_levelcap_fix():
     return True
 
 
+# Scope strictly to box:{} so we don't accidentally patch pokemon:{} keys.
+ATTACKTYPE_BOX_SECTION = re.compile(r'(box:\s*\{)([\s\S]*?)(\n\t\},\n\tchangeName:\s*\{)')
+
+ATTACKTYPE_SORT_ANCHORS = declare_anchors('apply_attacktype_sort', 'src/js/file/text.js',
+    Anchor('box section', ATTACKTYPE_BOX_SECTION),
+)
+
 def apply_attacktype_sort():
     """Add attack type sorting option + localized type labels to box section in text.js.
 
@@ -2545,15 +3598,13 @@ def apply_attacktype_sort():
     """
     path = JS_ROOT / "file" / "text.js"
     content = read_file(path)
+    hit = ATTACKTYPE_SORT_ANCHORS.scan(content)['box section']
 
-    import re
-
-    # Scope strictly to box:{} so we don't accidentally patch pokemon:{} keys.
-    box_match = re.search(r'(box:\s*\{)([\s\S]*?)(\n\t\},\n\tchangeName:\s*\{)', content)
-    if not box_match:
+    if not hit.found:
         log_fail("text.js: Attack type labels", "box section not found")
         return False
 
+    box_match = ATTACKTYPE_BOX_SECTION.match(content, hit.spans[0][0])
     box_start, box_body, box_end = box_match.group(1), box_match.group(2), box_match.group(3)
 
     shiny_match = re.search(r'(shiny:\s*\[.*?\])', box_body)
@@ -2588,25 +3639,10 @@ def apply_attacktype_sort():
     return True
 
 
-def apply_challenge_party_preserve():
-    """Preserve team lineup, items, and tile positions when starting a challenge.
-    
-    Vanilla ChallengeScene.startChallenge() strips all items and moves all team
-    Pokemon to the box before loading the area. This QoL patch saves the team state
-    before the wipe and restores it after loadArea, so players keep their party
-    lineup and deployed positions. Draft challenges are excluded (intentionally fresh).
-    """
-    path = JS_ROOT / "game" / "scenes" / "ChallengeScene.js"
-    content = read_file(path)
-    
-    if '// MOD: Save team state before challenge wipe' in content:
-        log_skip("ChallengeScene.js: Challenge party preserve")
-        return True
-    
-    old_start = """this.main.boxScene.removeAllItems();
+PARTY_PRESERVE_START = """this.main.boxScene.removeAllItems();
 		this.main.boxScene.removeAllButton();"""
-    
-    new_start = """// MOD: Save team state before challenge wipe (QoL)
+
+PARTY_PRESERVE_START_MODDED = """// MOD: Save team state before challenge wipe (QoL)
 		this._savedTeamForChallenge = this.main.team.pokemon.map(p => ({
 			pokemon: p,
 			item: p.item ? p.item : null,
@@ -2615,35 +3651,21 @@ def apply_challenge_party_preserve():
 
 		this.main.boxScene.removeAllItems();
 		this.main.boxScene.removeAllButton();"""
-    
-    if old_start not in content:
-        log_fail("ChallengeScene.js: Challenge party preserve", "removeAllItems/removeAllButton pattern not found")
-        return False
-    
-    content = content.replace(old_start, new_start)
-    
-    # After loadArea + UI.update + getHealed, restore team (but not for draft)
-    old_post = """this.main.player.getHealed(14);
-		this.main.teamManager.teamChallenge = [[], [], [], [], []];
-		if (this.challenges.draft) this.main.draftScene.open();"""
-    
-    new_post = """this.main.player.getHealed(14);
-		this.main.teamManager.teamChallenge = [[], [], [], [], []];
 
-		// MOD: Restore team lineup after challenge wipe (skip for draft)
-		if (!this.challenges.draft && this._savedTeamForChallenge && this._savedTeamForChallenge.length > 0) {
+PARTY_PRESERVE_CANCEL_MODDED = """this.main.boxScene.removeAllItems();
+		this.main.boxScene.removeAllButton();
+
+		// MOD: Restore team lineup after surrender (skip for draft)
+		if (this._savedTeamForChallenge && this._savedTeamForChallenge.length > 0) {
 			for (const saved of this._savedTeamForChallenge) {
 				const poke = saved.pokemon;
-				// Move from box back to team
 				if (this.main.box.pokemon.includes(poke)) {
 					this.main.box.removePokemon(poke);
 					this.main.team.addPokemon(poke);
 				}
-				// Re-equip item
 				if (saved.item) {
 					poke.equipItem(saved.item);
 				}
-				// Redeploy to tile if position was saved
 				if (saved.tilePosition >= 0 && saved.tilePosition < this.main.area.placementTiles.length) {
 					const tile = this.main.area.placementTiles[saved.tilePosition];
 					if (tile && !tile.tower && poke.tiles.includes(tile.land)) {
@@ -2656,40 +3678,51 @@ def apply_challenge_party_preserve():
 					}
 				}
 			}
-			this.main.UI.update();
+			this._savedTeamForChallenge = null;
 		}
 
-		if (this.challenges.draft) this.main.draftScene.open();"""
-    
-    if old_post not in content:
-        log_fail("ChallengeScene.js: Challenge party preserve", "post-loadArea pattern not found")
-        return False
-    
-    content = content.replace(old_post, new_post)
-    
-    # Patch cancelChallenge (surrender) to also restore team
-    old_cancel = """this.main.boxScene.removeAllItems();
-		this.main.boxScene.removeAllButton();
-
 		this.main.area.checkWeather();
 		this.main.UI.update();
 
 		this.main.game.cancelDeployUnit();"""
-    
-    new_cancel = """this.main.boxScene.removeAllItems();
+
+PARTY_PRESERVE_ANCHORS = declare_anchors('apply_challenge_party_preserve', 'src/js/game/scenes/ChallengeScene.js',
+    Anchor('applied marker', '// MOD: Save team state before challenge wipe'),
+    Anchor('surrender restore', '// MOD: Restore team lineup after surrender'),
+    Anchor('Tower import', "import { Tower }"),
+    # Patch cancelChallenge (surrender) to also restore team. It starts with the
+    # same removeAllItems/removeAllButton pair, so it gets the save block too;
+    # declared before that anchor so this one splices both.
+    Anchor('cancelChallenge', """this.main.boxScene.removeAllItems();
 		this.main.boxScene.removeAllButton();
 
-		// MOD: Restore team lineup after surrender (skip for draft)
-		if (this._savedTeamForChallenge && this._savedTeamForChallenge.length > 0) {
+		this.main.area.checkWeather();
+		this.main.UI.update();
+
+		this.main.game.cancelDeployUnit();""",
+           PARTY_PRESERVE_START_MODDED[:-len(PARTY_PRESERVE_START)] + PARTY_PRESERVE_CANCEL_MODDED, count=0),
+    Anchor('startChallenge', PARTY_PRESERVE_START, PARTY_PRESERVE_START_MODDED, count=0),
+    # After loadArea + UI.update + getHealed, restore team (but not for draft)
+    Anchor('post loadArea', """this.main.player.getHealed(14);
+		this.main.teamManager.teamChallenge = [[], [], [], [], []];
+		if (this.challenges.draft) this.main.draftScene.open();""",
+           """this.main.player.getHealed(14);
+		this.main.teamManager.teamChallenge = [[], [], [], [], []];
+
+		// MOD: Restore team lineup after challenge wipe (skip for draft)
+		if (!this.challenges.draft && this._savedTeamForChallenge && this._savedTeamForChallenge.length > 0) {
 			for (const saved of this._savedTeamForChallenge) {
 				const poke = saved.pokemon;
+				// Move from box back to team
 				if (this.main.box.pokemon.includes(poke)) {
 					this.main.box.removePokemon(poke);
 					this.main.team.addPokemon(poke);
 				}
+				// Re-equip item
 				if (saved.item) {
 					poke.equipItem(saved.item);
 				}
+				// Redeploy to tile if position was saved
 				if (saved.tilePosition >= 0 && saved.tilePosition < this.main.area.placementTiles.length) {
 					const tile = this.main.area.placementTiles[saved.tilePosition];
 					if (tile && !tile.tower && poke.tiles.includes(tile.land)) {
@@ -2702,34 +3735,57 @@ def apply_challenge_party_preserve():
 					}
 				}
 			}
-			this._savedTeamForChallenge = null;
+			this.main.UI.update();
 		}
 
-		this.main.area.checkWeather();
-		this.main.UI.update();
+		if (this.challenges.draft) this.main.draftScene.open();""", count=0),
+    # Add Tower import for programmatic deployment
+    Anchor('import', "import { Pokemon } from '../component/Pokemon.js';",
+           "import { Pokemon } from '../component/Pokemon.js';\nimport { Tower } from '../component/Tower.js';", count=0),
+)
 
-		this.main.game.cancelDeployUnit();"""
+def apply_challenge_party_preserve():
+    """Preserve team lineup, items, and tile positions when starting a challenge.
     
-    if old_cancel in content:
-        content = content.replace(old_cancel, new_cancel)
-    elif '// MOD: Restore team lineup after surrender' in content:
-        pass  # already applied
-    else:
-        log_fail("ChallengeScene.js: Challenge party preserve (surrender)", "cancelChallenge pattern not found")
+    Vanilla ChallengeScene.startChallenge() strips all items and moves all team
+    Pokemon to the box before loading the area. This QoL patch saves the team state
+    before the wipe and restores it after loadArea, so players keep their party
+    lineup and deployed positions. Draft challenges are excluded (intentionally fresh).
+    """
+    path = JS_ROOT / "game" / "scenes" / "ChallengeScene.js"
+    content = read_file(path)
+    hits = PARTY_PRESERVE_ANCHORS.scan(content)
+    
+    if hits['applied marker'].found:
+        log_skip("ChallengeScene.js: Challenge party preserve")
+        return True
+    
+    if not hits['startChallenge'].found:
+        log_fail("ChallengeScene.js: Challenge party preserve", "removeAllItems/removeAllButton pattern not found")
         return False
     
-    # Add Tower import for programmatic deployment
-    if "import { Tower }" not in content:
-        old_import = "import { Pokemon } from '../component/Pokemon.js';"
-        new_import = "import { Pokemon } from '../component/Pokemon.js';\nimport { Tower } from '../component/Tower.js';"
-        if old_import in content:
-            content = content.replace(old_import, new_import)
+    if not hits['post loadArea'].found:
+        log_fail("ChallengeScene.js: Challenge party preserve", "post-loadArea pattern not found")
+        return False
     
+    if not hits['cancelChallenge'].found and not hits['surrender restore'].found:
+        log_fail("ChallengeScene.js: Challenge party preserve (surrender)", "cancelChallenge pattern not found")
+        return False
+    
+    content = PARTY_PRESERVE_ANCHORS.splice(content, hits, skip=('import',) if hits['Tower import'].found else ())
     write_file(path, content)
     log_success("ChallengeScene.js: Challenge party preserve (team + items + positions)")
     return True
 
 
+RETARGET_FIX_ANCHORS = declare_anchors('apply_projectile_retarget_fix', 'src/js/game/component/Projectile.js',
+    Anchor('tower range', 'this.tower.range'),
+    Anchor('tower source', 'findClosestEnemy(this.tower'),
+    # Vanilla pattern: retargets from projectile position with 200px range
+    Anchor('fallbackSource', "const fallbackSource = { center: this.position || { x: this.position?.x ?? 0, y: this.position?.y ?? 0 } };\n            const newTarget = this.tower.findClosestEnemy(fallbackSource, 200);",
+           "// MOD: Retarget from tower position within tower's actual range\n            const towerRange = this.tower.range || 100;\n            const newTarget = this.tower.findClosestEnemy(this.tower, towerRange);", count=0),
+)
+
 def apply_projectile_retarget_fix():
     """
     Fix projectile retargeting to search from tower position within tower's range,
@@ -2737,18 +3793,15 @@ def apply_projectile_retarget_fix():
     """
     path = JS_ROOT / "game" / "component" / "Projectile.js"
     content = read_file(path)
+    hits = RETARGET_FIX_ANCHORS.scan(content)
     
     # Check if already fixed (modded file or already patched)
-    if 'this.tower.range' in content and 'findClosestEnemy(this.tower' in content:
+    if hits['tower range'].found and hits['tower source'].found:
         log_skip("Projectile.js: Retarget fix")
         return True
     
-    # Vanilla pattern: retargets from projectile position with 200px range
-    old = "const fallbackSource = { center: this.position || { x: this.position?.x ?? 0, y: this.position?.y ?? 0 } };\n            const newTarget = this.tower.findClosestEnemy(fallbackSource, 200);"
-    new = "// MOD: Retarget from tower position within tower's actual range\n            const towerRange = this.tower.range || 100;\n            const newTarget = this.tower.findClosestEnemy(this.tower, towerRange);"
-    
-    if old in content:
-        content = content.replace(old, new)
+    content = RETARGET_FIX_ANCHORS.splice(content, hits)
+    if hits['fallbackSource']:
         write_file(path, content)
         log_success("Projectile.js: Retarget fix (tower position + tower range)")
         return True
@@ -2757,23 +3810,11 @@ def apply_projectile_retarget_fix():
     return False
 
 
-def apply_offscreen_target_fix():
-    """
-    Add off-screen target cleanup to Projectile.js.
-    Deletes projectiles whose target enemy has gone off-screen.
-    """
-    path = JS_ROOT / "game" / "component" / "Projectile.js"
-    content = read_file(path)
-    
-    # Check if already applied
-    if 'off-screen' in content.lower() or 'offscreen' in content.lower():
-        log_skip("Projectile.js: Off-screen target fix")
-        return True
-    
+OFFSCREEN_FIX_ANCHORS = declare_anchors('apply_offscreen_target_fix', 'src/js/game/component/Projectile.js',
+    Anchor('off-screen', re.compile(r'off-screen|offscreen', re.IGNORECASE)),
     # Insert after the retarget block, before the "if (!this.enemy" check
-    marker = "if (!this.enemy || this.enemy.hp <= 0) {\n            this.markedForDeletion = true;\n            return;\n        }\n\n        this.age"
-    
-    offscreen_check = """if (!this.enemy || this.enemy.hp <= 0) {
+    Anchor('enemy check', "if (!this.enemy || this.enemy.hp <= 0) {\n            this.markedForDeletion = true;\n            return;\n        }\n\n        this.age",
+           """if (!this.enemy || this.enemy.hp <= 0) {
             this.markedForDeletion = true;
             return;
         }
@@ -2789,10 +3830,25 @@ def apply_offscreen_target_fix():
             }
         }
 
-        this.age"""
+        this.age""", count=0),
+)
+
+def apply_offscreen_target_fix():
+    """
+    Add off-screen target cleanup to Projectile.js.
+    Deletes projectiles whose target enemy has gone off-screen.
+    """
+    path = JS_ROOT / "game" / "component" / "Projectile.js"
+    content = read_file(path)
+    hits = OFFSCREEN_FIX_ANCHORS.scan(content)
     
-    if marker in content:
-        content = content.replace(marker, offscreen_check)
+    # Check if already applied
+    if hits['off-screen'].found:
+        log_skip("Projectile.js: Off-screen target fix")
+        return True
+    
+    content = OFFSCREEN_FIX_ANCHORS.splice(content, hits)
+    if hits['enemy check']:
         write_file(path, content)
         log_success("Projectile.js: Off-screen target fix")
         return True
@@ -2801,6 +3857,17 @@ def apply_offscreen_target_fix():
     return False
 
 
+SHELLBELL_FIX_ANCHORS = declare_anchors('apply_shellbell_fix', 'src/js/game/component/Enemy.js',
+    Anchor('trueDamageDealt', 'pokemon.trueDamageDealt'),
+    Anchor('totalTrueDamageDealt', 'totalTrueDamageDealt'),
+    # Find the damageDealt increment line and add trueDamageDealt tracking with overkill-safe min
+    Anchor('damageDealt', "    this.main.area.totalDamageDealt += amount;\n\t    pokemon.damageDealt += amount;",
+           "    this.main.area.totalDamageDealt += amount;\n"
+           "\t    pokemon.damageDealt += amount;\n\n"
+           "\t    this.main.area.totalTrueDamageDealt += Math.min((this.hp + this.armor), amount);\n"
+           "\t    pokemon.trueDamageDealt += Math.min((this.hp + this.armor), amount);"),
+)
+
 def apply_shellbell_fix():
     """Fix Shell Bell / Clefairy Doll trigger tracking if trueDamageDealt is missing.
 
@@ -2809,21 +3876,15 @@ def apply_shellbell_fix():
     """
     path = JS_ROOT / "game" / "component" / "Enemy.js"
     content = read_file(path)
+    hits = SHELLBELL_FIX_ANCHORS.scan(content)
 
     # Already present in vanilla or other patches (supports both capped and uncapped forms)
-    if 'pokemon.trueDamageDealt' in content and 'totalTrueDamageDealt' in content:
+    if hits['trueDamageDealt'].found and hits['totalTrueDamageDealt'].found:
         log_skip("Enemy.js: Shell Bell / Clefairy Doll fix")
         return True
 
-    # Find the damageDealt increment line and add trueDamageDealt tracking with overkill-safe min
-    old = "    this.main.area.totalDamageDealt += amount;\n\t    pokemon.damageDealt += amount;"
-    new = ("    this.main.area.totalDamageDealt += amount;\n"
-           "\t    pokemon.damageDealt += amount;\n\n"
-           "\t    this.main.area.totalTrueDamageDealt += Math.min((this.hp + this.armor), amount);\n"
-           "\t    pokemon.trueDamageDealt += Math.min((this.hp + this.armor), amount);")
-
-    if old in content:
-        content = content.replace(old, new, 1)
+    content = SHELLBELL_FIX_ANCHORS.splice(content, hits)
+    if hits['damageDealt']:
         write_file(path, content)
         log_success("Enemy.js: Shell Bell / Clefairy Doll fix (trueDamageDealt increment)")
         return True
@@ -2835,37 +3896,40 @@ def apply_shellbell_fix():
 # ============================================================================
 # SCENES.CSS - Fix emoji rendering in pixel font
 # ============================================================================
+EMOJI_FONT = "font-family: 'Segoe UI Emoji', 'Apple Color Emoji', 'Noto Color Emoji', sans-serif;"
+
+EMOJI_MSRRE_RULE = ".msrre {\n\tvertical-align: middle;\n\tposition: relative;\n\ttop: -4px; /* ajusta seg\u00fan se necesite */\n}"
+EMOJI_MSRRE_RULE_MODDED = ".msrre {\n\tvertical-align: middle;\n\tposition: relative;\n\ttop: -4px; /* ajusta seg\u00fan se necesite */\n\tfont-family: 'Segoe UI Emoji', 'Apple Color Emoji', 'Noto Color Emoji', sans-serif;\n}"
+
+def _append_emoji_font(match):
+    """Regex rule fallback: insert the emoji font before the closing brace."""
+    return match.group(1) + '\n\t' + EMOJI_FONT + '\n' + match.group(2)
+
+EMOJI_FONT_ANCHORS = declare_anchors('apply_emoji_font_fix', 'src/css/scenes.css',
+    Anchor('emoji font', "'Segoe UI Emoji'"),
+    Anchor('msrre', '.msrre'),
+    # Unrecognised builds: regex insert before closing brace of .msrre
+    Anchor('msrre rule', {
+        '1.5.4': EMOJI_MSRRE_RULE,
+        '*': re.compile(r'(\.msrre\s*\{[^}]*)(})'),
+    }, lambda m: EMOJI_MSRRE_RULE_MODDED if m.group(0) == EMOJI_MSRRE_RULE else _append_emoji_font(m)),
+)
+
 def apply_emoji_font_fix():
     """Add emoji font-family to .msrre so star emoji renders with PressStart2P."""
     path = APP_EXTRACTED / "src" / "css" / "scenes.css"
     content = read_file(path)
+    hits = EMOJI_FONT_ANCHORS.scan(content)
 
-    if "'Segoe UI Emoji'" in content:
-        log_skip("scenes.css: Emoji font fix")
-        return True
-
-    if '.msrre' not in content:
+    if hits['emoji font'].found or not hits['msrre'].found:
         log_skip("scenes.css: Emoji font fix")
         return True
 
-    old = ".msrre {\n\tvertical-align: middle;\n\tposition: relative;\n\ttop: -4px; /* ajusta seg\u00fan se necesite */\n}"
-
-    new = ".msrre {\n\tvertical-align: middle;\n\tposition: relative;\n\ttop: -4px; /* ajusta seg\u00fan se necesite */\n\tfont-family: 'Segoe UI Emoji', 'Apple Color Emoji', 'Noto Color Emoji', sans-serif;\n}"
-
-    if old in content:
-        content = content.replace(old, new)
-        write_file(path, content)
-        log_success("scenes.css: Emoji font fix")
-        return True
-
-    # Fallback: regex insert before closing brace of .msrre
-    pattern = r'(\.msrre\s*\{[^}]*)(})'
-    match = re.search(pattern, content)
-    if match and "'Segoe UI Emoji'" not in match.group(1):
-        insert = "\n\tfont-family: 'Segoe UI Emoji', 'Apple Color Emoji', 'Noto Color Emoji', sans-serif;\n"
-        content = content[:match.end(1)] + insert + content[match.start(2):]
+    content = EMOJI_FONT_ANCHORS.splice(content, hits)
+    hit = hits['msrre rule']
+    if hit:
         write_file(path, content)
-        log_success("scenes.css: Emoji font fix (regex)")
+        log_success("scenes.css: Emoji font fix" + (" (regex)" if isinstance(hit.pattern, re.Pattern) else ""))
         return True
 
     log_fail("scenes.css: Emoji font fix")
@@ -2874,44 +3938,48 @@ def apply_emoji_font_fix():
 # ============================================================================
 # UI.CSS - Fix emoji rendering for lock icon and speed button
 # ============================================================================
+UI_EMOJI_LOCK_RULE = ".lock {\n\tfilter: grayscale(50%);\n\topacity: 0.8;\n\tline-height: 66px;\n\tfont-size: 30px;\n}"
+UI_EMOJI_LOCK_RULE_MODDED = f".lock {{\n\tfilter: grayscale(50%);\n\topacity: 0.8;\n\tline-height: 66px;\n\tfont-size: 30px;\n\t{EMOJI_FONT}\n}}"
+
+UI_EMOJI_FONT_ANCHORS = declare_anchors('apply_ui_emoji_font_fix', 'src/css/ui.css',
+    Anchor('emoji font', "'Segoe UI Emoji'"),
+    Anchor('lock rule body', re.compile(r'\.lock \{(?:(?!\.lock \{)[^}])*')),
+    # Fix .lock class (regex fallback on unrecognised builds)
+    Anchor('lock rule', {
+        '1.5.4': UI_EMOJI_LOCK_RULE,
+        '*': re.compile(r'(\.lock\s*\{[^}]*)(})'),
+    }, lambda m: UI_EMOJI_LOCK_RULE_MODDED if m.group(0) == UI_EMOJI_LOCK_RULE else _append_emoji_font(m)),
+    # The speed-wave shares a rule with pause-wave, then has its own. Add to shared rule.
+    Anchor('speed/pause wave rule', re.compile(r'(\.ui-speed-wave,\s*\.ui-pause-wave\s*\{[^}]*)(})'),
+           _append_emoji_font),
+)
+
 def apply_ui_emoji_font_fix():
     """Add emoji font-family to .lock and .ui-speed-wave so ?? and ?? render correctly."""
     path = APP_EXTRACTED / "src" / "css" / "ui.css"
     content = read_file(path)
-    
-    emoji_font = "font-family: 'Segoe UI Emoji', 'Apple Color Emoji', 'Noto Color Emoji', sans-serif;"
-    changes = 0
-    
-    # Fix .lock class
-    if '.lock {' in content and "'Segoe UI Emoji'" not in content.split('.lock {')[1].split('}')[0]:
-        old_lock = ".lock {\n\tfilter: grayscale(50%);\n\topacity: 0.8;\n\tline-height: 66px;\n\tfont-size: 30px;\n}"
-        new_lock = f".lock {{\n\tfilter: grayscale(50%);\n\topacity: 0.8;\n\tline-height: 66px;\n\tfont-size: 30px;\n\t{emoji_font}\n}}"
-        if old_lock in content:
-            content = content.replace(old_lock, new_lock)
-            changes += 1
-        else:
-            # Regex fallback
-            pattern = r'(\.lock\s*\{[^}]*)(})'
-            match = re.search(pattern, content)
-            if match and "'Segoe UI Emoji'" not in match.group(1):
-                content = content[:match.end(1)] + f"\n\t{emoji_font}\n" + content[match.start(2):]
-                changes += 1
-    
-    # Fix .ui-speed-wave class
-    speed_section = content.split('.ui-speed-wave,')[0] if '.ui-speed-wave,' in content else ''
-    # The speed-wave shares a rule with pause-wave, then has its own. Add to shared rule.
-    shared_pattern = r'(\.ui-speed-wave,\s*\.ui-pause-wave\s*\{[^}]*)(})'
-    match = re.search(shared_pattern, content)
-    if match and "'Segoe UI Emoji'" not in match.group(1):
-        content = content[:match.end(1)] + f"\n\t{emoji_font}\n" + content[match.start(2):]
-        changes += 1
-    
+    hits = UI_EMOJI_FONT_ANCHORS.scan(content)
+
+    def has_emoji_font(name):
+        start, end, _ = hits[name].spans[0]
+        return "'Segoe UI Emoji'" in content[start:end]
+
+    skip = set()
+    if not hits['lock rule body'].found or has_emoji_font('lock rule body'):
+        skip.add('lock rule')
+    elif hits['lock rule'].found and has_emoji_font('lock rule'):
+        skip.add('lock rule')
+    if hits['speed/pause wave rule'].found and has_emoji_font('speed/pause wave rule'):
+        skip.add('speed/pause wave rule')
+
+    content = UI_EMOJI_FONT_ANCHORS.splice(content, hits, skip=skip)
+    changes = sum(1 for hit in hits if hit)
     if changes > 0:
         write_file(path, content)
         log_success(f"ui.css: Emoji font fix ({changes} rules)")
         return True
     
-    if "'Segoe UI Emoji'" in content:
+    if hits['emoji font'].found:
         log_skip("ui.css: Emoji font fix")
         return True
     
@@ -2921,6 +3989,23 @@ def apply_ui_emoji_font_fix():
 # ============================================================================
 # AREA.JS - Clamp wave numbers to 100 (when Endless Mode is NOT installed)
 # ============================================================================
+STAR_DISPLAY_CAPPED = 'const cappedStars = this.main.player.records.reduce((sum, r) => sum + Math.min(100, r), 0); this.playerStars.innerHTML = `<span class="msrre">\u2b50</span>${cappedStars}`;'
+
+STAR_DISPLAY_ANCHORS = declare_anchors('apply_star_display_cap', 'src/js/game/UI.js',
+    Anchor('cappedStars', 'cappedStars'),
+    Anchor('playerStars', 'playerStars'),
+    # Vanilla caps changed over time (1200 in older builds, 2000 in 1.5), so
+    # match any Math.min(<number>, this.main.player.stars) form; the modded
+    # UI.js shows raw stars without Math.min.
+    Anchor('star display line', (
+        re.compile(r'this\.playerStars\.innerHTML\s*=\s*`<span class="msrre">.*?</span>\$\{Math\.min\(\d+,\s*this\.main\.player\.stars\)\}`;'),
+        re.compile(r'this\.playerStars\.innerHTML\s*=\s*`<span class="msrre">.*?</span>\$\{this\.main\.player\.stars\}`;'),
+    ), lambda m: STAR_DISPLAY_CAPPED, count=0),
+    # Fallback: handle newer vanilla caps without depending on the exact number
+    Anchor('stars cap', re.compile(r'Math\.min\(\d+,\s*this\.main\.player\.stars\)'),
+           lambda m: 'this.main.player.records.reduce((sum, r) => sum + Math.min(100, r), 0)'),
+)
+
 def apply_star_display_cap():
     """
     Surgically patch UI.js to cap the star display when Endless Mode is not installed.
@@ -2932,43 +4017,16 @@ def apply_star_display_cap():
     # Try UI.modded.js first, fall back to vanilla UI.js
     path = JS_ROOT / "game" / "UI.js"
     content = read_file(path)
+    hits = STAR_DISPLAY_ANCHORS.scan(content)
     
     # Check if already applied
-    if 'cappedStars' in content:
+    if hits['cappedStars'].found:
         log_skip("UI.js: Star display cap")
         return True
     
-    # Find and replace the star display line.
-    # Vanilla caps changed over time (1200 in older builds, 2000 in 1.5),
-    # so match any Math.min(<number>, this.main.player.stars) form.
-    old_pattern = r'this\.playerStars\.innerHTML\s*=\s*`<span class="msrre">.*?</span>\$\{Math\.min\(\d+,\s*this\.main\.player\.stars\)\}`;'
-    match = re.search(old_pattern, content)
-    
-    if match:
-        new_line = 'const cappedStars = this.main.player.records.reduce((sum, r) => sum + Math.min(100, r), 0); this.playerStars.innerHTML = `<span class="msrre">\u2b50</span>${cappedStars}`;'
-        content = content.replace(match.group(0), new_line)
-        write_file(path, content)
-        log_success("UI.js: Star display capped (100 per route without Endless)")
-        return True
-    
-    # Try matching the modded UI.js pattern (shows raw stars without Math.min)
-    modded_pattern = r'this\.playerStars\.innerHTML\s*=\s*`<span class="msrre">.*?</span>\$\{this\.main\.player\.stars\}`;'
-    match2 = re.search(modded_pattern, content)
-    if match2:
-        new_line = 'const cappedStars = this.main.player.records.reduce((sum, r) => sum + Math.min(100, r), 0); this.playerStars.innerHTML = `<span class="msrre">\u2b50</span>${cappedStars}`;'
-        content = content.replace(match2.group(0), new_line)
-        write_file(path, content)
-        log_success("UI.js: Star display capped (100 per route without Endless)")
-        return True
-    
-    # Fallback: handle newer vanilla caps without depending on the exact number
-    fallback_match = re.search(r'Math\.min\(\d+,\s*this\.main\.player\.stars\)', content)
-    if fallback_match and 'playerStars' in content:
-        content = content.replace(
-            fallback_match.group(0),
-            'this.main.player.records.reduce((sum, r) => sum + Math.min(100, r), 0)',
-            1
-        )
+    skip = ('stars cap',) if hits['star display line'].found or not hits['playerStars'].found else ()
+    content = STAR_DISPLAY_ANCHORS.splice(content, hits, skip=skip)
+    if hits['star display line'] or hits['stars cap']:
         write_file(path, content)
         log_success("UI.js: Star display capped (100 per route without Endless)")
         return True
@@ -2977,6 +4035,15 @@ def apply_star_display_cap():
     return False
 
 
+STAR_RECORD_ANCHORS = declare_anchors('apply_star_record_cap', 'src/js/game/UI.js',
+    Anchor('capped record', 'Math.min(100, this.main.player.records[this.main.area.map.id])'),
+    Anchor('Math.min(100', 'Math.min(100'),
+    Anchor('mapRecord', 'mapRecord'),
+    # Match the modded line
+    Anchor('record line', 'this.mapRecord.innerHTML = `<span class="msrre">\u2b50</span>${this.main.player.records[this.main.area.map.id]}`;',
+           'this.mapRecord.innerHTML = `<span class="msrre">\u2b50</span>${Math.min(100, this.main.player.records[this.main.area.map.id])}`;', count=0),
+)
+
 def apply_star_record_cap():
     """Cap the per-route record star display (mapRecord) at 100 when Endless isn't installed.
     
@@ -2985,23 +4052,20 @@ def apply_star_record_cap():
     """
     path = JS_ROOT / "game" / "UI.js"
     content = read_file(path)
+    hits = STAR_RECORD_ANCHORS.scan(content)
     
-    if 'Math.min(100, this.main.player.records[this.main.area.map.id])' in content:
+    if hits['capped record'].found:
         log_skip("UI.js: Map record star cap")
         return True
     
-    # Match the modded line
-    old_record = 'this.mapRecord.innerHTML = `<span class="msrre">\u2b50</span>${this.main.player.records[this.main.area.map.id]}`;'
-    new_record = 'this.mapRecord.innerHTML = `<span class="msrre">\u2b50</span>${Math.min(100, this.main.player.records[this.main.area.map.id])}`;'
-    
-    if old_record in content:
-        content = content.replace(old_record, new_record)
+    content = STAR_RECORD_ANCHORS.splice(content, hits)
+    if hits['record line']:
         write_file(path, content)
         log_success("UI.js: Map record star capped at 100")
         return True
     
     # Try vanilla pattern (has Math.min(100, ...))
-    if 'Math.min(100' in content and 'mapRecord' in content:
+    if hits['Math.min(100'].found and hits['mapRecord'].found:
         log_skip("UI.js: Map record star cap (vanilla already caps)")
         return True
     
@@ -3009,6 +4073,33 @@ def apply_star_record_cap():
     return True
 
 
+WAVE_CLAMP_ANCHORS = declare_anchors('apply_wave_clamp', 'src/js/game/core/Area.js',
+    # Area.modded.js (has ENDLESS MODE markers) needs no clamp
+    Anchor('ENDLESS MODE', 'ENDLESS MODE'),
+    Anchor('endlessMode', 'endlessMode'),
+    Anchor('spawnEndlessWave', 'spawnEndlessWave'),
+    Anchor('applied marker', '// MOD: WAVE CLAMP'),
+    # 1. Clamp waveNumber after it's read from routeWaves in loadArea
+    Anchor('loadArea wave', 'this.waveNumber = this.routeWaves[routeNumber];\n\t\tthis.waveActive = false;',
+           'this.waveNumber = this.routeWaves[routeNumber];\n'
+                       '\t\t// MOD: WAVE CLAMP - Cap at 100 when Endless Mode is not installed\n'
+                       '\t\tif (this.waveNumber > 100) {\n'
+                       '\t\t\tthis.waveNumber = 100;\n'
+                       '\t\t\tthis.routeWaves[routeNumber] = 100;\n'
+                       '\t\t}\n'
+                       '\t\tthis.waveActive = false;', count=0),
+    # 2. Clamp in changeWave (wave selector) — prevent jumping past 100
+    Anchor('changeWave', 'this.waveNumber = nextWave;\n\t\tthis.routeWaves[this.routeNumber] = nextWave;',
+           '// MOD: WAVE CLAMP\n'
+                  '\t\tthis.waveNumber = Math.min(100, nextWave);\n'
+                  '\t\tthis.routeWaves[this.routeNumber] = Math.min(100, nextWave);', count=0),
+    # 3. Guard waves[waveNumber] accesses with optional chaining where possible
+    Anchor('preview accessor', 'this.waves[this.waveNumber].preview[0]',
+           '(this.waves[this.waveNumber]?.preview?.[0] || this.waves[1]?.preview?.[0])', count=0),
+    Anchor('offSet accessor', "this.waves[this.waveNumber].offSet || 50",
+           "(this.waves[this.waveNumber]?.offSet || this.waves[((this.waveNumber - 1) % 100) + 1]?.offSet || 50)", count=0),
+)
+
 def apply_wave_clamp():
     """
     Surgically patch Area.js to clamp waveNumber to 100.
@@ -3022,60 +4113,24 @@ def apply_wave_clamp():
     """
     path = JS_ROOT / "game" / "core" / "Area.js"
     
-    if not path.exists():
+    if not game_file_exists(path):
         log_skip("Area.js: Wave clamp (file not found)")
         return True
     
     content = read_file(path)
+    hits = WAVE_CLAMP_ANCHORS.scan(content)
     
-    # If this is Area.modded.js (has ENDLESS MODE markers), don't clamp
-    if 'ENDLESS MODE' in content or 'endlessMode' in content or 'spawnEndlessWave' in content:
+    if hits['ENDLESS MODE'].found or hits['endlessMode'].found or hits['spawnEndlessWave'].found:
         log_skip("Area.js: Wave clamp (Endless Mode detected, not needed)")
         return True
     
     # Check if already applied
-    if '// MOD: WAVE CLAMP' in content:
+    if hits['applied marker'].found:
         log_skip("Area.js: Wave clamp")
         return True
     
-    changes = 0
-    
-    # 1. Clamp waveNumber after it's read from routeWaves in loadArea
-    old_wave_assign = 'this.waveNumber = this.routeWaves[routeNumber];\n\t\tthis.waveActive = false;'
-    new_wave_assign = ('this.waveNumber = this.routeWaves[routeNumber];\n'
-                       '\t\t// MOD: WAVE CLAMP - Cap at 100 when Endless Mode is not installed\n'
-                       '\t\tif (this.waveNumber > 100) {\n'
-                       '\t\t\tthis.waveNumber = 100;\n'
-                       '\t\t\tthis.routeWaves[routeNumber] = 100;\n'
-                       '\t\t}\n'
-                       '\t\tthis.waveActive = false;')
-    
-    if old_wave_assign in content:
-        content = content.replace(old_wave_assign, new_wave_assign)
-        changes += 1
-    
-    # 2. Clamp in changeWave (wave selector) — prevent jumping past 100
-    old_change = 'this.waveNumber = nextWave;\n\t\tthis.routeWaves[this.routeNumber] = nextWave;'
-    new_change = ('// MOD: WAVE CLAMP\n'
-                  '\t\tthis.waveNumber = Math.min(100, nextWave);\n'
-                  '\t\tthis.routeWaves[this.routeNumber] = Math.min(100, nextWave);')
-    
-    if old_change in content:
-        content = content.replace(old_change, new_change)
-        changes += 1
-    
-    # 3. Guard waves[waveNumber] accesses with optional chaining where possible
-    # Pattern: this.waves[this.waveNumber].preview[0]
-    content = content.replace(
-        'this.waves[this.waveNumber].preview[0]',
-        '(this.waves[this.waveNumber]?.preview?.[0] || this.waves[1]?.preview?.[0])'
-    )
-    
-    # Pattern: this.waves[this.waveNumber].offSet
-    content = content.replace(
-        "this.waves[this.waveNumber].offSet || 50",
-        "(this.waves[this.waveNumber]?.offSet || this.waves[((this.waveNumber - 1) % 100) + 1]?.offSet || 50)"
-    )
+    content = WAVE_CLAMP_ANCHORS.splice(content, hits)
+    changes = sum(1 for name in ('loadArea wave', 'changeWave') if hits[name])
     
     if changes > 0:
         write_file(path, content)
@@ -3245,24 +4300,95 @@ app.setPath('userData', moddedPath);
     return True
 
 
-def apply_selected_mods(selected_features: list, progress_callback=None):
+def _check_game_build(source, allow_unknown=False):
+    """Identify the game build before touching anything.
+    
+    Returns:
+        tuple: (ok: bool, version_warning: str or None). ok is False for an
+        unknown build unless allow_unknown is set.
+    """
+    build, mismatches = identify_game_build(source)
+    if build:
+        print(f"  [OK] Game build recognised: v{build['game_version']} "
+              f"({build.get('platform', '?')}, matched by {build['matched_by']}), "
+              f"patch profile: {PATCH_PROFILE or 'all variants'}")
+        return True, None
+    version_warning = (f"Unknown game build! This mod is built for game v{GAME_VERSION}.\n"
+                       f"Mismatched files: {', '.join(m.split(':')[0] for m in mismatches)}\n"
+                       f"The mod may not work correctly.")
+    if not allow_unknown:
+        print(f"\n  [FAIL] {version_warning}")
+        return False, version_warning
+    print(f"\n  [WARNING] {version_warning}")
+    return True, version_warning
+
+def build_install_plan(selected_features):
+    """Ordered, de-duplicated list of patch functions for a feature selection.
+
+    Includes the always-on steps (userData redirect, debug diagnostics) and the
+    safety patches that only apply when a feature is NOT selected.
+    """
+    functions_to_call = []
+    for feature_key in selected_features:
+        if feature_key in MOD_FEATURES:
+            functions_to_call.extend(MOD_FEATURES[feature_key]['functions'])
+
+    # Always apply userData redirect when any mod is selected
+    if selected_features:
+        functions_to_call.append('apply_modded_userdata_redirect')
+
+    # Enforce anti-duplicate behavior when Allow Duplicate Pokemon is NOT selected
+    if 'allow_dupes' not in selected_features:
+        functions_to_call.append('apply_force_no_dupes')
+
+    # Apply wave clamp + star display cap if Endless Mode is NOT selected
+    # Prevents crashes when a save has wave > 100 but Endless isn't installed
+    # Also caps star display so endless records don't inflate the total
+    if 'endless' not in selected_features:
+        functions_to_call.extend(['apply_wave_clamp', 'apply_star_display_cap', 'apply_star_record_cap'])
+
+    functions_to_call.append('apply_debug_diagnostics')
+
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_functions = []
+    for f in functions_to_call:
+        if f not in seen:
+            seen.add(f)
+            unique_functions.append(f)
+    return unique_functions
+
+def apply_selected_mods(selected_features: list, progress_callback=None, incremental=True, overlay=True,
+                        allow_unknown_build=False):
     """
     Apply only selected mod features.
     
     Flow:
-    1. Ensure vanilla backup exists (create from app.asar if needed)
-    2. Extract fresh from vanilla backup (clean slate every time)
+    1. Ensure vanilla backup exists (create from app.asar if needed) and
+       identify the game build by fingerprint; unknown builds are refused
+       (unless no features are selected, i.e. restoring vanilla).
+       If this feature set was built before, the cached app.asar is put in
+       place and steps 2-4 are skipped
+    2. Overlay mode (default): read the patch targets straight out of
+       app.asar.vanilla, nothing is extracted. Otherwise extract fresh from
+       the vanilla backup (clean slate every time), or - in incremental
+       mode - restore only the files whose patch chain changed since the
+       last install
     3. Apply selected mod features
-    4. Repack into app.asar
+    4. Repack into app.asar (skipped if nothing changed and app.asar is ours)
     
     Args:
         selected_features: List of feature keys from MOD_FEATURES
         progress_callback: Optional callback(current, total, message) for GUI progress
+        incremental: Reuse the previous install when its manifest matches, or a
+            cached build of the same feature set
+        overlay: Patch in memory against the vanilla asar instead of app_extracted/
+        allow_unknown_build: Patch anyway (with a warning) if the build isn't recognised
     
     Returns:
         tuple: (success: bool, applied: list, failed: list)
     """
-    global applied_mods, failed_mods
+    global applied_mods, failed_mods, _install_tracker, _session
     applied_mods = []
     failed_mods = []
     
@@ -3275,139 +4401,191 @@ def apply_selected_mods(selected_features: list, progress_callback=None):
     if not backup_ok:
         return False, [], [backup_msg]
     
-    # Step 2: Extract fresh from vanilla
-    print("\n[*] Extracting vanilla game files...")
-    if progress_callback:
-        progress_callback(0, 1, "Extracting vanilla game files...")
-    
-    extract_ok, extract_msg = extract_from_vanilla(progress_callback)
-    if not extract_ok:
-        return False, [], [extract_msg]
-    
-    # Step 2b: Verify game version compatibility
-    compatible, mismatches = check_game_version_compatibility()
-    if not compatible:
-        warning = (f"Game version mismatch! This mod is built for game v{GAME_VERSION}.\n"
-                   f"Mismatched files: {', '.join(m.split(':')[0] for m in mismatches)}\n"
-                   f"The mod may not work correctly.")
-        print(f"\n  [WARNING] {warning}")
-        # Don't block in GUI mode - just warn. The GUI can check return value.
-        failed_mods.append(f"VERSION WARNING: {warning}")
-    else:
-        print(f"  [OK] Game files match expected version ({GAME_VERSION})")
-    
-    # Build list of functions to call
-    functions_to_call = []
-    for feature_key in selected_features:
-        if feature_key in MOD_FEATURES:
-            functions_to_call.extend(MOD_FEATURES[feature_key]['functions'])
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_functions = []
-    for f in functions_to_call:
-        if f not in seen:
-            seen.add(f)
-            unique_functions.append(f)
-    
-    total = len(unique_functions) + 1  # +1 for repack
-    current = 0
-    
-    # Step 3: Apply selected mods
-    print("\n[*] Applying selected mods...")
-    
-    # Get function references from globals
-    for func_name in unique_functions:
-        current += 1
-        if progress_callback:
-            progress_callback(current, total, f"Applying {func_name}...")
-        
-        func = globals().get(func_name)
-        if func and callable(func):
-            try:
-                func()
-            except Exception as e:
-                failed_mods.append(f"{func_name}: {str(e)}")
-        else:
-            failed_mods.append(f"{func_name}: function not found")
-    
-    # Step 4: Always apply userData redirect when any mod is selected
+    source = APP_ASAR_VANILLA if APP_ASAR_VANILLA.exists() else APP_ASAR
+    # Restoring vanilla (no features) only runs the anchor-based safety
+    # patches, which leave a file alone when their anchor isn't found
     if selected_features:
+        build_ok, version_warning = _check_game_build(source, allow_unknown_build)
+        if not build_ok:
+            return False, [], [f"VERSION WARNING: {version_warning}"]
+    else:
+        identify_game_build(source)
+        version_warning = None
+    
+    unique_functions = build_install_plan(selected_features)
+    prev = _load_install_manifest() if incremental else None
+    plan = None
+    in_place = False
+    
+    # Step 1b: Reuse an earlier build of this exact feature set if one is cached
+    cache_key = _build_cache_key(selected_features) if overlay and source == APP_ASAR_VANILLA else None
+    cached = _cache_lookup(cache_key) if incremental else None
+    if cached is not None:
         if progress_callback:
-            progress_callback(current + 1, total, "Applying userData redirect...")
+            progress_callback(0, 1, "Reusing cached build...")
+        if prev and prev.get('mode', 'extract') == 'extract':
+            _discard_install_manifest()  # app_extracted/ no longer matches app.asar
+        if _install_cached_build(cache_key, cached, source):
+            _remove_stale_extraction()
+            applied_mods, failed_mods = list(cached['applied']), list(cached['failed'])
+            if selected_features:
+                _setup_modded_saves(selected_features, progress_callback, 1)
+            return True, applied_mods.copy(), failed_mods.copy()
+    
+    if overlay and source == APP_ASAR_VANILLA:
         try:
-            apply_modded_userdata_redirect()
+            _session = _AsarOverlay(source)
+            in_place = True
         except Exception as e:
-            failed_mods.append(f"userData redirect: {str(e)}")
+            print(f"  [WARN] Can't patch {source.name} in place, extracting instead: {e}")
     
-    # Step 4b: Enforce anti-duplicate behavior when Allow Duplicate Pokemon is NOT selected
-    if 'allow_dupes' not in selected_features:
-        try:
-            apply_force_no_dupes()
-        except Exception as e:
-            failed_mods.append(f"force no dupes: {str(e)}")
-
-    # Step 4c: Apply wave clamp + star display cap if Endless Mode is NOT selected
-    # Prevents crashes when a save has wave > 100 but Endless isn't installed
-    # Also caps star display so endless records don't inflate the total
-    if 'endless' not in selected_features:
-        try:
-            apply_wave_clamp()
-        except Exception as e:
-            failed_mods.append(f"wave clamp: {str(e)}")
-        try:
-            apply_star_display_cap()
-        except Exception as e:
-            failed_mods.append(f"star display cap: {str(e)}")
-        try:
-            apply_star_record_cap()
-        except Exception as e:
-            failed_mods.append(f"star record cap: {str(e)}")
-    
-    # Step 4d: Apply debug diagnostics
-    if progress_callback:
-        progress_callback(current + 1, total, "Applying debug diagnostics...")
     try:
-        apply_debug_diagnostics()
-    except Exception as e:
-        failed_mods.append(f"debug diagnostics: {str(e)}")
-    
-    # Step 5: Repack
-    if progress_callback:
-        progress_callback(total, total, "Repacking game...")
-    
-    repack_success = _repack_game()
-    
-    # Step 6: Set up modded saves (after repack, so game files are ready)
-    if selected_features and repack_success:
+        if in_place:
+            # Step 2 (overlay): files are pulled from the vanilla asar on demand
+            print(f"\n[*] Patching game files in place from {source.name} (no extraction)...")
+            if prev and prev.get('mode', 'extract') == 'extract':
+                _discard_install_manifest()  # stash belongs to an on-disk install
+            rerun = list(unique_functions)
+            restored = 0
+            _install_tracker = _InstallTracker(stash=False)
+        else:
+            plan = _plan_incremental(unique_functions, prev, source) if prev else None
+        
+        if not in_place and plan is None:
+            # Step 2: Extract fresh from vanilla
+            print("\n[*] Extracting vanilla game files...")
+            if progress_callback:
+                progress_callback(0, 1, "Extracting vanilla game files...")
+            
+            extract_ok, extract_msg = extract_from_vanilla(progress_callback)
+            if not extract_ok:
+                return False, [], [extract_msg]
+            
+            rerun = list(unique_functions)
+            restored = 0
+            _install_tracker = _InstallTracker()
+        elif not in_place:
+            # Step 2 (incremental): restore only the files whose patch chain changed
+            rerun, dirty = plan
+            print(f"\n[*] Incremental install: {len(rerun)} of {len(unique_functions)} patch steps affected")
+            if progress_callback:
+                progress_callback(0, 1, "Restoring changed files from vanilla...")
+            _install_tracker = _InstallTracker(prev.get('vanilla'))
+            # Drop the manifest while the tree is in flux; it's rewritten at the end
+            INSTALL_MANIFEST.unlink()
+            restored = _restore_from_stash(dirty, _install_tracker.vanilla)
+            print(f"  [OK] Restored {restored} file(s) from vanilla stash")
+        
+        if version_warning:
+            # Don't block in GUI mode - just warn. The GUI can check return value.
+            failed_mods.append(f"VERSION WARNING: {version_warning}")
+        
+        total = len(unique_functions) + 1  # +1 for repack
+        
+        # Step 3: Apply selected mods (buffered; files are written once at the end)
+        print("\n[*] Applying selected mods...")
+        if not in_place:
+            _session = _PatchSession()
+        
+        try:
+            functions = _run_patch_steps(unique_functions, rerun, prev, progress_callback, total)
+            if in_place:
+                outputs = _session.output_hashes()
+            else:
+                _session.flush()
+                outputs = {
+                    rel: _hash_file(APP_EXTRACTED / rel)
+                    for record in functions.values() for rel in record['writes']
+                }
+            manifest = {
+                'format': MANIFEST_FORMAT,
+                'mode': 'overlay' if in_place else 'extract',
+                'mod_version': MOD_VERSION,
+                'source': _source_fingerprint(source),
+                'version_warning': version_warning,
+                'profile': PATCH_PROFILE,
+                'order': unique_functions,
+                'functions': functions,
+                'vanilla': _install_tracker.vanilla,
+                'outputs': outputs,
+            }
+        finally:
+            _install_tracker = None
+        
+        # Step 4: Repack
         if progress_callback:
-            progress_callback(total, total, "Setting up modded saves...")
-        try:
-            import importlib
-            try:
-                from lib import save_manager
-            except ImportError:
-                import save_manager
-            importlib.reload(save_manager)
-            save_ok, save_msg = save_manager.setup_modded_saves()
-            save_manager.set_mod_flag()
-            # Write installed features manifest for save editor
-            import json
-            features_path = MODS_DIR / 'installed_features.json'
-            with open(features_path, 'w') as f:
-                json.dump(selected_features, f)
-            print(f"  [INFO] Save setup result: success={save_ok}, msg={save_msg}")
-            if not save_ok:
-                print(f"  [WARN] Save setup: {save_msg}")
-        except Exception as e:
-            import traceback
-            print(f"  [WARN] Save manager error: {e}")
-            traceback.print_exc()
+            progress_callback(total, total, "Repacking game...")
+        
+        asar_unchanged = prev is not None and prev.get('asar') == _source_fingerprint(APP_ASAR)
+        if plan is not None and not rerun and not restored and asar_unchanged:
+            print("  [OK] app.asar already matches this feature set, skipping repack")
+            repack_success = True
+        elif in_place:
+            # Same vanilla source + same patched bytes = same archive
+            if (asar_unchanged and prev.get('mode') == 'overlay'
+                    and prev.get('mod_version') == MOD_VERSION
+                    and prev.get('source') == manifest['source']
+                    and prev.get('outputs') == outputs):
+                print("  [OK] app.asar already matches this feature set, skipping repack")
+                repack_success = True
+            else:
+                repack_success = _write_overlay_asar()
+        else:
+            repack_success = _repack_game()
+    finally:
+        if _session is not None:
+            _session.close()
+            _session = None
+    
+    if repack_success:
+        manifest['asar'] = _source_fingerprint(APP_ASAR)
+    _save_install_manifest(manifest)
+    if repack_success and in_place:
+        _remove_stale_extraction()
+        _cache_store(cache_key, selected_features, manifest)
+    
+    # Step 5: Set up modded saves (after repack, so game files are ready)
+    if selected_features and repack_success:
+        _setup_modded_saves(selected_features, progress_callback, total)
     
     return repack_success, applied_mods.copy(), failed_mods.copy()
 
+def _setup_modded_saves(selected_features, progress_callback, total):
+    """Migrate saves to the modded profile and record the installed features."""
+    if progress_callback:
+        progress_callback(total, total, "Setting up modded saves...")
+    try:
+        import importlib
+        try:
+            from lib import save_manager
+        except ImportError:
+            import save_manager
+        importlib.reload(save_manager)
+        save_ok, save_msg = save_manager.setup_modded_saves()
+        save_manager.set_mod_flag()
+        # Write installed features manifest for save editor
+        import json
+        features_path = MODS_DIR / 'installed_features.json'
+        with open(features_path, 'w') as f:
+            json.dump(selected_features, f)
+        print(f"  [INFO] Save setup result: success={save_ok}, msg={save_msg}")
+        if not save_ok:
+            print(f"  [WARN] Save setup: {save_msg}")
+    except Exception as e:
+        import traceback
+        print(f"  [WARN] Save manager error: {e}")
+        traceback.print_exc()
+
 def _repack_game():
     """Repack the game asar. Returns True on success."""
+    # Native repack (no Node.js needed)
+    try:
+        asar.create_package(APP_EXTRACTED, APP_ASAR)
+        print("  [OK] Game repacked successfully!")
+        return True
+    except Exception as e:
+        print(f"  [WARN] Native repack failed, trying Node.js: {e}")
+    
     creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
     
     # Try local repack script first (more reliable)
@@ -3472,6 +4650,45 @@ def _repack_game():
 # ============================================================================
 # TEAM.JS - Allow duplicate Pokemon IDs
 # ============================================================================
+ALLOW_DUPES_TEAM_DEDUP = """		const seenIds = new Set();
+	    this.pokemon = this.pokemon.filter(p => {
+	        if (seenIds.has(p.id)) return false; // duplicado
+	        seenIds.add(p.id);
+	        return true;
+	    });"""
+
+ALLOW_DUPES_TEAM_ANCHORS = declare_anchors('apply_allow_dupes', 'src/js/game/core/Team.js',
+    Anchor('applied marker', '// MOD: Dedup filter removed'),
+    # Comment out the dedup filter block (either indentation style)
+    Anchor('dedup filter', (ALLOW_DUPES_TEAM_DEDUP, ALLOW_DUPES_TEAM_DEDUP.replace('\t    ', '\t\t')),
+           """		// MOD: Dedup filter removed — allow duplicate species IDs on team
+		// const seenIds = new Set();
+	    // this.pokemon = this.pokemon.filter(p => {
+	    //     if (seenIds.has(p.id)) return false;
+	    //     seenIds.add(p.id);
+	    //     return true;
+	    // });""", count=0),
+)
+
+# Box.js filters box Pokemon against team IDs, which removes Pokemon like
+# Cherubi (id:75) when Cherrim (id:75) is on team
+ALLOW_DUPES_BOX_ANCHORS = declare_anchors('apply_allow_dupes', 'src/js/game/core/Box.js',
+    Anchor('applied marker', '// MOD: Box dedup filter removed'),
+    Anchor('dedup filter', """        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
+        this.pokemon = this.pokemon.filter(p => {
+            if (seenIds.has(p.id)) return false; 
+            seenIds.add(p.id); 
+            return true;
+        });""",
+           """        // MOD: Box dedup filter removed — allow duplicate species IDs in box
+        // const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
+        // this.pokemon = this.pokemon.filter(p => {
+        //     if (seenIds.has(p.id)) return false; 
+        //     seenIds.add(p.id); 
+        //     return true;
+        // });""", count=0),
+)
+
 def apply_allow_dupes():
     """Remove the team deduplication filter that prevents duplicate species IDs.
     
@@ -3481,123 +4698,65 @@ def apply_allow_dupes():
     """
     path = JS_ROOT / "game" / "core" / "Team.js"
     content = read_file(path)
+    hits = ALLOW_DUPES_TEAM_ANCHORS.scan(content)
     
-    if '// MOD: Dedup filter removed' in content:
+    if hits['applied marker'].found:
         log_skip("Team.js: Allow dupes (already applied)")
         return True
     
-    # Find and comment out the dedup filter block
-    old_dedup = """		const seenIds = new Set();
-	    this.pokemon = this.pokemon.filter(p => {
-	        if (seenIds.has(p.id)) return false; // duplicado
-	        seenIds.add(p.id);
-	        return true;
-	    });"""
-    
-    new_dedup = """		// MOD: Dedup filter removed — allow duplicate species IDs on team
-		// const seenIds = new Set();
-	    // this.pokemon = this.pokemon.filter(p => {
-	    //     if (seenIds.has(p.id)) return false;
-	    //     seenIds.add(p.id);
-	    //     return true;
-	    // });"""
-    
-    if old_dedup not in content:
-        # Try alternate formatting (tabs vs spaces)
-        old_dedup_alt = old_dedup.replace('	    ', '\t\t')
-        if old_dedup_alt in content:
-            content = content.replace(old_dedup_alt, new_dedup)
-        else:
-            log_fail("Team.js: Allow dupes - dedup block not found (game version may differ)")
-            return False
-    else:
-        content = content.replace(old_dedup, new_dedup)
+    content = ALLOW_DUPES_TEAM_ANCHORS.splice(content, hits)
+    if not hits['dedup filter']:
+        log_fail("Team.js: Allow dupes - dedup block not found (game version may differ)")
+        return False
     
     write_file(path, content)
     log_success("Team.js: Allow duplicate Pokemon IDs")
 
-    # Also remove Box.js dedup filter — it filters box Pokemon against team IDs,
-    # which removes Pokemon like Cherubi (id:75) when Cherrim (id:75) is on team
     box_path = JS_ROOT / "game" / "core" / "Box.js"
     box_content = read_file(box_path)
+    box_hits = ALLOW_DUPES_BOX_ANCHORS.scan(box_content)
 
-    if '// MOD: Box dedup filter removed' in box_content:
+    if box_hits['applied marker'].found:
         log_skip("Box.js: Allow dupes (already applied)")
         return True
 
-    old_box_dedup = """        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
-        this.pokemon = this.pokemon.filter(p => {
-            if (seenIds.has(p.id)) return false; 
-            seenIds.add(p.id); 
-            return true;
-        });"""
-
-    new_box_dedup = """        // MOD: Box dedup filter removed — allow duplicate species IDs in box
-        // const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
-        // this.pokemon = this.pokemon.filter(p => {
-        //     if (seenIds.has(p.id)) return false; 
-        //     seenIds.add(p.id); 
-        //     return true;
-        // });"""
-
-    if old_box_dedup not in box_content:
+    box_content = ALLOW_DUPES_BOX_ANCHORS.splice(box_content, box_hits)
+    if not box_hits['dedup filter']:
         log_fail("Box.js: Allow dupes - dedup block not found (game version may differ)")
         return False
 
-    box_content = box_content.replace(old_box_dedup, new_box_dedup)
     write_file(box_path, box_content)
     log_success("Box.js: Allow duplicate Pokemon IDs in box")
     return True
 
 
-def apply_force_no_dupes():
-    """Force vanilla chain-level dedupe when allow_dupes is not selected.
-
-    In PokePath, evolution lines share the same specie.id, so id-based dedupe
-    naturally blocks same-chain duplicates (e.g. Charizard + Charmander).
-    Also guards runtime additions so duplicate eggs vanish instead of persisting.
-    """
-    team_path = JS_ROOT / "game" / "core" / "Team.js"
-    team_content = read_file(team_path)
+FORCE_NO_DUPES_TEAM_DEDUP = """		// MOD: Force no-dupes by shared specie.id (chain-level dedupe)
+		const seenIds = new Set();
+	    this.pokemon = this.pokemon.filter(p => {
+	        if (seenIds.has(p.id)) return false;
+	        seenIds.add(p.id);
+	        return true;
+	    });"""
 
-    team_old = """		const seenIds = new Set();
+FORCE_NO_DUPES_TEAM_ANCHORS = declare_anchors('apply_force_no_dupes', 'src/js/game/core/Team.js',
+    Anchor('applied dedup', FORCE_NO_DUPES_TEAM_DEDUP),
+    Anchor('applied guard', "if (this.pokemon.some(p => p.id === pokemon.id)) return false;"),
+    # Vanilla dedup block, or the one apply_allow_dupes commented out
+    Anchor('dedup block', ("""		const seenIds = new Set();
 	    this.pokemon = this.pokemon.filter(p => {
 	        if (seenIds.has(p.id)) return false; // duplicado
 	        seenIds.add(p.id);
 	        return true;
-	    });"""
-    team_old_allow = """		// MOD: Dedup filter removed — allow duplicate species IDs on team
+	    });""", """		// MOD: Dedup filter removed — allow duplicate species IDs on team
 		// const seenIds = new Set();
 	    // this.pokemon = this.pokemon.filter(p => {
 	    //     if (seenIds.has(p.id)) return false;
 	    //     seenIds.add(p.id);
 	    //     return true;
-	    // });"""
-    team_new = """		// MOD: Force no-dupes by shared specie.id (chain-level dedupe)
-		const seenIds = new Set();
-	    this.pokemon = this.pokemon.filter(p => {
-	        if (seenIds.has(p.id)) return false;
-	        seenIds.add(p.id);
-	        return true;
-	    });"""
-
-    if team_new in team_content:
-        log_skip("Team.js: Force no-dupes dedup block (already applied)")
-    elif team_old in team_content:
-        team_content = team_content.replace(team_old, team_new)
-        write_file(team_path, team_content)
-        log_success("Team.js: Force no-dupes by specie.id")
-    elif team_old_allow in team_content:
-        team_content = team_content.replace(team_old_allow, team_new)
-        write_file(team_path, team_content)
-        log_success("Team.js: Force no-dupes by specie.id")
-    else:
-        log_fail("Team.js: Force no-dupes - dedup block not found")
-        return False
-
+	    // });"""),
+           FORCE_NO_DUPES_TEAM_DEDUP, count=0),
     # Guard runtime additions (egg pulls, rewards, transfers)
-    team_content = read_file(team_path)
-    team_add_old = """\taddPokemon(pokemon) {
+    Anchor('addPokemon', """\taddPokemon(pokemon) {
 \t\tpokemon.inGroup = true;
 \t\tpokemon.damageDealt = 0;
 \t\tpokemon.trueDamageDealt = 0;
@@ -3614,8 +4773,8 @@ def apply_force_no_dupes():
 \t\tthis.pokemon.push(pokemon);
 \t\tif (this.main.UI.fastScene.isOpen) this.main.UI.fastScene.close();
 \t}
-"""
-    team_add_new = """\taddPokemon(pokemon) {
+""",
+           """\taddPokemon(pokemon) {
 \t\t// MOD: Force no-dupes by shared specie.id (chain-level dedupe)
 \t\tif (this.pokemon.some(p => p.id === pokemon.id)) return false;
 \n\t\tpokemon.inGroup = true;
@@ -3635,83 +4794,52 @@ def apply_force_no_dupes():
 \t\tif (this.main.UI.fastScene.isOpen) this.main.UI.fastScene.close();
 \t\treturn true;
 \t}
-"""
-    if "if (this.pokemon.some(p => p.id === pokemon.id)) return false;" in team_content:
-        log_skip("Team.js: Force no-dupes addPokemon guard")
-    elif team_add_old in team_content:
-        team_content = team_content.replace(team_add_old, team_add_new)
-        write_file(team_path, team_content)
-        log_success("Team.js: Runtime addPokemon no-dupe guard")
-    else:
-        log_fail("Team.js: Force no-dupes addPokemon block not found")
-        return False
-
-    box_path = JS_ROOT / "game" / "core" / "Box.js"
-    box_content = read_file(box_path)
+""", count=0),
+)
 
-    box_old = """        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
+FORCE_NO_DUPES_BOX_DEDUP = """        // MOD: Force no-dupes by shared specie.id (chain-level dedupe)
+        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
         this.pokemon = this.pokemon.filter(p => {
             if (seenIds.has(p.id)) return false; 
             seenIds.add(p.id); 
             return true;
         });"""
-    box_old_allow = """        // MOD: Box dedup filter removed — allow duplicate species IDs in box
+
+FORCE_NO_DUPES_BOX_ANCHORS = declare_anchors('apply_force_no_dupes', 'src/js/game/core/Box.js',
+    Anchor('applied dedup', FORCE_NO_DUPES_BOX_DEDUP),
+    Anchor('applied guard', "if (this.main.team.pokemon.some(p => p !== pokemon && p.id === pokemon.id)) return false;"),
+    Anchor('applied box guard', "if (this.pokemon.some(p => p.id === pokemon.id)) return false;"),
+    Anchor('dedup block', ("""        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
+        this.pokemon = this.pokemon.filter(p => {
+            if (seenIds.has(p.id)) return false; 
+            seenIds.add(p.id); 
+            return true;
+        });""", """        // MOD: Box dedup filter removed — allow duplicate species IDs in box
         // const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
         // this.pokemon = this.pokemon.filter(p => {
         //     if (seenIds.has(p.id)) return false; 
         //     seenIds.add(p.id); 
         //     return true;
-        // });"""
-    box_new = """        // MOD: Force no-dupes by shared specie.id (chain-level dedupe)
-        const seenIds = new Set(this.main.team.pokemon.map(p => p.id)); 
-        this.pokemon = this.pokemon.filter(p => {
-            if (seenIds.has(p.id)) return false; 
-            seenIds.add(p.id); 
-            return true;
-        });"""
-
-    if box_new in box_content:
-        log_skip("Box.js: Force no-dupes dedup block (already applied)")
-    elif box_old in box_content:
-        box_content = box_content.replace(box_old, box_new)
-        write_file(box_path, box_content)
-        log_success("Box.js: Force no-dupes by specie.id")
-    elif box_old_allow in box_content:
-        box_content = box_content.replace(box_old_allow, box_new)
-        write_file(box_path, box_content)
-        log_success("Box.js: Force no-dupes by specie.id")
-    else:
-        log_fail("Box.js: Force no-dupes - dedup block not found")
-        return False
-
-    box_content = read_file(box_path)
-    box_add_old = """\taddPokemon(pokemon) {
+        // });"""),
+           FORCE_NO_DUPES_BOX_DEDUP, count=0),
+    Anchor('addPokemon', """\taddPokemon(pokemon) {
 \t\tthis.pokemon.push(pokemon);
 \t}
-"""
-    box_add_new = """\taddPokemon(pokemon) {
+""",
+           """\taddPokemon(pokemon) {
 \t\t// MOD: Force no-dupes by shared specie.id (chain-level dedupe)
 \t\tif (this.main.team.pokemon.some(p => p !== pokemon && p.id === pokemon.id)) return false;
 \t\tif (this.pokemon.some(p => p.id === pokemon.id)) return false;
 \t\tthis.pokemon.push(pokemon);
 \t\treturn true;
 \t}
-"""
-    if "if (this.main.team.pokemon.some(p => p !== pokemon && p.id === pokemon.id)) return false;" in box_content and "if (this.pokemon.some(p => p.id === pokemon.id)) return false;" in box_content:
-        log_skip("Box.js: Force no-dupes addPokemon guard")
-    elif box_add_old in box_content:
-        box_content = box_content.replace(box_add_old, box_add_new)
-        write_file(box_path, box_content)
-        log_success("Box.js: Runtime addPokemon no-dupe guard")
-    else:
-        log_fail("Box.js: Force no-dupes addPokemon block not found")
-        return False
+""", count=0),
+)
 
-    # Ensure egg purchases handle guarded addPokemon return values.
-    shop_path = JS_ROOT / "game" / "core" / "Shop.js"
-    shop_content = read_file(shop_path)
-    if "const addedToTeam = this.main.team.addPokemon(newPokemon);" not in shop_content:
-        shop_old = """\t\tif (this.main.team.pokemon.length < this.main.player.teamSlots && typeof this.main.area.inChallenge.slotLimit != 'number') {
+# Ensure egg purchases handle guarded addPokemon return values.
+FORCE_NO_DUPES_SHOP_ANCHORS = declare_anchors('apply_force_no_dupes', 'src/js/game/core/Shop.js',
+    Anchor('applied marker', "const addedToTeam = this.main.team.addPokemon(newPokemon);"),
+    Anchor('buyEgg', """\t\tif (this.main.team.pokemon.length < this.main.player.teamSlots && typeof this.main.area.inChallenge.slotLimit != 'number') {
 \t\t\tconst newPokemon = new Pokemon(pokemon, 1, null, this.main);
 \t\t\tif (isShinyEgg) {
 \t\t\t\tnewPokemon.isShiny = true;
@@ -3733,8 +4861,8 @@ def apply_force_no_dupes():
 
 \t\tthis.main.player.stats.totalPokemonLevel++;
 \t\tthis.main.player.achievementProgress.evolutionCount++;
-"""
-        shop_new = """\t\tlet added = false;
+""",
+           """\t\tlet added = false;
 \t\tif (this.main.team.pokemon.length < this.main.player.teamSlots && typeof this.main.area.inChallenge.slotLimit != 'number') {
 \t\t\tconst newPokemon = new Pokemon(pokemon, 1, null, this.main);
 \t\t\tif (isShinyEgg) {
@@ -3760,56 +4888,77 @@ def apply_force_no_dupes():
 \t\t\tthis.main.player.stats.totalPokemonLevel++;
 \t\t\tthis.main.player.achievementProgress.evolutionCount++;
 \t\t}
-"""
-        if shop_old in shop_content:
-            shop_content = shop_content.replace(shop_old, shop_new)
-            write_file(shop_path, shop_content)
-            log_success("Shop.js: Egg duplicate pulls now vanish if no-dupes blocks add")
-        else:
-            log_fail("Shop.js: buyEgg block not found for no-dupes guard")
-            return False
+""", count=0),
+)
+
+def _force_no_dupes_file(path, anchor_set, guards):
+    """Swap one file's dedup block for the chain-level one and guard its
+    addPokemon; guards names the probes that mark the guard as applied."""
+    label = path.name
+    content = read_file(path)
+    hits = anchor_set.scan(content)
+    if not hits['applied dedup'].found and not hits['dedup block'].found:
+        log_fail(f"{label}: Force no-dupes - dedup block not found")
+        return False
+
+    skip = set()
+    if hits['applied dedup'].found:
+        skip.add('dedup block')
+    guarded = all(hits[name].found for name in guards)
+    if guarded:
+        skip.add('addPokemon')
+    content = anchor_set.splice(content, hits, skip=skip)
+    if hits['dedup block'] or hits['addPokemon']:
+        write_file(path, content)
+
+    if hits['dedup block']:
+        log_success(f"{label}: Force no-dupes by specie.id")
+    else:
+        log_skip(f"{label}: Force no-dupes dedup block (already applied)")
+
+    if guarded:
+        log_skip(f"{label}: Force no-dupes addPokemon guard")
+    elif hits['addPokemon']:
+        log_success(f"{label}: Runtime addPokemon no-dupe guard")
     else:
+        log_fail(f"{label}: Force no-dupes addPokemon block not found")
+        return False
+    return True
+
+def apply_force_no_dupes():
+    """Force vanilla chain-level dedupe when allow_dupes is not selected.
+
+    In PokePath, evolution lines share the same specie.id, so id-based dedupe
+    naturally blocks same-chain duplicates (e.g. Charizard + Charmander).
+    Also guards runtime additions so duplicate eggs vanish instead of persisting.
+    """
+    if not _force_no_dupes_file(JS_ROOT / "game" / "core" / "Team.js",
+                                FORCE_NO_DUPES_TEAM_ANCHORS, ('applied guard',)):
+        return False
+    if not _force_no_dupes_file(JS_ROOT / "game" / "core" / "Box.js",
+                                FORCE_NO_DUPES_BOX_ANCHORS, ('applied guard', 'applied box guard')):
+        return False
+
+    shop_path = JS_ROOT / "game" / "core" / "Shop.js"
+    shop_content = read_file(shop_path)
+    shop_hits = FORCE_NO_DUPES_SHOP_ANCHORS.scan(shop_content)
+    if shop_hits['applied marker'].found:
         log_skip("Shop.js: buyEgg no-dupes guard (already applied)")
+        return True
 
+    shop_content = FORCE_NO_DUPES_SHOP_ANCHORS.splice(shop_content, shop_hits)
+    if not shop_hits['buyEgg']:
+        log_fail("Shop.js: buyEgg block not found for no-dupes guard")
+        return False
+    write_file(shop_path, shop_content)
+    log_success("Shop.js: Egg duplicate pulls now vanish if no-dupes blocks add")
     return True
 
 
 # ============================================================================
 # DEBUG DIAGNOSTICS - Add debug logging and F9 diagnostics
 # ============================================================================
-def apply_debug_diagnostics():
-    """Add debug diagnostic logging and F9 diagnostic dump for remote troubleshooting."""
-    print("\n[*] Adding debug diagnostics...")
-    
-    # 1. Patch Init.js to expose Main instance on window
-    init_path = JS_ROOT / "game" / "Init.js"
-    init_content = read_file(init_path)
-    
-    # Check if already applied
-    if 'window.__POKEPATH_MAIN__' in init_content:
-        log_skip("Init.js: Main instance exposure")
-    else:
-        old_init = "new Main(this.data.save);"
-        new_init = "const main = new Main(this.data.save); window.__POKEPATH_MAIN__ = main;"
-        
-        if old_init in init_content:
-            init_content = init_content.replace(old_init, new_init)
-            write_file(init_path, init_content)
-            log_success("Init.js: Main instance exposed on window")
-        else:
-            log_fail("Init.js: Main instance exposure", "Main instantiation not found")
-    
-    # 2. Inject debug script into index.html
-    index_path = APP_EXTRACTED / "index.html"
-    index_content = read_file(index_path)
-    
-    # Check if already applied
-    if 'PokePath TD Infinite Mod — Debug Diagnostics' in index_content:
-        log_skip("index.html: Debug script injection")
-        return True
-    
-    # Find the closing </body> tag and inject before it
-    debug_script = '''
+DEBUG_DIAGNOSTICS_SCRIPT = '''
     <script>
         // PokePath TD Infinite Mod — Debug Diagnostics v__MOD_VERSION__
         (function() {
@@ -3891,13 +5040,51 @@ def apply_debug_diagnostics():
             });
         })();
     </script>
-</body>'''
-    debug_script = debug_script.replace('__MOD_VERSION__', MOD_VERSION).replace('__GAME_VERSION__', GAME_VERSION)
+</body>'''.replace('__MOD_VERSION__', MOD_VERSION).replace('__GAME_VERSION__', GAME_VERSION)
+
+# 1. Expose the Main instance on window
+DEBUG_INIT_ANCHORS = declare_anchors('apply_debug_diagnostics', 'src/js/game/Init.js',
+    Anchor('applied marker', 'window.__POKEPATH_MAIN__'),
+    Anchor('new Main', "new Main(this.data.save);",
+           "const main = new Main(this.data.save); window.__POKEPATH_MAIN__ = main;", count=0),
+)
+
+# 2. Inject the debug script before the closing </body> tag
+DEBUG_INDEX_ANCHORS = declare_anchors('apply_debug_diagnostics', 'index.html',
+    Anchor('applied marker', 'PokePath TD Infinite Mod — Debug Diagnostics'),
+    Anchor('</body>', '</body>', DEBUG_DIAGNOSTICS_SCRIPT, count=0),
+)
+
+def apply_debug_diagnostics():
+    """Add debug diagnostic logging and F9 diagnostic dump for remote troubleshooting."""
+    print("\n[*] Adding debug diagnostics...")
+    
+    init_path = JS_ROOT / "game" / "Init.js"
+    init_content = read_file(init_path)
+    init_hits = DEBUG_INIT_ANCHORS.scan(init_content)
+    
+    # Check if already applied
+    if init_hits['applied marker'].found:
+        log_skip("Init.js: Main instance exposure")
+    else:
+        init_content = DEBUG_INIT_ANCHORS.splice(init_content, init_hits)
+        if init_hits['new Main']:
+            write_file(init_path, init_content)
+            log_success("Init.js: Main instance exposed on window")
+        else:
+            log_fail("Init.js: Main instance exposure", "Main instantiation not found")
     
-    old_closing = '</body>'
+    index_path = APP_EXTRACTED / "index.html"
+    index_content = read_file(index_path)
+    index_hits = DEBUG_INDEX_ANCHORS.scan(index_content)
+    
+    # Check if already applied
+    if index_hits['applied marker'].found:
+        log_skip("index.html: Debug script injection")
+        return True
     
-    if old_closing in index_content:
-        index_content = index_content.replace(old_closing, debug_script)
+    index_content = DEBUG_INDEX_ANCHORS.splice(index_content, index_hits)
+    if index_hits['</body>']:
         write_file(index_path, index_content)
         log_success("index.html: Debug script injected (F9 for diagnostics)")
         return True
@@ -3929,22 +5116,15 @@ def main():
         print(f"\nERROR: {backup_msg}")
         return
     
-    # Step 2: Extract fresh from vanilla
-    print("\n[*] Extracting vanilla game files...")
-    extract_ok, extract_msg = extract_from_vanilla()
-    if not extract_ok:
-        print(f"\nERROR: {extract_msg}")
-        return
-    
-    # Step 3: Verify game version compatibility
+    # Step 2: Verify game version compatibility (before anything is extracted)
     print("\n[*] Checking game version compatibility...")
     compatible, mismatches = check_game_version_compatibility()
     if compatible:
-        print(f"  [OK] Game files match expected version ({GAME_VERSION})")
+        print(f"  [OK] Game build recognised: v{GAME_BUILD['game_version']} ({GAME_BUILD.get('platform', '?')})")
     else:
-        print(f"\n  [WARNING] Game version mismatch detected!")
+        print(f"\n  [WARNING] Unknown game build detected!")
         print(f"  This mod was built for PokePath TD v{GAME_VERSION}.")
-        print(f"  Your game files differ from the expected version:\n")
+        print(f"  Your game files differ from every known build:\n")
         for m in mismatches:
             print(f"    - {m}")
         print(f"\n  The mod may not work correctly. Features like placement,")
@@ -3955,6 +5135,13 @@ def main():
             print("\n  Installation cancelled. Update your game or download")
             print("  the correct mod version for your game.")
             return
+    
+    # Step 3: Extract fresh from vanilla
+    print("\n[*] Extracting vanilla game files...")
+    extract_ok, extract_msg = extract_from_vanilla()
+    if not extract_ok:
+        print(f"\nERROR: {extract_msg}")
+        return
 
     print("\n[*] Applying all mods...\n")
     
@@ -4036,53 +5223,22 @@ def main():
     
     # Repack
     print("\n[*] Repacking game...")
-    creationflags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-    
-    try:
-        # Use cmd.exe on Windows to bypass PowerShell execution policy issues
-        if sys.platform == 'win32':
-            cmd = ['cmd', '/c', 'npx', 'asar', 'pack', 
-                   str(APP_EXTRACTED), 
-                   str(GAME_ROOT / 'resources' / 'app.asar')]
-        else:
-            cmd = ['npx', 'asar', 'pack', 
-                   str(APP_EXTRACTED), 
-                   str(GAME_ROOT / 'resources' / 'app.asar')]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True, 
-            text=True,
-            timeout=300,  # 5 minute timeout
-            creationflags=creationflags
-        )
-        
-        # Check for PowerShell execution policy error
-        if 'cannot be loaded because running scripts is disabled' in result.stderr:
-            print("  [ERROR] PowerShell is blocking scripts. Try running from Command Prompt (cmd.exe)")
-        elif result.returncode == 0:
-            print("  [OK] Game repacked successfully!")
-            # Set mod flag so GUI installer knows game is modded
-            try:
-                from lib import save_manager
-                save_manager.set_mod_flag()
-            except Exception:
-                pass
-            # Write installed features manifest (all features when using main())
-            try:
-                import json
-                all_features = list(MOD_FEATURES.keys())
-                features_path = MODS_DIR / 'installed_features.json'
-                with open(features_path, 'w') as f:
-                    json.dump(all_features, f)
-            except Exception:
-                pass
-        else:
-            print(f"  [ERROR] Repack failed: {result.stderr}")
-    except subprocess.TimeoutExpired:
-        print("  [ERROR] Repack timed out after 5 minutes")
-    except FileNotFoundError:
-        print("  [ERROR] npx/asar not found - make sure Node.js is installed")
+    if _repack_game():
+        # Set mod flag so GUI installer knows game is modded
+        try:
+            from lib import save_manager
+            save_manager.set_mod_flag()
+        except Exception:
+            pass
+        # Write installed features manifest (all features when using main())
+        try:
+            import json
+            all_features = list(MOD_FEATURES.keys())
+            features_path = MODS_DIR / 'installed_features.json'
+            with open(features_path, 'w') as f:
+                json.dump(all_features, f)
+        except Exception:
+            pass
     
     print("\n=== All done! Launch the game. ===")
 
@@ -4092,6 +5248,10 @@ if __name__ == "__main__":
     parser.add_argument('--features', type=str, help='Comma-separated feature keys to install (e.g. speed,pause_micro,endless)')
     parser.add_argument('--reset', action='store_true', help='Reset game to vanilla')
     parser.add_argument('--list', action='store_true', help='List available feature keys')
+    parser.add_argument('--full', action='store_true', help='Ignore the previous install and rebuild everything (with --features)')
+    parser.add_argument('--plan', action='store_true', help='Dry run: report every patch anchor hit/miss against the vanilla asar without writing anything (all features unless --features is given)')
+    parser.add_argument('--extract', action='store_true', help='Patch a full extraction in resources/app_extracted instead of the asar in place (with --features)')
+    parser.add_argument('--allow-unknown-build', action='store_true', help='Patch even if the game build is not in game_builds.json (with --features)')
     args = parser.parse_args()
     
     if args.list:
@@ -4099,23 +5259,26 @@ if __name__ == "__main__":
         for key, feat in MOD_FEATURES.items():
             print(f"  {key:20s} - {feat['name']}")
         sys.exit(0)
+    elif args.plan:
+        features = [f.strip() for f in args.features.split(',')] if args.features else list(MOD_FEATURES)
+        print(f"\n[*] Planning install of: {', '.join(features)}")
+        plan_report = plan_selected_mods(features)
+        print(f"[*] Game build: {'v' + GAME_BUILD['game_version'] if GAME_BUILD else 'unknown'}, "
+              f"patch profile: {PATCH_PROFILE or 'all variants'}")
+        print_install_plan(plan_report)
+        sys.exit(1 if any(entry['status'] == 'fail' for entry in plan_report) else 0)
     elif args.reset:
         print("\n[*] Resetting to vanilla...")
         extract_ok, msg = extract_from_vanilla()
         if extract_ok:
             # Repack
-            import subprocess as _sp
-            creationflags = _sp.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            cmd = ['cmd', '/c', 'npx', 'asar', 'pack', str(APP_EXTRACTED), str(GAME_ROOT / 'resources' / 'app.asar')] if sys.platform == 'win32' else ['npx', 'asar', 'pack', str(APP_EXTRACTED), str(GAME_ROOT / 'resources' / 'app.asar')]
-            result = _sp.run(cmd, capture_output=True, text=True, timeout=300, creationflags=creationflags)
-            if result.returncode == 0:
+            if _repack_game():
                 print("  [OK] Game reset to vanilla and repacked!")
-            else:
-                print(f"  [ERROR] Repack failed: {result.stderr}")
         else:
             print(f"  [ERROR] {msg}")
     elif args.features:
         features = [f.strip() for f in args.features.split(',')]
-        apply_selected_mods(features)
+        apply_selected_mods(features, incremental=not args.full, overlay=not args.extract,
+                            allow_unknown_build=args.allow_unknown_build)
     else:
         main()
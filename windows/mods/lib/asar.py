@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Asar Archive
+Pure-Python reader/writer for Electron's app.asar format, so extracting and
+repacking the game doesn't need a Node.js process (or npx) for every install.
+
+Layout (all integers little-endian uint32, Chromium Pickle framing):
+  [0:4]   4                          size of the following size pickle
+  [4:8]   header_pickle_size         bytes of the header pickle
+  [8:12]  header_payload_size        payload of the header pickle
+  [12:16] json_length                length of the UTF-8 header JSON
+  [16:]   header JSON, padded to 4 bytes, then the file data
+
+File offsets in the header JSON are strings relative to the start of the
+data section (8 + header_pickle_size). Output matches @electron/asar 3.x,
+including the per-file SHA256 integrity block list.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import stat
+import struct
+import sys
+from pathlib import Path
+
+
+INTEGRITY_ALGORITHM = 'SHA256'
+INTEGRITY_BLOCK_SIZE = 4 * 1024 * 1024
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# os.sendfile only accepts regular-file destinations on Linux
+_HAS_SENDFILE = hasattr(os, 'sendfile') and sys.platform.startswith('linux')
+
+
+class AsarError(Exception):
+    """Raised for malformed archives or entries that can't be read/written."""
+
+
+def _align4(n):
+    return (n + 3) & ~3
+
+
+def _split(rel_path):
+    parts = [p for p in str(rel_path).replace('\\', '/').split('/') if p and p != '.']
+    if any(p == '..' for p in parts):
+        raise AsarError(f"Path escapes archive root: {rel_path}")
+    return parts
+
+
+# ============================================================================
+# READER
+# ============================================================================
+class AsarArchive:
+    """
+    Read-only view of an asar archive.
+
+    The header is parsed eagerly; file data is served from a read-only mmap
+    so reads and extraction never copy the archive through Python objects
+    more than once.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = None
+        try:
+            self.header, self.data_offset = self._read_header()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_header(self):
+        prefix = self._file.read(16)
+        if len(prefix) < 16:
+            raise AsarError(f"{self.path.name}: file too small to be an asar archive")
+        size_payload, header_pickle_size, header_payload_size, json_length = struct.unpack('<4I', prefix)
+        if size_payload != 4 or header_payload_size + 4 != header_pickle_size or json_length > header_payload_size - 4:
+            raise AsarError(f"{self.path.name}: not an asar archive (bad header framing)")
+        raw = self._file.read(json_length)
+        if len(raw) != json_length:
+            raise AsarError(f"{self.path.name}: truncated asar header")
+        try:
+            header = json.loads(raw.decode('utf-8'))
+        except ValueError as e:
+            raise AsarError(f"{self.path.name}: corrupt asar header JSON: {e}")
+        if not isinstance(header, dict) or 'files' not in header:
+            raise AsarError(f"{self.path.name}: asar header has no file table")
+        return header, 8 + header_pickle_size
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def mmap(self):
+        if self._mmap is None:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    @property
+    def unpacked_dir(self):
+        return self.path.with_name(self.path.name + '.unpacked')
+
+    # --- lookup -------------------------------------------------------------
+
+    def get_entry(self, rel_path):
+        """Return the header node for rel_path (file, dir or link), or None."""
+        node = self.header
+        for part in _split(rel_path):
+            files = node.get('files')
+            if files is None or part not in files:
+                return None
+            node = files[part]
+        return node
+
+    def exists(self, rel_path):
+        return self.get_entry(rel_path) is not None
+
+    def walk(self, node=None, prefix=''):
+        """
+        Yield (rel_path, node) for every entry in header order, directories
+        before their contents. rel_path uses '/' separators.
+        """
+        node = self.header if node is None else node
+        for name, child in node.get('files', {}).items():
+            rel = f"{prefix}{name}"
+            yield rel, child
+            if 'files' in child:
+                yield from self.walk(child, rel + '/')
+
+    def iter_files(self):
+        """Yield (rel_path, node) for regular files only."""
+        for rel, node in self.walk():
+            if 'files' not in node and 'link' not in node:
+                yield rel, node
+
+    # --- data access --------------------------------------------------------
+
+    def _file_entry(self, rel_path):
+        node = self.get_entry(rel_path)
+        if node is None:
+            raise AsarError(f"Not in archive: {rel_path}")
+        if 'files' in node or 'link' in node:
+            raise AsarError(f"Not a regular file: {rel_path}")
+        return node
+
+    def entry_span(self, node):
+        """Absolute (start, size) of a packed file's bytes inside the archive."""
+        size = int(node.get('size', 0))
+        start = self.data_offset + int(node.get('offset', 0))
+        if start + size > len(self.mmap):
+            raise AsarError(f"{self.path.name}: entry runs past end of archive")
+        return start, size
+
+    def read(self, rel_path):
+        """Return the contents of a file in the archive as bytes."""
+        node = self._file_entry(rel_path)
+        if node.get('unpacked'):
+            return (self.unpacked_dir / Path(*_split(rel_path))).read_bytes()
+        start, size = self.entry_span(node)
+        return self.mmap[start:start + size]
+
+    def read_text(self, rel_path, encoding='utf-8'):
+        return self.read(rel_path).decode(encoding)
+
+    def copy_to(self, node, out_file):
+        """Write a packed file's bytes into an open binary file object."""
+        start, size = self.entry_span(node)
+        if not size:
+            return
+        if _HAS_SENDFILE:
+            out_file.flush()
+            out_fd, in_fd = out_file.fileno(), self._file.fileno()
+            sent = 0
+            while sent < size:
+                n = os.sendfile(out_fd, in_fd, start + sent, size - sent)
+                if n == 0:
+                    raise AsarError(f"{self.path.name}: unexpected end of archive")
+                sent += n
+            out_file.seek(0, os.SEEK_END)
+        else:
+            with memoryview(self.mmap) as view:
+                out_file.write(view[start:start + size])
+
+    def extract_file(self, rel_path, dest):
+        """Extract a single file to dest (a file path)."""
+        node = self._file_entry(rel_path)
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if node.get('unpacked'):
+            shutil.copyfile(self.unpacked_dir / Path(*_split(rel_path)), dest)
+        else:
+            with open(dest, 'wb') as out:
+                self.copy_to(node, out)
+        if node.get('executable') and os.name != 'nt':
+            os.chmod(dest, 0o755)
+
+    def extract_all(self, dest):
+        """Extract the whole archive into dest (created if missing)."""
+        dest = Path(dest)
+        dest.mkdir(parents=True, exist_ok=True)
+        links = []
+        for rel, node in self.walk():
+            target = dest.joinpath(*_split(rel))
+            if 'files' in node:
+                target.mkdir(parents=True, exist_ok=True)
+            elif 'link' in node:
+                links.append((target, node['link']))
+            else:
+                self.extract_file(rel, target)
+        # Links last, so their targets already exist (matches @electron/asar)
+        for target, link in links:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            link_target = dest.joinpath(*_split(link))
+            try:
+                os.symlink(os.path.relpath(link_target, target.parent), target)
+            except OSError as e:
+                raise AsarError(f"Could not create symlink {target}: {e}")
+        return dest
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+class PackEntry:
+    """
+    One file to be written into a new archive.
+
+    source is a filesystem path, a bytes-like object, or an AsarArchive (with
+    node set to the entry's header node). size must be the exact number of
+    bytes the source will produce. A known integrity record is reused as-is
+    instead of re-hashing the data.
+    """
+
+    def __init__(self, rel_path, size, source, executable=False, node=None, integrity=None):
+        self.rel_path = '/'.join(_split(rel_path))
+        self.size = size
+        self.source = source
+        self.executable = executable
+        self.node = node
+        self.integrity = integrity
+
+    @classmethod
+    def from_path(cls, rel_path, path):
+        st = os.stat(path)
+        executable = os.name != 'nt' and bool(st.st_mode & stat.S_IXUSR)
+        return cls(rel_path, st.st_size, Path(path), executable)
+
+    @classmethod
+    def from_archive(cls, rel_path, archive, node):
+        """Entry copied verbatim from another archive (kernel-side where possible)."""
+        return cls(rel_path, int(node.get('size', 0)), archive,
+                   bool(node.get('executable')), node, node.get('integrity'))
+
+    def iter_chunks(self, buf):
+        if isinstance(self.source, AsarArchive):
+            start, size = self.source.entry_span(self.node)
+            with memoryview(self.source.mmap) as view:
+                for pos in range(start, start + size, COPY_CHUNK_SIZE):
+                    yield view[pos:min(pos + COPY_CHUNK_SIZE, start + size)]
+            return
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            with memoryview(self.source) as view:
+                for pos in range(0, len(view), COPY_CHUNK_SIZE):
+                    yield view[pos:pos + COPY_CHUNK_SIZE]
+            return
+        with open(self.source, 'rb') as f:
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                yield view[:n]
+
+    def write_to(self, out, buf):
+        """Copy the entry's bytes into out and return its integrity record."""
+        if self.integrity is not None and isinstance(self.source, AsarArchive):
+            self.source.copy_to(self.node, out)
+            return self.integrity
+        integrity = _Integrity()
+        written = 0
+        for chunk in self.iter_chunks(buf):
+            integrity.update(chunk)
+            out.write(chunk)
+            written += len(chunk)
+        if written != self.size:
+            raise AsarError(f"{self.rel_path} changed size while packing "
+                            f"({self.size} -> {written} bytes)")
+        return integrity.result()
+
+
+class _Integrity:
+    """Incremental SHA256 file hash + 4 MiB block hashes (asar integrity)."""
+
+    def __init__(self):
+        self.file_hash = hashlib.sha256()
+        self.block_hash = hashlib.sha256()
+        self.block_fill = 0
+        self.blocks = []
+
+    def update(self, data):
+        self.file_hash.update(data)
+        pos, n = 0, len(data)
+        while pos < n:
+            take = min(INTEGRITY_BLOCK_SIZE - self.block_fill, n - pos)
+            self.block_hash.update(data[pos:pos + take])
+            self.block_fill += take
+            pos += take
+            if self.block_fill == INTEGRITY_BLOCK_SIZE:
+                self.blocks.append(self.block_hash.hexdigest())
+                self.block_hash = hashlib.sha256()
+                self.block_fill = 0
+
+    def result(self):
+        # The trailing (possibly empty) block is always emitted, like asar's flush()
+        return {
+            'algorithm': INTEGRITY_ALGORITHM,
+            'hash': self.file_hash.hexdigest(),
+            'blockSize': INTEGRITY_BLOCK_SIZE,
+            'blocks': self.blocks + [self.block_hash.hexdigest()],
+        }
+
+
+def _placeholder_integrity(size):
+    zero = '0' * 64
+    return {
+        'algorithm': INTEGRITY_ALGORITHM,
+        'hash': zero,
+        'blockSize': INTEGRITY_BLOCK_SIZE,
+        'blocks': [zero] * (size // INTEGRITY_BLOCK_SIZE + 1),
+    }
+
+
+def _encode_header(header):
+    raw = json.dumps(header, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    padded = _align4(len(raw))
+    prefix = struct.pack('<4I', 4, 8 + padded, 4 + padded, len(raw))
+    return prefix + raw + b'\0' * (padded - len(raw))
+
+
+def write_archive(dest, entries, directories=()):
+    """
+    Write a new asar archive from PackEntry objects in one streaming pass.
+
+    The header is sized up front (integrity hashes have a fixed length), file
+    data is streamed straight after it while being hashed, and the final
+    header is written back over the placeholder. The archive is built in a
+    temp file next to dest and moved into place atomically.
+
+    Args:
+        dest: Output archive path.
+        entries: Iterable of PackEntry; data is laid out in this order.
+        directories: Extra (possibly empty) directory paths to record.
+
+    Returns:
+        Path: dest
+    """
+    dest = Path(dest)
+    entries = list(entries)
+    root = {'files': {}}
+
+    def _dir_node(parts):
+        node = root
+        for part in parts:
+            child = node['files'].setdefault(part, {'files': {}})
+            if 'files' not in child:
+                raise AsarError(f"Path is both a file and a directory: {'/'.join(parts)}")
+            node = child
+        return node
+
+    for rel in directories:
+        _dir_node(_split(rel))
+
+    nodes = []
+    offset = 0
+    for entry in entries:
+        parts = entry.rel_path.split('/')
+        parent = _dir_node(parts[:-1])
+        if parts[-1] in parent['files']:
+            raise AsarError(f"Duplicate archive entry: {entry.rel_path}")
+        node = {'size': entry.size, 'offset': str(offset)}
+        if entry.executable:
+            node['executable'] = True
+        node['integrity'] = entry.integrity or _placeholder_integrity(entry.size)
+        parent['files'][parts[-1]] = node
+        nodes.append(node)
+        offset += entry.size
+
+    placeholder = _encode_header(root)
+    tmp = dest.with_name(dest.name + '.tmp')
+    buf = bytearray(COPY_CHUNK_SIZE)
+    # A stale temp file may be a hardlink to something else: never write through it
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        with open(tmp, 'wb') as out:
+            out.write(placeholder)
+            for entry, node in zip(entries, nodes):
+                node['integrity'] = entry.write_to(out, buf)
+            final = _encode_header(root)
+            if len(final) != len(placeholder):
+                raise AsarError("asar header size changed while packing")
+            out.seek(0)
+            out.write(final)
+        os.replace(tmp, dest)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    return dest
+
+
+def collect_dir(src_dir):
+    """
+    Scan a directory into (entries, directories) for write_archive, in
+    sorted path order. Symlinks are followed.
+    """
+    src_dir = Path(src_dir)
+    entries, directories = [], []
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        dirnames.sort()
+        rel_dir = Path(dirpath).relative_to(src_dir).as_posix()
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        if prefix:
+            directories.append(rel_dir)
+        for name in sorted(filenames):
+            entries.append(PackEntry.from_path(prefix + name, Path(dirpath) / name))
+    return entries, directories
+
+
+def create_package(src_dir, dest):
+    """Pack a directory into an asar archive (like `asar pack src dest`)."""
+    src_dir = Path(src_dir)
+    if not src_dir.is_dir():
+        raise AsarError(f"Not a directory: {src_dir}")
+    entries, directories = collect_dir(src_dir)
+    return write_archive(dest, entries, directories)
+
+
+def extract_all(archive_path, dest):
+    """Extract an asar archive into dest (like `asar extract archive dest`)."""
+    with AsarArchive(archive_path) as archive:
+        return archive.extract_all(dest)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Balance Simulator
+Plays waves headlessly with the installed (modded) game's own logic and
+reports per-wave stats, for tuning endless scaling without playing it.
+
+Each chunk of waves runs in its own Node process (headless_sim.mjs, no
+canvas or DOM, as fast as the CPU allows), several at a time. A chunk
+starts fresh at its first wave with the team deployed, so chunks are
+independent and the wave range can be split freely.
+
+    python lib/balance_sim.py scenario.json --waves 5000-5999 -j 8 --csv w5000.csv
+    python lib/balance_sim.py --save game --waves 101-3000 --bucket 250
+    python lib/balance_sim.py --save exported_save.json --route 2 --waves 1-100
+
+The team comes from a scenario file (see headless_sim.mjs for the format)
+or from a save: `--save game` reads the modded game's save directly, any
+other value is an exported save JSON. Team members are placed on their
+saved tilePosition.
+
+The game scripts come from `--game` (an extracted tree), else from
+resources/app_extracted when the mods were installed with --extract, else
+from the installed app.asar, which is extracted once into a temp folder
+keyed by its fingerprint and reused until the game is re-patched.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from lib import asar, fingerprint, leveldb_reader
+    from lib.apply_mods import APP_ASAR, APP_EXTRACTED, is_extracted_install
+    from lib.save_manager import MODDED_SAVE
+except ImportError:
+    import asar
+    import fingerprint
+    import leveldb_reader
+    from apply_mods import APP_ASAR, APP_EXTRACTED, is_extracted_install
+    from save_manager import MODDED_SAVE
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+HEADLESS_SIM = SCRIPT_DIR / 'headless_sim.mjs'
+GAME_CACHE_DIR = Path(tempfile.gettempdir()) / 'pokepath_balance_sim'
+GAME_SCRIPT = Path('src', 'js', 'game', 'Game.js')
+
+CHUNK_WAVES = 100
+PLAYER_HEALTH = 14  # hearts per run; a wave leaking this much power would end it
+CSV_FIELDS = ('wave', 'endless', 'enemies', 'hp', 'killed', 'leaked', 'damageTaken',
+              'damageDealt', 'gold', 'simSeconds', 'stalled', 'realMs')
+
+
+class SimError(Exception):
+    """Raised when a headless run fails or the scenario can't be built."""
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+def scenario_from_save(source, route=None):
+    """Build a scenario from a save: 'game' (the modded game's save) or an exported JSON file."""
+    if source == 'game':
+        data = leveldb_reader.read_save(MODDED_SAVE)
+        if data is None:
+            raise SimError(f"no save found in {MODDED_SAVE}")
+    else:
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise SimError(f"save unreadable: {e}")
+    save = data['save'] if isinstance(data.get('save'), dict) else data
+
+    team = [p for p in save.get('team', []) if isinstance(p, dict)]
+    if route is None:
+        route = (save.get('area') or {}).get('routeNumber', 0)
+    return {
+        'route': route,
+        'team': team,
+        'stars': (save.get('player') or {}).get('stars', 0),
+    }
+
+
+def load_scenario(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise SimError(f"scenario unreadable: {e}")
+
+
+def parse_waves(text):
+    """'5000-5999' or '5000' -> (first, last)."""
+    first, _, last = text.partition('-')
+    try:
+        first, last = int(first), int(last or first)
+    except ValueError:
+        raise ValueError(f"bad wave range {text!r} (expected FIRST-LAST)")
+    if first < 1 or last < first:
+        raise ValueError(f"bad wave range {text!r}")
+    return first, last
+
+
+# ============================================================================
+# GAME FILES
+# ============================================================================
+def find_game_dir(game_dir=None, progress=print):
+    """
+    The game tree to simulate: game_dir if given, else app_extracted if the
+    install manifest says app.asar was packed from it (--extract), else the
+    installed app.asar extracted into GAME_CACHE_DIR (once per build; older
+    extractions are dropped). Any other app_extracted is left over from an
+    earlier install and is ignored.
+    """
+    if game_dir:
+        return Path(game_dir)
+    if is_extracted_install() and (APP_EXTRACTED / GAME_SCRIPT).is_file():
+        return APP_EXTRACTED
+    if not APP_ASAR.is_file():
+        raise SimError(f"no installed game found ({APP_ASAR}); pass --game with an extracted game folder")
+
+    try:
+        key = fingerprint.compute_fingerprint(APP_ASAR, key_files=())['header'][:16]
+        dest = GAME_CACHE_DIR / key
+        if (dest / GAME_SCRIPT).is_file():
+            return dest
+        if progress:
+            progress(f"Extracting {APP_ASAR.name} for the simulator (once per build)...")
+        GAME_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for old in GAME_CACHE_DIR.iterdir():
+            if old.name != key:
+                shutil.rmtree(old, ignore_errors=True)
+        # Extract beside the final folder and rename, so a concurrent or
+        # interrupted run never sees a half-written tree
+        staging = Path(tempfile.mkdtemp(prefix=f'{key}.', dir=GAME_CACHE_DIR))
+        try:
+            asar.extract_all(APP_ASAR, staging)
+            os.replace(staging, dest)
+        except OSError:
+            if not (dest / GAME_SCRIPT).is_file():
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return dest
+    except (OSError, asar.AsarError) as e:
+        raise SimError(f"could not extract {APP_ASAR}: {e}")
+
+
+# ============================================================================
+# RUNS
+# ============================================================================
+def run_chunk(scenario, first, count, game_dir, seed=None):
+    """
+    Simulate `count` waves starting at `first` in one headless Node process.
+
+    Returns:
+        list: the chunk's wave records (dicts, see CSV_FIELDS)
+    """
+    cmd = ['node', str(HEADLESS_SIM), '--game', str(game_dir), '--scenario', '-',
+           '--from', str(first), '--count', str(count)]
+    if seed is not None:
+        cmd += ['--seed', str(seed)]
+    try:
+        result = subprocess.run(
+            cmd, input=json.dumps(scenario), capture_output=True, text=True,
+            encoding='utf-8', errors='replace',
+            creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0), cwd=str(SCRIPT_DIR)
+        )
+    except FileNotFoundError:
+        raise SimError("Node.js not found")
+
+    waves = []
+    for line in result.stdout.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get('event') == 'start' and record.get('skipped'):
+            print(f"  [WARN] not placed: {', '.join(record['skipped'])}")
+        elif record.get('event') == 'wave':
+            waves.append(record)
+    if result.returncode != 0:
+        raise SimError(result.stderr.strip() or f"headless_sim exited with {result.returncode}")
+    return waves
+
+
+def run_waves(scenario, first, last, game_dir=None, jobs=None, seed=None,
+              chunk=CHUNK_WAVES, progress=print):
+    """Simulate waves first..last, `chunk` waves per process, `jobs` processes at a time."""
+    game_dir = find_game_dir(game_dir, progress)
+    starts = list(range(first, last + 1, chunk))
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(starts)))
+    waves = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_chunk, scenario, start, min(chunk, last + 1 - start), game_dir, seed): start
+                   for start in starts}
+        for done, future in enumerate(as_completed(futures), 1):
+            start = futures[future]
+            chunk_waves = future.result()
+            waves.extend(chunk_waves)
+            if progress:
+                leaked = sum(1 for w in chunk_waves if w['leaked'])
+                progress(f"[{done}/{len(starts)}] waves {start}-{start + len(chunk_waves) - 1}: "
+                         f"{leaked} with leaks")
+    waves.sort(key=lambda w: w['wave'])
+    return waves
+
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+def write_csv(waves, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(waves)
+
+
+def summarize(waves, bucket):
+    """Per-bucket table plus the first leaking and first run-ending waves."""
+    lines = [f"{'waves':>13} {'cleared':>8} {'avg leaked':>11} {'avg hp':>14} {'avg secs':>9} {'stalled':>8}"]
+    for i in range(0, len(waves), bucket):
+        group = waves[i:i + bucket]
+        n = len(group)
+        lines.append(
+            f"{group[0]['wave']:>6}-{group[-1]['wave']:<6} "
+            f"{sum(1 for w in group if not w['leaked']) / n:>8.0%} "
+            f"{sum(w['leaked'] for w in group) / n:>11.1f} "
+            f"{sum(w['hp'] for w in group) / n:>14,.0f} "
+            f"{sum(w['simSeconds'] for w in group) / n:>9.1f} "
+            f"{sum(1 for w in group if w['stalled']):>8}"
+        )
+    first_leak = next((w['wave'] for w in waves if w['leaked']), None)
+    first_loss = next((w['wave'] for w in waves if w['damageTaken'] >= PLAYER_HEALTH), None)
+    lines.append(f"First wave with a leak: {first_leak or 'none'}")
+    lines.append(f"First wave costing {PLAYER_HEALTH}+ health: {first_loss or 'none'}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulate waves headlessly and report per-wave balance stats')
+    parser.add_argument('scenario', nargs='?', help='Scenario JSON (route, team, ...)')
+    parser.add_argument('--save', help="Take route and team from a save instead: 'game' or an exported save JSON")
+    parser.add_argument('--route', type=int, help='Route to play (overrides the scenario/save)')
+    parser.add_argument('--waves', required=True, help='Wave range FIRST-LAST, e.g. 5000-5999')
+    parser.add_argument('--game', help='Extracted, modded game folder (default: the installed game)')
+    parser.add_argument('--csv', help='Write every wave record to this CSV file')
+    parser.add_argument('--bucket', type=int, default=100, help='Waves per summary row (default: 100)')
+    parser.add_argument('--chunk', type=int, default=CHUNK_WAVES, help=f'Waves per Node process (default: {CHUNK_WAVES})')
+    parser.add_argument('--seed', type=int, help='Seed the game\'s randomness (reruns with the same --chunk match)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Parallel Node processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    if bool(args.scenario) == bool(args.save):
+        parser.error('give either a scenario file or --save')
+    try:
+        first, last = parse_waves(args.waves)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        scenario = scenario_from_save(args.save, args.route) if args.save else load_scenario(args.scenario)
+        if args.route is not None:
+            scenario['route'] = args.route
+        print(f"Simulating waves {first}-{last} on route {scenario.get('route', 0)} "
+              f"with {len(scenario.get('team') or [])} team members")
+        waves = run_waves(scenario, first, last, args.game, args.jobs, args.seed, max(1, args.chunk))
+    except SimError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    if args.csv:
+        write_csv(waves, args.csv)
+        print(f"Wrote {len(waves)} waves to {args.csv}")
+    print(summarize(waves, max(1, args.bucket)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Build Fingerprinting
+Identifies which game build an app.asar is by content hash, instead of
+trusting a handful of file sizes.
+
+A fingerprint is a streaming BLAKE2b over the asar header (which already
+carries @electron/asar's per-file SHA256 integrity, so it pins the whole
+build) plus one digest per key game script, hashed straight from the byte
+range the header points at. Only the header and those ranges are read -
+never the whole archive.
+
+Known builds live in game_builds.json next to this file. To record a new
+build, run against its *vanilla* asar:
+
+    python lib/fingerprint.py path/to/app.asar.vanilla --add 1.5.5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    from lib import asar
+except ImportError:
+    import asar
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BUILDS_DB = SCRIPT_DIR / "game_builds.json"
+
+DIGEST_SIZE = 16
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Scripts the .modded.js replacements and anchor patches depend on most
+KEY_FILES = (
+    "src/js/game/Game.js",
+    "src/js/game/component/Pokemon.js",
+    "src/js/game/scenes/PokemonScene.js",
+    "src/js/game/core/Area.js",
+    "src/js/game/core/Team.js",
+    "src/js/game/core/Box.js",
+)
+
+
+def _blake2b():
+    return hashlib.blake2b(digest_size=DIGEST_SIZE)
+
+
+# ============================================================================
+# FINGERPRINTING
+# ============================================================================
+def compute_fingerprint(asar_path, key_files=KEY_FILES):
+    """
+    Fingerprint an asar archive.
+
+    Returns:
+        dict: {'asar_size', 'header': hex digest of the header region,
+               'files': {rel: {'size', 'blake2b'} or None if missing}}
+    """
+    asar_path = Path(asar_path)
+    with asar.AsarArchive(asar_path) as archive:
+        # The mmap only faults in the pages we touch: the header and the key files
+        header = _update_span(_blake2b(), archive, 0, archive.data_offset)
+
+        files = {}
+        for rel in key_files:
+            node = archive.get_entry(rel)
+            if node is None or 'files' in node or 'link' in node:
+                files[rel] = None
+                continue
+            files[rel] = {'size': int(node.get('size', 0)), 'blake2b': _hash_entry(archive, rel, node)}
+
+        return {
+            'asar_size': len(archive.mmap),
+            'header': header.hexdigest(),
+            'files': files,
+        }
+
+
+def _hash_entry(archive, rel, node):
+    digest = _blake2b()
+    if node.get('unpacked'):
+        with open(archive.unpacked_dir / rel, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    start, size = archive.entry_span(node)
+    return _update_span(digest, archive, start, size).hexdigest()
+
+
+def _update_span(digest, archive, start, size):
+    with memoryview(archive.mmap) as view:
+        for pos in range(start, start + size, HASH_CHUNK_SIZE):
+            digest.update(view[pos:min(pos + HASH_CHUNK_SIZE, start + size)])
+    return digest
+
+
+# ============================================================================
+# KNOWN-BUILD DATABASE
+# ============================================================================
+def load_builds(path=BUILDS_DB):
+    """Known builds from the fingerprint DB (empty list if it's missing)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('builds', [])
+    except FileNotFoundError:
+        return []
+
+
+def _match(build, fp):
+    """How a DB entry matches a fingerprint: 'header', 'files', 'sizes' or None."""
+    if build.get('header'):
+        return 'header' if build['header'] == fp['header'] else None
+    expected = build.get('files', {})
+    if not expected:
+        return None
+    for rel, want in expected.items():
+        got = fp['files'].get(rel)
+        if got is None or got['size'] != want.get('size'):
+            return None
+        if want.get('blake2b') and got['blake2b'] != want['blake2b']:
+            return None
+    if build.get('asar_size') and build['asar_size'] != fp['asar_size']:
+        return None
+    # Legacy entries only pin sizes; they're accepted until a digest is recorded
+    return 'files' if all(w.get('blake2b') for w in expected.values()) else 'sizes'
+
+
+def identify_build(fp, builds=None):
+    """
+    Look a fingerprint up in the known-build DB.
+
+    Returns:
+        dict: the matching build plus a 'matched_by' key, or None if unknown
+    """
+    for build in load_builds() if builds is None else builds:
+        how = _match(build, fp)
+        if how:
+            return dict(build, matched_by=how)
+    return None
+
+
+def describe_mismatches(fp, build):
+    """Human-readable differences between a fingerprint and a known build's key files."""
+    mismatches = []
+    for rel, want in build.get('files', {}).items():
+        got = fp['files'].get(rel)
+        if got is None:
+            mismatches.append(f"{rel}: FILE MISSING (expected {want.get('size')} bytes)")
+        elif got['size'] != want.get('size'):
+            mismatches.append(f"{rel}: {got['size']} bytes (expected {want.get('size')})")
+        elif want.get('blake2b') and got['blake2b'] != want['blake2b']:
+            mismatches.append(f"{rel}: content differs from v{build.get('game_version')}")
+    if not mismatches and build.get('header') and build['header'] != fp['header']:
+        mismatches.append(f"asar header differs from v{build.get('game_version')}")
+    return mismatches
+
+
+def record_build(fp, game_version, platform='windows', profile=None, path=BUILDS_DB):
+    """Add (or replace) a build entry in the fingerprint DB.
+
+    profile names the apply_mods patch profile for the build (defaults to
+    game_version).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            db = json.load(f)
+    except FileNotFoundError:
+        db = {'format': 1, 'builds': []}
+    entry = {
+        'game_version': game_version,
+        'platform': platform,
+        'profile': profile or game_version,
+        'asar_size': fp['asar_size'],
+        'header': fp['header'],
+        'files': {rel: info for rel, info in fp['files'].items() if info},
+    }
+    db['builds'] = [b for b in db.get('builds', [])
+                    if (b.get('game_version'), b.get('platform')) != (game_version, platform)]
+    db['builds'].insert(0, entry)
+    tmp = Path(path).with_name(Path(path).name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(db, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
+    return entry
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fingerprint a PokePath TD app.asar')
+    parser.add_argument('asar', help='Path to a vanilla app.asar (or app.asar.vanilla)')
+    parser.add_argument('--add', metavar='GAME_VERSION', help='Record this build in game_builds.json')
+    parser.add_argument('--platform', default='windows', help='Platform tag for --add (default: windows)')
+    parser.add_argument('--profile', help='Patch profile for --add (default: the game version)')
+    args = parser.parse_args()
+
+    fp = compute_fingerprint(args.asar)
+    if args.add:
+        record_build(fp, args.add, args.platform, args.profile)
+        print(f"Recorded v{args.add} ({args.platform}) in {BUILDS_DB.name}")
+    else:
+        build = identify_build(fp)
+        print(json.dumps(fp, indent=2))
+        if build:
+            print(f"Known build: v{build['game_version']} ({build.get('platform')}, matched by {build['matched_by']})")
+        else:
+            print("Unknown build")
+            sys.exit(1)
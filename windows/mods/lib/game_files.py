@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Game Files
+Read-only access to the installed game's scripts and assets for the tools
+(save editor, diagnostics), wherever they currently live.
+
+The default install patches the asar in place and never leaves an
+extracted tree behind, so files are looked up in order:
+  1. resources/app_extracted   (apply_mods.py --extract, dev setups)
+  2. resources/app.asar        (the installed, possibly modded, game)
+  3. resources/app.asar.vanilla
+Paths are archive-relative with '/' separators, e.g. 'src/js/game/data/itemData.js'.
+"""
+
+import threading
+from pathlib import Path
+
+try:
+    from lib.asar import AsarArchive, AsarError
+except ImportError:
+    from asar import AsarArchive, AsarError
+
+
+def _normalize(rel_path):
+    """'./src\\js/x.js' -> 'src/js/x.js' (archive-style relative path)."""
+    parts = str(rel_path).replace('\\', '/').split('/')
+    return '/'.join(p for p in parts if p not in ('', '.'))
+
+
+class GameFiles:
+    """
+    Reads game files from an extracted tree or an asar archive. Safe to
+    share between threads (the save editor decodes sprites on workers).
+    """
+
+    def __init__(self, resources):
+        self.resources = Path(resources) if resources else None
+        self._lock = threading.Lock()
+        self._archive = None
+        self._opened = False
+
+    @property
+    def extracted(self):
+        """The extracted game folder, or None if there isn't one."""
+        if self.resources is None:
+            return None
+        tree = self.resources / 'app_extracted'
+        return tree if (tree / 'src').is_dir() else None
+
+    def _asar(self):
+        with self._lock:
+            if not self._opened:
+                self._opened = True
+                for name in ('app.asar', 'app.asar.vanilla'):
+                    path = self.resources / name if self.resources else None
+                    if path is None or not path.exists():
+                        continue
+                    try:
+                        self._archive = AsarArchive(path)
+                        break
+                    except (OSError, AsarError):
+                        continue
+            return self._archive
+
+    @property
+    def source(self):
+        """Where files are read from (folder or asar path), or None."""
+        return self.extracted or (self._asar().path if self._asar() else None)
+
+    def read_bytes(self, rel_path):
+        """Contents of a game file, or None if it can't be found or read."""
+        rel_path = _normalize(rel_path)
+        tree = self.extracted
+        if tree is not None:
+            try:
+                return (tree / rel_path).read_bytes()
+            except OSError:
+                return None
+        archive = self._asar()
+        if archive is None:
+            return None
+        try:
+            with self._lock:  # the archive's mmap is opened lazily
+                return archive.read(rel_path)
+        except (OSError, AsarError):
+            return None
+
+    def read_text(self, rel_path):
+        data = self.read_bytes(rel_path)
+        return data.decode('utf-8', errors='replace') if data is not None else None
+
+    def exists(self, rel_path):
+        rel_path = _normalize(rel_path)
+        tree = self.extracted
+        if tree is not None:
+            return (tree / rel_path).exists()
+        archive = self._asar()
+        return archive is not None and archive.exists(rel_path)
+
+    def close(self):
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+            self._archive = None
+            self._opened = False
@@ -0,0 +1,64 @@
+/**
+ * PokePath Headless Hooks - module loader hooks for headless_sim.mjs
+ *
+ * Registered with module.register() before any game module is imported:
+ *   - the game's scripts are ES modules shipped as plain .js with no
+ *     package.json "type", so everything under src/js loads as 'module'
+ *   - modules that only talk to the DOM, audio or localStorage are replaced
+ *     by ones exporting the same names, each bound to the shims' absorb
+ *     object (callable, constructible, every property is itself)
+ *   - utils/Sprite.js exports the shims' layout-only Sprite
+ */
+
+import { readFile } from 'node:fs/promises';
+
+// Paths relative to src/js
+const ABSORBED_MODULES = ['file/audio.js', 'file/data.js', 'utils/Element.js'];
+const REPLACED_EXPORTS = { 'utils/Sprite.js': ['Sprite'] };
+
+let gameJsUrl = null;
+let shimsUrl = null;
+
+export function initialize(data) {
+    gameJsUrl = data.gameJsUrl;
+    shimsUrl = data.shimsUrl;
+}
+
+/**
+ * Names a module exports, found by pattern (the game's modules only use
+ * plain declarations and export lists).
+ */
+function exportedNames(source) {
+    const names = new Set();
+    const declaration = /^\s*export\s+(?:async\s+)?(?:function\s*\*?|class|const|let|var)\s+([A-Za-z_$][\w$]*)/gm;
+    for (const match of source.matchAll(declaration)) names.add(match[1]);
+    for (const match of source.matchAll(/^\s*export\s*\{([^}]*)\}/gm)) {
+        for (const part of match[1].split(',')) {
+            const name = part.trim().split(/\s+as\s+/).pop().trim();
+            if (name) names.add(name);
+        }
+    }
+    if (/^\s*export\s+default\b/m.test(source)) names.add('default');
+    return names;
+}
+
+function headlessModule(source, replaced = []) {
+    const lines = [`import { absorb } from ${JSON.stringify(shimsUrl)};`];
+    for (const name of exportedNames(source)) {
+        if (replaced.includes(name)) continue;
+        lines.push(name === 'default' ? 'export default absorb;' : `export const ${name} = absorb;`);
+    }
+    if (replaced.length) lines.push(`export { ${replaced.join(', ')} } from ${JSON.stringify(shimsUrl)};`);
+    return lines.join('\n');
+}
+
+export async function load(url, context, nextLoad) {
+    if (!gameJsUrl || !url.startsWith(gameJsUrl)) return nextLoad(url, context);
+    const rel = decodeURIComponent(url.slice(gameJsUrl.length).split(/[?#]/)[0]);
+    const source = await readFile(new URL(url), 'utf8');
+
+    if (ABSORBED_MODULES.includes(rel) || rel in REPLACED_EXPORTS) {
+        return { format: 'module', shortCircuit: true, source: headlessModule(source, REPLACED_EXPORTS[rel]) };
+    }
+    return { format: 'module', shortCircuit: true, source };
+}
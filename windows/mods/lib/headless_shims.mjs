@@ -0,0 +1,193 @@
+/**
+ * PokePath Headless Shims - just enough browser for the game's logic
+ *
+ * Nothing here draws or plays anything. Entities still get real sizes,
+ * because Enemy/Tower centers (and so ranges and hit tests) are derived
+ * from sprite frame sizes: images are "loaded" synchronously by reading the
+ * PNG header from the extracted game.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+
+// ============================================================================
+// ABSORB
+// ============================================================================
+// Stands in for any DOM object, context or module export the logic touches:
+// calls and `new` return it, every property read returns it, writes are
+// dropped and it converts to 0. Bound function target: no non-configurable
+// `prototype`, so the get trap may answer for every key.
+function absorbTarget() {}
+
+export const absorb = new Proxy(absorbTarget.bind(null), {
+    get(target, key) {
+        if (key === Symbol.toPrimitive) return () => 0;
+        if (typeof key === 'symbol' || key === 'then') return undefined;
+        return absorb;
+    },
+    set: () => true,
+    deleteProperty: () => true,
+    apply: () => absorb,
+    construct: () => absorb,
+});
+
+/** A DOM-like object that keeps what is written to it and absorbs the rest. */
+export function headlessElement(props = {}) {
+    return new Proxy(props, {
+        get(target, key) {
+            if (key in target) return target[key];
+            return (typeof key === 'symbol' || key === 'then') ? undefined : absorb;
+        },
+    });
+}
+
+// ============================================================================
+// IMAGES
+// ============================================================================
+const PNG_SIGNATURE = Buffer.from([0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]);
+const imageSizes = new Map();
+let appRoot = process.cwd();
+
+/** [width, height] from a PNG's IHDR chunk, or null. Cached per path. */
+export function pngSize(src) {
+    if (typeof src !== 'string' || !src || /^(data|https?|blob):/.test(src)) return null;
+    const file = path.resolve(appRoot, decodeURIComponent(src.split(/[?#]/)[0]));
+    if (imageSizes.has(file)) return imageSizes.get(file);
+    let size = null;
+    try {
+        const header = Buffer.alloc(24);
+        const fd = fs.openSync(file, 'r');
+        try {
+            fs.readSync(fd, header, 0, 24, 0);
+        } finally {
+            fs.closeSync(fd);
+        }
+        if (header.subarray(0, 8).equals(PNG_SIGNATURE)) size = [header.readUInt32BE(16), header.readUInt32BE(20)];
+    } catch (_) { size = null; }
+    imageSizes.set(file, size);
+    return size;
+}
+
+export class HeadlessImage {
+    constructor(width = 0, height = 0) {
+        this.width = width;
+        this.height = height;
+        this.naturalWidth = 0;
+        this.naturalHeight = 0;
+        this.complete = false;
+        this.onload = null;
+        this.onerror = null;
+        this.style = absorb;
+        this._src = '';
+        this._listeners = { load: [], error: [] };
+    }
+
+    get src() {
+        return this._src;
+    }
+
+    // Loads synchronously: onload runs before the assignment returns
+    set src(value) {
+        this._src = typeof value === 'string' ? value : (value?.src ?? String(value));
+        const size = pngSize(this._src);
+        this.complete = true;
+        if (size) {
+            [this.width, this.height] = size;
+            [this.naturalWidth, this.naturalHeight] = size;
+        }
+        const type = size ? 'load' : 'error';
+        const handler = size ? this.onload : this.onerror;
+        if (typeof handler === 'function') handler.call(this, { type, target: this });
+        for (const fn of this._listeners[type]) fn.call(this, { type, target: this });
+    }
+
+    addEventListener(type, fn) {
+        if (this._listeners[type]) this._listeners[type].push(fn);
+    }
+
+    removeEventListener(type, fn) {
+        const list = this._listeners[type];
+        if (list && list.includes(fn)) list.splice(list.indexOf(fn), 1);
+    }
+
+    decode() {
+        return Promise.resolve();
+    }
+}
+
+// ============================================================================
+// SPRITE
+// ============================================================================
+// Same constructor and fields as utils/Sprite.js, minus the drawing:
+// frames.max columns by frames.rows direction rows per sheet.
+export class Sprite {
+    constructor(x, y, ctx, image, frames = 1, rows = 1, _offset = 0, hold = 10) {
+        this.position = { x, y };
+        this.ctx = ctx;
+        this.frames = { max: frames, rows, current: 0, elapsed: 0, hold, direction: 0 };
+        this.width = 0;
+        this.height = 0;
+        this.loaded = false;
+        this.sprite = new HeadlessImage();
+        this.sprite.onload = () => {
+            this.width = this.sprite.width / this.frames.max;
+            this.height = this.sprite.height / this.frames.rows;
+            this.loaded = true;
+        };
+        this.sprite.src = image;
+    }
+
+    draw() {}
+}
+
+// ============================================================================
+// GLOBALS
+// ============================================================================
+function memoryStorage() {
+    const items = new Map();
+    return {
+        getItem: (key) => (items.has(String(key)) ? items.get(String(key)) : null),
+        setItem: (key, value) => { items.set(String(key), String(value)); },
+        removeItem: (key) => { items.delete(String(key)); },
+        clear: () => items.clear(),
+        key: (i) => [...items.keys()][i] ?? null,
+        get length() { return items.size; },
+    };
+}
+
+// Keeps its size and its context's `canvas` back-reference (logic bounds
+// checks read ctx.canvas.width); drawing calls are absorbed
+function headlessCanvas() {
+    const canvas = headlessElement({ width: 300, height: 150, style: absorb });
+    const ctx = headlessElement({ canvas });
+    canvas.getContext = () => ctx;
+    return canvas;
+}
+
+/**
+ * Install the browser globals the game's modules reach for. root: the
+ * extracted app folder, which the game's './src/assets/...' paths are
+ * relative to.
+ */
+export function installGlobals(root) {
+    appRoot = root;
+    const document = headlessElement({
+        createElement: (tag) => (String(tag).toLowerCase() === 'canvas'
+            ? headlessCanvas()
+            : headlessElement({ style: absorb })),
+        querySelector: () => null,
+        querySelectorAll: () => [],
+        getElementsByClassName: () => [],
+    });
+    Object.assign(globalThis, {
+        document,
+        window: globalThis,
+        Image: HeadlessImage,
+        Audio: absorb,
+        localStorage: memoryStorage(),
+        requestAnimationFrame: () => 0,
+        cancelAnimationFrame: () => {},
+        addEventListener: () => {},
+        removeEventListener: () => {},
+    });
+}
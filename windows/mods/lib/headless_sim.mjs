@@ -0,0 +1,298 @@
+/**
+ * PokePath Headless Simulation - batch wave runs with no canvas or DOM
+ *
+ * Runs the installed game's own Area, Enemy, Tower and Projectile logic
+ * (through Game.simulateStep, the FIXED-TIMESTEP build) as fast as the CPU
+ * allows, and prints one JSON line per wave. Driven by balance_sim.py.
+ *
+ * Usage:
+ *   node headless_sim.mjs --game <app_extracted> --scenario <file|-> [--from N] [--count N] [--seed N]
+ *
+ * Scenario (JSON):
+ *   {
+ *     "route": 0,
+ *     "team": [{"specieKey": "charizard", "lvl": 2000, "item": "choiceSpecs", "tilePosition": 12}],
+ *     "stars": 0,             optional: player stars (end-of-wave gold bonus)
+ *     "fossilInTeam": 0,      optional: fossil count the fossil items scale with
+ *     "speed": 10,            optional: steps per rendered frame, as at that game speed
+ *     "maxWaveSeconds": 900   optional: simulated time before a wave counts as stalled
+ *   }
+ * Team entries use the save file's pokemon format (Pokemon.fromOriginalData);
+ * "item" may be an item id or a saved item object.
+ *
+ * Output lines (stdout):
+ *   {"event": "start", "route", "from", "count", "towers": [...], "skipped": [...]}
+ *   {"event": "wave", "wave", "endless", "enemies", "hp", "killed", "leaked",
+ *    "damageTaken", "damageDealt", "gold", "simSeconds", "stalled", "realMs"}
+ *   {"event": "done", "waves", "realSeconds"}
+ * Errors go to stderr with a non-zero exit code. The game's own console
+ * output is dropped (stdout carries the results) unless --verbose is given.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import { register } from 'node:module';
+import { pathToFileURL } from 'node:url';
+import { absorb, installGlobals } from './headless_shims.mjs';
+
+const PLAYER_HEALTH = 14;
+const DEFAULT_SPEED = 10;
+const DEFAULT_MAX_WAVE_SECONDS = 900;
+
+// ============================================================================
+// ARGUMENTS
+// ============================================================================
+function parseArgs(argv) {
+    const args = { game: null, scenario: null, from: null, count: 1, seed: null, verbose: false };
+    for (let i = 0; i < argv.length; i++) {
+        const flag = argv[i];
+        const value = () => {
+            if (i + 1 >= argv.length) fail(`${flag} needs a value`);
+            return argv[++i];
+        };
+        switch (flag) {
+            case '--game': args.game = value(); break;
+            case '--scenario': args.scenario = value(); break;
+            case '--from': args.from = parseInt(value(), 10); break;
+            case '--count': args.count = parseInt(value(), 10); break;
+            case '--seed': args.seed = parseInt(value(), 10); break;
+            case '--verbose': args.verbose = true; break;
+            default: fail(`unknown argument ${flag}`);
+        }
+    }
+    if (!args.game || !args.scenario) fail('--game and --scenario are required');
+    if (args.from !== null && !(args.from >= 1)) fail('--from must be a wave number >= 1');
+    if (!(args.count >= 1)) fail('--count must be >= 1');
+    if (args.seed !== null && !Number.isInteger(args.seed)) fail('--seed must be an integer');
+    return args;
+}
+
+function fail(message) {
+    process.stderr.write(`headless_sim: ${message}\n`);
+    process.exit(2);
+}
+
+function readScenario(source) {
+    try {
+        return JSON.parse(fs.readFileSync(source === '-' ? 0 : source, 'utf8'));
+    } catch (e) {
+        fail(`scenario unreadable: ${e.message}`);
+    }
+}
+
+function emit(record) {
+    process.stdout.write(JSON.stringify(record) + '\n');
+}
+
+// Deterministic Math.random for reproducible runs (mulberry32)
+function seededRandom(seed) {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6D2B79F5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+// ============================================================================
+// STAND-IN GAME STATE
+// ============================================================================
+// Everything the entity logic reads off `main`, without the scenes and UI.
+// The player never loses health: leaks are counted instead, so a wave that
+// would end the run is still played out and measured.
+function headlessMain(scenario, route, items, tally) {
+    const player = {
+        health: { [route]: PLAYER_HEALTH },
+        records: { [route]: 0 },
+        gold: 0,
+        stars: scenario.stars ?? 0,
+        extraGold: 0,
+        items,
+        fossilInTeam: scenario.fossilInTeam ?? 0,
+        megaInTeam: false,
+        shinyAmount: 0,
+        stats: absorb,
+        achievementProgress: absorb,
+        changeGold(amount) {
+            this.gold += amount;
+            if (amount > 0) tally.gold += amount;
+        },
+        getDamaged(power) {
+            tally.leaked++;
+            tally.damageTaken += power;
+        },
+        getHealed() {},
+        obtainStar() {},
+        unlockAchievement() {},
+    };
+    return {
+        lang: 0,
+        mute: [true, true, true],
+        showDamage: false,
+        displayHealth: 0,
+        mapEffects: 2,
+        autoStop: false,
+        autoStopBoss: false,
+        player,
+        team: { pokemon: [] },
+        box: { pokemon: [] },
+        utility: {
+            chrono: () => absorb,
+            numberDot: (value) => String(value),
+            isBetweenHours: (start, end) => {
+                const hour = new Date().getHours();
+                return hour >= start && hour < end;
+            },
+        },
+        UI: absorb,
+        scene: absorb,
+        shop: absorb,
+        teamManager: absorb,
+        mapScene: absorb,
+        shopScene: absorb,
+        finalScene: absorb,
+        boxScene: absorb,
+    };
+}
+
+// ============================================================================
+// RUN
+// ============================================================================
+async function main() {
+    const args = parseArgs(process.argv.slice(2));
+    const scenario = readScenario(args.scenario);
+    const appRoot = path.resolve(args.game);
+    const jsRoot = path.join(appRoot, 'src', 'js');
+    if (!fs.existsSync(path.join(jsRoot, 'game', 'Game.js'))) fail(`no extracted game at ${appRoot} (extract app.asar there, or run balance_sim.py without --game)`);
+
+    if (!args.verbose) {
+        for (const level of ['log', 'info', 'warn', 'debug']) console[level] = () => {};
+    } else {
+        // stdout is the results channel
+        for (const level of ['log', 'info', 'warn', 'debug']) console[level] = console.error;
+    }
+
+    if (args.seed !== null) Math.random = seededRandom(args.seed);
+
+    installGlobals(appRoot);
+    register(new URL('./headless_hooks.mjs', import.meta.url), {
+        data: {
+            gameJsUrl: pathToFileURL(jsRoot).href + '/',
+            shimsUrl: new URL('./headless_shims.mjs', import.meta.url).href,
+        },
+    });
+    const gameModule = (rel) => import(pathToFileURL(path.join(jsRoot, ...rel.split('/'))).href);
+    const [{ Game }, { Area }, { Pokemon }, { pokemonData }, { itemData }, { routeData }] = await Promise.all([
+        gameModule('game/Game.js'),
+        gameModule('game/core/Area.js'),
+        gameModule('game/component/Pokemon.js'),
+        gameModule('game/data/pokemonData.js'),
+        gameModule('game/data/itemData.js'),
+        gameModule('game/data/routeData.js'),
+    ]);
+    if (typeof Game.prototype.simulateStep !== 'function') {
+        fail('installed Game.js has no fixed-timestep loop; apply the mods (deltatime feature) first');
+    }
+    if (typeof Area.prototype.spawnEndlessWave !== 'function') {
+        fail('installed Area.js is not the endless build; apply the mods (endless feature) first');
+    }
+
+    const route = scenario.route ?? 0;
+    if (!routeData[route]) fail(`unknown route ${route}`);
+    const team = Array.isArray(scenario.team) ? scenario.team.filter(Boolean) : [];
+    if (team.length === 0) fail('scenario has no team');
+
+    // Held items must be in player.items for the Pokemon constructor to equip them
+    const itemId = (item) => (typeof item === 'string' ? item : item?.id);
+    const items = [];
+    for (const entry of team) {
+        const id = itemId(entry.item);
+        if (!id) continue;
+        if (!itemData[id]) fail(`unknown item ${id}`);
+        if (!items.includes(itemData[id])) items.push(itemData[id]);
+    }
+
+    const tally = { leaked: 0, damageTaken: 0, gold: 0 };
+    const game = headlessMain(scenario, route, items, tally);
+    game.game = new Game(game);
+    for (const entry of team) {
+        if (!pokemonData[entry.specieKey]) fail(`unknown pokemon ${entry.specieKey}`);
+        const id = itemId(entry.item);
+        const pokemon = Pokemon.fromOriginalData({ ...entry, item: id ? { id } : null }, game);
+        pokemon.tilePosition = entry.tilePosition ?? -1;
+        game.team.pokemon.push(pokemon);
+    }
+
+    // Area's constructor loads the route and deploys every team member onto
+    // its saved tilePosition, exactly as when a save is loaded
+    const startWave = args.from ?? scenario.startWave ?? 1;
+    const area = new Area(game, { routeNumber: route, routeWaves: { [route]: startWave } });
+    const sim = game.game;
+    emit({
+        event: 'start',
+        route,
+        from: startWave,
+        count: args.count,
+        towers: area.towers.map(t => ({ specie: t.pokemon.specie.key, lvl: t.pokemon.lvl, tile: t.pokemon.tilePosition })),
+        skipped: game.team.pokemon.filter(p => !p.isDeployed).map(p => p.specie.key),
+    });
+    if (area.towers.length === 0) fail('no team member could be placed (check tilePosition and tile types)');
+
+    const stepMs = sim.frameDuration;
+    const frameSteps = Math.max(1, Math.round(scenario.speed ?? DEFAULT_SPEED));
+    const maxSteps = Math.ceil((scenario.maxWaveSeconds ?? DEFAULT_MAX_WAVE_SECONDS) * 1000 / stepMs);
+    const runStart = performance.now();
+
+    for (let n = 0; n < args.count; n++) {
+        const wave = area.waveNumber;
+        const waveStart = performance.now();
+        tally.leaked = 0;
+        tally.damageTaken = 0;
+        tally.gold = 0;
+
+        area.newWave();
+        const spawned = [...area.enemies.map(e => e.hpMax), ...area._spawnQueue.map(d => d.enemy.hp)];
+        let steps = 0;
+        while (area.waveActive && steps < maxSteps) {
+            sim.simulateStep(stepMs, steps % frameSteps === 0);
+            steps++;
+        }
+        const stalled = area.waveActive;
+        const remaining = area.enemies.length + area._spawnQueue.length;
+        if (stalled) {
+            area.enemies = [];
+            area._spawnQueue = [];
+            area.endWave();
+        }
+
+        emit({
+            event: 'wave',
+            wave,
+            endless: area.endlessMode,
+            enemies: spawned.length,
+            hp: spawned.reduce((sum, hp) => sum + hp, 0),
+            killed: Math.max(0, spawned.length - tally.leaked - remaining),
+            leaked: tally.leaked,
+            damageTaken: tally.damageTaken,
+            damageDealt: area.totalDamageDealt,
+            gold: tally.gold,
+            simSeconds: Math.round(steps * stepMs) / 1000,
+            stalled,
+            realMs: Math.round(performance.now() - waveStart),
+        });
+
+        // Wave 100 outside endless opens the final scene; continue as its button does
+        if (area.waveNumber === wave) {
+            if (wave !== 100) fail(`wave ${wave} did not advance`);
+            area.enableEndlessMode();
+        }
+    }
+    emit({ event: 'done', waves: args.count, realSeconds: Math.round(performance.now() - runStart) / 1000 });
+}
+
+main().catch((e) => {
+    process.stderr.write(`headless_sim: ${e?.stack ?? e}\n`);
+    process.exitCode = 1;
+});
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+PokePath TD LevelDB Reader
+Read-only, pure-Python access to the game's Local Storage LevelDB, so loading
+a save doesn't need Node.js, the `level` package or a temp JSON file.
+
+Only what a point lookup needs is implemented:
+  - write-ahead logs (*.log): 32 KiB blocks of FULL/FIRST/MIDDLE/LAST
+    records, each a WriteBatch (sequence, count, put/delete entries)
+  - tables (*.ldb / *.sst): footer -> index block -> data blocks, blocks
+    optionally snappy-compressed, prefix-compressed entries
+Every live and leftover file is scanned and the entry with the highest
+sequence number wins, so MANIFEST/CURRENT don't have to be parsed
+(compaction keeps sequence numbers, so stale files only ever hold older
+versions of a key).
+
+Chromium stores each Local Storage value with a one-byte encoding prefix:
+0x00 = UTF-16LE, 0x01 = Latin-1. The game keeps its whole save as JSON in
+SAVE_KEY.
+"""
+
+import hashlib
+import json
+import struct
+from pathlib import Path
+
+
+SAVE_KEY = b'_file://\x00\x01data'
+
+LOG_BLOCK_SIZE = 32768
+LOG_HEADER_SIZE = 7
+LOG_FULL, LOG_FIRST, LOG_MIDDLE, LOG_LAST = 1, 2, 3, 4
+
+TABLE_MAGIC = 0xdb4775248b80fb57
+FOOTER_SIZE = 48
+BLOCK_TRAILER_SIZE = 5
+NO_COMPRESSION, SNAPPY_COMPRESSION = 0, 1
+
+TYPE_DELETION, TYPE_VALUE = 0, 1
+
+
+class LevelDBError(Exception):
+    """Raised for files this reader can't make sense of."""
+
+
+def _varint(data, pos):
+    """Decode a little-endian base-128 varint at pos. Returns (value, new_pos)."""
+    result = shift = 0
+    while True:
+        if pos >= len(data):
+            raise LevelDBError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise LevelDBError("varint too long")
+
+
+# ============================================================================
+# SNAPPY
+# ============================================================================
+def snappy_decompress(data):
+    """Decompress a raw (unframed) snappy block."""
+    length, pos = _varint(data, 0)
+    out = bytearray()
+    end = len(data)
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        kind = tag & 3
+        if kind == 0:  # literal
+            size = tag >> 2
+            if size >= 60:
+                extra = size - 59
+                size = int.from_bytes(data[pos:pos + extra], 'little')
+                pos += extra
+            size += 1
+            out += data[pos:pos + size]
+            pos += size
+            continue
+        if kind == 1:
+            size = ((tag >> 2) & 7) + 4
+            offset = ((tag >> 5) << 8) | data[pos]
+            pos += 1
+        elif kind == 2:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 2], 'little')
+            pos += 2
+        else:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 4], 'little')
+            pos += 4
+        if offset == 0 or offset > len(out):
+            raise LevelDBError("corrupt snappy block (bad copy offset)")
+        start = len(out) - offset
+        if offset >= size:
+            out += out[start:start + size]
+        else:
+            # Overlapping copy repeats the last `offset` bytes
+            pattern = bytes(out[start:])
+            out += (pattern * (size // offset + 1))[:size]
+    if len(out) != length:
+        raise LevelDBError("corrupt snappy block (length mismatch)")
+    return bytes(out)
+
+
+# ============================================================================
+# WRITE-AHEAD LOG
+# ============================================================================
+def _iter_log_records(data):
+    """Reassembled logical records of a log file; a torn tail is ignored."""
+    pending = None
+    pos = 0
+    end = len(data)
+    while pos + LOG_HEADER_SIZE <= end:
+        block_left = LOG_BLOCK_SIZE - pos % LOG_BLOCK_SIZE
+        if block_left < LOG_HEADER_SIZE:
+            pos += block_left  # block trailer padding
+            continue
+        length, kind = struct.unpack_from('<HB', data, pos + 4)
+        start = pos + LOG_HEADER_SIZE
+        if kind == 0 and length == 0:
+            pos += block_left  # zero-filled (preallocated) rest of block
+            continue
+        if start + length > end:
+            return  # record still being written
+        fragment = data[start:start + length]
+        pos = start + length
+        if kind == LOG_FULL:
+            pending = None
+            yield fragment
+        elif kind == LOG_FIRST:
+            pending = bytearray(fragment)
+        elif kind == LOG_MIDDLE and pending is not None:
+            pending += fragment
+        elif kind == LOG_LAST and pending is not None:
+            pending += fragment
+            yield bytes(pending)
+            pending = None
+
+
+def iter_log_entries(path):
+    """Yield (user_key, sequence, type, value) for every write in a log file."""
+    data = Path(path).read_bytes()
+    for record in _iter_log_records(data):
+        if len(record) < 12:
+            continue
+        sequence, count = struct.unpack_from('<QI', record, 0)
+        pos = 12
+        try:
+            for i in range(count):
+                kind = record[pos]
+                key_len, pos = _varint(record, pos + 1)
+                key = record[pos:pos + key_len]
+                pos += key_len
+                value = None
+                if kind == TYPE_VALUE:
+                    value_len, pos = _varint(record, pos)
+                    value = record[pos:pos + value_len]
+                    pos += value_len
+                elif kind != TYPE_DELETION:
+                    raise LevelDBError(f"unknown write batch entry type {kind}")
+                yield key, sequence + i, kind, value
+        except (IndexError, LevelDBError):
+            continue  # skip a corrupt batch, keep reading the log
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+def _read_block(data, handle):
+    offset, size = handle
+    if offset + size + BLOCK_TRAILER_SIZE > len(data):
+        raise LevelDBError("block runs past end of table")
+    contents = data[offset:offset + size]
+    compression = data[offset + size]
+    if compression == SNAPPY_COMPRESSION:
+        return snappy_decompress(contents)
+    if compression != NO_COMPRESSION:
+        raise LevelDBError(f"unsupported block compression {compression}")
+    return contents
+
+
+def _iter_block(block):
+    """Yield (key, value) for every entry of a table block."""
+    if len(block) < 4:
+        raise LevelDBError("block too small")
+    num_restarts = struct.unpack_from('<I', block, len(block) - 4)[0]
+    limit = len(block) - 4 - 4 * num_restarts
+    if limit < 0:
+        raise LevelDBError("bad restart array")
+    pos = 0
+    key = b''
+    while pos < limit:
+        shared, pos = _varint(block, pos)
+        non_shared, pos = _varint(block, pos)
+        value_len, pos = _varint(block, pos)
+        key = key[:shared] + block[pos:pos + non_shared]
+        pos += non_shared
+        yield key, block[pos:pos + value_len]
+        pos += value_len
+
+
+def _block_handle(data, pos=0):
+    offset, pos = _varint(data, pos)
+    size, pos = _varint(data, pos)
+    return (offset, size), pos
+
+
+def iter_table_entries(path, user_key=None):
+    """Yield (user_key, sequence, type, value) from a table file.
+
+    With user_key, only data blocks whose index range can hold it are read.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < FOOTER_SIZE:
+        raise LevelDBError(f"{Path(path).name}: too small to be a table")
+    footer = data[-FOOTER_SIZE:]
+    if struct.unpack_from('<Q', footer, FOOTER_SIZE - 8)[0] != TABLE_MAGIC:
+        raise LevelDBError(f"{Path(path).name}: bad table magic")
+    _, pos = _block_handle(footer)  # metaindex (filters) isn't needed
+    index_handle, _ = _block_handle(footer, pos)
+
+    for separator, handle_bytes in _iter_block(_read_block(data, index_handle)):
+        # Index keys are >= every key in their block and < every key after it
+        if user_key is not None and separator[:-8] < user_key:
+            continue
+        handle, _ = _block_handle(handle_bytes)
+        for internal_key, value in _iter_block(_read_block(data, handle)):
+            key = internal_key[:-8]
+            tag = struct.unpack_from('<Q', internal_key, len(internal_key) - 8)[0]
+            yield key, tag >> 8, tag & 0xff, value
+        if user_key is not None and separator[:-8] > user_key:
+            break
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+def get(db_dir, key, attempts=3):
+    """Newest value of key in a LevelDB directory, or None if absent/deleted.
+
+    The DB may be live (the game or the save helper has it open): a file
+    compacted away, or a table still being written, mid-scan just means the
+    scan is started over.
+    """
+    db_dir = Path(db_dir)
+    if not db_dir.is_dir():
+        return None
+    key = bytes(key)
+    for attempt in range(attempts):
+        try:
+            return _scan(db_dir, key)
+        except (FileNotFoundError, LevelDBError):
+            if attempt == attempts - 1:
+                raise
+
+
+def _scan(db_dir, key):
+    best_seq, best = -1, None
+    for path in sorted(db_dir.iterdir()):
+        suffix = path.suffix.lower()
+        if suffix == '.log':
+            entries = iter_log_entries(path)
+        elif suffix in ('.ldb', '.sst'):
+            entries = iter_table_entries(path, key)
+        else:
+            continue
+        for entry_key, sequence, kind, value in entries:
+            if entry_key == key and sequence > best_seq:
+                best_seq, best = sequence, (value if kind == TYPE_VALUE else None)
+    return best
+
+
+def decode_local_storage_value(raw):
+    """Decode a Chromium Local Storage value (encoding prefix byte + string)."""
+    if not raw:
+        return ''
+    if raw[0] == 0:
+        return raw[1:].decode('utf-16-le')
+    if raw[0] == 1:
+        return raw[1:].decode('latin-1')
+    raise LevelDBError(f"unknown Local Storage value encoding {raw[0]}")
+
+
+def value_digest(raw):
+    """SHA-256 of a stored value's bytes - the save editor's delta-write base
+    hash, computed the same way by save_helper.js."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def read_save(db_dir, key=SAVE_KEY):
+    """The game's save as parsed JSON, or None if the DB has no save."""
+    return read_save_with_digest(db_dir, key)[0]
+
+
+def read_save_with_digest(db_dir, key=SAVE_KEY):
+    """(parsed save, value_digest of the stored value), or (None, None)."""
+    raw = get(db_dir, key)
+    if raw is None:
+        return None, None
+    text = decode_local_storage_value(raw)
+    if not text:
+        return None, None
+    return json.loads(text), value_digest(raw)
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 2:
+        print("Usage: python leveldb_reader.py <path to Local Storage/leveldb>")
+        sys.exit(2)
+    save = read_save(sys.argv[1])
+    if save is None:
+        print("No save found")
+        sys.exit(1)
+    print(json.dumps(save, indent=2))
@@ -2,19 +2,95 @@
  * PokePath Save Helper - Node.js LevelDB access
  * 
  * Data format: Leading 0x00 byte + UTF-16LE encoded JSON
+ *
+ * Usage:
+ *   node save_helper.js export|import [--modded]           one-shot, via current_save.json
+ *   node save_helper.js export|import [--modded] --stdio   one-shot, compact JSON on stdout/stdin
+ *   node save_helper.js serve                              long-lived bridge (see serve())
  */
 
 const { Level } = require('level');
+const crypto = require('crypto');
 const path = require('path');
 const fs = require('fs');
 const os = require('os');
+const readline = require('readline');
 const { execSync } = require('child_process');
 
 const isModded = process.argv.includes('--modded');
-const APP_FOLDER = isModded ? 'pokePathTD_Electron_modded' : 'pokePathTD_Electron';
-const LEVELDB_PATH = path.join(os.homedir(), `AppData/Roaming/${APP_FOLDER}/Local Storage/leveldb`);
+const useStdio = process.argv.includes('--stdio');
+const LEVELDB_PATH = leveldbPath(isModded);
 const SAVE_KEY = '_file://\x00\x01data';
 const TEMP_FILE = path.join(__dirname, 'current_save.json');
+// serve: release the DB after this long without requests so the game can open it
+const SERVE_IDLE_CLOSE_MS = 15000;
+
+function leveldbPath(modded) {
+    const appFolder = modded ? 'pokePathTD_Electron_modded' : 'pokePathTD_Electron';
+    return path.join(os.homedir(), `AppData/Roaming/${appFolder}/Local Storage/leveldb`);
+}
+
+function decodeSaveText(raw) {
+    // Skip leading byte, decode as UTF-16LE
+    return raw.slice(1).toString('utf16le');
+}
+
+function encodeSaveText(text) {
+    // Encode as UTF-16LE with leading 0x00 byte
+    return Buffer.concat([Buffer.from([0x00]), Buffer.from(text, 'utf16le')]);
+}
+
+function decodeSave(raw) {
+    return JSON.parse(decodeSaveText(raw));
+}
+
+function encodeSave(parsed) {
+    return encodeSaveText(JSON.stringify(parsed));
+}
+
+// Base hash for delta writes; lib/leveldb_reader.py value_digest() must match
+function valueHash(raw) {
+    return crypto.createHash('sha256').update(raw).digest('hex');
+}
+
+/**
+ * Apply JSON Patch (RFC 6902) add/replace/remove ops to a parsed save in place.
+ */
+function applyPatch(doc, ops) {
+    for (const op of ops) {
+        const keys = String(op.path).split('/').slice(1).map(k => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+        if (!keys.length) throw new Error(`Bad patch path: ${op.path}`);
+        const last = keys.pop();
+        let parent = doc;
+        for (const key of keys) {
+            parent = parent !== null && typeof parent === 'object' ? parent[key] : undefined;
+            if (parent === undefined) throw new Error(`Patch path not found: ${op.path}`);
+        }
+        if (parent === null || typeof parent !== 'object') throw new Error(`Patch path not found: ${op.path}`);
+        const index = Array.isArray(parent) ? (last === '-' ? parent.length : Number(last)) : last;
+        if (op.op !== 'add' && !(index in parent)) throw new Error(`Patch path not found: ${op.path}`);
+
+        if (op.op === 'remove') {
+            if (Array.isArray(parent)) parent.splice(index, 1); else delete parent[index];
+        } else if (op.op === 'replace') {
+            parent[index] = op.value;
+        } else if (op.op === 'add') {
+            if (Array.isArray(parent)) parent.splice(index, 0, op.value); else parent[index] = op.value;
+        } else {
+            throw new Error(`Unsupported patch op: ${op.op}`);
+        }
+    }
+    return doc;
+}
+
+function readStdin() {
+    return new Promise((resolve, reject) => {
+        const chunks = [];
+        process.stdin.on('data', chunk => chunks.push(chunk));
+        process.stdin.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+        process.stdin.on('error', reject);
+    });
+}
 
 /**
  * Check if the game process is currently running (Windows).
@@ -36,8 +112,8 @@ function isGameRunning() {
  * Try to clear a stale LOCK file if the game isn't running.
  * Returns true if lock was cleared or doesn't exist.
  */
-function clearStaleLock() {
-    const lockPath = path.join(LEVELDB_PATH, 'LOCK');
+function clearStaleLock(dbPath = LEVELDB_PATH) {
+    const lockPath = path.join(dbPath, 'LOCK');
     if (!fs.existsSync(lockPath)) return true;
 
     if (isGameRunning()) {
@@ -59,16 +135,16 @@ function clearStaleLock() {
 /**
  * Open the LevelDB with retry + stale lock cleanup.
  */
-async function openDbWithRetry(maxRetries = 2) {
+async function openDbWithRetry(maxRetries = 2, dbPath = LEVELDB_PATH) {
     for (let attempt = 0; attempt <= maxRetries; attempt++) {
         try {
-            const db = new Level(LEVELDB_PATH, { valueEncoding: 'buffer' });
+            const db = new Level(dbPath, { valueEncoding: 'buffer' });
             await db.open();
             return db;
         } catch (e) {
             if (attempt < maxRetries && (e.message.includes('lock') || e.message.includes('LOCK'))) {
                 console.log(`INFO: DB locked, attempting to clear stale lock (attempt ${attempt + 1}/${maxRetries})`);
-                if (!clearStaleLock()) {
+                if (!clearStaleLock(dbPath)) {
                     throw e;
                 }
                 await new Promise(r => setTimeout(r, 500));
@@ -79,9 +155,127 @@ async function openDbWithRetry(maxRetries = 2) {
     }
 }
 
+/**
+ * Long-lived bridge for the save editor: one JSON request per stdin line,
+ * one JSON response per stdout line, handled strictly in order.
+ *
+ *   {"id": 1, "cmd": "export", "modded": true}  -> {"id": 1, "ok": true, "save": {...}, "base_hash": "..."}
+ *   {"id": 2, "cmd": "import", "modded": true, "save": {...}}           -> {"id": 2, "ok": true, "base_hash": "..."}
+ *   {"id": 3, "cmd": "patch", "modded": true, "base_hash": "...", "ops": [...]} -> {"id": 3, "ok": true, "base_hash": "..."}
+ *   {"id": 4, "cmd": "close"}   release every open DB (the LOCK) now
+ *   {"id": 5, "cmd": "quit"}    close and exit (so does EOF on stdin)
+ *
+ * base_hash is valueHash() of the stored value. patch applies JSON Patch ops
+ * to the current save only if it still hashes to base_hash, and otherwise
+ * answers {"ok": false, "conflict": true, ...} without writing.
+ *
+ * Failures answer {"id": .., "ok": false, "error": "..."}. Each DB stays open
+ * between requests and is closed after SERVE_IDLE_CLOSE_MS of inactivity.
+ */
+async function serve() {
+    // stdout carries the protocol; route diagnostics (INFO lines etc.) to stderr
+    console.log = console.error;
+    const reply = msg => process.stdout.write(JSON.stringify(msg) + '\n');
+    const dbs = new Map();  // db path -> { db, timer }
+    let queue = Promise.resolve();  // requests (and idle closes) run one at a time
+    let rl = null;
+
+    async function closeDb(dbPath) {
+        const entry = dbs.get(dbPath);
+        if (!entry) return;
+        dbs.delete(dbPath);
+        clearTimeout(entry.timer);
+        try { await entry.db.close(); } catch {}
+    }
+
+    async function closeAll() {
+        for (const dbPath of [...dbs.keys()]) await closeDb(dbPath);
+    }
+
+    async function getDb(modded, create) {
+        const dbPath = leveldbPath(modded);
+        let entry = dbs.get(dbPath);
+        if (!entry) {
+            if (!fs.existsSync(dbPath)) {
+                if (!create) throw new Error(`Game save not found at ${dbPath}`);
+                fs.mkdirSync(dbPath, { recursive: true });
+            }
+            entry = { db: await openDbWithRetry(2, dbPath), timer: null };
+            dbs.set(dbPath, entry);
+        }
+        clearTimeout(entry.timer);
+        entry.timer = setTimeout(() => { queue = queue.then(() => closeDb(dbPath)); }, SERVE_IDLE_CLOSE_MS);
+        return entry.db;
+    }
+
+    async function handle(line) {
+        if (!line.trim()) return;
+        let req;
+        try {
+            req = JSON.parse(line);
+        } catch (e) {
+            reply({ id: null, ok: false, error: `Bad request: ${e.message}` });
+            return;
+        }
+        try {
+            if (req.cmd === 'export') {
+                const db = await getDb(!!req.modded, false);
+                const raw = await db.get(SAVE_KEY);
+                reply({ id: req.id, ok: true, save: decodeSave(raw), base_hash: valueHash(raw) });
+            } else if (req.cmd === 'import') {
+                if (req.save === undefined) throw new Error('import needs a "save" object');
+                const db = await getDb(!!req.modded, true);
+                const value = encodeSave(req.save);
+                await db.put(SAVE_KEY, value);
+                reply({ id: req.id, ok: true, base_hash: valueHash(value) });
+            } else if (req.cmd === 'patch') {
+                if (!Array.isArray(req.ops)) throw new Error('patch needs an "ops" array');
+                const db = await getDb(!!req.modded, false);
+                let raw;
+                try { raw = await db.get(SAVE_KEY); } catch { raw = undefined; }
+                if (!raw || valueHash(raw) !== req.base_hash) {
+                    reply({ id: req.id, ok: false, conflict: true, error: 'Save changed since it was loaded' });
+                    return;
+                }
+                if (!req.ops.length) {
+                    reply({ id: req.id, ok: true, base_hash: req.base_hash });
+                    return;
+                }
+                const value = encodeSave(applyPatch(decodeSave(raw), req.ops));
+                await db.put(SAVE_KEY, value);
+                reply({ id: req.id, ok: true, base_hash: valueHash(value) });
+            } else if (req.cmd === 'close') {
+                await closeAll();
+                reply({ id: req.id, ok: true });
+            } else if (req.cmd === 'quit') {
+                await closeAll();
+                reply({ id: req.id, ok: true });
+                rl.close();
+            } else {
+                throw new Error(`Unknown command: ${req.cmd}`);
+            }
+        } catch (e) {
+            reply({ id: req.id, ok: false, error: e.message });
+        }
+    }
+
+    rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+    rl.on('line', line => { queue = queue.then(() => handle(line)); });
+    // Let the event loop drain (flushing stdout) instead of process.exit()
+    rl.on('close', () => { queue = queue.then(closeAll).then(() => process.stdin.destroy()); });
+}
+
 async function main() {
     const cmd = process.argv.filter(a => !a.startsWith('--'))[2];
     
+    if (cmd === 'serve') {
+        return serve();
+    }
+    if (cmd === 'export' && useStdio) {
+        // stdout carries the save; route diagnostics to stderr
+        console.log = console.error;
+    }
+    
     if (!fs.existsSync(LEVELDB_PATH)) {
         if (cmd === 'import') {
             fs.mkdirSync(LEVELDB_PATH, { recursive: true });
@@ -94,30 +288,35 @@ async function main() {
     const db = await openDbWithRetry();
     
     try {
-        if (cmd === 'export') {
-            const raw = await db.get(SAVE_KEY);
-            
-            // Skip leading byte, decode as UTF-16LE
-            const str = raw.slice(1).toString('utf16le');
+        if (cmd === 'export' && useStdio) {
+            // The stored text is already compact JSON: validate it and pass it through
+            const text = decodeSaveText(await db.get(SAVE_KEY));
+            JSON.parse(text);
+            process.stdout.write(text + '\n');
+        }
+        else if (cmd === 'export') {
+            const parsed = decodeSave(await db.get(SAVE_KEY));
             
-            // Parse and save as pretty JSON
-            const parsed = JSON.parse(str);
+            // Save as pretty JSON
             fs.writeFileSync(TEMP_FILE, JSON.stringify(parsed, null, 2), 'utf8');
             console.log('OK:' + TEMP_FILE);
         } 
+        else if (cmd === 'import' && useStdio) {
+            // Store the JSON text as given (validated, not re-serialized)
+            const text = (await readStdin()).trim();
+            JSON.parse(text);
+            await db.put(SAVE_KEY, encodeSaveText(text));
+            console.log('OK:imported');
+        }
         else if (cmd === 'import') {
             const json = fs.readFileSync(TEMP_FILE, 'utf8');
             const parsed = JSON.parse(json);
             
-            // Encode as UTF-16LE with leading 0x00 byte
-            const utf16 = Buffer.from(JSON.stringify(parsed), 'utf16le');
-            const data = Buffer.concat([Buffer.from([0x00]), utf16]);
-            
-            await db.put(SAVE_KEY, data);
+            await db.put(SAVE_KEY, encodeSave(parsed));
             console.log('OK:imported');
         }
         else {
-            console.log('Usage: node save_helper.js [export|import] [--modded]');
+            console.log('Usage: node save_helper.js [export|import|serve] [--modded] [--stdio]');
         }
     } catch (e) {
         console.error('ERROR:', e.message);
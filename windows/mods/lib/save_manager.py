@@ -10,12 +10,18 @@ The modded game uses app.setPath('userData', ...) to redirect Electron's
 userData to pokePathTD_Electron_modded, keeping vanilla saves untouched.
 """
 
+import json
 import os
 import shutil
 import subprocess
 import ctypes
 from pathlib import Path
 
+try:
+    from lib import leveldb_reader
+except ImportError:
+    import leveldb_reader
+
 
 def _get_real_appdata():
     """
@@ -70,14 +76,46 @@ RESOURCES = GAME_ROOT / 'resources'
 MOD_FLAG = RESOURCES / '.modded'
 
 
+def _export_vanilla_save_text(save_helper, creationflags):
+    """
+    The vanilla save's JSON text, read straight from LevelDB, or through
+    `save_helper.js export --stdio` if the direct read fails.
+    
+    Returns:
+        tuple: (text: str or None, error: str or None)
+    """
+    try:
+        raw = leveldb_reader.get(VANILLA_SAVE, leveldb_reader.SAVE_KEY)
+        if raw is not None:
+            return leveldb_reader.decode_local_storage_value(raw), None
+    except (OSError, ValueError, leveldb_reader.LevelDBError) as e:
+        print(f"  [WARN] Direct save read failed, using save_helper.js: {e}")
+    
+    try:
+        result = subprocess.run(
+            ['node', str(save_helper), 'export', '--stdio'],  # no --modded = vanilla
+            capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30,
+            creationflags=creationflags, cwd=str(SCRIPT_DIR)
+        )
+    except subprocess.TimeoutExpired:
+        return None, "Export timed out"
+    except FileNotFoundError:
+        return None, "Node.js not found"
+    if result.returncode != 0 or not result.stdout.strip():
+        return None, f"Export failed: {result.stderr.strip() or 'no save data'}"
+    return result.stdout.strip(), None
+
+
 def _migrate_save_via_api():
     """
-    Migrate vanilla save to modded location using save_helper.js export/import.
+    Migrate vanilla save to modded location using save_helper.js import.
     
-    This reads the save through LevelDB's proper API (export from vanilla),
-    then writes it through the API (import to modded). This avoids raw file
-    copy issues where LevelDB write-ahead logs may not replay correctly,
-    which can cause subtle data corruption (e.g. starter not removed from egg shop).
+    The vanilla save's JSON text is read directly from LevelDB and piped,
+    as-is, into `save_helper.js import --modded --stdio`, which writes it
+    through LevelDB's proper API. No temp file, no re-serialization. This
+    avoids raw file copy issues where LevelDB write-ahead logs may not replay
+    correctly, which can cause subtle data corruption (e.g. starter not
+    removed from egg shop).
     
     Returns:
         tuple: (success: bool, message: str)
@@ -87,25 +125,11 @@ def _migrate_save_via_api():
         return False, "save_helper.js not found"
     
     creationflags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
-    temp_save = SCRIPT_DIR / 'current_save.json'
     
     # Step 1: Export from vanilla save
-    try:
-        result = subprocess.run(
-            ['node', str(save_helper), 'export'],  # no --modded = vanilla
-            capture_output=True, text=True, timeout=30,
-            creationflags=creationflags, cwd=str(SCRIPT_DIR)
-        )
-        if result.returncode != 0 or 'OK:' not in result.stdout:
-            return False, f"Export failed: {result.stderr.strip() or result.stdout.strip()}"
-    except subprocess.TimeoutExpired:
-        return False, "Export timed out"
-    except FileNotFoundError:
-        return False, "Node.js not found"
-    
-    # Verify export produced a file
-    if not temp_save.exists():
-        return False, "Export succeeded but no save file produced"
+    save_text, error = _export_vanilla_save_text(save_helper, creationflags)
+    if save_text is None:
+        return False, error
     
     # Step 2: Ensure modded userData directory exists
     _mkdir_native(MODDED_SAVE.parent)
@@ -113,20 +137,23 @@ def _migrate_save_via_api():
     # Step 3: Import to modded save
     try:
         result = subprocess.run(
-            ['node', str(save_helper), 'import', '--modded'],
-            capture_output=True, text=True, timeout=30,
-            creationflags=creationflags, cwd=str(SCRIPT_DIR)
+            ['node', str(save_helper), 'import', '--modded', '--stdio'],
+            input=save_text, capture_output=True, text=True, encoding='utf-8', errors='replace',
+            timeout=30, creationflags=creationflags, cwd=str(SCRIPT_DIR)
         )
         if result.returncode != 0 or 'OK:' not in result.stdout:
             return False, f"Import failed: {result.stderr.strip() or result.stdout.strip()}"
     except subprocess.TimeoutExpired:
         return False, "Import timed out"
+    except FileNotFoundError:
+        return False, "Node.js not found"
     
-    # Clean up temp file
+    # Step 4: Read the modded save back directly and make sure it matches
     try:
-        temp_save.unlink()
-    except Exception:
-        pass
+        if leveldb_reader.read_save(MODDED_SAVE) != json.loads(save_text):
+            return False, "Migrated save doesn't match the vanilla save"
+    except (OSError, ValueError, leveldb_reader.LevelDBError) as e:
+        print(f"  [WARN] Couldn't verify migrated save: {e}")
     
     return True, "Vanilla save migrated to modded location via LevelDB API"
 
@@ -225,11 +252,19 @@ def _has_real_save(leveldb_path):
     """
     Check if a LevelDB directory contains actual game save data (not just scaffolding).
     
-    Real saves have .ldb files with game data. An empty or freshly-initialized
-    LevelDB only has LOG, LOCK, MANIFEST, CURRENT, and a tiny .log file.
-    
-    Uses cmd.exe dir to bypass Microsoft Store Python's filesystem virtualization.
+    Looks the save key up directly (leveldb_reader), so a save that only
+    lives in the write-ahead log counts too. If Python can't see or read the
+    directory, falls back to checking for .ldb files: an empty or
+    freshly-initialized LevelDB only has LOG, LOCK, MANIFEST, CURRENT, and a
+    tiny .log file. That check uses cmd.exe dir to bypass Microsoft Store
+    Python's filesystem virtualization.
     """
+    if leveldb_path.is_dir():
+        try:
+            raw = leveldb_reader.get(leveldb_path, leveldb_reader.SAVE_KEY)
+            return raw is not None and len(raw) > 1
+        except (OSError, leveldb_reader.LevelDBError) as e:
+            print(f"  [WARN] Couldn't read {leveldb_path}: {e}")
     try:
         result = subprocess.run(
             ['cmd', '/c', 'dir', '/b', str(leveldb_path) + '\\*.ldb'],
@@ -324,7 +359,12 @@ def restore_vanilla():
         return False, "No vanilla backup found (app.asar.vanilla missing)"
     
     try:
-        shutil.copy2(app_vanilla, app_asar)
+        # Replace rather than overwrite: app.asar may be a hardlink into the build cache
+        tmp = app_asar.with_name(app_asar.name + '.tmp')
+        shutil.copy2(app_vanilla, tmp)
+        os.replace(tmp, app_asar)
+        # A modded app_extracted/ would otherwise still read as the installed game
+        shutil.rmtree(RESOURCES / 'app_extracted', ignore_errors=True)
         clear_mod_flag()
         print("  [OK] Game restored to vanilla")
         return True, "Game restored to vanilla"
@@ -0,0 +1,802 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Save Operations
+The save editor's bulk edits without the GUI: SaveDocument (in-memory save
+access), SpeciesData (evolution data from dev/pokemon_data.json) and
+SaveOps, which applies edits to a SaveDocument and reports what changed.
+
+Run directly to apply a list of operations to exported save JSON files,
+one worker process per file:
+
+    python lib/save_ops.py saves/*.json --op unlock_all --op max_all --op gold=99999 -o edited/
+    python lib/save_ops.py saves/*.json --op route_wave=3:50 --in-place
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+POKEMON_DATA_FILE = SCRIPT_DIR.parent / 'dev' / 'pokemon_data.json'
+
+TEAM_SLOTS = 10
+BOX_SLOTS = 200  # Increased from 64 to support unlock all
+
+SPECIES_INDEX_FORMAT = 1
+
+MAX_GOLD = 99999999999
+MAX_GOLD_QOL = 9007199254740991  # Number.MAX_SAFE_INTEGER, QoL mod lifts the gold cap
+
+# Profile-counted species that aren't route rewards or shop eggs
+EXPLICIT_UNLOCKABLES = {
+    'greavard', 'cacnea', 'ducklett', 'sandygast', 'luvdisc',
+    'chatot', 'shedinja', 'gholdengo', 'stakataka', 'missingNo',
+}
+
+
+# ============================================================================
+# SAVE DOCUMENT
+# ============================================================================
+class SaveDocument:
+    """A game save held in memory (the JSON the game keeps in Local Storage)."""
+
+    def __init__(self, data=None):
+        self.data = data
+        self.source = None
+
+    def load_from_file(self, path: Path) -> bool:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+            self.source = 'file'
+            return True
+        except Exception as e:
+            print(f"Load error: {e}")
+        return False
+
+    def export_to_file(self, path: Path) -> bool:
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            return True
+        except:
+            return False
+
+    @property
+    def save_obj(self):
+        return self.data.get('save', self.data) if self.data else {}
+
+    @property
+    def player(self):
+        return self.save_obj.get('player', {})
+
+    @property
+    def team(self):
+        return self.save_obj.get('team', [])
+
+    @property
+    def box(self):
+        return self.save_obj.get('box', [])
+
+    def get_pokemon_at_slot(self, slot_index):
+        team = self.team
+        box = self.box
+        if slot_index < TEAM_SLOTS:
+            return team[slot_index] if slot_index < len(team) else None
+        else:
+            box_index = slot_index - TEAM_SLOTS
+            return box[box_index] if box_index < len(box) else None
+
+    def set_pokemon_at_slot(self, slot_index, pokemon):
+        if not self.data:
+            return
+        save = self.save_obj
+        if slot_index < TEAM_SLOTS:
+            while len(save['team']) <= slot_index:
+                save['team'].append(None)
+            save['team'][slot_index] = pokemon
+            while save['team'] and save['team'][-1] is None:
+                save['team'].pop()
+        else:
+            box_index = slot_index - TEAM_SLOTS
+            while len(save['box']) <= box_index:
+                save['box'].append(None)
+            save['box'][box_index] = pokemon
+            while save['box'] and save['box'][-1] is None:
+                save['box'].pop()
+
+    def delete_at_slot(self, slot_index):
+        if not self.data:
+            return
+        save = self.save_obj
+        if slot_index < TEAM_SLOTS:
+            if slot_index < len(save['team']):
+                save['team'].pop(slot_index)
+        else:
+            box_index = slot_index - TEAM_SLOTS
+            if box_index < len(save['box']):
+                save['box'].pop(box_index)
+
+    def set_player(self, key, val):
+        if 'save' in self.data:
+            self.data['save']['player'][key] = val
+        else:
+            self.data['player'][key] = val
+
+    @property
+    def area(self):
+        return self.save_obj.setdefault('area', {}) if self.data else {}
+
+    @property
+    def items(self):
+        if not self.data:
+            return []
+
+        player = self.player
+        if isinstance(player, dict):
+            items = player.get('items')
+            if isinstance(items, list):
+                return items
+            player['items'] = []
+            return player['items']
+
+        return self.save_obj.setdefault('items', [])
+
+    @property
+    def shop(self):
+        return self.save_obj.get('shop', {}) if self.data else {}
+
+    def get_effective_team_slots(self):
+        if not self.data:
+            return TEAM_SLOTS
+        raw_value = self.player.get('teamSlots', TEAM_SLOTS)
+        try:
+            team_slots = int(raw_value)
+        except Exception:
+            team_slots = TEAM_SLOTS
+        return max(1, min(TEAM_SLOTS, team_slots))
+
+    def first_empty_team_slot(self):
+        for i in range(self.get_effective_team_slots()):
+            if not self.get_pokemon_at_slot(i):
+                return i
+        return None
+
+    def get_current_route_number(self):
+        area = self.area
+        try:
+            route_number = int(area.get('routeNumber', 0) or 0)
+        except Exception:
+            route_number = 0
+        return max(0, route_number)
+
+    def get_current_wave_number(self):
+        area = self.area
+        route_number = self.get_current_route_number()
+        route_waves = area.setdefault('routeWaves', [])
+        if len(route_waves) <= route_number:
+            route_waves.extend([1] * (route_number + 1 - len(route_waves)))
+        try:
+            wave = int(route_waves[route_number])
+        except Exception:
+            wave = 1
+        return max(1, wave)
+
+    def set_route_and_wave(self, route_number, wave_number):
+        if not self.data:
+            return
+
+        route_number = max(0, int(route_number))
+        wave_number = max(1, int(wave_number))
+
+        area = self.area
+        route_waves = area.setdefault('routeWaves', [])
+        if len(route_waves) <= route_number:
+            route_waves.extend([1] * (route_number + 1 - len(route_waves)))
+
+        area['routeNumber'] = route_number
+        route_waves[route_number] = wave_number
+
+    def set_item_at_slot(self, slot_index, item_obj):
+        if not self.data:
+            return
+        items = self.items
+        while len(items) <= slot_index:
+            items.append(None)
+        items[slot_index] = item_obj
+
+    def get_pokemon_item(self, slot_index):
+        pokemon = self.get_pokemon_at_slot(slot_index)
+        if not isinstance(pokemon, dict):
+            return None
+        item_obj = pokemon.get('item')
+        return item_obj if isinstance(item_obj, dict) else None
+
+    def set_pokemon_item(self, slot_index, item_obj):
+        pokemon = self.get_pokemon_at_slot(slot_index)
+        if not isinstance(pokemon, dict):
+            return
+        if item_obj is None:
+            pokemon.pop('item', None)
+        else:
+            pokemon['item'] = item_obj
+
+
+# ============================================================================
+# SPECIES DATA
+# ============================================================================
+class SpeciesData:
+    """
+    Species keys and evolution chains from dev/pokemon_data.json.
+
+    Every relation the editor asks about (next/previous evolution, base form,
+    final form, chain, stage) is precomputed into integer-indexed tables at
+    load, so lookups are O(1) instead of walking `evolutions` per call. The
+    tables are cached in pokemon_data.index.json beside the data file, keyed
+    by its hash.
+    """
+
+    # Display name overrides for Pokemon with unclear internal keys
+    DISPLAY_NAMES = {
+        'aegislash': 'Aegislash Shield',
+        'aegislashSword': 'Aegislash Sword',
+        'lycanrocDay': 'Lycanroc Day',
+        'lycanrocNight': 'Lycanroc Night',
+    }
+
+    # Form alternates and mega evolutions that should resolve to their main form
+    FORM_TO_MAIN = {
+        'aegislashSword': 'aegislash',
+        'lycanrocNight': 'lycanrocDay',
+        'megaAbsol': 'absol',
+        'megaCharizardX': 'charizard',
+        'megaSceptile': 'sceptile',
+        'megaAlakazam': 'alakazam',
+    }
+
+    def __init__(self, path=POKEMON_DATA_FILE):
+        self.data = {}
+        self.all_pokemon = []
+
+        raw = b''
+        if Path(path).exists():
+            raw = Path(path).read_bytes()
+            self.data = json.loads(raw)
+
+        self.all_pokemon = sorted(self.data.get('allKeys', []))
+        self._load_tables(Path(path), raw)
+
+    # ------------------------------------------------------------------------
+    # Lookup tables
+    # ------------------------------------------------------------------------
+    def _tables_key(self, raw):
+        digest = hashlib.sha256(raw)
+        # The tables also bake in FORM_TO_MAIN
+        digest.update(json.dumps([SPECIES_INDEX_FORMAT, self.FORM_TO_MAIN], sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load_tables(self, path, raw):
+        cache_path = path.with_name(path.stem + '.index.json')
+        key = self._tables_key(raw)
+        tables = None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                tables = cached
+        except (OSError, ValueError):
+            pass
+
+        if tables is None:
+            tables = self._build_tables()
+            tables['key'] = key
+            if raw:
+                try:
+                    tmp = cache_path.with_name(cache_path.name + '.tmp')
+                    with open(tmp, 'w', encoding='utf-8') as f:
+                        json.dump(tables, f, separators=(',', ':'))
+                    os.replace(tmp, cache_path)
+                except OSError:
+                    pass  # read-only install: rebuild next time
+
+        self._keys = tables['keys']
+        self._index = {k: i for i, k in enumerate(self._keys)}
+        self._next = tables['next']
+        self._prev = tables['prev']
+        self._base = tables['base']
+        self._final = tables['final']
+        self._stage = tables['stage']
+        self._chain_of = tables['chain_of']
+        self._chains = tables['chains']
+
+    def _build_tables(self):
+        """Index every known key and precompute its relations as index arrays."""
+        evos = self.data.get('evolutions', {})
+        all_keys = self.data.get('allKeys', [])
+        forward = {k: v['evolves_to'] for k, v in evos.items()}
+        reverse = {v: k for k, v in forward.items()}
+        keys = list(dict.fromkeys(
+            list(all_keys) + list(forward) + list(forward.values())
+            + list(self.FORM_TO_MAIN) + list(self.FORM_TO_MAIN.values())
+        ))
+        index = {k: i for i, k in enumerate(keys)}
+        known = set(all_keys)
+
+        def walk(key, step):
+            seen = {key}
+            while key in step and step[key] not in seen:
+                key = step[key]
+                seen.add(key)
+            return key
+
+        next_of, prev_of, base_of, final_of = [], [], [], []
+        for key in keys:
+            main = self.FORM_TO_MAIN.get(key, key)
+            next_of.append(index[forward.get(key, key)])
+            prev_of.append(index[reverse.get(main, main)])
+            final_of.append(index[walk(key, forward)])
+            # Also handle any mega not in the explicit map (megaX -> strip 'mega' prefix)
+            if main.startswith('mega') and main != 'meganium':
+                possible_base = main[4:5].lower() + main[5:]
+                if possible_base in known:
+                    main = possible_base
+            base_of.append(index[walk(main, reverse)])
+
+        chains, chain_ids, chain_of, stage = [], {}, [], []
+        for i, base in enumerate(base_of):
+            if base not in chain_ids:
+                chain_ids[base] = len(chains)
+                chains.append([index[k] for k in self._walk_chain(keys[base], forward)])
+            chain_of.append(chain_ids[base])
+            members = chains[chain_ids[base]]
+            stage.append(members.index(i) if i in members else 0)
+
+        return {
+            'format': SPECIES_INDEX_FORMAT,
+            'keys': keys,
+            'next': next_of,
+            'prev': prev_of,
+            'base': base_of,
+            'final': final_of,
+            'stage': stage,
+            'chain_of': chain_of,
+            'chains': chains,
+        }
+
+    @staticmethod
+    def _walk_chain(base, forward):
+        chain = [base]
+        while chain[-1] in forward and forward[chain[-1]] not in chain:
+            chain.append(forward[chain[-1]])
+        return chain
+
+    def _resolve_unknown_base(self, key):
+        """get_base_form for a key the tables don't cover."""
+        if key.startswith('mega') and key != 'meganium':
+            possible_base = key[4:5].lower() + key[5:]
+            if possible_base in self.data.get('allKeys', []):
+                return self._keys[self._base[self._index[possible_base]]]
+        return key
+
+    # ------------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------------
+    def get_display_name(self, key):
+        if key in self.DISPLAY_NAMES:
+            return self.DISPLAY_NAMES[key]
+        # Split camelCase into words (e.g. 'mrMime' -> 'Mr Mime')
+        name = re.sub(r'([a-z])([A-Z])', r'\1 \2', key)
+        return name.replace('-', ' ').title()
+
+    def get_base_forms(self):
+        return self.data.get('baseForms', [])
+
+    def get_next_evo(self, key):
+        """Get the next evolution (one step) of a Pokemon."""
+        i = self._index.get(key)
+        return key if i is None else self._keys[self._next[i]]
+
+    def get_prev_evo(self, key):
+        """Get the previous evolution (one step back) of a Pokemon.
+        For form alternates (e.g. aegislashSword), resolve to the main form first."""
+        i = self._index.get(key)
+        return key if i is None else self._keys[self._prev[i]]
+
+    def get_final_evo(self, key):
+        """Get the final evolution of a Pokemon."""
+        i = self._index.get(key)
+        return key if i is None else self._keys[self._final[i]]
+
+    def get_base_form(self, key):
+        """Get the base form of a Pokemon by reversing the evolution chain.
+        Resolves form alternates and mega evolutions first."""
+        i = self._index.get(key)
+        return self._resolve_unknown_base(key) if i is None else self._keys[self._base[i]]
+
+    def get_chain(self, key):
+        """Get all species keys in an evolution chain (from base to final)."""
+        i = self._index.get(key)
+        if i is None:
+            base = self._resolve_unknown_base(key)
+            if base == key:
+                return [key]
+            i = self._index[base]
+        return [self._keys[j] for j in self._chains[self._chain_of[i]]]
+
+    def get_stage(self, key):
+        """Position of key in its evolution chain (0 = base; forms/megas count as 0)."""
+        i = self._index.get(key)
+        return 0 if i is None else self._stage[i]
+
+    def get_unlock_roots(self):
+        """Return one unlockable root per obtainable line/standalone species.
+        Uses actual metadata relationships instead of the older baseForms list so
+        newly added standalone Pokemon and new lines are included automatically."""
+        roots = []
+        for key in self.all_pokemon:
+            if key.startswith('mega'):
+                continue
+            if key in self.FORM_TO_MAIN:
+                continue
+            if self.get_prev_evo(key) == key:
+                roots.append(key)
+        return roots
+
+    def create_new_pokemon(self, species_key):
+        return {
+            "specieKey": species_key,
+            "lvl": 1,
+            "targetMode": "area",
+            "favorite": False,
+            "isShiny": False,
+            "hideShiny": False,
+            "isMega": False
+        }
+
+
+# ============================================================================
+# GAME DATA
+# ============================================================================
+def parse_route_reward_keys(text):
+    """Route challenge Pokémon rewards from routeData.js source.
+    Uses reward index 1 (the Pokémon slot in challengeReward arrays)."""
+    rewards = []
+    for match in re.finditer(r"challengeReward\s*:\s*\[(.*?)\]", text or '', re.DOTALL):
+        values = re.findall(r"'([^']+)'", match.group(1))
+        if len(values) >= 2:
+            rewards.append(values[1])
+    return rewards
+
+
+def parse_egg_list_keys(text):
+    """eggListData species keys from pokemonData.js source."""
+    match = re.search(r"eggListData\s*=\s*\[(.*?)\]\s*;", text or '', re.DOTALL)
+    return re.findall(r"'([^']+)'", match.group(1)) if match else []
+
+
+def _read_game_script(path):
+    try:
+        return Path(path).read_text(encoding='utf-8', errors='replace') if path else ''
+    except OSError:
+        return ''
+
+
+def load_route_reward_keys(route_data_file):
+    """Route challenge Pokémon rewards from a routeData.js file."""
+    return parse_route_reward_keys(_read_game_script(route_data_file))
+
+
+def load_egg_list_keys(pokemon_js_data_file):
+    """eggListData species keys from a pokemonData.js file."""
+    return parse_egg_list_keys(_read_game_script(pokemon_js_data_file))
+
+
+# ============================================================================
+# OPERATIONS
+# ============================================================================
+class SaveOps:
+    """
+    Bulk edits on a SaveDocument. Each returns a summary of what it changed;
+    showing it (message box, CLI line) is up to the caller.
+
+    features are the installed mod feature ids; route_reward_keys and
+    egg_list_keys come from the game's routeData.js / pokemonData.js and only
+    affect unlock_all.
+    """
+
+    def __init__(self, save, species, features=(), route_reward_keys=(), egg_list_keys=()):
+        self.save = save
+        self.species = species
+        self.features = set(features)
+        self.route_reward_keys = set(route_reward_keys)
+        self.egg_list_keys = set(egg_list_keys)
+
+    def is_max_evo(self, poke):
+        """Check if a Pokemon is at its max evolution."""
+        key = poke.get('specieKey') or poke.get('specie', {}).get('key', '')
+        if not key:
+            return True  # Unknown — allow shiny
+        return self.species.get_final_evo(key) == key
+
+    def _profile_ownership_key(self, key, obtainable_keys):
+        if not key:
+            return None
+        # Profile completion is mostly tracked by root/base species keys.
+        # Prioritize base-form ownership so max evolutions (e.g. cacturne)
+        # correctly satisfy base-counted entries (e.g. cacnea).
+        base = self.species.get_base_form(key)
+        if base in obtainable_keys:
+            return base
+        if key in obtainable_keys:
+            return key
+        return None
+
+    def unlock_all(self):
+        """Add one Lv1 Pokemon per species line the save doesn't own yet.
+
+        Returns:
+            dict: {'added', 'added_to_team', 'skipped'}
+        """
+        species = self.species
+
+        # Collect currently owned species keys
+        existing_keys = set()
+        for p in self.save.team + self.save.box:
+            if p:
+                key = p.get('specieKey', '')
+                if key:
+                    existing_keys.add(key)
+
+        # Build set of covered evolution chains for non-profile roots
+        covered_chains = set()
+        for key in existing_keys:
+            covered_chains.add(species.get_base_form(key))
+            for chain_key in species.get_chain(key):
+                covered_chains.add(chain_key)
+
+        # Build profile-obtainable key set (used by in-game completion counters)
+        all_keys = set(species.all_pokemon)
+        shop_egg_keys = set(self.save.save_obj.get('shop', {}).get('eggList', []) or [])
+        obtainable_keys = {
+            k for k in (EXPLICIT_UNLOCKABLES | self.route_reward_keys | self.egg_list_keys | shop_egg_keys)
+            if k in all_keys
+        }
+
+        owned_profile_keys = set()
+        for key in existing_keys:
+            ownership_key = self._profile_ownership_key(key, obtainable_keys)
+            if ownership_key:
+                owned_profile_keys.add(ownership_key)
+
+        count = 0
+        skipped = 0
+        added_to_team = 0
+        unlock_targets = list(species.get_unlock_roots())
+
+        # Include non-root unlockables that profile counts separately.
+        extra_unlocks = set()
+        for extra_key in obtainable_keys:
+            if species.get_base_form(extra_key) == extra_key:
+                continue
+            extra_unlocks.add(extra_key)
+
+        for extra_key in sorted(extra_unlocks):
+            if extra_key not in unlock_targets:
+                unlock_targets.append(extra_key)
+
+        for key in unlock_targets:
+            if key in existing_keys:
+                skipped += 1
+                continue
+
+            ownership_key = self._profile_ownership_key(key, obtainable_keys)
+
+            # If this key is counted by profile completion, require exact missing ownership key.
+            if ownership_key:
+                if ownership_key in owned_profile_keys:
+                    skipped += 1
+                    continue
+            else:
+                # Fallback behavior for non-profile roots: avoid same-chain duplicates.
+                if key in covered_chains and key not in extra_unlocks:
+                    skipped += 1
+                    continue
+
+            new_poke = species.create_new_pokemon(key)
+            team_slot = self.save.first_empty_team_slot()
+            if team_slot is not None:
+                self.save.set_pokemon_at_slot(team_slot, new_poke)
+                added_to_team += 1
+            else:
+                self.save.box.append(new_poke)
+
+            count += 1
+            existing_keys.add(key)
+            covered_chains.add(species.get_base_form(key))
+            for chain_key in species.get_chain(key):
+                covered_chains.add(chain_key)
+            if ownership_key:
+                owned_profile_keys.add(ownership_key)
+
+        return {'added': count, 'added_to_team': added_to_team, 'skipped': skipped}
+
+    def make_all_shiny(self):
+        """Make all Pokemon in team and box shiny. Without the Shiny mod, only max evolutions.
+
+        Returns:
+            dict: {'changed', 'skipped'}
+        """
+        has_shiny_mod = 'shiny' in self.features
+        count = 0
+        skipped = 0
+        for poke in self.save.team + self.save.box:
+            if poke and not poke.get('isShiny', False):
+                if not has_shiny_mod and not self.is_max_evo(poke):
+                    skipped += 1
+                    continue
+                poke['isShiny'] = True
+                count += 1
+        return {'changed': count, 'skipped': skipped}
+
+    def max_all(self):
+        """Fully evolve every Pokemon and raise it to at least Lv100.
+
+        Returns:
+            dict: {'changed'}
+        """
+        count = 0
+        for p in self.save.team + self.save.box:
+            if p:
+                # Evolve to final form
+                old_key = p.get('specieKey', '')
+                new_key = self.species.get_final_evo(old_key)
+                p['specieKey'] = new_key
+                # Only raise level to 100, never lower Pokemon already above 100
+                if p.get('lvl', 1) < 100:
+                    p['lvl'] = 100
+                count += 1
+        return {'changed': count}
+
+    def max_gold(self):
+        """The most gold the installed mods allow."""
+        return MAX_GOLD_QOL if 'qol' in self.features else MAX_GOLD
+
+    def set_gold_value(self, amount):
+        """Set gold to specific amount."""
+        amount = max(0, int(amount))
+        self.save.set_player('gold', amount)
+        return {'gold': amount}
+
+    def set_route_and_wave(self, route_number, wave_number):
+        """Set the last played route and its wave."""
+        self.save.set_route_and_wave(route_number, wave_number)
+        return {'route': self.save.get_current_route_number(), 'wave': self.save.get_current_wave_number()}
+
+
+# ============================================================================
+# BATCH CLI
+# ============================================================================
+def parse_op(text):
+    """'max_all', 'gold=123' / 'gold=max' or 'route_wave=R:W' -> (name, args)."""
+    name, _, value = text.partition('=')
+    name = name.strip()
+    if name in ('unlock_all', 'max_all', 'make_all_shiny') and not value:
+        return name, ()
+    if name == 'gold' and value:
+        return 'set_gold_value', (None if value == 'max' else int(value.replace(',', '')),)
+    if name == 'route_wave' and value:
+        route, _, wave = value.partition(':')
+        return 'set_route_and_wave', (int(route), int(wave or 1))
+    raise ValueError(f"unknown operation '{text}' (expected unlock_all, max_all, make_all_shiny, gold=N|max or route_wave=R:W)")
+
+
+_WORKER = {}
+
+
+def _init_worker(options):
+    _WORKER['species'] = SpeciesData(options['pokemon_data'])
+    _WORKER['options'] = options
+
+
+def output_paths(saves, out_dir=None):
+    """
+    Destination for each input save: itself, or under out_dir at its path
+    relative to the inputs' common folder (just the file name when they
+    all share one), so same-named saves from different folders don't
+    collide. Raises ValueError if a file is given twice.
+    """
+    sources = [os.path.abspath(src) for src in saves]
+    seen = set()
+    for src, full in zip(saves, sources):
+        key = os.path.normcase(full)
+        if key in seen:
+            raise ValueError(f"{src} is given more than once")
+        seen.add(key)
+    if out_dir is None:
+        return list(saves)
+    try:
+        base = os.path.commonpath([os.path.dirname(full) for full in sources])
+    except ValueError:
+        raise ValueError("inputs are on different drives; edit them in separate runs")
+    return [os.path.join(out_dir, os.path.relpath(full, base)) for full in sources]
+
+
+def _edit_file(job):
+    """Apply the configured operations to one save file. Runs in a pool worker."""
+    src, dest = job
+    options = _WORKER['options']
+    save = SaveDocument()
+    try:
+        with open(src, 'r', encoding='utf-8') as f:
+            save.data = json.load(f)
+    except (OSError, ValueError) as e:
+        return src, False, f"load failed: {e}"
+
+    ops = SaveOps(save, _WORKER['species'], options['features'],
+                  options['route_reward_keys'], options['egg_list_keys'])
+    results = []
+    try:
+        for name, args in options['ops']:
+            if name == 'set_gold_value' and args[0] is None:
+                args = (ops.max_gold(),)
+            results.append((name, getattr(ops, name)(*args)))
+    except Exception as e:
+        return src, False, f"{name} failed: {e}"
+
+    os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+    tmp = dest + '.tmp'
+    if not save.export_to_file(Path(tmp)):
+        return src, False, f"could not write {tmp}"
+    os.replace(tmp, dest)
+    summary = ', '.join(f"{name} {result}" for name, result in results)
+    return src, True, f"-> {dest}: {summary}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply save editor operations to exported save JSON files')
+    parser.add_argument('saves', nargs='+', help='Exported save JSON files')
+    parser.add_argument('--op', action='append', required=True, metavar='OP',
+                        help='unlock_all, max_all, make_all_shiny, gold=N|max, route_wave=R:W (repeatable, applied in order)')
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument('-o', '--out-dir', help='Write edited saves here (same file names, sub-folders kept for inputs from several folders)')
+    out.add_argument('--in-place', action='store_true', help='Overwrite the input files')
+    parser.add_argument('--features', default='', help='Installed mod features, comma separated (e.g. shiny,qol)')
+    parser.add_argument('--game-data', help='Extracted src/js/game/data folder (routeData.js, pokemonData.js) for unlock_all')
+    parser.add_argument('--pokemon-data', default=str(POKEMON_DATA_FILE), help='pokemon_data.json to use')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    try:
+        ops = [parse_op(op) for op in args.op]
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        dests = output_paths(args.saves, args.out_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    game_data = Path(args.game_data) if args.game_data else None
+    options = {
+        'ops': ops,
+        'features': [f for f in args.features.split(',') if f],
+        'route_reward_keys': load_route_reward_keys(game_data / 'routeData.js') if game_data else [],
+        'egg_list_keys': load_egg_list_keys(game_data / 'pokemonData.js') if game_data else [],
+        'pokemon_data': args.pokemon_data,
+    }
+
+    failed = 0
+    jobs = max(1, min(args.jobs or os.cpu_count() or 1, len(args.saves)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as pool:
+        for src, ok, detail in pool.map(_edit_file, zip(args.saves, dests)):
+            print(f"[{'OK' if ok else 'FAIL'}] {src} {detail}")
+            failed += not ok
+    print(f"{len(args.saves) - failed}/{len(args.saves)} saves edited")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
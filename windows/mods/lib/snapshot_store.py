@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Save Snapshots
+Content-addressed history of game saves, taken automatically by the save
+editor before destructive edits.
+
+Each snapshot is a small manifest that points at chunks: one per save
+subtree (team, box, player, area, shop) plus one for everything else. A
+chunk is stored once under objects/, named by the SHA-256 of its compact
+JSON and zlib-compressed, so snapshots that share a subtree share its chunk
+and a long history of one save costs little more than its edits.
+
+    save_snapshots/
+        objects/ab/abcdef....z      compressed chunk JSON
+        snapshots/<id>.json         {'created', 'label', 'wrapped', 'order', 'chunks'}
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+SNAPSHOT_DIR = SCRIPT_DIR.parent / "save_snapshots"
+
+SNAPSHOT_FORMAT = 1
+CHUNKED_SUBTREES = ('team', 'box', 'player', 'area', 'shop')
+REST_CHUNK = '_rest'
+MAX_SNAPSHOTS = 100
+COMPRESS_LEVEL = 6
+
+
+class SnapshotError(Exception):
+    """Raised for a missing or damaged snapshot."""
+
+
+def _objects_dir(root):
+    return Path(root) / "objects"
+
+
+def _snapshots_dir(root):
+    return Path(root) / "snapshots"
+
+
+def _object_path(root, digest):
+    return _objects_dir(root) / digest[:2] / f"{digest}.z"
+
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# CHUNKS
+# ============================================================================
+def _put_chunk(root, value):
+    """Store a JSON value (if not already stored). Returns its digest."""
+    blob = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    digest = hashlib.sha256(blob).hexdigest()
+    path = _object_path(root, digest)
+    if not path.exists():
+        _atomic_write(path, zlib.compress(blob, COMPRESS_LEVEL))
+    return digest
+
+
+def _get_chunk(root, digest):
+    try:
+        blob = zlib.decompress(_object_path(root, digest).read_bytes())
+    except (OSError, zlib.error) as e:
+        raise SnapshotError(f"chunk {digest[:12]} unreadable: {e}")
+    if hashlib.sha256(blob).hexdigest() != digest:
+        raise SnapshotError(f"chunk {digest[:12]} is corrupt")
+    return json.loads(blob)
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+def take_snapshot(data, label='', root=SNAPSHOT_DIR, keep=MAX_SNAPSHOTS):
+    """
+    Record a save (the editor's SaveData.data dict) as a new snapshot.
+
+    Returns:
+        str: the snapshot id
+    """
+    wrapped = isinstance(data.get('save'), dict)
+    save_obj = data['save'] if wrapped else data
+
+    chunks = {}
+    for key in CHUNKED_SUBTREES:
+        if key in save_obj:
+            chunks[key] = _put_chunk(root, save_obj[key])
+    rest = {k: v for k, v in save_obj.items() if k not in CHUNKED_SUBTREES}
+    if wrapped:
+        rest = {'outer': {k: v for k, v in data.items() if k != 'save'}, 'save': rest}
+    chunks[REST_CHUNK] = _put_chunk(root, rest)
+
+    created = time.time()
+    snapshot_id = time.strftime('%Y%m%d-%H%M%S', time.localtime(created)) + f"-{int(created * 1000) % 1000:03d}"
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'created': created,
+        'label': label,
+        'wrapped': wrapped,
+        'order': list(save_obj.keys()),
+        'chunks': chunks,
+    }
+    _atomic_write(_snapshots_dir(root) / f"{snapshot_id}.json", json.dumps(manifest, indent=2).encode('utf-8'))
+    if keep:
+        prune(keep, root)
+    return snapshot_id
+
+
+def list_snapshots(root=SNAPSHOT_DIR):
+    """Snapshot manifests, newest first, each with an added 'id'."""
+    snapshots = []
+    for path in _snapshots_dir(root).glob('*.json'):
+        try:
+            manifest = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        manifest['id'] = path.stem
+        snapshots.append(manifest)
+    snapshots.sort(key=lambda m: (m.get('created', 0), m['id']), reverse=True)
+    return snapshots
+
+
+def load_snapshot(snapshot_id, root=SNAPSHOT_DIR):
+    """Rebuild the save dict recorded by a snapshot."""
+    path = _snapshots_dir(root) / f"{snapshot_id}.json"
+    try:
+        manifest = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"snapshot {snapshot_id} unreadable: {e}")
+
+    chunks = manifest.get('chunks', {})
+    rest = _get_chunk(root, chunks[REST_CHUNK])
+    outer, rest = (rest['outer'], rest['save']) if manifest.get('wrapped') else ({}, rest)
+    parts = dict(rest)
+    for key in CHUNKED_SUBTREES:
+        if key in chunks:
+            parts[key] = _get_chunk(root, chunks[key])
+
+    # Put keys back in the order the game wrote them
+    save_obj = {key: parts.pop(key) for key in manifest.get('order', []) if key in parts}
+    save_obj.update(parts)
+    if not manifest.get('wrapped'):
+        return save_obj
+    data = dict(outer)
+    data['save'] = save_obj
+    return data
+
+
+def prune(keep=MAX_SNAPSHOTS, root=SNAPSHOT_DIR):
+    """Drop all but the newest `keep` snapshots and any chunk no longer referenced."""
+    snapshots = list_snapshots(root)
+    for manifest in snapshots[keep:]:
+        try:
+            (_snapshots_dir(root) / f"{manifest['id']}.json").unlink()
+        except OSError:
+            pass
+    if len(snapshots) <= keep:
+        return
+    live = {digest for manifest in snapshots[:keep] for digest in manifest.get('chunks', {}).values()}
+    for path in _objects_dir(root).glob('*/*.z'):
+        if path.stem not in live:
+            try:
+                path.unlink()
+            except OSError:
+                pass
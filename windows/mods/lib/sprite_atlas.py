@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+PokePath TD Sprite Atlases
+Packs a sprite folder into one image per thumbnail size, so the save editor
+reads a single PNG instead of opening and resizing hundreds of files.
+
+    dev/sprite_atlas/<variant>_<size>.png    every sprite, resized, on a grid
+    dev/sprite_atlas/<variant>_<size>.json   {'source': signature, 'sprites': {name: [x, y]}}
+
+The atlases are generated, not shipped: each one is built on first use and
+rebuilt automatically when its source folder changes (file names or
+sizes). To build them ahead of time, e.g. when packaging a release:
+
+    python lib/sprite_atlas.py
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+PATCHES_DIR = SCRIPT_DIR.parent / "patches"
+ATLAS_DIR = SCRIPT_DIR.parent / "dev" / "sprite_atlas"  # cache, git-ignored
+
+ATLAS_FORMAT = 1
+# Thumbnail sizes the save editor draws: grid cells and the editor preview
+ATLAS_SIZES = (48, 64)
+VARIANTS = {
+    'normal': PATCHES_DIR / "normal_sprites",
+    'shiny': PATCHES_DIR / "shiny_sprites",
+}
+
+
+def source_signature(src_dir):
+    """
+    Cheap change detector for a sprite folder: one directory listing, no
+    file reads. File names and sizes only (not mtimes), so a prebuilt atlas
+    stays valid after the mod folder is unzipped or checked out.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with os.scandir(src_dir) as entries:
+        for name, size in sorted((e.name, e.stat().st_size) for e in entries
+                                 if e.name.lower().endswith('.png') and e.is_file()):
+            digest.update(f"{name}\0{size}\n".encode('utf-8'))
+    return f"{ATLAS_FORMAT}:{digest.hexdigest()}"
+
+
+def build_atlas(src_dir, size, out_base):
+    """Resize every PNG in src_dir to size x size and pack them into out_base.png/.json."""
+    src_dir = Path(src_dir)
+    signature = source_signature(src_dir)
+    paths = sorted(p for p in src_dir.iterdir() if p.suffix.lower() == '.png')
+    cols = max(1, math.ceil(math.sqrt(len(paths))))
+    rows = max(1, math.ceil(len(paths) / cols))
+    sheet = Image.new('RGBA', (cols * size, rows * size))
+
+    sprites = {}
+    for i, path in enumerate(paths):
+        try:
+            with Image.open(path) as img:
+                # NEAREST keeps pixel art crisp (same as the editor's per-file path)
+                thumb = img.convert('RGBA').resize((size, size), Image.Resampling.NEAREST)
+        except OSError:
+            continue
+        x, y = (i % cols) * size, (i // cols) * size
+        sheet.paste(thumb, (x, y))
+        sprites[path.stem] = [x, y]
+
+    out_base = Path(out_base)
+    out_base.parent.mkdir(parents=True, exist_ok=True)
+    # Image first: an index is only ever written next to its finished image
+    png_tmp = out_base.with_name(out_base.name + '.png.tmp')
+    sheet.save(png_tmp, 'PNG', optimize=True)
+    os.replace(png_tmp, out_base.with_suffix('.png'))
+    index_tmp = out_base.with_name(out_base.name + '.json.tmp')
+    with open(index_tmp, 'w', encoding='utf-8') as f:
+        json.dump({'source': signature, 'size': size, 'sprites': sprites}, f)
+    os.replace(index_tmp, out_base.with_suffix('.json'))
+    return sprites
+
+
+class SpriteAtlas:
+    """
+    One variant's sprites at one size. The packed image is read once, on the
+    first lookup; thumbnails are cropped out of it on demand. Safe to use
+    from several threads.
+    """
+
+    def __init__(self, src_dir, size, atlas_dir=ATLAS_DIR, variant=None):
+        self.src_dir = Path(src_dir)
+        self.size = size
+        self.base = Path(atlas_dir) / f"{variant or self.src_dir.name}_{size}"
+        self._sheet = None
+        self._sprites = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        self._sprites = {}
+        if not self.src_dir.is_dir():
+            return
+        signature = source_signature(self.src_dir)
+        try:
+            with open(self.base.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('source') != signature or index.get('size') != self.size:
+                raise ValueError("stale atlas")
+            sprites = index['sprites']
+        except (OSError, ValueError, KeyError):
+            try:
+                sprites = build_atlas(self.src_dir, self.size, self.base)
+            except OSError as e:
+                print(f"Sprite atlas build failed ({self.base.name}): {e}")
+                return
+        try:
+            with Image.open(self.base.with_suffix('.png')) as sheet:
+                self._sheet = sheet.convert('RGBA')
+        except OSError as e:
+            print(f"Sprite atlas unreadable ({self.base.name}): {e}")
+            return
+        self._sprites = sprites
+
+    def get(self, name):
+        """The named sprite as a size x size PIL image, or None if the atlas lacks it."""
+        with self._lock:
+            if self._sprites is None:
+                self._load()
+            pos = self._sprites.get(name)
+            if pos is None:
+                return None
+            x, y = pos
+            return self._sheet.crop((x, y, x + self.size, y + self.size))
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or list(ATLAS_SIZES)
+    for variant, src in VARIANTS.items():
+        if not src.is_dir():
+            print(f"Skipping {variant}: {src} not found")
+            continue
+        for size in sizes:
+            sprites = build_atlas(src, size, ATLAS_DIR / f"{variant}_{size}")
+            print(f"{variant}_{size}: {len(sprites)} sprites")
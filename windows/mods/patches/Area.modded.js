@@ -485,7 +485,7 @@ export class Area {
 			const spawnPos = this.getSpawnPosition(waypointEnemy, xOffset);
 			if (enemy) {
 				this.enemies.push(
-					new Enemy(
+					Enemy.acquire(
 						spawnPos.x,
 						spawnPos.y,
 						enemy,
@@ -710,7 +710,7 @@ export class Area {
 		for (const desc of spawnDescriptors) {
 			if (desc.xOffset <= SPAWN_BUFFER) {
 				this.enemies.push(
-					new Enemy(desc.x, desc.y, desc.enemy, desc.waypoints, this.main, this.main.game.ctx)
+					Enemy.acquire(desc.x, desc.y, desc.enemy, desc.waypoints, this.main, this.main.game.ctx)
 				);
 			} else {
 				this._spawnQueue.push(desc);
@@ -744,7 +744,7 @@ export class Area {
 			if (distanceTraveled >= next.xOffset - SPAWN_BUFFER) {
 				this._spawnQueue.shift();
 				this.enemies.push(
-					new Enemy(next.x, next.y, next.enemy, next.waypoints, this.main, this.main.game.ctx)
+					Enemy.acquire(next.x, next.y, next.enemy, next.waypoints, this.main, this.main.game.ctx)
 				);
 			} else {
 				break; // Queue is sorted, so no later enemies are ready either
@@ -862,7 +862,7 @@ export class Area {
 			const xOffset = (i + 1) * bossSpacing;
 			const spawnPos = this.getSpawnPosition(waypointEnemy, xOffset);
 			this.enemies.push(
-				new Enemy(
+				Enemy.acquire(
 					spawnPos.x,
 					spawnPos.y,
 					scaledBoss,
@@ -897,7 +897,7 @@ export class Area {
 				const xOffset = (bossCount + 1) * bossSpacing + (i + 1) * 25;
 				const spawnPos = this.getSpawnPosition(waypointEnemy, xOffset);
 				this.enemies.push(
-					new Enemy(
+					Enemy.acquire(
 						spawnPos.x,
 						spawnPos.y,
 						scaledEscort,
@@ -936,7 +936,7 @@ export class Area {
 					const waypointEnemy = this.waypoints[Math.floor(Math.random() * this.waypoints.length)];
 					const spawnPos = this.getSpawnPosition(waypointEnemy, xOffset);
 					this.enemies.push(
-						new Enemy(
+						Enemy.acquire(
 							spawnPos.x,
 							spawnPos.y,
 							enemy,
@@ -959,7 +959,7 @@ export class Area {
 		const waypointEnemy = this.waypoints[Math.floor(Math.random() * this.waypoints.length)];
 		const spawnPos = this.getSpawnPosition(waypointEnemy, 150);
 		this.enemies.push(
-			new Enemy(
+			Enemy.acquire(
 				spawnPos.x,
 				spawnPos.y,
 				boss,
@@ -1,21 +1,111 @@
 import { Sprite } from '../../utils/Sprite.js';
 import { playSound } from '../../file/audio.js';
 
+// ============================================================================
+// MOD: POOLING - enemies and their damage texts are recycled
+// ============================================================================
+// Endless at 10x spawns and kills thousands of enemies per second; building
+// each one (and a text object per hit) from scratch kept the GC busy enough
+// to stutter. The fixed-timestep Game releases enemies it removes, and Area
+// spawns through Enemy.acquire().
+//
+// Enemies are pooled per sprite sheet, so a reused one keeps a loaded image
+// and valid frame sizes. One is handed out again only ENEMY_REUSE_STEPS
+// simulation steps after its release: longer than a projectile lives
+// (lifeTime 5000 ms), so no shot still in flight can land on its next life.
+const ENEMY_POOL_MAX = 512;
+const ENEMY_REUSE_STEPS = 360; // 6 s of game time at 60 steps/s
+const FLOATING_TEXT_POOL_MAX = 1024;
+
+const enemyPool = new Map(); // sprite key -> released enemies, oldest first
+let enemyPoolSize = 0;
+const floatingTextPool = [];
+
+function enemyPoolKey(enemy) {
+	return `${enemy.sprite.image}|${enemy.sprite.frames}`;
+}
+
+class FloatingText {
+	reset(text, y, color) {
+		this.text = text;
+		this.timer = 0;
+		this.duration = 1000;
+		this.y = y;
+		this.vy = -60;
+		this.alpha = 1;
+		this.color = color;
+		return this;
+	}
+}
+
+function acquireFloatingText(text, y, color) {
+	return (floatingTextPool.pop() ?? new FloatingText()).reset(text, y, color);
+}
+
+function releaseFloatingText(ft) {
+	if (floatingTextPool.length < FLOATING_TEXT_POOL_MAX) floatingTextPool.push(ft);
+}
+
 export class Enemy extends Sprite {
 	constructor(x, y, enemy, waypoints, main, ctx) {
 		super(x, y, ctx, enemy.sprite.image, enemy.sprite.frames, 8);
 		this.main = main;
 
+		// MOD: POOLING - sprite frame state as constructed, restored on reuse
+		this._baseFrames = { ...this.frames };
+		this._poolKey = enemyPoolKey(enemy);
+		this._poolSrc = this.sprite.src;
+		this.statusEffects = [];
+		this.floatingTexts = [];
+
+		const cursePath = './src/assets/images/icons/curse.png';
+
+		let cached = null;
+		try {
+			if (this.main && this.main.assets && typeof this.main.assets.getImage === 'function') {
+				cached = this.main.assets.getImage(cursePath);
+			}
+			// fallback a main.getImage con helper
+			if (!cached && this.main && typeof this.main.getImage === 'function') {
+				cached = this.main.getImage(cursePath);
+			}
+			// tambi├⌐n comprobar imageCache directo por compatibilidad
+			if (!cached && this.main && this.main.imageCache && this.main.imageCache[cursePath]) {
+				cached = this.main.imageCache[cursePath];
+			}
+		} catch (_) { cached = null; }
+
+		this.curseIcon = cached || null;
+
+		if (!this.curseIcon) {
+		    this.curseIcon = new Image();
+		    this.curseIcon.src = './src/assets/images/icons/curse.png';
+		}
+
+		this.reset(x, y, enemy, waypoints, main, ctx);
+	}
+
+	// MOD: POOLING - everything a spawn sets up; run by the constructor and
+	// again when Enemy.acquire() hands out a released enemy
+	reset(x, y, enemy, waypoints, main, ctx) {
+		this.main = main;
+		this.ctx = ctx;
+		this.position.x = x;
+		this.position.y = y;
+		Object.assign(this.frames, this._baseFrames);
+		this._prevX = undefined;
+		this._prevY = undefined;
+		this._markedForRemoval = false;
+
 		const wave = this.main.area.waveNumber;
 
 		this.radius = 4;
 		this.waypoints = waypoints;
 		this.waypointIndex = 0;
 
-		this.center = {
-			x: this.position.x + this.width / 2,
-			y: this.position.y + this.height / 2
-		};
+		if (!this.center) this.center = { x: 0, y: 0 };
+		this.center.x = this.position.x + this.width / 2;
+		this.center.y = this.position.y + this.height / 2;
 
 		this.enemy = enemy;
 		this.hp = enemy.hp;
@@ -51,32 +141,9 @@ export class Enemy extends Sprite {
 		this.reviveAnimTime = 0;
 		this.reviveScale = 1;
 
-		this.statusEffects = [];
-		this.floatingTexts = [];
-
-		const cursePath = './src/assets/images/icons/curse.png';
+		this.statusEffects.length = 0;
+		this.floatingTexts.length = 0;
 
-		let cached = null;
-		try {
-			if (this.main && this.main.assets && typeof this.main.assets.getImage === 'function') {
-				cached = this.main.assets.getImage(cursePath);
-			}
-			// fallback a main.getImage con helper
-			if (!cached && this.main && typeof this.main.getImage === 'function') {
-				cached = this.main.getImage(cursePath);
-			}
-			// tambi├⌐n comprobar imageCache directo por compatibilidad
-			if (!cached && this.main && this.main.imageCache && this.main.imageCache[cursePath]) {
-				cached = this.main.imageCache[cursePath];
-			}
-		} catch (_) { cached = null; }
-
-		this.curseIcon = cached || null;
-
-		if (!this.curseIcon) {
-		    this.curseIcon = new Image();
-		    this.curseIcon.src = './src/assets/images/icons/curse.png';
-		}
 		// Wave scaling for difficulty (waves 1-100 only)
 		// ENDLESS MODE (wave > 100): All scaling handled by Area.js spawnEndlessWave
 		if (wave <= 100) {
@@ -135,6 +202,41 @@ export class Enemy extends Sprite {
 		}
 	}
 
+	// A released enemy of the same sprite if one is old enough, else a new one
+	static acquire(x, y, enemy, waypoints, main, ctx) {
+		const free = enemyPool.get(enemyPoolKey(enemy));
+		const step = main.game?.simStep ?? 0;
+		if (free && free.length > 0 && step - free[0]._releasedAt >= ENEMY_REUSE_STEPS) {
+			const reused = free.shift();
+			enemyPoolSize--;
+			reused.reset(x, y, enemy, waypoints, main, ctx);
+			return reused;
+		}
+		return new Enemy(x, y, enemy, waypoints, main, ctx);
+	}
+
+	// Called once the enemy is out of area.enemies for good
+	release() {
+		for (let i = 0; i < this.floatingTexts.length; i++) releaseFloatingText(this.floatingTexts[i]);
+		this.floatingTexts.length = 0;
+		this.statusEffects.length = 0;
+
+		// Towers compare against their last target; a recycled enemy must not match
+		const towers = this.main.area.towers;
+		for (let t = 0; t < towers.length; t++) {
+			if (towers[t].target === this) towers[t].target = null;
+			if (towers[t].lastTarget === this) towers[t].lastTarget = null;
+		}
+
+		// Swapped sprites (groudon's primal form, shiny variants) don't match their pool
+		if (this.sprite.src !== this._poolSrc || enemyPoolSize >= ENEMY_POOL_MAX) return;
+		this._releasedAt = this.main.game?.simStep ?? 0;
+		let free = enemyPool.get(this._poolKey);
+		if (!free) enemyPool.set(this._poolKey, free = []);
+		free.push(this);
+		enemyPoolSize++;
+	}
+
 	draw() {
 		this.ctx.save();
 
@@ -392,28 +494,54 @@ export class Enemy extends Sprite {
 		this.ctx.restore(); 
 	}
 
+	// MOD: FIXED-TIMESTEP - drawn by Game.render(), between the last two
+	// simulated positions; update() below no longer draws. Renders that
+	// aren't allowed to step the sprite sheet put its counters back.
+	render(alpha = 1, advanceSprite = true) {
+		const pos = this.position;
+		const x = pos.x;
+		const y = pos.y;
+		if (this._prevX !== undefined) {
+			pos.x = this._prevX + (x - this._prevX) * alpha;
+			pos.y = this._prevY + (y - this._prevY) * alpha;
+		}
+		const frames = this.frames;
+		const current = frames.current;
+		const elapsed = frames.elapsed;
+		this.ctx.save();
+		this.ctx.globalAlpha = this.opacity;
+		this.draw();
+		this.ctx.restore();
+		if (!advanceSprite) {
+			frames.current = current;
+			frames.elapsed = elapsed;
+		}
+		pos.x = x;
+		pos.y = y;
+	}
+
 	update(deltaTime = 1000 / 60) {
 		// deltaTime ya viene escalado por Game (ms)
 		const simDelta = deltaTime;
 		const frameFactor = simDelta / (1000 / 60);
+		this._prevX = this.position.x;
+		this._prevY = this.position.y;
 
 		if (this.dying) {
 	        this.opacity -= this.dyingSpeed * frameFactor;
 	        if (this.opacity <= 0) {
+	            // MOD: POOLING - the fixed-timestep Game drops marked enemies in
+	            // one pass after the update loop and releases them
+	            if (this.main.game?.simulateStep) {
+	                this._markedForRemoval = true;
+	                return;
+	            }
 	            const index = this.main.area.enemies.indexOf(this);
 	            if (index > -1) this.main.area.enemies.splice(index, 1);
 	            return;
 	        }
 	    }
 
-		// DELTA TIME FIX: Skip drawing during sub-step simulation
-		if (!this._skipDraw) {
-		    this.ctx.save();
-		    this.ctx.globalAlpha = this.opacity;
-		    this.draw();
-		    this.ctx.restore();
-		}
-
 	    if (!this.dying) {
 	    	if (this.isRegeneratorReviving) {
 			    this.regeneratorReviveTimer -= simDelta;
@@ -885,15 +1013,7 @@ export class Enemy extends Sprite {
 	            }
 	        }
 
-	        this.floatingTexts.push({
-	            text: `-${amount}${isCritical ? '!' : ''}`,
-	            timer: 0,
-	            duration: 1000,
-	            y: startY,     
-	            vy: -60,       
-	            alpha: 1,
-	            color
-	        });
+	        this.floatingTexts.push(acquireFloatingText(`-${amount}${isCritical ? '!' : ''}`, startY, color));
 	    }
 
 	    if (armorHit > 0) {
@@ -904,15 +1024,7 @@ export class Enemy extends Sprite {
 	            }
 	        }
 
-	        this.floatingTexts.push({
-	            text: `-${armorHit}${isCritical ? '!' : ''}`,
-	            timer: 0,
-	            duration: 1000,
-	            y: startY,
-	            vy: -60,
-	            alpha: 1,
-	            color: isCritical ? '#ffeb3b' : '#66ccff'
-	        });
+	        this.floatingTexts.push(acquireFloatingText(`-${armorHit}${isCritical ? '!' : ''}`, startY, isCritical ? '#ffeb3b' : '#66ccff'));
 	    }
 
 	    if ((ability?.id === 'curse' || ability?.id === 'willOWisp' || ability?.id === 'curseDoubleShot') && this.cursed && cursedDamage > 0 && !alreadyCursed.has(this)) {
@@ -1022,8 +1134,11 @@ export class Enemy extends Sprite {
 	}
 
 	updateFloatingTexts(deltaTime) {
-	    for (let i = this.floatingTexts.length - 1; i >= 0; i--) {
-	        const ft = this.floatingTexts[i];
+	    // MOD: POOLING - expired texts are compacted out in place and recycled
+	    const texts = this.floatingTexts;
+	    let kept = 0;
+	    for (let i = 0; i < texts.length; i++) {
+	        const ft = texts[i];
 	        ft.timer += deltaTime;
 
 	        ft.y += ft.vy * (deltaTime / 1000);
@@ -1031,10 +1146,10 @@ export class Enemy extends Sprite {
 	        const minAlpha = 0.5;
 	        ft.alpha = Math.max(minAlpha, 1 - 0.4 * (ft.timer / ft.duration));
 
-	        if (ft.timer >= ft.duration) {
-	            this.floatingTexts.splice(i, 1);
-	        }
+	        if (ft.timer >= ft.duration) releaseFloatingText(ft);
+	        else texts[kept++] = ft;
 	    }
+	    texts.length = kept;
 	}
 
 	applyStatusEffect(effect, pokemon) {
@@ -2,6 +2,121 @@ import { Tower } from './component/Tower.js';
 import { text } from '../file/text.js';
 import { playSound } from '../file/audio.js';
 
+// MOD: PERF - Uniform spatial hash of enemy centers (tower target broadphase).
+// Rebuilt once per sub-step with a counting sort into flat typed arrays, so a
+// rebuild allocates nothing once the arrays have grown to the enemy count.
+// Each tower then only range-tests the enemies in cells its range box
+// overlaps instead of every enemy on the map.
+class EnemyGrid {
+	constructor(width, height, cellSize = 48) {
+	    this.cellSize = cellSize;
+	    this.cols = Math.ceil(width / cellSize);
+	    this.rows = Math.ceil(height / cellSize);
+	    this.width = width;
+	    this.height = height;
+	    this.cellStart = new Int32Array(this.cols * this.rows + 1);
+	    this.cellFill = new Int32Array(this.cols * this.rows + 1);
+	    this.cellOf = new Int32Array(256);
+	    this.items = new Int32Array(256); // enemy indices grouped by cell
+	    this.marks = new Int32Array(8);   // one bit per enemy index, per query
+	    this.enemies = null;
+	}
+
+	// Index every live, on-canvas enemy (the same filter the tower loop used).
+	rebuild(enemies) {
+	    const n = enemies.length;
+	    if (this.cellOf.length < n) {
+	        const size = Math.max(n, this.cellOf.length * 2);
+	        this.cellOf = new Int32Array(size);
+	        this.items = new Int32Array(size);
+	        this.marks = new Int32Array((size + 31) >> 5);
+	    }
+	    const { cols, rows, cellSize, width, height, cellOf, cellStart } = this;
+	    cellStart.fill(0);
+	    for (let i = 0; i < n; i++) {
+	        const enemy = enemies[i];
+	        const cx = enemy.center.x;
+	        const cy = enemy.center.y;
+	        if (enemy.dying || cx < 0 || cx > width || cy < 0 || cy > height) {
+	            cellOf[i] = -1;
+	            continue;
+	        }
+	        const col = Math.min(cols - 1, (cx / cellSize) | 0);
+	        const row = Math.min(rows - 1, (cy / cellSize) | 0);
+	        const cell = row * cols + col;
+	        cellOf[i] = cell;
+	        cellStart[cell + 1]++;
+	    }
+	    const cellCount = cols * rows;
+	    for (let c = 0; c < cellCount; c++) cellStart[c + 1] += cellStart[c];
+	    // Fill from the back so each cell keeps ascending enemy order
+	    const fill = this.cellFill;
+	    fill.set(cellStart);
+	    for (let i = n - 1; i >= 0; i--) {
+	        const cell = cellOf[i];
+	        if (cell >= 0) this.items[--fill[cell + 1]] = i;
+	    }
+	    this.enemies = enemies;
+	}
+
+	// Enemies within `inRange` of the tower, in enemies-array order (towers
+	// break targeting ties by that order, same as the full scan did).
+	query(tower, hx, hy, inRange, out) {
+	    const { cols, rows, cellSize, cellStart, items, enemies } = this;
+	    const x = tower.center.x;
+	    const y = tower.center.y;
+	    const c0 = Math.max(0, Math.floor((x - hx) / cellSize));
+	    const c1 = Math.min(cols - 1, Math.floor((x + hx) / cellSize));
+	    const r0 = Math.max(0, Math.floor((y - hy) / cellSize));
+	    const r1 = Math.min(rows - 1, Math.floor((y + hy) / cellSize));
+	    if (c0 > c1 || r0 > r1) return out;
+	    // Mark candidates in a bitmap, then read the set bits back in index
+	    // order: ordered output without sorting, O(candidates + enemies / 32)
+	    const marks = this.marks;
+	    let lo = marks.length, hi = -1;
+	    for (let row = r0; row <= r1; row++) {
+	        const base = row * cols;
+	        const end = cellStart[base + c1 + 1];
+	        for (let k = cellStart[base + c0]; k < end; k++) {
+	            const w = items[k] >> 5;
+	            marks[w] |= 1 << (items[k] & 31);
+	            if (w < lo) lo = w;
+	            if (w > hi) hi = w;
+	        }
+	    }
+	    for (let w = lo; w <= hi; w++) {
+	        let bits = marks[w];
+	        if (bits === 0) continue;
+	        marks[w] = 0;
+	        while (bits !== 0) {
+	            const low = bits & -bits;
+	            bits ^= low;
+	            const enemy = enemies[(w << 5) | (31 - Math.clz32(low))];
+	            // An earlier tower may have killed it this step
+	            if (!enemy.dying && inRange(tower, enemy)) out.push(enemy);
+	        }
+	    }
+	    return out;
+	}
+}
+
+// MOD: FIXED-TIMESTEP loop limits
+const MAX_STEPS_PER_FRAME = 100;  // CPU safety cap; simulated time beyond it is dropped
+const MAX_FRAME_GAP_MS = 250;     // a throttled/hidden window resumes instead of fast-forwarding
+
+// Half-extents of the box that bounds a tower's range shape (see
+// isEnemyInRange), written into one reused pair: this runs per tower per step
+const rangeExtents = [0, 0];
+function rangeHalfExtents(tower) {
+	const r = tower.range;
+	switch (tower.pokemon.rangeType) {
+	    case 'horizontalLine': rangeExtents[0] = r; rangeExtents[1] = 24; break;
+	    case 'verticalLine': rangeExtents[0] = 24; rangeExtents[1] = r; break;
+	    default: rangeExtents[0] = rangeExtents[1] = Math.max(r, 36);
+	}
+	return rangeExtents;
+}
+
 export class Game {
 	constructor(main) {
 	    this.main = main;
@@ -22,7 +137,12 @@ export class Game {
 	    this.frameDuration = 1000 / this.FPS;
 	    this.lastTime = 0;
 	    this.loopId = null;
+	    this.simAccumulator = 0; // MOD: simulated ms owed to the fixed-timestep loop
+	    this.spriteClock = 0; // MOD: real ms owed to sprite-sheet animation (one frame tick per frameDuration)
 	    this.animate = this.animate.bind(this);
+	    this.enemyGrid = new EnemyGrid(this.canvas.width, this.canvas.height);
+	    this.simStep = 0; // MOD: sub-step counter, keys per-step caches (Tower target ordering)
+	    this.isEnemyInRange = this.isEnemyInRange.bind(this);
 	    this.ranges = false;
 	    this.speedFactor = 0.8;
 	    this.chrono;
@@ -39,29 +159,45 @@ export class Game {
   	load() {
 	    this.stopped = false;
 	    this.lastTime = performance.now();
-	    if (this.loopId) clearInterval(this.loopId);
-	    this.loopId = setInterval(() => this.animate(performance.now()), this.frameDuration);
+	    this.startLoop();
 	    this.setEvents();
 	    this.chrono = this.main.utility.chrono(1);
   	}
 
+	// MOD: FIXED-TIMESTEP loop driven by requestAnimationFrame (replaces setInterval)
+	startLoop() {
+	    this.stopLoop();
+	    const tick = (time) => {
+	        this.loopId = requestAnimationFrame(tick);
+	        this.animate(time);
+	    };
+	    this.loopId = requestAnimationFrame(tick);
+	}
+
+	stopLoop() {
+	    if (this.loopId) {
+	        cancelAnimationFrame(this.loopId);
+	        this.loopId = null;
+	    }
+	}
+
   	animate(time) {
 	    if (this.stopped) return;
 	    if (!this.lastTime) this.lastTime = time;
 	    const delta = time - this.lastTime;
-	    if (delta < this.frameDuration) return;
-	    
-	    this.lastTime = time - (delta % this.frameDuration);
-
-	    // --- MOD: DELTA TIME FIX - Sub-stepping for high speed accuracy ---
-	    // Calculate total scaled time to simulate this frame
-	    const totalScaledDelta = this.frameDuration * this.speedFactor;
-	    
-	    // Determine number of simulation steps (cap at 100 for CPU safety)
-	    // Each step simulates at most 1 frame worth of time (16.67ms)
-	    const maxStepMs = this.frameDuration; // 16.67ms at 60fps
-	    const numSteps = Math.min(100, Math.max(1, Math.ceil(totalScaledDelta / maxStepMs)));
-	    const stepDelta = totalScaledDelta / numSteps;
+	    this.lastTime = time;
+
+	    // --- MOD: FIXED-TIMESTEP SIMULATION ---
+	    // Game time owed (real time x speed) accumulates and is paid out in
+	    // fixed frameDuration steps, so every speed runs the same step size and
+	    // high speeds simply run more steps. Rendering happens on every rAF,
+	    // after the steps, interpolated by the leftover fraction of a step.
+	    const stepMs = this.frameDuration;
+	    const scaledDelta = Math.min(delta, MAX_FRAME_GAP_MS) * this.speedFactor;
+	    this.simAccumulator += scaledDelta;
+	    const numSteps = Math.min(MAX_STEPS_PER_FRAME, Math.floor(this.simAccumulator / stepMs));
+	    this.simAccumulator -= numSteps * stepMs;
+	    if (this.simAccumulator >= stepMs) this.simAccumulator %= stepMs; // over the cap: drop the backlog
 
 	    // Canvas shake (only process once per frame, not per step)
 	    if (this.canvasShake.active) {
@@ -82,115 +218,32 @@ export class Game {
 		    }
 		}
 
-	    // --- MOD: SUB-STEPPING LOOP for accurate high-speed simulation ---
-	    // PERF: Cache frequently accessed properties outside the loop
-	    const area = this.main.area;
-	    const enemies = area.enemies;
-	    const towers = area.towers;
-	    const canvasW = this.canvas.width;
-	    const canvasH = this.canvas.height;
-
-	    // PERF: Pre-compute snowCloak positions ONCE per frame (not per tower per step)
-	    // This replaces the per-tower snowCloak iteration in Tower.update()
-	    const snowCloakEnemies = [];
-	    for (let i = 0; i < enemies.length; i++) {
-	        const e = enemies[i];
-	        if (e && e.hp > 0 && !e.invulnerable && e.passive?.id === 'snowCloak') {
-	            snowCloakEnemies.push(e);
-	        }
-	    }
-
+	    // Entities with a render() method draw only in the render pass below.
+	    // Unmodded ones (vanilla Tower.js etc.) still draw inside update(), so
+	    // the background goes down right before the last step for them.
 	    for (let step = 0; step < numSteps; step++) {
-	        const isLastStep = (step === numSteps - 1);
-	        
-	        // PERF: Tell towers/enemies/projectiles to skip draw on non-last steps
-	        if (!isLastStep) {
-	            for (let t = 0; t < towers.length; t++) towers[t]._skipDraw = true;
-	            for (let i = 0; i < enemies.length; i++) enemies[i]._skipDraw = true;
-	        } else {
-	            for (let t = 0; t < towers.length; t++) towers[t]._skipDraw = false;
-	            for (let i = 0; i < enemies.length; i++) enemies[i]._skipDraw = false;
-	            // Render background on last step
-	            if (this.ctx) {
-	                if (this.canvasBackground.complete && this.canvasBackground.naturalWidth !== 0) {
-	                    this.ctx.drawImage(this.canvasBackground, 0, 0, canvasW, canvasH);
-	                } else {
-	                    this.ctx.clearRect(0, 0, canvasW, canvasH);
-	                }
-	            }
-	        }
-
-	        // Update enemies
-	        for (let i = enemies.length - 1; i >= 0; i--) {
-	          const enemy = enemies[i];
-	          // PERF: Check if enemy was removed during its own update by comparing array element
-	          enemy.update(stepDelta);
-	          if (enemies[i] !== enemy) continue;
-
-	          // Enemy exits the canvas
-	          if (enemy.waypoints.length === enemy.waypointIndex + 1) {
-	            if (
-	              enemy.position.x > canvasW ||
-	              enemy.position.x < -30 ||
-	              enemy.position.y - 20 > canvasH ||
-	              enemy.position.y < -20
-	            ) {
-	              playSound('hit2', 'effect');
-	              this.main.player.getDamaged(enemy.power);
-	              // PERF: Use loop index directly instead of indexOf
-	              enemies.splice(i, 1);
-	              continue;
-	            }
-	          }
-	        }
-
-	        // PERF: Batch-remove dead enemies (avoids indexOf per dying enemy)
-	        for (let i = enemies.length - 1; i >= 0; i--) {
-	            if (enemies[i]._markedForRemoval) enemies.splice(i, 1);
-	        }
-
-	        // Update towers
-	        // PERF: Build enemiesInRange with for-loop instead of .filter() to avoid array allocation per tower
-	        // PERF: recalculatePower only on first step (inputs don't change between sub-steps)
-	        for (let t = 0; t < towers.length; t++) {
-	          const tower = towers[t];
-	          tower._snowCloakEnemies = snowCloakEnemies; // PERF: pass pre-computed list
-	          tower._isFirstStep = (step === 0);
-	          const enemiesInRange = [];
-	          for (let e = 0; e < enemies.length; e++) {
-	            const enemy = enemies[e];
-	            if (enemy.dying) continue;
-	            const cx = enemy.center.x;
-	            const cy = enemy.center.y;
-	            if (cx < 0 || cx > canvasW || cy < 0 || cy > canvasH) continue;
-	            if (this.isEnemyInRange(tower, enemy)) {
-	              enemiesInRange.push(enemy);
-	            }
-	          }
-	          tower.update(enemiesInRange, stepDelta);
-	        }
-
-	        // MOD: Tick deferred spawn queue (spawns enemies as wave progresses)
-	        if (area._spawnQueue && area._spawnQueue.length > 0) {
-	          area.tickSpawnQueue(stepDelta);
-	        }
-
-	        // Check wave end condition (also check spawn queue is drained)
-	        if (area.waveActive && enemies.length === 0 && (!area._spawnQueue || area._spawnQueue.length === 0)) {
-	          area.endWave();
-	        }
+	        if (step === numSteps - 1) this.drawBackground();
+	        this.simulateStep(stepMs, step === 0);
 	    }
-	    // --- END SUB-STEPPING LOOP ---
+	    if (numSteps === 0) this.drawBackground();
+
+	    // Sprite.draw() steps its sheet once per call, which assumed one draw
+	    // per 1/FPS s. Let at most one draw per frameDuration of real time
+	    // advance it, so high refresh rates don't speed animations up.
+	    this.spriteClock = Math.min(this.spriteClock + delta, 2 * stepMs);
+	    const advanceSprites = this.spriteClock >= stepMs;
+	    if (advanceSprites) this.spriteClock -= stepMs;
+	    this.render(this.simAccumulator / stepMs, numSteps === 0, advanceSprites);
 
 	    // Update placement tiles (visual only)
 	    this.main.area.placementTiles.forEach(tile => tile.update(this.mouse));
 
-	    // PERF: Throttle damage dealt UI update to every 5 frames (DOM manipulation is expensive)
-	    if (!this._damageUpdateCounter) this._damageUpdateCounter = 0;
-	    this._damageUpdateCounter++;
-	    if (this._damageUpdateCounter >= 5) {
+	    // PERF: Throttle damage dealt UI update to every 5 frame durations (DOM manipulation is expensive)
+	    if (!this._damageUpdateElapsed) this._damageUpdateElapsed = 0;
+	    this._damageUpdateElapsed += delta;
+	    if (this._damageUpdateElapsed >= 5 * stepMs) {
 	        this.main.UI.updateDamageDealt();
-	        this._damageUpdateCounter = 0;
+	        this._damageUpdateElapsed = 0;
 	    }
 
 	    // Draw floating damage texts
@@ -212,7 +265,7 @@ export class Game {
 	    // Map effects
 	    if (this.main.mapEffects != 2) {
 	        if (this.effectEnabled) {
-	            this.effectTime += totalScaledDelta;
+	            this.effectTime += numSteps * stepMs;
 
 	            const targetAlpha = (this.main.mapEffects == 1) ? 1 : 0.65 + 0.1 * Math.sin(this.effectTime * 0.001);
 	            const targetGlobalAlpha = (this.main.mapEffects == 1) ? 1 : 0.65 + 0.01 * Math.sin(this.effectTime * 0.001);
@@ -220,7 +273,7 @@ export class Game {
 	            this.currentAlpha = this.currentAlpha ?? targetAlpha;
 	            this.currentGlobalAlpha = this.currentGlobalAlpha ?? targetGlobalAlpha;
 
-	            const lerpFactor = 0.05;
+	            const lerpFactor = 1 - Math.pow(0.95, delta / stepMs); // 0.05 per 1/FPS s, at any refresh rate
 	            this.currentAlpha += (targetAlpha - this.currentAlpha) * lerpFactor;
 	            this.currentGlobalAlpha += (targetGlobalAlpha - this.currentGlobalAlpha) * lerpFactor;
 
@@ -232,6 +285,121 @@ export class Game {
 	    }
 	}
 
+	drawBackground() {
+	    if (!this.ctx) return;
+	    if (this.canvasBackground.complete && this.canvasBackground.naturalWidth !== 0) {
+	        this.ctx.drawImage(this.canvasBackground, 0, 0, this.canvas.width, this.canvas.height);
+	    } else {
+	        this.ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+	    }
+	}
+
+	// One fixed step of game logic (no drawing for entities that have render())
+	simulateStep(stepDelta, isFirstStep) {
+	    // PERF: Cache frequently accessed properties
+	    const area = this.main.area;
+	    const enemies = area.enemies;
+	    const towers = area.towers;
+	    const canvasW = this.canvas.width;
+	    const canvasH = this.canvas.height;
+	    const grid = this.enemyGrid;
+	    this.simStep++;
+
+	    // PERF: Pre-compute snowCloak positions ONCE per step (not per tower)
+	    // This replaces the per-tower snowCloak iteration in Tower.update()
+	    const snowCloakEnemies = [];
+	    for (let i = 0; i < enemies.length; i++) {
+	        const e = enemies[i];
+	        if (e && e.hp > 0 && !e.invulnerable && e.passive?.id === 'snowCloak') {
+	            snowCloakEnemies.push(e);
+	        }
+	    }
+
+	    // Update enemies
+	    for (let i = enemies.length - 1; i >= 0; i--) {
+	      const enemy = enemies[i];
+	      // PERF: Check if enemy was removed during its own update by comparing array element
+	      enemy.update(stepDelta);
+	      if (enemies[i] !== enemy || enemy._markedForRemoval) continue;
+
+	      // Enemy exits the canvas
+	      if (enemy.waypoints.length === enemy.waypointIndex + 1) {
+	        if (
+	          enemy.position.x > canvasW ||
+	          enemy.position.x < -30 ||
+	          enemy.position.y - 20 > canvasH ||
+	          enemy.position.y < -20
+	        ) {
+	          playSound('hit2', 'effect');
+	          this.main.player.getDamaged(enemy.power);
+	          // PERF: Use loop index directly instead of indexOf
+	          enemies.splice(i, 1);
+	          if (enemy.release) enemy.release();
+	          continue;
+	        }
+	      }
+	    }
+
+	    // PERF: Batch-remove dead enemies in one in-place pass (no indexOf or
+	    // splice per dying enemy) and hand them back to Enemy's pool
+	    let kept = 0;
+	    for (let i = 0; i < enemies.length; i++) {
+	        const enemy = enemies[i];
+	        if (!enemy._markedForRemoval) enemies[kept++] = enemy;
+	        else if (enemy.release) enemy.release();
+	    }
+	    enemies.length = kept;
+
+	    // Update towers
+	    // PERF: Spatial hash broadphase - index enemy centers once per step,
+	    // then each tower only range-tests enemies in the cells it overlaps
+	    // PERF: recalculatePower only on the frame's first step (inputs don't change between steps)
+	    grid.rebuild(enemies);
+	    for (let t = 0; t < towers.length; t++) {
+	      const tower = towers[t];
+	      tower._snowCloakEnemies = snowCloakEnemies; // PERF: pass pre-computed list
+	      tower._isFirstStep = isFirstStep;
+	      const extents = rangeHalfExtents(tower);
+	      tower.update(grid.query(tower, extents[0], extents[1], this.isEnemyInRange, []), stepDelta);
+	    }
+
+	    // MOD: Tick deferred spawn queue (spawns enemies as wave progresses)
+	    if (area._spawnQueue && area._spawnQueue.length > 0) {
+	      area.tickSpawnQueue(stepDelta);
+	    }
+
+	    // Check wave end condition (also check spawn queue is drained)
+	    if (area.waveActive && enemies.length === 0 && (!area._spawnQueue || area._spawnQueue.length === 0)) {
+	      area.endWave();
+	    }
+	}
+
+	// Draw the current state, `alpha` of the way from the previous step to the
+	// latest one. redrawAll: no step ran this frame, so entities that only draw
+	// from update() are drawn here too (paused / idle frames). advanceSprites:
+	// whether this draw may step sprite-sheet animations (see animate()).
+	render(alpha, redrawAll, advanceSprites = true) {
+	    const area = this.main.area;
+	    const enemies = area.enemies;
+	    const towers = area.towers;
+
+	    for (let i = 0; i < enemies.length; i++) {
+	        const enemy = enemies[i];
+	        if (enemy.render) enemy.render(alpha, advanceSprites);
+	        else if (redrawAll) enemy.draw();
+	    }
+	    for (let t = 0; t < towers.length; t++) {
+	        const tower = towers[t];
+	        if (tower.render) tower.render(alpha);
+	        else if (redrawAll) tower.draw();
+	        const projectiles = tower.projectiles;
+	        if (!projectiles) continue;
+	        for (let p = 0; p < projectiles.length; p++) {
+	            if (projectiles[p].render) projectiles[p].render(alpha, advanceSprites);
+	        }
+	    }
+	}
+
   	tryDeployUnit(pos, ui) {
   		console.warn('[MOD-DEBUG] tryDeployUnit called:', { pokemonIndex: pos, deployingUnitExists: !!this.deployingUnit, stopped: this.stopped });
   		if (this.stopped) return playSound('pop0', 'ui');
@@ -709,11 +877,8 @@ export class Game {
 
 	        if (this.main.UI.fastScene.isOpen) this.main.UI.fastScene.close();
 
-	        // Stop the game loop interval
-	        if (this.loopId) {
-	            clearInterval(this.loopId);
-	            this.loopId = null;
-	        }
+	        // Stop the game loop
+	        this.stopLoop();
 
 	        // Block canvas interaction
 	        this.canvas.style.pointerEvents = 'none';
@@ -732,8 +897,7 @@ export class Game {
 	        this.stopped = false;
 	        this.lastTime = performance.now();
 
-	        if (this.loopId) clearInterval(this.loopId);
-	        this.loopId = setInterval(() => this.animate(performance.now()), this.frameDuration);
+	        this.startLoop();
 
 	        this.hidePauseOverlay();
 
@@ -744,10 +908,7 @@ export class Game {
 
 	stop() {
 	    this.stopped = true;
-	    if (this.loopId) {
-	      	clearInterval(this.loopId);
-	      	this.loopId = null;
-	    }
+	    this.stopLoop();
 	    this.canvas.style.pointerEvents = 'none';
 	}
 
@@ -755,8 +916,7 @@ export class Game {
 	    if (!this.stopped) return;
 	    this.stopped = false;
 	    this.lastTime = performance.now();
-	    if (this.loopId) clearInterval(this.loopId);
-	    this.loopId = setInterval(() => this.animate(performance.now()), this.frameDuration);
+	    this.startLoop();
 	    this.canvas.style.pointerEvents = 'auto';
   	}
 
@@ -1,10 +1,47 @@
 import { Sprite } from '../../utils/Sprite.js';
 import { playSound } from '../../file/audio.js';
 
+// ============================================================================
+// MOD: POOLING - spent projectiles are recycled
+// ============================================================================
+// Every shot used to be a new Projectile; at 10x in endless that is thousands
+// of short-lived objects per second. Towers create them through
+// Projectile.acquire() and release them as they drop them. Pooled per sprite
+// sheet, so a reused projectile keeps a loaded image and valid frame sizes.
+// Only the tower's projectiles array refers to a projectile, so it can be
+// handed out again straight away.
+const PROJECTILE_POOL_MAX = 512;
+
+const projectilePool = new Map(); // sprite key -> released projectiles
+let projectilePoolSize = 0;
+
+function projectilePoolKey(projectile) {
+    return `${projectile.sprite.image}|${projectile.sprite.frames}`;
+}
+
 export class Projectile extends Sprite {
     constructor(x, y, enemy, ctx, projectile, tower) {
         super(x, y, ctx, projectile.sprite.image, projectile.sprite.frames);
 
+        // MOD: POOLING - sprite frame state as constructed, restored on reuse
+        this._baseFrames = { ...this.frames };
+        this._poolKey = projectilePoolKey(projectile);
+        this._poolSrc = this.sprite.src;
+        this.velocity = { x: 0, y: 0 };
+        this.pulse = {};
+
+        this.reset(x, y, enemy, ctx, projectile, tower);
+    }
+
+    // MOD: POOLING - everything a shot sets up; run by the constructor and
+    // again when Projectile.acquire() hands out a released projectile
+    reset(x, y, enemy, ctx, projectile, tower) {
+        this.position.x = x;
+        this.position.y = y;
+        Object.assign(this.frames, this._baseFrames);
+        this._prevX = undefined;
+        this._prevY = undefined;
+
         const rawSpeed = projectile.speed ?? 5;
         let baseSpeed = rawSpeed <= 30 ? rawSpeed * 60 : rawSpeed;
 
@@ -19,7 +56,8 @@ export class Projectile extends Sprite {
         }
         this.speed = baseSpeed;
 
-        this.velocity = { x: 0, y: 0 };
+        this.velocity.x = 0;
+        this.velocity.y = 0;
         this.enemy = enemy;
         this.ctx = ctx;
         this.tower = tower;
@@ -33,16 +71,15 @@ export class Projectile extends Sprite {
         this.lifeTime = 5000;
         this.age = 0;
 
-        this.pulse = {
-            active: false,
-            x: 0,
-            y: 0,
-            radius: 0,
-            alpha: 0,
-            maxRadius: 0,
-            speed: 0,
-            color: '#ffffff'
-        };
+        const pulse = this.pulse;
+        pulse.active = false;
+        pulse.x = 0;
+        pulse.y = 0;
+        pulse.radius = 0;
+        pulse.alpha = 0;
+        pulse.maxRadius = 0;
+        pulse.speed = 0;
+        pulse.color = '#ffffff';
         this.impacting = false;
 
         this.orbit = projectile.orbit ?? null;
@@ -62,10 +99,75 @@ export class Projectile extends Sprite {
         }
     }
 
+    // A released projectile of the same sprite if there is one, else a new one
+    static acquire(x, y, enemy, ctx, projectile, tower) {
+        const free = projectilePool.get(projectilePoolKey(projectile));
+        if (free && free.length > 0) {
+            const reused = free.pop();
+            projectilePoolSize--;
+            reused.reset(x, y, enemy, ctx, projectile, tower);
+            return reused;
+        }
+        return new Projectile(x, y, enemy, ctx, projectile, tower);
+    }
+
+    // Called by the tower once the projectile is out of its projectiles array
+    release() {
+        this.enemy = null;
+        this.tower = null;
+        if (this.sprite.src !== this._poolSrc || projectilePoolSize >= PROJECTILE_POOL_MAX) return;
+        let free = projectilePool.get(this._poolKey);
+        if (!free) projectilePool.set(this._poolKey, free = []);
+        free.push(this);
+        projectilePoolSize++;
+    }
+
+    // MOD: FIXED-TIMESTEP - drawn by Game.render(), between the last two
+    // simulated positions; update() below no longer draws. Renders that
+    // aren't allowed to step the sprite sheet put its counters back.
+    render(alpha = 1, advanceSprite = true) {
+        if (this.impacting) {
+            const sp = this.pulse;
+            if (!this.ctx || !sp || !sp.active) return;
+            this.ctx.beginPath();
+            this.ctx.arc(sp.x, sp.y, sp.radius, 0, Math.PI * 2);
+
+            const hex = (sp.color || '#ffffff').replace('#', '');
+            const r = parseInt(hex.substring(0, 2), 16) || 255;
+            const g = parseInt(hex.substring(2, 4), 16) || 255;
+            const b = parseInt(hex.substring(4, 6), 16) || 255;
+
+            this.ctx.fillStyle = `rgba(${r},${g},${b},${sp.alpha})`;
+            this.ctx.fill();
+            return;
+        }
+        if (this.markedForDeletion) return;
+
+        const pos = this.position;
+        const x = pos.x;
+        const y = pos.y;
+        if (this._prevX !== undefined) {
+            pos.x = this._prevX + (x - this._prevX) * alpha;
+            pos.y = this._prevY + (y - this._prevY) * alpha;
+        }
+        const frames = this.frames;
+        const current = frames.current;
+        const elapsed = frames.elapsed;
+        this.draw();
+        if (!advanceSprite) {
+            frames.current = current;
+            frames.elapsed = elapsed;
+        }
+        pos.x = x;
+        pos.y = y;
+    }
+
     update(deltaTime = 1000 / 60) {
         const simDelta = deltaTime;
         const frameFactor = simDelta / (1000 / 60);
         const secs = simDelta / 1000;
+        this._prevX = this.position.x;
+        this._prevY = this.position.y;
 
         if (this.orbit) {
             this.age += simDelta;
@@ -113,8 +215,6 @@ export class Projectile extends Sprite {
                 }
             }
 
-            if (!this.tower?._skipDraw) this.draw();
-
             if (this.orbitDuration !== Infinity && this.age >= this.orbitDuration) {
                 this.markedForDeletion = true;
             }
@@ -168,17 +268,6 @@ export class Projectile extends Sprite {
                 return;
             }
 
-            this.ctx.beginPath();
-            this.ctx.arc(sp.x, sp.y, sp.radius, 0, Math.PI * 2);
-
-            const hex = (sp.color || '#ffffff').replace('#', '');
-            const r = parseInt(hex.substring(0, 2), 16) || 255;
-            const g = parseInt(hex.substring(2, 4), 16) || 255;
-            const b = parseInt(hex.substring(4, 6), 16) || 255;
-
-            this.ctx.fillStyle = `rgba(${r},${g},${b},${sp.alpha})`;
-            this.ctx.fill();
-
             sp.radius += sp.speed * frameFactor;
             sp.alpha -= 0.04 * frameFactor;
 
@@ -211,9 +300,6 @@ export class Projectile extends Sprite {
         this.center.x = this.position.x + (this.width ? this.width / 2 : 0);
         this.center.y = this.position.y + (this.height ? this.height / 2 : 0);
 
-        // DELTA TIME FIX: Skip drawing during sub-step simulation
-        if (!this.tower?._skipDraw) this.draw();
-        
         // DELTA TIME FIX: Swept collision detection (line-circle intersection)
         // Check if the movement path intersects with enemy hitbox
         const hitRadius = (this.enemy.radius ?? 6) + 4; // slightly larger margin for swept detection
@@ -560,7 +646,7 @@ export class Projectile extends Sprite {
                     const sx = this.enemy.center.x + (Math.random() - 0.5) * 6;
                     const sy = this.enemy.center.y + (Math.random() - 0.5) * 6;
 
-                    const newProj = new Projectile(
+                    const newProj = Projectile.acquire(
                         sx,
                         sy,
                         next,
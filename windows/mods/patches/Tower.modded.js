@@ -2,6 +2,67 @@ import { Projectile } from './Projectile.js';
 import { Sprite } from '../../utils/Sprite.js';
 import { playSound } from '../../file/audio.js';
 
+// MOD: PERF - Target ordering shared by all towers.
+// Each targeting mode maps an enemy to a sort key (lower = preferred); the
+// keys reproduce the comparators getOrderedEnemies used to sort with.
+const hasStatus = (e, type) => !!(e.statusEffects && e.statusEffects.some(se => se.type === type));
+const TARGET_KEYS = {
+    invisible:   e => -Number(e.invisible === true),
+    first:       e => -(e.distanceTraveled || 0),
+    last:        e => (e.distanceTraveled || 0),
+    faster:      e => -(e.speed || 0),
+    slower:      e => (e.speed || 0),
+    highHP:      e => -(e.hp || 0),
+    lowHP:       e => (e.hp || 0),
+    highArmor:   e => -(e.armor || 0),
+    noArmor:     e => Number(e.armor <= 0),
+    poisoned:    e => -Number(hasStatus(e, 'poison')),
+    notPoisoned: e => Number(hasStatus(e, 'poison')),
+    burned:      e => -Number(hasStatus(e, 'burn')),
+    notBurned:   e => Number(hasStatus(e, 'burn')),
+    stuned:      e => -Number(hasStatus(e, 'stun')),
+    notStuned:   e => Number(hasStatus(e, 'stun')),
+    slowed:      e => -Number(hasStatus(e, 'slow')),
+    notSlowed:   e => Number(hasStatus(e, 'slow')),
+    cursed:      e => -Number(hasStatus(e, 'curse')),
+    curseable:   e => Number(hasStatus(e, 'curse')),
+    nightmared:  e => -Number(hasStatus(e, 'nightmare')),
+};
+const UNRANKED = Number.MAX_SAFE_INTEGER;
+
+// Per sub-step, per mode: every enemy on the map ranked once (stable sort by
+// key, ties in enemies-array order). Towers sharing a mode reuse the ranks
+// and only scan their own in-range enemies for the lowest. Keyed by
+// Game.simStep, so the ranks are rebuilt whenever the simulation advances.
+const targetOrdering = {
+    modes: new Map(), // targetMode -> { step, enemies, ranks: Map(enemy -> rank) }
+
+    ranksFor(mode, enemies, step) {
+        let entry = this.modes.get(mode);
+        if (!entry) {
+            entry = { step: -1, enemies: null, ranks: new Map() };
+            this.modes.set(mode, entry);
+        }
+        if (entry.step === step && entry.enemies === enemies && step !== undefined) return entry.ranks;
+
+        const keyOf = TARGET_KEYS[mode];
+        const n = enemies.length;
+        const keys = new Float64Array(n);
+        const order = new Array(n);
+        for (let i = 0; i < n; i++) {
+            keys[i] = keyOf(enemies[i]);
+            order[i] = i;
+        }
+        order.sort((a, b) => (keys[a] - keys[b]) || (a - b));
+        const ranks = entry.ranks;
+        ranks.clear();
+        for (let r = 0; r < n; r++) ranks.set(enemies[order[r]], r);
+        entry.step = step;
+        entry.enemies = enemies;
+        return ranks;
+    },
+};
+
 export class Tower extends Sprite {
     constructor(main, x, y, ctx, pokemon, tile, teleportBuff = false) {
         super(x, y, ctx, pokemon.sprite.image, pokemon.sprite.frames, 8, 0, pokemon.sprite.hold);
@@ -136,7 +197,7 @@ export class Tower extends Sprite {
         });
 
         if (this.attackType === 'orbital') this.refreshOrbitalProjectiles();
-        else this.projectiles = this.projectiles.filter(p => !p?.orbit);
+        else this.releaseOrbitalProjectiles();
 
         this.updateTowerSprite();
     }
@@ -643,10 +704,19 @@ export class Tower extends Sprite {
     }
 
     refreshOrbitalProjectiles() {
-        this.projectiles = this.projectiles.filter(p => !p?.orbit);
+        this.releaseOrbitalProjectiles();
         this.spawnOrbitales();
     }
 
+    // MOD: POOLING - dropped projectiles go back to Projectile's pool
+    releaseOrbitalProjectiles() {
+        this.projectiles = this.projectiles.filter(p => {
+            if (!p?.orbit) return true;
+            p.release();
+            return false;
+        });
+    }
+
     getOrbitalAngularSpeed() {
         let angularSpeed = this.orbitalSpeed || (Math.PI / 5);
         if (this.ability?.id == 'shiftGear' && this.shiftGearSpeed > 0) angularSpeed = this.shiftGearSpeed;
@@ -677,7 +747,7 @@ export class Tower extends Sprite {
                 }
             };
 
-            const proj = new Projectile(
+            const proj = Projectile.acquire(
                 this.center.x,
                 this.center.y,
                 null,
@@ -690,6 +760,25 @@ export class Tower extends Sprite {
         }
     }
 
+    // MOD: FIXED-TIMESTEP - drawn once per frame by Game.render() (towers
+    // don't move, so there is nothing to interpolate); projectiles are
+    // rendered by the Game right after their tower
+    render(alpha = 1) {
+        this.draw();
+        if (this.pokemon.attackType === 'area' && this.pulse?.active) {
+            this.ctx.beginPath();
+            this.ctx.arc(this.center.x, this.center.y, this.pulse.radius, 0, Math.PI * 2);
+
+            const hex = (this.pokemon.specie.color || '#ffffff').replace('#', '');
+            const r = parseInt(hex.substring(0, 2), 16) || 255;
+            const g = parseInt(hex.substring(2, 4), 16) || 255;
+            const b = parseInt(hex.substring(4, 6), 16) || 255;
+
+            this.ctx.fillStyle = `rgba(${r},${g},${b},${this.pulse.alpha})`;
+            this.ctx.fill();
+        }
+    }
+
     update(enemiesInRange, deltaTime = 1000 / 60) {
 
         const simDelta = deltaTime;
@@ -725,9 +814,6 @@ export class Tower extends Sprite {
             if (this.frames.current >= this.frames.max) this.frames.current = 0;
         }
 
-        // DELTA TIME FIX: Skip drawing during sub-step simulation
-        if (!this._skipDraw) this.draw();
-
         if (!this.attackCooldown && this.attackCooldown !== 0) this.attackCooldown = 0;
         // cds usan simDelta 
         this.attackCooldown -= simDelta;
@@ -832,23 +918,19 @@ export class Tower extends Sprite {
             if (this.revealInvisible) {
                 const invisibleList = validEnemies.filter(e => e.invisible);
                 if (invisibleList.length > 0) {
-                    const orderedInv = this.getOrderedEnemies(invisibleList);
-                    desiredTarget = orderedInv[0] || null;
+                    desiredTarget = this.selectTargets(invisibleList, 1)[0] || null;
                 } else {
                     if (this.target && validEnemies.includes(this.target) && this.target.hp > 0) {
                         desiredTarget = this.target;
                     } else {
-                        const ordered = this.getOrderedEnemies(validEnemies);
-                        desiredTarget = ordered[0] || null;
+                        desiredTarget = this.selectTargets(validEnemies, 1)[0] || null;
                     }
                 }
             } else {
-                const ordered = this.getOrderedEnemies(validEnemies);
-                desiredTarget = ordered[0] || null;
+                desiredTarget = this.selectTargets(validEnemies, 1)[0] || null;
             }
         } else {
-            const ordered = this.getOrderedEnemies(validEnemies);
-            desiredTarget = ordered[0] || null;
+            desiredTarget = this.selectTargets(validEnemies, 1)[0] || null;
         }
 
         if (!this.target || this.target.hp <= 0 || !validEnemies.includes(this.target) || (desiredTarget && desiredTarget !== this.target)) {
@@ -985,17 +1067,6 @@ export class Tower extends Sprite {
             }
 
             if (this.pulse.active) {
-                this.ctx.beginPath();
-                this.ctx.arc(this.center.x, this.center.y, this.pulse.radius, 0, Math.PI * 2);
-
-                const hex = (this.pokemon.specie.color || '#ffffff').replace('#', '');
-                const r = parseInt(hex.substring(0, 2), 16) || 255;
-                const g = parseInt(hex.substring(2, 4), 16) || 255;
-                const b = parseInt(hex.substring(4, 6), 16) || 255;
-
-                this.ctx.fillStyle = `rgba(${r},${g},${b},${this.pulse.alpha})`;
-                this.ctx.fill();
-
                 this.pulse.radius += this.pulse.speed * frameFactor;
                 this.pulse.alpha -= 0.04 * frameFactor;
                 if (this.pulse.radius >= this.pulse.maxRadius || this.pulse.alpha <= 0)
@@ -1030,7 +1101,8 @@ export class Tower extends Sprite {
             if (this.pokemon?.item?.id == 'zoomLens' && this.pokemon?.ability?.id == 'simple') maxShots = 3;
             if (this.pokemon?.item?.id == 'cherryBlossom') maxShots = 3;
 
-            const orderedAll = this.getOrderedEnemies(validEnemies);
+            // PERF: Only the best few are needed - one extra in case the current target is among them
+            const orderedAll = this.selectTargets(validEnemies, maxShots + 1);
 
             const targets = [];
             if (this.target && validEnemies.includes(this.target)) targets.push(this.target);
@@ -1064,7 +1136,7 @@ export class Tower extends Sprite {
             } else {
                targets.forEach(tgt => {
                     if (!tgt) return;
-                    const proj = new Projectile(
+                    const proj = Projectile.acquire(
                         this.position.x + 12,
                         this.position.y + 12,
                         tgt,
@@ -1100,6 +1172,7 @@ export class Tower extends Sprite {
 
             if (p.markedForDeletion) {
                 this.projectiles.splice(i, 1);
+                p.release();
                 continue;
             }
 
@@ -1113,12 +1186,16 @@ export class Tower extends Sprite {
                     p.enemy = newTarget;
                 } else {
                     this.projectiles.splice(i, 1);
+                    p.release();
                     continue;
                 }
             }
 
             if (typeof p.update === 'function') p.update(deltaTime); // pasamos delta ya escalado por Game
-            if (p.markedForDeletion) this.projectiles.splice(i, 1);
+            if (p.markedForDeletion) {
+                this.projectiles.splice(i, 1);
+                p.release();
+            }
         }
     }
 
@@ -1148,86 +1225,65 @@ export class Tower extends Sprite {
         return closest;
     }
 
-    getOrderedEnemies(validEnemies) {
-        if (!validEnemies || validEnemies.length === 0) return [];
-
-        const arr = validEnemies.slice();
-
-        const hasStatus = (e, type) => e.statusEffects && e.statusEffects.some(se => se.type === type);
+    // MOD: PERF - The best `count` targets for this tower's targeting mode,
+    // best first: one pass over the candidates against the shared per-step
+    // ranking, instead of copying and sorting them on every call.
+    selectTargets(validEnemies, count = 1) {
+        if (!validEnemies || validEnemies.length === 0 || count <= 0) return [];
         if (this.pokemon?.item?.id == 'quickClaw' && this.ability.id !== 'defiant') this.targetMode = 'faster';
 
-        switch (this.targetMode) {
-            case 'invisible':
-                arr.sort((a, b) => Number(b.invisible === true) - Number(a.invisible === true));
-                break;
-            case 'first':
-                arr.sort((a, b) => (b.distanceTraveled || 0) - (a.distanceTraveled || 0)); // m├ís recorrido primero
-                break;
-            case 'last':
-                arr.sort((a, b) => (a.distanceTraveled || 0) - (b.distanceTraveled || 0)); // menos recorrido primero
-                break;
-            case 'faster':
-                arr.sort((a, b) => (b.speed || 0) - (a.speed || 0));
-                break;
-            case 'slower':
-                arr.sort((a, b) => (a.speed || 0) - (b.speed || 0));
-                break;
-            case 'highHP':
-                arr.sort((a, b) => (b.hp || 0) - (a.hp || 0));
-                break;
-            case 'lowHP':
-                arr.sort((a, b) => (a.hp || 0) - (b.hp || 0));
-                break;
-            case 'highArmor':
-                arr.sort((a, b) => (b.armor || 0) - (a.armor || 0));
-                break;
-            case 'noArmor':
-                arr.sort((a, b) => Number(a.armor <= 0) - Number(b.armor <= 0));
-                break;
-            case 'poisoned':
-                arr.sort((a, b) => Number(hasStatus(b, 'poison')) - Number(hasStatus(a, 'poison')));
-                break;
-            case 'notPoisoned':
-                arr.sort((a, b) => Number(!hasStatus(b, 'poison')) - Number(!hasStatus(a, 'poison')));
-                break;
-            case 'burned':
-                arr.sort((a, b) => Number(hasStatus(b, 'burn')) - Number(hasStatus(a, 'burn')));
-                break;
-            case 'notBurned':
-                arr.sort((a, b) => Number(!hasStatus(b, 'burn')) - Number(!hasStatus(a, 'burn')));
-                break;
-            case 'stuned':
-                arr.sort((a, b) => Number(hasStatus(b, 'stun')) - Number(hasStatus(a, 'stun')));
-                break;
-            case 'notStuned':
-                arr.sort((a, b) => Number(!hasStatus(b, 'stun')) - Number(!hasStatus(a, 'stun')));
-                break;
-            case 'slowed':
-                arr.sort((a, b) => Number(hasStatus(b, 'slow')) - Number(hasStatus(a, 'slow')));
-                break;
-            case 'notSlowed':
-                arr.sort((a, b) => Number(!hasStatus(b, 'slow')) - Number(!hasStatus(a, 'slow')));
-                break;
-            case 'cursed':
-                arr.sort((a, b) => Number(hasStatus(b, 'curse')) - Number(hasStatus(a, 'cursed')));
-                break;
-            case 'curseable':
-                arr.sort((a, b) => Number(!hasStatus(b, 'curse')) - Number(!hasStatus(a, 'cursed')));
-                break;
-            case 'nightmared':
-                arr.sort((a, b) => Number(hasStatus(b, 'nightmare')) - Number(hasStatus(a, 'nightmare')));
-                break;
-            case 'random':
-                for (let i = arr.length - 1; i > 0; i--) {
-                    const j = Math.floor(Math.random() * (i + 1));
-                    [arr[i], arr[j]] = [arr[j], arr[i]];
+        const n = validEnemies.length;
+        if (this.targetMode === 'random') {
+            const pool = validEnemies.slice();
+            const picks = Math.min(count, n);
+            for (let i = 0; i < picks; i++) {
+                const j = i + Math.floor(Math.random() * (n - i));
+                [pool[i], pool[j]] = [pool[j], pool[i]];
+            }
+            pool.length = picks;
+            return pool;
+        }
+        if (!TARGET_KEYS[this.targetMode]) return validEnemies.slice(0, count);
+
+        const ranks = targetOrdering.ranksFor(this.targetMode, this.main.area.enemies, this.main.game.simStep);
+        const rankOf = e => ranks.get(e) ?? UNRANKED;
+        if (count >= n) return validEnemies.slice().sort((a, b) => rankOf(a) - rankOf(b));
+        if (count === 1) {
+            let best = validEnemies[0];
+            let bestRank = ranks.get(best) ?? UNRANKED;
+            for (let i = 1; i < n; i++) {
+                const r = ranks.get(validEnemies[i]) ?? UNRANKED;
+                if (r < bestRank) {
+                    best = validEnemies[i];
+                    bestRank = r;
                 }
-                break;
-            default:
-                break;
+            }
+            return [best];
         }
 
-        return arr;
+        // Small bounded insertion: count is a handful of shots
+        const top = [];
+        const topRanks = [];
+        for (let i = 0; i < n; i++) {
+            const e = validEnemies[i];
+            const r = ranks.get(e) ?? UNRANKED;
+            if (top.length === count && r >= topRanks[count - 1]) continue;
+            let at = top.length === count ? count - 1 : top.length;
+            while (at > 0 && topRanks[at - 1] > r) {
+                top[at] = top[at - 1];
+                topRanks[at] = topRanks[at - 1];
+                at--;
+            }
+            top[at] = e;
+            topRanks[at] = r;
+        }
+        return top;
+    }
+
+    // Full ordering of the candidates (best first), from the same shared ranking
+    getOrderedEnemies(validEnemies) {
+        if (!validEnemies || validEnemies.length === 0) return [];
+        return this.selectTargets(validEnemies, validEnemies.length);
     }
 
     getTarget(validEnemies) {
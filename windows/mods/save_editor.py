@@ -9,13 +9,26 @@ PokePath TD Save Editor
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import atexit
 import copy
+import io
 import json
+import queue
 import re
 import shutil
 import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
 from pathlib import Path
 
+from lib.game_files import GameFiles
+from lib.save_ops import (
+    BOX_SLOTS, TEAM_SLOTS, SaveDocument, SaveOps, SpeciesData,
+    parse_egg_list_keys, parse_route_reward_keys,
+)
+
 # Load version metadata from version.json
 def get_version_info():
     version_file = Path(__file__).parent / "version.json"
@@ -53,8 +66,6 @@ except ImportError:
 
 DEFAULT_GRID_COLS = 7
 CELL_PAD = 2
-TEAM_SLOTS = 10
-BOX_SLOTS = 200  # Increased from 64 to support unlock all
 CELL_SIZE = 58  # Fixed cell size
 
 # ============================================================================
@@ -130,12 +141,14 @@ def find_paths():
 
 PATHS = find_paths()
 SCRIPT_DIR = Path(__file__).parent
-TEMP_SAVE = SCRIPT_DIR / 'lib' / 'current_save.json'
 POKEMON_DATA_FILE = SCRIPT_DIR / 'dev' / 'pokemon_data.json'
 SAVE_HELPER = SCRIPT_DIR / 'lib' / 'save_helper.js'
-ROUTE_DATA_FILE = (PATHS.get('game_root') / 'resources' / 'app_extracted' / 'src' / 'js' / 'game' / 'data' / 'routeData.js') if PATHS.get('game_root') else None
-POKEMON_JS_DATA_FILE = (PATHS.get('game_root') / 'resources' / 'app_extracted' / 'src' / 'js' / 'game' / 'data' / 'pokemonData.js') if PATHS.get('game_root') else None
-ITEM_DATA_FILE = (PATHS.get('game_root') / 'resources' / 'app_extracted' / 'src' / 'js' / 'game' / 'data' / 'itemData.js') if PATHS.get('game_root') else None
+# Game scripts and assets: extracted tree if there is one, else read from the asar
+GAME_FILES = GameFiles(PATHS['game_root'] / 'resources' if PATHS.get('game_root') else None)
+ROUTE_DATA_FILE = 'src/js/game/data/routeData.js'
+POKEMON_JS_DATA_FILE = 'src/js/game/data/pokemonData.js'
+ITEM_DATA_FILE = 'src/js/game/data/itemData.js'
+GAME_SPRITES_DIR = 'src/assets/images/pokemon'
 
 # Auto-detect if game is modded (uses separate save location)
 def _is_game_modded():
@@ -149,6 +162,22 @@ def _is_game_modded():
 
 IS_MODDED = _is_game_modded()
 
+try:
+    from lib import leveldb_reader
+    from lib.save_manager import VANILLA_SAVE, MODDED_SAVE
+except Exception:
+    leveldb_reader = None
+
+try:
+    from lib import snapshot_store
+except Exception:
+    snapshot_store = None
+
+try:
+    from lib import sprite_atlas
+except Exception:
+    sprite_atlas = None
+
 def _get_installed_features():
     """Read which mod features are currently installed."""
     try:
@@ -171,11 +200,11 @@ def _has_feature(key):
 def _load_route_options():
     """Load route labels from routeData.js (route id + display order + English name)."""
     route_options = []
-    if not ROUTE_DATA_FILE or not ROUTE_DATA_FILE.exists():
+    text = GAME_FILES.read_text(ROUTE_DATA_FILE)
+    if not text:
         return route_options
 
     try:
-        text = ROUTE_DATA_FILE.read_text(encoding='utf-8', errors='replace')
         pattern = re.compile(
             r"id\s*:\s*(\d+).*?order\s*:\s*(\d+).*?name\s*:\s*\[\s*'([^']+)'",
             re.DOTALL,
@@ -200,49 +229,23 @@ def _load_route_options():
 
 
 def _load_route_reward_pokemon_keys():
-    """Extract route challenge Pokémon rewards from routeData.js.
-    Uses reward index 1 (the Pokémon slot in challengeReward arrays)."""
-    rewards = []
-    if not ROUTE_DATA_FILE or not ROUTE_DATA_FILE.exists():
-        return rewards
-
-    try:
-        text = ROUTE_DATA_FILE.read_text(encoding='utf-8', errors='replace')
-        for match in re.finditer(r"challengeReward\s*:\s*\[(.*?)\]", text, re.DOTALL):
-            values = re.findall(r"'([^']+)'", match.group(1))
-            if len(values) >= 2:
-                rewards.append(values[1])
-    except Exception:
-        pass
-
-    return rewards
+    """Route challenge Pokémon rewards from the game's routeData.js."""
+    return parse_route_reward_keys(GAME_FILES.read_text(ROUTE_DATA_FILE))
 
 
 def _load_egg_list_keys():
-    """Extract eggListData species keys from pokemonData.js."""
-    eggs = []
-    if not POKEMON_JS_DATA_FILE or not POKEMON_JS_DATA_FILE.exists():
-        return eggs
-
-    try:
-        text = POKEMON_JS_DATA_FILE.read_text(encoding='utf-8', errors='replace')
-        match = re.search(r"eggListData\s*=\s*\[(.*?)\]\s*;", text, re.DOTALL)
-        if match:
-            eggs = re.findall(r"'([^']+)'", match.group(1))
-    except Exception:
-        pass
-
-    return eggs
+    """eggListData species keys from the game's pokemonData.js."""
+    return parse_egg_list_keys(GAME_FILES.read_text(POKEMON_JS_DATA_FILE))
 
 
 def _load_item_catalog_from_data():
     """Load base item definitions from itemData.js."""
     catalog = {}
-    if not ITEM_DATA_FILE or not ITEM_DATA_FILE.exists():
+    text = GAME_FILES.read_text(ITEM_DATA_FILE)
+    if not text:
         return catalog
 
     try:
-        text = ITEM_DATA_FILE.read_text(encoding='utf-8', errors='replace')
         pattern = re.compile(
             r"id\s*:\s*'([^']+)'.*?name\s*:\s*\[\s*['\"]([^'\"]+)['\"].*?sprite\s*:\s*'([^']+)'",
             re.DOTALL,
@@ -305,17 +308,200 @@ def _ensure_node_save_deps():
 # SAVE DATA
 # ============================================================================
 
-class SaveData:
+SAVE_HELPER_TIMEOUT = 30  # seconds per request (a stale LevelDB lock can hang the helper)
+
+# Save subtrees written as deltas; a change anywhere else forces a full write
+TRACKED_SUBTREES = ('team', 'box', 'player', 'area', 'shop', 'items')
+
+
+class SaveBridgeError(Exception):
+    """The save helper answered a request with an error (or went away)."""
+
+
+class SaveConflictError(SaveBridgeError):
+    """A delta write was refused: the stored save changed since it was loaded."""
+
+
+class SaveBridge:
+    """
+    Persistent `node save_helper.js serve` process.
+
+    Requests and responses are single lines of JSON on the helper's
+    stdin/stdout, so a load or save costs one round trip instead of a Node
+    startup plus a LevelDB open. The helper is started on first use and
+    restarted if it dies; it releases the DB by itself when idle.
+    """
+
+    def __init__(self):
+        self.proc = None
+        self._lines = None
+        self._stderr = deque(maxlen=20)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self.proc = subprocess.Popen(
+            ['node', str(SAVE_HELPER), 'serve'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            cwd=str(SCRIPT_DIR), text=True, encoding='utf-8', errors='replace', bufsize=1,
+            creationflags=0x08000000 if sys.platform == 'win32' else 0  # CREATE_NO_WINDOW
+        )
+        self._lines = queue.Queue()
+        self._stderr.clear()
+        threading.Thread(target=self._pump, args=(self.proc.stdout, self._lines.put, True), daemon=True).start()
+        threading.Thread(target=self._pump, args=(self.proc.stderr, self._stderr.append), daemon=True).start()
+
+    @staticmethod
+    def _pump(stream, sink, mark_eof=False):
+        for line in stream:
+            sink(line.rstrip('\n'))
+        if mark_eof:
+            sink(None)  # the helper exited
+
+    def _error_detail(self, fallback):
+        return next((line for line in reversed(self._stderr) if line.strip()), fallback)
+
+    def request(self, cmd, timeout=SAVE_HELPER_TIMEOUT, **fields):
+        """Send one request and wait for its response dict. Raises SaveBridgeError or TimeoutError."""
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            self._next_id += 1
+            req_id = self._next_id
+            try:
+                self.proc.stdin.write(json.dumps(dict(fields, id=req_id, cmd=cmd), separators=(',', ':')) + '\n')
+                self.proc.stdin.flush()
+            except OSError:
+                raise SaveBridgeError(self._error_detail("Save helper exited unexpectedly"))
+            while True:
+                try:
+                    line = self._lines.get(timeout=timeout)
+                except queue.Empty:
+                    self._kill()
+                    raise TimeoutError("Save helper timed out (possible stale lock)")
+                if line is None:
+                    raise SaveBridgeError(self._error_detail("Save helper exited unexpectedly"))
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue  # not protocol output
+                if msg.get('id') == req_id:
+                    break
+            if not msg.get('ok'):
+                error = SaveConflictError if msg.get('conflict') else SaveBridgeError
+                raise error(msg.get('error') or "Unknown error")
+            return msg
+
+    def _kill(self):
+        if self.proc is not None:
+            try:
+                self.proc.kill()
+            except OSError:
+                pass
+            self.proc = None
+
+    def close(self):
+        """Ask the helper to release the DB and exit."""
+        with self._lock:
+            if self.proc is None or self.proc.poll() is not None:
+                return
+            try:
+                self.proc.stdin.close()  # EOF: the helper closes its DBs and exits
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+            self.proc = None
+
+
+SAVE_BRIDGE = SaveBridge()
+atexit.register(SAVE_BRIDGE.close)
+
+
+class SaveData(SaveDocument):
+    """SaveDocument plus reading/writing the game's own save DB."""
+
     def __init__(self):
-        self.data = None
-        self.source = None
+        super().__init__()
+        self.last_error = None
+        self.conflict = False
+        # What the game DB held when last read/written, for delta writes
+        self._base = None
+        self._base_hash = None
+        self._base_modded = None
+
+    def _mark_clean(self, base_hash, modded=None):
+        """Remember the current data as the DB's contents (base_hash None = unknown)."""
+        self._base = copy.deepcopy(self.data) if base_hash else None
+        self._base_hash = base_hash
+        self._base_modded = modded
+
+    def build_patch(self):
+        """
+        JSON Patch (RFC 6902) ops turning the last loaded/saved save into the
+        current data, or None when only a full write will do (no base, or a
+        change outside TRACKED_SUBTREES).
+        """
+        base, current = self._base, self.data
+        if not isinstance(base, dict) or not isinstance(current, dict):
+            return None
+        if ('save' in base) != ('save' in current):
+            return None
+        prefix = '/save' if 'save' in current else ''
+        if prefix:
+            if {k: v for k, v in base.items() if k != 'save'} != {k: v for k, v in current.items() if k != 'save'}:
+                return None
+            base, current = base['save'], current['save']
+            if not isinstance(base, dict) or not isinstance(current, dict):
+                return None
+        def untracked(obj):
+            return {k: v for k, v in obj.items() if k not in TRACKED_SUBTREES}
+        if untracked(base) != untracked(current):
+            return None
+
+        ops = []
+        for key in TRACKED_SUBTREES:
+            path = f"{prefix}/{key}"
+            if key not in current:
+                if key in base:
+                    ops.append({'op': 'remove', 'path': path})
+            elif key not in base:
+                ops.append({'op': 'add', 'path': path, 'value': current[key]})
+            elif base[key] != current[key]:
+                ops.extend(self._diff_slots(path, base[key], current[key]))
+        return ops
+
+    @staticmethod
+    def _diff_slots(path, old, new):
+        """Per-slot replaces for a same-length list (team/box edits), else one replace."""
+        if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+            changed = [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+            if len(changed) <= len(new) // 2:
+                return [{'op': 'replace', 'path': f"{path}/{i}", 'value': new[i]} for i in changed]
+        return [{'op': 'replace', 'path': path, 'value': new}]
     
     def load_from_game(self, modded=None) -> bool:
         if modded is None:
             modded = IS_MODDED
+        self.last_error = None
+
+        # Read the save key straight out of LevelDB (no Node.js needed)
+        if leveldb_reader is not None:
+            db_dir = MODDED_SAVE if modded else VANILLA_SAVE
+            try:
+                save, base_hash = leveldb_reader.read_save_with_digest(db_dir)
+                if save is not None:
+                    self.data = save
+                    self.source = 'game'
+                    self._mark_clean(base_hash, bool(modded))
+                    return True
+                if db_dir.is_dir():
+                    self.last_error = f"No game save found in {db_dir}"
+                    return False
+            except (OSError, ValueError, leveldb_reader.LevelDBError) as e:
+                print(f"Direct save read failed, using save helper: {e}")
+
         if not SAVE_HELPER.exists():
             return False
-        self.last_error = None
 
         deps_ok, deps_error = _ensure_node_save_deps()
         if not deps_ok:
@@ -323,240 +509,137 @@ class SaveData:
             return False
 
         try:
-            cmd = ['node', str(SAVE_HELPER), 'export']
-            if modded:
-                cmd.append('--modded')
-            result = subprocess.run(
-                cmd,
-                capture_output=True, text=True, cwd=str(SCRIPT_DIR),
-                encoding='utf-8', errors='replace',
-                timeout=30
-            )
-            if result.returncode == 0 and 'OK:' in result.stdout:
-                if TEMP_SAVE.exists():
-                    with open(TEMP_SAVE, 'r', encoding='utf-8') as f:
-                        self.data = json.load(f)
-                    self.source = 'game'
-                    return True
+            reply = SAVE_BRIDGE.request('export', modded=bool(modded))
+            self.data = reply['save']
+            self.source = 'game'
+            self._mark_clean(reply.get('base_hash'), bool(modded))
+            return True
+        except (SaveBridgeError, TimeoutError) as e:
             # Store error details for display
-            self.last_error = result.stderr.strip() or result.stdout.strip() or "Unknown error"
-        except subprocess.TimeoutExpired:
-            self.last_error = "Save helper timed out (possible stale lock)"
+            self.last_error = str(e)
         except Exception as e:
             self.last_error = str(e)
             print(f"Load error: {e}")
         return False
     
-    def save_to_game(self, modded=None) -> bool:
+    def save_to_game(self, modded=None, force=False) -> bool:
+        """
+        Write the save to the game DB. When it was loaded from the same DB only
+        the changed subtrees are sent, and the helper refuses them (setting
+        self.conflict) if the stored save changed meanwhile; force=True
+        overwrites the whole save regardless.
+        """
         if modded is None:
             modded = IS_MODDED
         if not self.data or not SAVE_HELPER.exists():
             return False
         self.last_error = None
+        self.conflict = False
 
         deps_ok, deps_error = _ensure_node_save_deps()
         if not deps_ok:
             self.last_error = deps_error
             return False
 
+        ops = None
+        if not force and self._base_hash and self._base_modded == bool(modded):
+            ops = self.build_patch()
+
         try:
-            with open(TEMP_SAVE, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f)
-            cmd = ['node', str(SAVE_HELPER), 'import']
-            if modded:
-                cmd.append('--modded')
-            result = subprocess.run(
-                cmd,
-                capture_output=True, text=True, cwd=str(SCRIPT_DIR),
-                encoding='utf-8', errors='replace',
-                timeout=30
-            )
-            if result.returncode == 0 and 'OK:' in result.stdout:
-                return True
-            self.last_error = result.stderr.strip() or result.stdout.strip() or "Unknown error"
-        except subprocess.TimeoutExpired:
-            self.last_error = "Save helper timed out (possible stale lock)"
+            if ops is not None:
+                reply = SAVE_BRIDGE.request('patch', modded=bool(modded), base_hash=self._base_hash, ops=ops)
+            else:
+                reply = SAVE_BRIDGE.request('import', modded=bool(modded), save=self.data)
+            self._mark_clean(reply.get('base_hash'), bool(modded))
+            return True
+        except SaveConflictError as e:
+            self.conflict = True
+            self.last_error = str(e)
+        except (SaveBridgeError, TimeoutError) as e:
+            self.last_error = str(e)
         except Exception as e:
             self.last_error = str(e)
             print(f"Save error: {e}")
         return False
     
     def load_from_file(self, path: Path) -> bool:
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-            self.source = 'file'
-            return True
-        except Exception as e:
-            print(f"Load error: {e}")
-        return False
-    
-    def export_to_file(self, path: Path) -> bool:
-        try:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2)
-            return True
-        except:
+        if not super().load_from_file(path):
             return False
-    
-    @property
-    def save_obj(self):
-        return self.data.get('save', self.data) if self.data else {}
-    
-    @property
-    def player(self):
-        return self.save_obj.get('player', {})
-    
-    @property
-    def team(self):
-        return self.save_obj.get('team', [])
-    
-    @property
-    def box(self):
-        return self.save_obj.get('box', [])
-    
-    def get_pokemon_at_slot(self, slot_index):
-        team = self.team
-        box = self.box
-        if slot_index < TEAM_SLOTS:
-            return team[slot_index] if slot_index < len(team) else None
-        else:
-            box_index = slot_index - TEAM_SLOTS
-            return box[box_index] if box_index < len(box) else None
-    
-    def set_pokemon_at_slot(self, slot_index, pokemon):
-        if not self.data:
-            return
-        save = self.save_obj
-        if slot_index < TEAM_SLOTS:
-            while len(save['team']) <= slot_index:
-                save['team'].append(None)
-            save['team'][slot_index] = pokemon
-            while save['team'] and save['team'][-1] is None:
-                save['team'].pop()
-        else:
-            box_index = slot_index - TEAM_SLOTS
-            while len(save['box']) <= box_index:
-                save['box'].append(None)
-            save['box'][box_index] = pokemon
-            while save['box'] and save['box'][-1] is None:
-                save['box'].pop()
-    
-    def delete_at_slot(self, slot_index):
-        if not self.data:
-            return
-        save = self.save_obj
-        if slot_index < TEAM_SLOTS:
-            if slot_index < len(save['team']):
-                save['team'].pop(slot_index)
-        else:
-            box_index = slot_index - TEAM_SLOTS
-            if box_index < len(save['box']):
-                save['box'].pop(box_index)
-    
-    def set_player(self, key, val):
-        if 'save' in self.data:
-            self.data['save']['player'][key] = val
-        else:
-            self.data['player'][key] = val
-
-    @property
-    def area(self):
-        return self.save_obj.setdefault('area', {}) if self.data else {}
-
-    @property
-    def items(self):
-        if not self.data:
-            return []
+        self._mark_clean(None)
+        return True
 
-        player = self.player
-        if isinstance(player, dict):
-            items = player.get('items')
-            if isinstance(items, list):
-                return items
-            player['items'] = []
-            return player['items']
+# ============================================================================
+# POKEMON DATA
+# ============================================================================
 
-        return self.save_obj.setdefault('items', [])
+class SpriteLoader:
+    """
+    Decodes sprite images on background threads so painting never waits on
+    PIL. submit(key, load, on_done): load() runs on a worker and returns a
+    PIL image (or None); on_done(image) then runs on the Tk thread, polled
+    via after(), where it is safe to make the PhotoImage. Requests for a key
+    already in flight share its result.
+    """
+
+    WORKERS = 4
+    POLL_MS = 15
+    RESULTS_PER_POLL = 64  # keep each poll short so the UI stays responsive
+
+    def __init__(self, root):
+        self.root = root
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._waiting = {}  # key -> [on_done, ...] for jobs not yet delivered
+        self._poll_job = None
+        for _ in range(self.WORKERS):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def _work(self):
+        while True:
+            key, load = self._jobs.get()
+            try:
+                image = load()
+            except Exception:
+                image = None
+            self._results.put((key, image))
 
-    @property
-    def shop(self):
-        return self.save_obj.get('shop', {}) if self.data else {}
+    def pending(self, key):
+        return key in self._waiting
 
-    def get_current_route_number(self):
-        area = self.area
-        try:
-            route_number = int(area.get('routeNumber', 0) or 0)
-        except Exception:
-            route_number = 0
-        return max(0, route_number)
-
-    def get_current_wave_number(self):
-        area = self.area
-        route_number = self.get_current_route_number()
-        route_waves = area.setdefault('routeWaves', [])
-        if len(route_waves) <= route_number:
-            route_waves.extend([1] * (route_number + 1 - len(route_waves)))
-        try:
-            wave = int(route_waves[route_number])
-        except Exception:
-            wave = 1
-        return max(1, wave)
-
-    def set_route_and_wave(self, route_number, wave_number):
-        if not self.data:
+    def submit(self, key, load, on_done):
+        if key in self._waiting:
+            self._waiting[key].append(on_done)
             return
+        self._waiting[key] = [on_done]
+        self._jobs.put((key, load))
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
 
-        route_number = max(0, int(route_number))
-        wave_number = max(1, int(wave_number))
-
-        area = self.area
-        route_waves = area.setdefault('routeWaves', [])
-        if len(route_waves) <= route_number:
-            route_waves.extend([1] * (route_number + 1 - len(route_waves)))
-
-        area['routeNumber'] = route_number
-        route_waves[route_number] = wave_number
-
-    def set_item_at_slot(self, slot_index, item_obj):
-        if not self.data:
-            return
-        items = self.items
-        while len(items) <= slot_index:
-            items.append(None)
-        items[slot_index] = item_obj
+    def _poll(self):
+        self._poll_job = None
+        for _ in range(self.RESULTS_PER_POLL):
+            try:
+                key, image = self._results.get_nowait()
+            except queue.Empty:
+                break
+            for on_done in self._waiting.pop(key, []):
+                on_done(image)
+        if self._waiting:
+            self._poll_job = self.root.after(self.POLL_MS, self._poll)
 
-    def get_pokemon_item(self, slot_index):
-        pokemon = self.get_pokemon_at_slot(slot_index)
-        if not isinstance(pokemon, dict):
-            return None
-        item_obj = pokemon.get('item')
-        return item_obj if isinstance(item_obj, dict) else None
 
-    def set_pokemon_item(self, slot_index, item_obj):
-        pokemon = self.get_pokemon_at_slot(slot_index)
-        if not isinstance(pokemon, dict):
-            return
-        if item_obj is None:
-            pokemon.pop('item', None)
-        else:
-            pokemon['item'] = item_obj
+class PokemonData(SpeciesData):
+    """SpeciesData plus sprite loading for the grid."""
 
-# ============================================================================
-# POKEMON DATA
-# ============================================================================
+    # Sprite PhotoImages kept for reuse; cells hold their own reference to
+    # whatever they show, so evicting one never blanks the grid
+    SPRITE_CACHE_LIMIT = 512
 
-class PokemonData:
     def __init__(self):
-        self.data = {}
-        self.sprites = {}
-        self.all_pokemon = []
-        
-        if POKEMON_DATA_FILE.exists():
-            with open(POKEMON_DATA_FILE, encoding='utf-8') as f:
-                self.data = json.load(f)
-        
-        self.all_pokemon = sorted(self.data.get('allKeys', []))
+        super().__init__(POKEMON_DATA_FILE)
+        self.sprites = OrderedDict()  # (key, size, is_shiny) -> PhotoImage or None, LRU order
+        self.atlases = {}  # (variant, size) -> SpriteAtlas
+        self.loader = None  # SpriteLoader; set by the App to decode off the Tk thread
     
     # Sprite filename mappings for Pokemon with non-standard names
     SPRITE_NAME_MAP = {
@@ -565,166 +648,99 @@ class PokemonData:
         'lycanrocDay': 'lycanroc1',
         'lycanrocNight': 'lycanroc2',
     }
-    
-    def get_sprite(self, key, size=48, is_shiny=False):
-        if not HAS_PIL:
+
+    def _atlas(self, variant, size):
+        """Packed thumbnails of the mod's bundled sprites, or None without them."""
+        src = PATHS.get(f'mod_{variant}_sprites')
+        if sprite_atlas is None or not src:
             return None
-        cache_key = f"{key}_{size}_{'shiny' if is_shiny else 'normal'}"
-        if cache_key not in self.sprites:
-            # Map special sprite names
-            sprite_key = self.SPRITE_NAME_MAP.get(key, key)
-            
-            # Try shiny paths in order of priority
-            if is_shiny:
-                shiny_paths = []
-                # 1. Mod's bundled shiny sprites (always available in distributed installs)
-                if PATHS.get('mod_shiny_sprites'):
-                    shiny_paths.append(PATHS['mod_shiny_sprites'] / f"{sprite_key}.png")
-                # 2. Extracted shiny sprites folder
-                if PATHS.get('sprites_shiny'):
-                    shiny_paths.append(PATHS['sprites_shiny'] / f"{sprite_key}.png")
-                
-                for shiny_path in shiny_paths:
-                    if shiny_path.exists():
-                        try:
-                            # Use NEAREST for pixel art to keep crisp edges
-                            img = Image.open(shiny_path).resize((size, size), Image.Resampling.NEAREST)
-                            self.sprites[cache_key] = ImageTk.PhotoImage(img)
-                            return self.sprites[cache_key]
-                        except:
-                            pass
-            
-            # Normal sprite lookup, prefer bundled mod sprites but fall back to extracted runtime sprites
-            normal_paths = []
-            if PATHS.get('mod_normal_sprites'):
-                normal_paths.append(PATHS['mod_normal_sprites'] / f"{sprite_key}.png")
-            if PATHS.get('sprites'):
-                fallback_path = PATHS['sprites'] / f"{sprite_key}.png"
-                if fallback_path not in normal_paths:
-                    normal_paths.append(fallback_path)
-            if PATHS.get('extracted_normal_sprites'):
-                extracted_path = PATHS['extracted_normal_sprites'] / f"{sprite_key}.png"
-                if extracted_path not in normal_paths:
-                    normal_paths.append(extracted_path)
-
-            self.sprites[cache_key] = None
-            for path in normal_paths:
+        atlas = self.atlases.get((variant, size))
+        if atlas is None:
+            # setdefault: sprite loader threads racing here still share one atlas
+            atlas = self.atlases.setdefault((variant, size), sprite_atlas.SpriteAtlas(src, size, variant=variant))
+        return atlas
+
+    def load_sprite_image(self, key, size=48, is_shiny=False):
+        """The sprite as a size x size PIL image (no Tk involved), or None."""
+        # Map special sprite names
+        sprite_key = self.SPRITE_NAME_MAP.get(key, key)
+        variants = ('shiny', 'normal') if is_shiny else ('normal',)
+
+        for variant in variants:
+            # 1. Mod's bundled sprites, sliced from the atlas (always available in distributed installs)
+            atlas = self._atlas(variant, size)
+            img = atlas.get(sprite_key) if atlas is not None else None
+            if img is not None:
+                return img
+
+            # 2. Loose files: bundled (if no atlas), then extracted runtime sprites
+            paths = []
+            if atlas is None and PATHS.get(f'mod_{variant}_sprites'):
+                paths.append(PATHS[f'mod_{variant}_sprites'] / f"{sprite_key}.png")
+            for source in (('sprites_shiny',) if variant == 'shiny' else ('sprites', 'extracted_normal_sprites')):
+                if PATHS.get(source):
+                    path = PATHS[source] / f"{sprite_key}.png"
+                    if path not in paths:
+                        paths.append(path)
+            for path in paths:
                 if not path.exists():
                     continue
                 try:
                     # Use NEAREST for pixel art to keep crisp edges
-                    img = Image.open(path).resize((size, size), Image.Resampling.NEAREST)
-                    self.sprites[cache_key] = ImageTk.PhotoImage(img)
-                    break
-                except:
+                    return Image.open(path).resize((size, size), Image.Resampling.NEAREST)
+                except Exception:
                     continue
-        return self.sprites.get(cache_key)
-    
-    # Display name overrides for Pokemon with unclear internal keys
-    DISPLAY_NAMES = {
-        'aegislash': 'Aegislash Shield',
-        'aegislashSword': 'Aegislash Sword',
-        'lycanrocDay': 'Lycanroc Day',
-        'lycanrocNight': 'Lycanroc Night',
-    }
-    
-    def get_display_name(self, key):
-        if key in self.DISPLAY_NAMES:
-            return self.DISPLAY_NAMES[key]
-        # Split camelCase into words (e.g. 'mrMime' -> 'Mr Mime')
-        import re
-        name = re.sub(r'([a-z])([A-Z])', r'\1 \2', key)
-        return name.replace('-', ' ').title()
-    
-    def get_base_forms(self):
-        return self.data.get('baseForms', [])
-    
-    def get_next_evo(self, key):
-        """Get the next evolution (one step) of a Pokemon."""
-        evos = self.data.get('evolutions', {})
-        if key in evos:
-            return evos[key]['evolves_to']
-        return key
-    
-    # Form alternates and mega evolutions that should resolve to their main form
-    FORM_TO_MAIN = {
-        'aegislashSword': 'aegislash',
-        'lycanrocNight': 'lycanrocDay',
-        'megaAbsol': 'absol',
-        'megaCharizardX': 'charizard',
-        'megaSceptile': 'sceptile',
-        'megaAlakazam': 'alakazam',
-    }
-    
-    def get_prev_evo(self, key):
-        """Get the previous evolution (one step back) of a Pokemon.
-        For form alternates (e.g. aegislashSword), resolve to the main form first."""
-        evos = self.data.get('evolutions', {})
-        # If this is a form alternate, resolve to main form first
-        if key in self.FORM_TO_MAIN:
-            key = self.FORM_TO_MAIN[key]
-        reverse = {v['evolves_to']: k for k, v in evos.items()}
-        return reverse.get(key, key)
-    
-    def get_final_evo(self, key):
-        """Get the final evolution of a Pokemon."""
-        evos = self.data.get('evolutions', {})
-        while key in evos:
-            key = evos[key]['evolves_to']
-        return key
-    
-    def get_base_form(self, key):
-        """Get the base form of a Pokemon by reversing the evolution chain.
-        Resolves form alternates and mega evolutions first."""
-        # Resolve form alternates / megas to main form
-        if key in self.FORM_TO_MAIN:
-            key = self.FORM_TO_MAIN[key]
-        # Also handle any mega not in the explicit map (megaX -> strip 'mega' prefix)
-        if key.startswith('mega') and key != 'meganium':
-            possible_base = key[4].lower() + key[5:]
-            if possible_base in self.data.get('allKeys', []):
-                key = possible_base
-        evos = self.data.get('evolutions', {})
-        reverse = {v['evolves_to']: k for k, v in evos.items()}
-        while key in reverse:
-            key = reverse[key]
-        return key
-    
-    def get_chain(self, key):
-        """Get all species keys in an evolution chain (from base to final)."""
-        base = self.get_base_form(key)
-        chain = [base]
-        evos = self.data.get('evolutions', {})
-        current = base
-        while current in evos:
-            current = evos[current]['evolves_to']
-            chain.append(current)
-        return chain
-
-    def get_unlock_roots(self):
-        """Return one unlockable root per obtainable line/standalone species.
-        Uses actual metadata relationships instead of the older baseForms list so
-        newly added standalone Pokemon and new lines are included automatically."""
-        roots = []
-        for key in self.all_pokemon:
-            if key.startswith('mega'):
-                continue
-            if key in self.FORM_TO_MAIN:
-                continue
-            if self.get_prev_evo(key) == key:
-                roots.append(key)
-        return roots
-    
-    def create_new_pokemon(self, species_key):
-        return {
-            "specieKey": species_key,
-            "lvl": 1,
-            "targetMode": "area",
-            "favorite": False,
-            "isShiny": False,
-            "hideShiny": False,
-            "isMega": False
-        }
+
+            # 3. The game's own sprites, straight from the asar when nothing is extracted
+            data = GAME_FILES.read_bytes(f"{GAME_SPRITES_DIR}/{variant}/{sprite_key}.png")
+            if data is not None:
+                try:
+                    return Image.open(io.BytesIO(data)).resize((size, size), Image.Resampling.NEAREST)
+                except Exception:
+                    pass
+        return None
+
+    def get_sprite(self, key, size=48, is_shiny=False):
+        if not HAS_PIL:
+            return None
+        cache_key = (key, size, bool(is_shiny))
+        if cache_key in self.sprites:
+            self.sprites.move_to_end(cache_key)
+            return self.sprites[cache_key]
+
+        return self._store_sprite(cache_key, self.load_sprite_image(key, size, is_shiny))
+
+    def _store_sprite(self, cache_key, img):
+        sprite = ImageTk.PhotoImage(img) if img is not None else None
+        self.sprites[cache_key] = sprite
+        if len(self.sprites) > self.SPRITE_CACHE_LIMIT:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def request_sprite(self, key, size=48, is_shiny=False, on_ready=None):
+        """
+        Non-blocking get_sprite. Returns (ready, sprite): a cached sprite is
+        returned at once; otherwise it is decoded on the loader's workers,
+        (False, None) is returned, and on_ready() runs once it is cached.
+        """
+        if not HAS_PIL:
+            return True, None
+        cache_key = (key, size, bool(is_shiny))
+        if cache_key in self.sprites:
+            self.sprites.move_to_end(cache_key)
+            return True, self.sprites[cache_key]
+        if self.loader is None:
+            return True, self.get_sprite(key, size, is_shiny)
+
+        def done(img):
+            if cache_key not in self.sprites:
+                self._store_sprite(cache_key, img)
+            if on_ready:
+                on_ready()
+
+        self.loader.submit(('pokemon',) + cache_key, lambda: self.load_sprite_image(key, size, is_shiny), done)
+        return False, None
+
 
 # ============================================================================
 # POKEMON CELL WIDGET
@@ -741,6 +757,7 @@ class PokemonCell(tk.Frame):
         self.on_click = on_click
         self.is_selected = False
         self.has_pokemon = False
+        self.render_key = None  # what the cell currently shows; see App._paint_cell
         
         # Sprite canvas (fixed size, no resizing)
         self.sprite_canvas = tk.Canvas(self, width=48, height=48, bg='#2a2a2a', 
@@ -763,8 +780,8 @@ class PokemonCell(tk.Frame):
     def _on_click(self, event=None):
         self.on_click(self.slot_index)
     
-    def set_pokemon(self, sprite_image, level, is_shiny=False, held_item_sprite=None):
-        """Update cell with Pokemon data."""
+    def set_pokemon(self, sprite_image, level, is_shiny=False, held_item_sprite=None, pending=False):
+        """Update cell with Pokemon data (pending: sprite still decoding, draw a placeholder)."""
         self.has_pokemon = True
         self.sprite_image = sprite_image
         self.held_item_image = held_item_sprite
@@ -773,6 +790,8 @@ class PokemonCell(tk.Frame):
         self.sprite_canvas.delete('all')
         if sprite_image:
             self.sprite_id = self.sprite_canvas.create_image(24, 24, image=sprite_image)
+        elif pending:
+            self.sprite_canvas.create_oval(14, 14, 34, 34, outline='#555555', dash=(2, 2))
         if held_item_sprite:
             self.sprite_canvas.create_image(47, 47, image=held_item_sprite, anchor='se')
 
@@ -783,7 +802,7 @@ class PokemonCell(tk.Frame):
         # Set background
         self._update_bg()
     
-    def set_item(self, sprite_image, label='item'):
+    def set_item(self, sprite_image, label='item', pending=False):
         """Update cell with item data."""
         self.has_pokemon = True
         self.sprite_image = sprite_image
@@ -792,6 +811,8 @@ class PokemonCell(tk.Frame):
         self.sprite_canvas.delete('all')
         if sprite_image:
             self.sprite_id = self.sprite_canvas.create_image(24, 24, image=sprite_image)
+        elif pending:
+            self.sprite_canvas.create_oval(14, 14, 34, 34, outline='#555555', dash=(2, 2))
         else:
             self.sprite_canvas.create_text(24, 24, text="?", font=('Arial', 16), fill='#dddddd')
 
@@ -812,6 +833,8 @@ class PokemonCell(tk.Frame):
     
     def set_selected(self, selected):
         """Update selection state."""
+        if selected == self.is_selected:
+            return
         self.is_selected = selected
         self._update_bg()
     
@@ -828,6 +851,93 @@ class PokemonCell(tk.Frame):
         self.sprite_canvas.config(bg=bg)
         self.level_label.config(bg=bg)
 
+
+class VirtualCellGrid:
+    """
+    Scrollable grid of `count` slots on a Canvas that only has PokemonCells
+    for the rows in view. Cells scrolled out of view are recycled for the
+    slots scrolling in, so the widget count stays at about one screenful
+    however many slots there are. paint(cell, slot_index) fills a cell.
+    """
+
+    SPAN_X = CELL_SIZE + CELL_PAD * 2
+    SPAN_Y = CELL_SIZE + 15 + CELL_PAD * 2
+
+    def __init__(self, canvas, scrollbar, first_slot, on_click, paint):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.first_slot = first_slot
+        self.on_click = on_click
+        self.paint = paint
+        self.count = 0
+        self.cols = DEFAULT_GRID_COLS
+        self.cells = {}  # slot_index -> PokemonCell, for slots in view
+        self._windows = {}  # PokemonCell -> canvas window id
+        self._spare = []  # hidden cells ready for reuse
+        self._view_job = None
+        canvas.configure(yscrollcommand=self._on_yscroll)
+
+    def configure(self, count=None, cols=None):
+        """Change the slot count and/or column count and re-layout if either changed."""
+        count = self.count if count is None else count
+        cols = self.cols if cols is None else max(1, cols)
+        if (count, cols) == (self.count, self.cols):
+            return
+        relayout = cols != self.cols
+        self.count, self.cols = count, cols
+        rows = -(-count // cols)
+        self.canvas.configure(scrollregion=(0, 0, cols * self.SPAN_X, rows * self.SPAN_Y))
+        if relayout:
+            for slot_index, cell in self.cells.items():
+                self.canvas.coords(self._windows[cell], *self._slot_xy(slot_index))
+        self.update_view()
+
+    def _slot_xy(self, slot_index):
+        i = slot_index - self.first_slot
+        return (i % self.cols) * self.SPAN_X + CELL_PAD, (i // self.cols) * self.SPAN_Y + CELL_PAD
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._view_job is None:
+            self._view_job = self.canvas.after_idle(self.update_view)
+
+    def update_view(self):
+        """Bind cells to the slots currently in view (painting only newly bound ones)."""
+        self._view_job = None
+        top = max(0, int(self.canvas.canvasy(0)))
+        height = max(self.canvas.winfo_height(), self.SPAN_Y)
+        rows = -(-self.count // self.cols)
+        first_row = min(top // self.SPAN_Y, max(0, rows - 1))
+        last_row = first_row + height // self.SPAN_Y + 1
+        start = self.first_slot + first_row * self.cols
+        end = self.first_slot + min(self.count, (last_row + 1) * self.cols)
+        wanted = range(start, end)
+
+        for slot_index in [s for s in self.cells if s not in wanted]:
+            cell = self.cells.pop(slot_index)
+            self.canvas.itemconfigure(self._windows[cell], state='hidden')
+            self._spare.append(cell)
+
+        for slot_index in wanted:
+            if slot_index in self.cells:
+                continue
+            if self._spare:
+                cell = self._spare.pop()
+                self.canvas.itemconfigure(self._windows[cell], state='normal')
+                self.canvas.coords(self._windows[cell], *self._slot_xy(slot_index))
+            else:
+                cell = PokemonCell(self.canvas, slot_index, self.on_click)
+                self._windows[cell] = self.canvas.create_window(*self._slot_xy(slot_index), window=cell, anchor='nw')
+            cell.slot_index = slot_index
+            cell.render_key = None
+            self.cells[slot_index] = cell
+            self.paint(cell, slot_index)
+
+    def repaint(self):
+        """Re-run paint for every cell in view."""
+        for slot_index, cell in self.cells.items():
+            self.paint(cell, slot_index)
+
 # ============================================================================
 # MAIN APP
 # ============================================================================
@@ -841,6 +951,11 @@ class App(tk.Tk):
         
         self.save = SaveData()
         self.poke_data = PokemonData()
+        self.sprite_loader = SpriteLoader(self) if HAS_PIL else None
+        self.poke_data.loader = self.sprite_loader
+        self._sprite_repaint_job = None
+        self.ops = SaveOps(self.save, self.poke_data, INSTALLED_FEATURES,
+                           _load_route_reward_pokemon_keys(), _load_egg_list_keys())
         self.route_options = _load_route_options()
         self.route_name_to_number = {}
         self.route_id_to_display = {}
@@ -852,14 +967,15 @@ class App(tk.Tk):
         self.held_item_display_to_obj = {}
         self.item_sprite_cache = {}
         self.item_visible_slots = []
-        self.item_cell_to_visible_index = {}
         self.editor_mode = 'pokemon'  # pokemon | items
         self.selected_item_slot = None
         self.selected_slot = None
-        self.cells = {}  # slot_index -> PokemonCell
+        self.team_cells = {}  # slot_index -> PokemonCell
+        self.box_grid = None  # VirtualCellGrid for the box / item slots
         self.team_cols = TEAM_SLOTS
         self.box_cols = DEFAULT_GRID_COLS
         self._relayout_job = None
+        self._team_laid_out = False
         
         self.build_ui()
         self.auto_load()
@@ -884,6 +1000,7 @@ class App(tk.Tk):
         ttk.Button(toolbar, text="Load File", command=self.load_file).pack(side='left', padx=2)
         ttk.Button(toolbar, text="Save to Game", command=self.save_game).pack(side='left', padx=2)
         ttk.Button(toolbar, text="Export", command=self.export).pack(side='left', padx=2)
+        ttk.Button(toolbar, text="Snapshots", command=self.restore_snapshot).pack(side='left', padx=2)
         
         ttk.Separator(toolbar, orient='vertical').pack(side='left', fill='y', padx=10)
         
@@ -915,7 +1032,7 @@ class App(tk.Tk):
         self.gold_entry = ttk.Entry(stats, textvariable=self.gold_var, width=12)
         self.gold_entry.grid(row=0, column=3, padx=5, sticky='w')
         ttk.Button(stats, text="Set", command=self.set_gold, width=5).grid(row=0, column=4, padx=2)
-        ttk.Button(stats, text="Max Gold", command=lambda: self.set_gold_value(9007199254740991 if _has_feature('qol') else 99999999999)).grid(row=0, column=5, padx=5)
+        ttk.Button(stats, text="Max Gold", command=self.max_gold).grid(row=0, column=5, padx=5)
         
         # Stars (display only - calculated from records)
         ttk.Label(stats, text="Stars:").grid(row=0, column=6, padx=5, sticky='e')
@@ -970,7 +1087,7 @@ class App(tk.Tk):
         for i in range(TEAM_SLOTS):
             cell = PokemonCell(self.team_grid, i, self.on_cell_click)
             cell.grid(row=0, column=i, padx=2, pady=2)
-            self.cells[i] = cell
+            self.team_cells[i] = cell
         
         # Box section
         self.box_header = tk.Label(self.left_frame, text="BOX (200 slots)", font=('Arial', 9, 'bold'), 
@@ -983,25 +1100,14 @@ class App(tk.Tk):
         
         box_canvas = tk.Canvas(self.box_container, bg='#1e1e1e', highlightthickness=0)
         box_scrollbar = ttk.Scrollbar(self.box_container, orient='vertical', command=box_canvas.yview)
-        box_inner = tk.Frame(box_canvas, bg='#1e1e1e')
         self.box_canvas = box_canvas
-        self.box_inner = box_inner
         
-        box_canvas.configure(yscrollcommand=box_scrollbar.set)
         box_scrollbar.pack(side='right', fill='y')
         box_canvas.pack(side='left', fill='both', expand=True)
         
-        box_canvas.create_window((0, 0), window=box_inner, anchor='nw')
-        box_inner.bind('<Configure>', lambda e: box_canvas.configure(scrollregion=box_canvas.bbox('all')))
-        
-        # Create box slots
-        for i in range(BOX_SLOTS):
-            slot_index = TEAM_SLOTS + i
-            row = i // DEFAULT_GRID_COLS
-            col = i % DEFAULT_GRID_COLS
-            cell = PokemonCell(box_inner, slot_index, self.on_cell_click)
-            cell.grid(row=row, column=col, padx=CELL_PAD, pady=CELL_PAD)
-            self.cells[slot_index] = cell
+        # Box slots: cells exist only for the rows in view
+        self.box_grid = VirtualCellGrid(box_canvas, box_scrollbar, TEAM_SLOTS, self.on_cell_click, self._paint_cell)
+        self.box_grid.configure(count=BOX_SLOTS)
         
         # Right - Editor (with scrollbar for small screens)
         right_outer = ttk.Frame(content, width=320)
@@ -1186,11 +1292,10 @@ class App(tk.Tk):
     def on_cell_click(self, slot_index):
         """Handle cell click - select Pokemon slot or item slot based on active tab."""
         if self.editor_mode == 'items':
-            visible_index = self.item_cell_to_visible_index.get(slot_index)
-            if visible_index is None:
+            if slot_index < TEAM_SLOTS:
                 return
 
-            self.selected_item_slot = visible_index
+            self.selected_item_slot = slot_index - TEAM_SLOTS
             self.refresh_grid()
             return
 
@@ -1218,6 +1323,7 @@ class App(tk.Tk):
             self.loaded_as_modded = use_modded
             self.source_label.config(text=f"Game Save ({mode_str}) - {team_count} team, {box_count} box")
             self._inject_missing_eggs()
+            self._prefetch_sprites()
             self.refresh_grid()
             self.status.config(text="Loaded!")
         else:
@@ -1261,6 +1367,7 @@ class App(tk.Tk):
         if path and self.save.load_from_file(Path(path)):
             self.source_label.config(text=f"File: {Path(path).name}")
             self._inject_missing_eggs()
+            self._prefetch_sprites()
             self.refresh_grid()
     
     def save_game(self):
@@ -1269,7 +1376,12 @@ class App(tk.Tk):
         self.status.config(text="Saving...")
         self.update()
         use_modded = self.save_mode_var.get() == "modded"
-        if self.save.save_to_game(modded=use_modded):
+        saved = self.save.save_to_game(modded=use_modded)
+        if not saved and self.save.conflict and messagebox.askyesno("Save Changed",
+                "The game's save changed since it was loaded into the editor.\n\n"
+                "Overwrite it with the editor's copy anyway?"):
+            saved = self.save.save_to_game(modded=use_modded, force=True)
+        if saved:
             mode_str = "modded" if use_modded else "vanilla"
             messagebox.showinfo("Saved", f"Save written to {mode_str}! Restart game.")
             self.status.config(text="Saved!")
@@ -1281,6 +1393,55 @@ class App(tk.Tk):
         if path and self.save.export_to_file(Path(path)):
             messagebox.showinfo("Exported", f"Saved to {path}")
 
+    def _snapshot(self, label):
+        """Record the current save in the snapshot store before a destructive edit."""
+        if snapshot_store is None or not self.save.data:
+            return
+        try:
+            snapshot_store.take_snapshot(self.save.data, label)
+        except Exception as e:
+            print(f"Snapshot failed: {e}")
+
+    def restore_snapshot(self):
+        if snapshot_store is None:
+            return
+        snapshots = snapshot_store.list_snapshots()
+        if not snapshots:
+            messagebox.showinfo("Snapshots", "No snapshots yet.\n\nOne is taken automatically before Delete All, Remove Duplicates and Complete All Stages.")
+            return
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Restore Snapshot")
+        dialog.geometry("380x400")
+        dialog.transient(self)
+        dialog.grab_set()
+
+        ttk.Label(dialog, text="Snapshots (newest first):").pack(pady=10)
+
+        listbox = tk.Listbox(dialog, height=15)
+        listbox.pack(fill='both', expand=True, padx=10, pady=10)
+        for snap in snapshots:
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snap.get('created', 0)))
+            listbox.insert(tk.END, f"{when}  {snap.get('label', '')}")
+
+        def on_restore():
+            sel = listbox.curselection()
+            if not sel:
+                return
+            try:
+                self.save.data = snapshot_store.load_snapshot(snapshots[sel[0]]['id'])
+            except snapshot_store.SnapshotError as e:
+                messagebox.showerror("Error", f"Could not restore snapshot:\n\n{e}")
+                return
+            self.selected_slot = None
+            self.selected_item_slot = None
+            self.refresh_grid()
+            self.status.config(text="Snapshot restored - Save to Game to keep it")
+            dialog.destroy()
+
+        ttk.Button(dialog, text="Restore", command=on_restore).pack(pady=10)
+        listbox.bind('<Double-1>', lambda e: on_restore())
+
     def _mode_from_tab_selection(self):
         if not hasattr(self, 'mode_tabs'):
             return 'pokemon'
@@ -1341,7 +1502,7 @@ class App(tk.Tk):
     def _apply_dynamic_grid_layout(self):
         self._relayout_job = None
 
-        if not self.cells:
+        if not self.team_cells:
             return
 
         team_width = self.team_grid.winfo_width() if hasattr(self, 'team_grid') else 0
@@ -1352,51 +1513,149 @@ class App(tk.Tk):
         if box_width <= 1 and hasattr(self, 'left_frame'):
             box_width = max(1, self.left_frame.winfo_width() - 20)
 
-        self.team_cols = self._dynamic_cols_for_width(team_width, TEAM_SLOTS, TEAM_SLOTS)
+        team_cols = self._dynamic_cols_for_width(team_width, TEAM_SLOTS, TEAM_SLOTS)
         self.box_cols = self._dynamic_cols_for_width(box_width, BOX_SLOTS, DEFAULT_GRID_COLS)
+        self.box_grid.configure(cols=self.box_cols)
+        self.box_grid.update_view()  # the box may also have grown taller
 
-        for i in range(TEAM_SLOTS):
-            cell = self.cells.get(i)
-            if cell:
+        if team_cols != self.team_cols or not self._team_laid_out:
+            self.team_cols = team_cols
+            self._team_laid_out = True
+            for i, cell in self.team_cells.items():
                 cell.grid_configure(row=i // self.team_cols, column=i % self.team_cols, padx=CELL_PAD, pady=CELL_PAD)
 
-        for i in range(BOX_SLOTS):
-            slot_index = TEAM_SLOTS + i
-            cell = self.cells.get(slot_index)
-            if cell:
-                cell.grid_configure(row=i // self.box_cols, column=i % self.box_cols, padx=CELL_PAD, pady=CELL_PAD)
-
     def _resolve_item_sprite_path(self, item_obj):
+        """Game-relative path of an item's sprite (see GAME_FILES), or None."""
         sprite = item_obj.get('sprite') if isinstance(item_obj, dict) else None
-        if not sprite or not PATHS.get('game_root'):
+        if not sprite:
             return None
+        return sprite.replace('\\', '/').lstrip('./')
 
-        relative = sprite.replace('\\', '/').lstrip('./')
-        return PATHS['game_root'] / 'resources' / 'app_extracted' / Path(relative)
+    @staticmethod
+    def _load_item_image(sprite_path, size):
+        """Decode and resize an item sprite (PIL only, safe off the Tk thread)."""
+        data = GAME_FILES.read_bytes(sprite_path) if sprite_path else None
+        if data is None:
+            return None
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                return img.convert('RGBA').resize((size, size), Image.NEAREST)
+        except Exception:
+            return None
+
+    def _store_item_sprite(self, cache_key, img):
+        tk_img = ImageTk.PhotoImage(img) if img is not None else None
+        self.item_sprite_cache[cache_key] = tk_img
+        return tk_img
 
     def get_item_sprite(self, item_obj, size=48):
+        return self.request_item_sprite(item_obj, size, background=False)[1]
+
+    def request_item_sprite(self, item_obj, size=48, on_ready=None, background=True):
+        """
+        Item counterpart of PokemonData.request_sprite: (ready, sprite), with
+        uncached sprites decoded on the sprite loader and on_ready() called
+        once they are cached.
+        """
         if not HAS_PIL or not item_obj:
-            return None
+            return True, None
 
         item_id = item_obj.get('id')
         if not item_id:
-            return None
+            return True, None
 
         cache_key = (item_id, size)
         if cache_key in self.item_sprite_cache:
-            return self.item_sprite_cache[cache_key]
+            return True, self.item_sprite_cache[cache_key]
 
         sprite_path = self._resolve_item_sprite_path(item_obj)
-        if not sprite_path or not sprite_path.exists():
-            return None
+        if not background or self.sprite_loader is None:
+            return True, self._store_item_sprite(cache_key, self._load_item_image(sprite_path, size))
 
-        try:
-            img = Image.open(sprite_path).convert('RGBA').resize((size, size), Image.NEAREST)
-            tk_img = ImageTk.PhotoImage(img)
-            self.item_sprite_cache[cache_key] = tk_img
-            return tk_img
-        except Exception:
-            return None
+        def done(img):
+            if cache_key not in self.item_sprite_cache:
+                self._store_item_sprite(cache_key, img)
+            if on_ready:
+                on_ready()
+
+        self.sprite_loader.submit(('item',) + cache_key, lambda: self._load_item_image(sprite_path, size), done)
+        return False, None
+
+    def _queue_sprite_repaint(self):
+        """Repaint the grid once for a burst of sprites arriving from the loader."""
+        if self._sprite_repaint_job is None:
+            self._sprite_repaint_job = self.after_idle(self._repaint_sprites)
+
+    def _repaint_sprites(self):
+        self._sprite_repaint_job = None
+        if not self.save.data:
+            return
+        if self.editor_mode != 'items':
+            for slot_index, cell in self.team_cells.items():
+                self._paint_cell(cell, slot_index)
+        self.box_grid.repaint()
+
+    def _prefetch_sprites(self):
+        """
+        Queue every sprite the loaded save can show (team, box, held and
+        inventory items) on the sprite loader, so scrolling and switching
+        tabs find them already decoded.
+        """
+        if self.sprite_loader is None:
+            return
+        for poke in list(self.save.team) + list(self.save.box):
+            if not poke:
+                continue
+            self.poke_data.request_sprite(poke.get('specieKey', '?'), 48, poke.get('isShiny', False))
+            self.request_item_sprite(poke.get('item'), 24)
+        for item_obj in self.save.items:
+            self.request_item_sprite(item_obj, 48)
+
+    def _paint_cell(self, cell, slot_index):
+        """
+        Show slot_index in cell for the current mode. Only cells whose
+        contents actually changed are redrawn, so an edit to one Pokemon
+        repaints one cell.
+        """
+        if self.editor_mode == 'items':
+            display_idx = slot_index - TEAM_SLOTS
+            item_obj = None
+            if display_idx >= 0:
+                actual_index = self._actual_item_index(display_idx)
+                item_obj = self.save.items[actual_index] if actual_index is not None and actual_index < len(self.save.items) else None
+            if item_obj:
+                ready, sprite = self.request_item_sprite(item_obj, 48, self._queue_sprite_repaint)
+                label = self._item_label(item_obj)
+                short_label = label[:10] + '…' if len(label) > 11 else label
+                render_key = ('item', sprite, short_label, ready)
+                if render_key != cell.render_key:
+                    cell.set_item(sprite, short_label, pending=not ready)
+            else:
+                render_key = ('empty', "empty")
+                if render_key != cell.render_key:
+                    cell.set_empty("empty")
+            cell.render_key = render_key
+            cell.set_selected(display_idx >= 0 and display_idx == self.selected_item_slot)
+            return
+
+        poke = self.save.get_pokemon_at_slot(slot_index)
+        if poke:
+            key = poke.get('specieKey', '?')
+            lvl = poke.get('lvl', 1)
+            is_shiny = poke.get('isShiny', False)
+            # Uncached sprites decode in the background; the cell shows a
+            # placeholder until _queue_sprite_repaint paints them in.
+            ready, sprite = self.poke_data.request_sprite(key, 48, is_shiny, self._queue_sprite_repaint)
+            held_item_sprite = self.request_item_sprite(poke.get('item'), 24, self._queue_sprite_repaint)[1]
+            render_key = ('pokemon', sprite, lvl, is_shiny, held_item_sprite, ready)
+            if render_key != cell.render_key:
+                cell.set_pokemon(sprite, lvl, is_shiny, held_item_sprite, pending=not ready)
+        else:
+            render_key = ('empty',)
+            if render_key != cell.render_key:
+                cell.set_empty()
+        cell.render_key = render_key
+        cell.set_selected(slot_index == self.selected_slot)
 
     def refresh_grid(self):
         """Refresh all cells with current data."""
@@ -1422,32 +1681,7 @@ class App(tk.Tk):
             self.box_header.pack(anchor='w', pady=(0, 2), before=self.box_container)
 
             self.item_visible_slots = self._get_visible_item_indices()
-            self.item_cell_to_visible_index = {}
-
-            for slot_index, cell in self.cells.items():
-                if slot_index < TEAM_SLOTS:
-                    cell.set_empty("empty")
-                    cell.set_selected(False)
-
-            item_cell_slots = [TEAM_SLOTS + i for i in range(BOX_SLOTS) if (TEAM_SLOTS + i) in self.cells]
-            for display_idx, cell_slot in enumerate(item_cell_slots):
-                cell = self.cells[cell_slot]
-                self.item_cell_to_visible_index[cell_slot] = display_idx
-
-                if display_idx < len(self.item_visible_slots):
-                    actual_index = self._actual_item_index(display_idx)
-                    item_obj = self.save.items[actual_index] if actual_index is not None and actual_index < len(self.save.items) else None
-                    if item_obj:
-                        sprite = self.get_item_sprite(item_obj, 48)
-                        label = self._item_label(item_obj)
-                        short_label = label[:10] + '…' if len(label) > 11 else label
-                        cell.set_item(sprite, short_label)
-                    else:
-                        cell.set_empty("empty")
-                else:
-                    cell.set_empty("empty")
-
-                cell.set_selected(display_idx == self.selected_item_slot)
+            self.box_grid.repaint()
 
             total_slots = len(self.item_visible_slots)
             filled_slots = len([idx for idx in self.item_visible_slots if self.save.items[idx]])
@@ -1465,22 +1699,9 @@ class App(tk.Tk):
             self.box_header.pack(anchor='w', pady=(5, 5), before=self.box_container)
 
             self.item_visible_slots = []
-            self.item_cell_to_visible_index = {}
-
-            for slot_index, cell in self.cells.items():
-                poke = self.save.get_pokemon_at_slot(slot_index)
-
-                if poke:
-                    key = poke.get('specieKey', '?')
-                    lvl = poke.get('lvl', 1)
-                    is_shiny = poke.get('isShiny', False)
-                    sprite = self.poke_data.get_sprite(key, 48, is_shiny)
-                    held_item_sprite = self.get_item_sprite(poke.get('item'), 24)
-                    cell.set_pokemon(sprite, lvl, is_shiny, held_item_sprite)
-                else:
-                    cell.set_empty()
-
-                cell.set_selected(slot_index == self.selected_slot)
+            for slot_index, cell in self.team_cells.items():
+                self._paint_cell(cell, slot_index)
+            self.box_grid.repaint()
 
             team_count = len(self.save.team)
             box_count = len(self.save.box)
@@ -1561,7 +1782,7 @@ class App(tk.Tk):
             messagebox.showerror("Invalid Wave", "Wave must be a whole number.")
             return
 
-        self.save.set_route_and_wave(route_number, wave_number)
+        self.ops.set_route_and_wave(route_number, wave_number)
         self.refresh_route_wave_controls()
         self.status.config(text=f"Set last route/wave to {selected}, Wave {max(1, wave_number)}")
 
@@ -1830,21 +2051,10 @@ class App(tk.Tk):
         self.refresh_grid()
 
     def _get_effective_team_slots(self):
-        if not self.save.data:
-            return TEAM_SLOTS
-        raw_value = self.save.player.get('teamSlots', TEAM_SLOTS)
-        try:
-            team_slots = int(raw_value)
-        except Exception:
-            team_slots = TEAM_SLOTS
-        return max(1, min(TEAM_SLOTS, team_slots))
+        return self.save.get_effective_team_slots()
 
     def _first_empty_team_slot(self):
-        max_slots = self._get_effective_team_slots()
-        for i in range(max_slots):
-            if not self.save.get_pokemon_at_slot(i):
-                return i
-        return None
+        return self.save.first_empty_team_slot()
 
     def _first_empty_box_slot(self):
         for i in range(BOX_SLOTS):
@@ -2128,147 +2338,30 @@ class App(tk.Tk):
             self.save.delete_at_slot(self.selected_slot)
             self.refresh_grid()
     
-    def _profile_ownership_key(self, key, obtainable_keys):
-        if not key:
-            return None
-        # Profile completion is mostly tracked by root/base species keys.
-        # Prioritize base-form ownership so max evolutions (e.g. cacturne)
-        # correctly satisfy base-counted entries (e.g. cacnea).
-        base = self.poke_data.get_base_form(key)
-        if base in obtainable_keys:
-            return base
-        if key in obtainable_keys:
-            return key
-        return None
-
     def unlock_all(self):
         if not self.save.data:
             return
-
-        # Collect currently owned species keys
-        existing_keys = set()
-        for p in self.save.team + self.save.box:
-            if p:
-                key = p.get('specieKey', '')
-                if key:
-                    existing_keys.add(key)
-
-        # Build set of covered evolution chains for non-profile roots
-        covered_chains = set()
-        for key in existing_keys:
-            covered_chains.add(self.poke_data.get_base_form(key))
-            for chain_key in self.poke_data.get_chain(key):
-                covered_chains.add(chain_key)
-
-        # Build profile-obtainable key set (used by in-game completion counters)
-        all_keys = set(self.poke_data.all_pokemon)
-        explicit_unlockables = {
-            'greavard', 'cacnea', 'ducklett', 'sandygast', 'luvdisc',
-            'chatot', 'shedinja', 'gholdengo', 'stakataka', 'missingNo',
-        }
-        route_reward_keys = set(_load_route_reward_pokemon_keys())
-        static_egg_keys = set(_load_egg_list_keys())
-        shop_egg_keys = set(self.save.save_obj.get('shop', {}).get('eggList', []) or [])
-        obtainable_keys = {
-            k for k in (explicit_unlockables | route_reward_keys | static_egg_keys | shop_egg_keys)
-            if k in all_keys
-        }
-
-        owned_profile_keys = set()
-        for key in existing_keys:
-            ownership_key = self._profile_ownership_key(key, obtainable_keys)
-            if ownership_key:
-                owned_profile_keys.add(ownership_key)
-
-        count = 0
-        skipped = 0
-        added_to_team = 0
-        unlock_targets = list(self.poke_data.get_unlock_roots())
-
-        # Include non-root unlockables that profile counts separately.
-        extra_unlocks = set()
-        for extra_key in obtainable_keys:
-            if self.poke_data.get_base_form(extra_key) == extra_key:
-                continue
-            extra_unlocks.add(extra_key)
-
-        for extra_key in sorted(extra_unlocks):
-            if extra_key not in unlock_targets:
-                unlock_targets.append(extra_key)
-
-        for key in unlock_targets:
-            if key in existing_keys:
-                skipped += 1
-                continue
-
-            ownership_key = self._profile_ownership_key(key, obtainable_keys)
-
-            # If this key is counted by profile completion, require exact missing ownership key.
-            if ownership_key:
-                if ownership_key in owned_profile_keys:
-                    skipped += 1
-                    continue
-            else:
-                # Fallback behavior for non-profile roots: avoid same-chain duplicates.
-                if key in covered_chains and key not in extra_unlocks:
-                    skipped += 1
-                    continue
-
-            new_poke = self.poke_data.create_new_pokemon(key)
-            team_slot = self._first_empty_team_slot()
-            if team_slot is not None:
-                self.save.set_pokemon_at_slot(team_slot, new_poke)
-                added_to_team += 1
-            else:
-                self.save.box.append(new_poke)
-
-            count += 1
-            existing_keys.add(key)
-            covered_chains.add(self.poke_data.get_base_form(key))
-            for chain_key in self.poke_data.get_chain(key):
-                covered_chains.add(chain_key)
-            if ownership_key:
-                owned_profile_keys.add(ownership_key)
-
+        result = self.ops.unlock_all()
+        count, added_to_team = result['added'], result['added_to_team']
         self.refresh_grid()
-        messagebox.showinfo("Done", f"Added {count} new Pokemon!\n({added_to_team} added to Team, {count - added_to_team} added to Box)\n({skipped} already covered)")
+        messagebox.showinfo("Done", f"Added {count} new Pokemon!\n({added_to_team} added to Team, {count - added_to_team} added to Box)\n({result['skipped']} already covered)")
     
     def make_all_shiny(self):
         """Make all Pokemon in team and box shiny. On vanilla saves, only max evolutions."""
         if not self.save.data:
             return
         
-        has_shiny_mod = _has_feature('shiny')
-        count = 0
-        skipped = 0
-        for poke in self.save.team + self.save.box:
-            if poke and not poke.get('isShiny', False):
-                if not has_shiny_mod and not self._is_max_evo(poke):
-                    skipped += 1
-                    continue
-                poke['isShiny'] = True
-                count += 1
-        
+        result = self.ops.make_all_shiny()
         self.refresh_grid()
-        msg = f"Made {count} Pokemon shiny!"
-        if skipped:
-            msg += f"\n({skipped} non-max evolutions skipped — Shiny mod not installed, no sprites for them)"
+        msg = f"Made {result['changed']} Pokemon shiny!"
+        if result['skipped']:
+            msg += f"\n({result['skipped']} non-max evolutions skipped — Shiny mod not installed, no sprites for them)"
         messagebox.showinfo("Done", msg)
     
     def max_all(self):
         if not self.save.data:
             return
-        count = 0
-        for p in self.save.team + self.save.box:
-            if p:
-                # Evolve to final form
-                old_key = p.get('specieKey', '')
-                new_key = self.poke_data.get_final_evo(old_key)
-                p['specieKey'] = new_key
-                # Only raise level to 100, never lower Pokemon already above 100
-                if p.get('lvl', 1) < 100:
-                    p['lvl'] = 100
-                count += 1
+        count = self.ops.max_all()['changed']
         self.refresh_grid()
         messagebox.showinfo("Done", f"Maxed {count} Pokemon to Lv100+ and fully evolved!")
     
@@ -2304,10 +2397,7 @@ class App(tk.Tk):
     
     def _is_max_evo(self, poke):
         """Check if a Pokemon is at its max evolution."""
-        key = poke.get('specieKey') or poke.get('specie', {}).get('key', '')
-        if not key:
-            return True  # Unknown — allow shiny
-        return self.poke_data.get_final_evo(key) == key
+        return self.ops.is_max_evo(poke)
 
     def _has_shiny_sprite(self, poke):
         """Check if this Pokemon has a shiny sprite available (max evo always does, others need mod sprites)."""
@@ -2354,6 +2444,7 @@ class App(tk.Tk):
         if not messagebox.askyesno("Delete All", f"Delete ALL {total} Pokemon?\n\nTeam: {team_count}\nBox: {box_count}\n\nThis cannot be undone!"):
             return
         
+        self._snapshot("Before Delete All Pokemon")
         # Clear team and box
         save_obj = self.save.save_obj
         save_obj['team'] = []
@@ -2377,11 +2468,7 @@ class App(tk.Tk):
                 continue
 
             base_key = self.poke_data.get_base_form(key)
-            chain = self.poke_data.get_chain(key)
-            try:
-                stage_index = chain.index(key)
-            except ValueError:
-                stage_index = 0
+            stage_index = self.poke_data.get_stage(key)
             try:
                 level = int(poke.get('lvl', 1) or 1)
             except Exception:
@@ -2413,18 +2500,17 @@ class App(tk.Tk):
             if candidate_rank > current_rank:
                 keep_by_base[base] = entry
 
+        duplicates = [entry for entry in occupied_slots if keep_by_base[entry['base']]['slot'] != entry['slot']]
+        if not duplicates:
+            messagebox.showinfo("Done", "No duplicates found.")
+            return
+
+        self._snapshot("Before Remove Duplicate Pokemon")
         removed = 0
-        for entry in sorted(occupied_slots, key=lambda e: e['slot'], reverse=True):
-            keep_entry = keep_by_base.get(entry['base'])
-            if keep_entry and keep_entry['slot'] == entry['slot']:
-                continue
+        for entry in sorted(duplicates, key=lambda e: e['slot'], reverse=True):
             self.save.delete_at_slot(entry['slot'])
             removed += 1
 
-        if removed == 0:
-            messagebox.showinfo("Done", "No duplicates found.")
-            return
-
         self.selected_slot = None
         self.refresh_grid()
         messagebox.showinfo("Done", f"Removed {removed} duplicate Pokemon (kept strongest form/level per evolution chain).")
@@ -2467,9 +2553,7 @@ class App(tk.Tk):
         messagebox.showinfo("Done", f"Unlocked {len(all_items)} items in inventory.")
 
     def max_gold(self):
-        if self.save.data:
-            self.save.set_player('gold', 9007199254740991 if _has_feature('qol') else 99999999999)
-            self.refresh_grid()
+        self.set_gold_value(self.ops.max_gold())
     
     def set_gold(self):
         """Set gold from entry field."""
@@ -2484,7 +2568,7 @@ class App(tk.Tk):
     def set_gold_value(self, amount):
         """Set gold to specific amount."""
         if self.save.data:
-            self.save.set_player('gold', amount)
+            self.ops.set_gold_value(amount)
             self.refresh_grid()
     
     def _inject_missing_eggs(self):
@@ -2594,6 +2678,7 @@ class App(tk.Tk):
 
         EXPECTED_STAR_ROUTE_COUNT = 20
 
+        self._snapshot("Before Complete All Stages")
         save_obj = self.save.save_obj
         records = list(save_obj.get('player', {}).get('records', []))
 